@@ -0,0 +1,431 @@
+"""
+Benchmarks of the wrapper's hot paths
+
+Runs against the in-process simulated SDK (jeti.simulator.SimulatedSDK),
+so it measures the Python side of every call: error checking, ctypes
+argument objects, buffer conversion and polling. Results are in seconds
+per operation, or stored / raw bytes for the size ratios (lower is better).
+
+Benchmarks:
+    check_error                 _check_error() on success
+    call_float_output           one DLL call with a c_float output (get_cct)
+    call_two_float_outputs      one DLL call with two outputs (get_chromaticity_xy)
+    spectrum_<n>                get_spectral_radiance() returning n values
+    get_all_values              JetiRadio.get_all_values() (5 DLL calls)
+    wait_overshoot_<t>ms        time wait_for_measurement() returns after a t ms exposure ends
+    concurrent_<n>_devices      time per spectrum with n devices read from n threads
+    discovery_cold              opening 4 devices without a device cache (enumeration)
+    discovery_warm              opening the same devices from the cache (direct opens)
+    storage_append              time per spectrum appended to a SpectrumStore (incl. compression)
+    storage_query               time of a one-device query spanning 10 s of a 4-device store
+    storage_size_ratio          stored / raw bytes of simulated spectra, lossless
+    storage_size_ratio_12bit    the same with values rounded to 12 mantissa bits
+    image_frame                 time per 64 × 1024 light image from iter_light_images() (1/frame rate)
+    image_read                  get_light_image() into a reused buffer
+    image_read_alloc            get_light_image() into a new array
+    channel_single_<n>          time per channel spectrum, single scans of n channels in one transfer
+    channel_stream_<n>          time per channel spectrum, ChannelStream blocks with dark subtraction
+
+Every run is appended to a JSON-lines history file. With a budgets file,
+a benchmark slower than its budget by more than --tolerance percent is a
+regression and the exit code is 1, which fails CI.
+
+Usage:
+    python benchmarks/bench_wrapper.py                      # run, check budgets
+    python benchmarks/bench_wrapper.py --quick -k spectrum  # subset, fewer repeats
+    python benchmarks/bench_wrapper.py --update-budgets     # accept current results
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+from jeti import JetiRadio, JetiRadioEx, JetiSpectroEx
+from jeti.discovery import DeviceInventory
+from jeti.storage import SpectrumStore
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+from jeti.wrapper import ConnectionType, _check_error
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BUDGETS = BENCHMARK_DIR / "budgets.json"
+DEFAULT_HISTORY = BENCHMARK_DIR / "history.jsonl"
+DEFAULT_TOLERANCE = 25.0
+
+SPECTRUM_RANGES = ((500, 550), (380, 780), (350, 1000))
+WAIT_INTEGRATION_TIMES = (1.0, 10.0, 50.0)
+CONCURRENT_DEVICES = (1, 2, 4)
+# Simulated link timing of the discovery benchmarks (seconds per device)
+DISCOVERY_PROBE_TIME = 0.02
+DISCOVERY_CONNECT_TIME = 0.005
+# Spectra per device stored by the storage benchmarks (independent of --quick,
+# so the size ratios are reproducible)
+STORAGE_ROWS = 1024
+STORAGE_DEVICES = 4
+IMAGE_ROWS = 64
+CHANNEL_COUNTS = (1, 8)
+CHANNEL_BLOCK = 16
+
+
+def time_per_call(function: Callable[[], object], number: int, repeat: int) -> float:
+    """
+    Best time per call over several timing runs
+
+    Args:
+        function: Callable without arguments
+        number: Calls per timing run
+        repeat: Number of timing runs
+
+    Returns:
+        Seconds per call (minimum over the runs)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _open(cls, devices: int = 1, time_scale: float = 0.0):
+    sdk = SimulatedSDK([SimulatedDevice(serial=f"SIM{number + 1:05d}", time_scale=time_scale,
+                                        seed=number) for number in range(devices)])
+    opened = []
+    for number in range(devices):
+        device = cls(dll=sdk)
+        device.open_device(number)
+        opened.append(device)
+    return opened
+
+
+def _measured(cls, devices: int = 1):
+    opened = _open(cls, devices)
+    for device in opened:
+        if isinstance(device, JetiRadioEx):
+            device.measure(10.0, 1)
+        else:
+            device.measure()
+        device.wait_for_measurement(0.0)
+    return opened
+
+
+def bench_check_error(scale: float) -> Dict[str, float]:
+    return {'check_error': time_per_call(lambda: _check_error(0, "JETI_Bench"),
+                                         int(200000 * scale), 5)}
+
+
+def bench_calls(scale: float) -> Dict[str, float]:
+    device, = _measured(JetiRadioEx)
+    try:
+        number = int(20000 * scale)
+        return {
+            'call_float_output': time_per_call(device.get_cct, number, 5),
+            'call_two_float_outputs': time_per_call(device.get_chromaticity_xy, number, 5),
+        }
+    finally:
+        device.close_device()
+
+
+def bench_spectrum(scale: float) -> Dict[str, float]:
+    device, = _measured(JetiRadioEx)
+    try:
+        results = {}
+        for begin, end in SPECTRUM_RANGES:
+            results[f'spectrum_{end - begin + 1}'] = time_per_call(
+                lambda: device.get_spectral_radiance(begin, end), int(2000 * scale), 5)
+        return results
+    finally:
+        device.close_device()
+
+
+def bench_get_all_values(scale: float) -> Dict[str, float]:
+    device, = _measured(JetiRadio)
+    try:
+        return {'get_all_values': time_per_call(device.get_all_values, int(5000 * scale), 5)}
+    finally:
+        device.close_device()
+
+
+def bench_wait(scale: float) -> Dict[str, float]:
+    device, = _open(JetiRadioEx, time_scale=1.0)
+    try:
+        results = {}
+        for integration_time in WAIT_INTEGRATION_TIMES:
+            overshoots = []
+            for _ in range(max(int(5 * scale), 2)):
+                start = time.perf_counter()
+                device.measure(integration_time, 1)
+                device.wait_for_measurement()
+                overshoots.append(time.perf_counter() - start - integration_time / 1000.0)
+            results[f'wait_overshoot_{integration_time:g}ms'] = sorted(overshoots)[len(overshoots) // 2]
+        return results
+    finally:
+        device.close_device()
+
+
+def bench_concurrency(scale: float) -> Dict[str, float]:
+    results = {}
+    for count in CONCURRENT_DEVICES:
+        devices = _measured(JetiRadioEx, count)
+        calls = int(2000 * scale)
+        barrier = threading.Barrier(count + 1)
+
+        def worker(device):
+            barrier.wait()
+            for _ in range(calls):
+                device.get_spectral_radiance(380, 780)
+
+        threads = [threading.Thread(target=worker, args=(device,)) for device in devices]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        results[f'concurrent_{count}_devices'] = (time.perf_counter() - start) / (calls * count)
+        for device in devices:
+            device.close_device()
+    return results
+
+
+def bench_discovery(scale: float) -> Dict[str, float]:
+    devices = [SimulatedDevice(serial=f"SIM{number + 1:05d}", time_scale=0.0,
+                               connection=ConnectionType.TCP, address=f"10.0.0.{number + 10}",
+                               probe_time=DISCOVERY_PROBE_TIME,
+                               connect_time=DISCOVERY_CONNECT_TIME) for number in range(4)]
+    sdk = SimulatedSDK(devices)
+    serials = [device.serial for device in devices]
+
+    def start(path: Path) -> float:
+        begin = time.perf_counter()
+        opened = DeviceInventory(path, dll=sdk).open_many(serials)
+        elapsed = time.perf_counter() - begin
+        for device in opened.values():
+            device.close_device()
+        return elapsed
+
+    cold, warm = [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(max(int(5 * scale), 2)):
+            path = Path(directory) / f"devices{run}.json"
+            cold.append(start(path))
+            warm.append(start(path))
+    return {'discovery_cold': min(cold), 'discovery_warm': min(warm)}
+
+
+def bench_storage(scale: float) -> Dict[str, float]:
+    device, = _open(JetiRadioEx)
+    try:
+        spectra = np.empty((STORAGE_ROWS, 401), dtype=np.float32)
+        for row in range(STORAGE_ROWS):
+            device.measure(10.0, 1)
+            device.wait_for_measurement(0.0)
+            spectra[row] = device.get_spectral_radiance(380, 780)
+    finally:
+        device.close_device()
+    timestamps = np.arange(STORAGE_ROWS, dtype=np.float64)
+    serials = [f"SIM{number + 1:05d}" for number in range(STORAGE_DEVICES)]
+    axis = np.arange(380.0, 781.0)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix, mantissa_bits in (('', None), ('_12bit', 12)):
+            store = SpectrumStore(Path(directory) / f"store{suffix}", axis, mantissa_bits=mantissa_bits)
+            start = time.perf_counter()
+            for serial in serials:
+                store.extend(serial, spectra, timestamps)
+            store.close()
+            if mantissa_bits is None:
+                results['storage_append'] = (time.perf_counter() - start) / (STORAGE_ROWS * STORAGE_DEVICES)
+            results[f'storage_size_ratio{suffix}'] = 1.0 / store.stats().ratio
+        store = SpectrumStore(Path(directory) / "store")
+        results['storage_query'] = time_per_call(lambda: store.query(serials[1], 500.0, 510.0),
+                                                 max(int(200 * scale), 1), 5)
+    return results
+
+
+def bench_images(scale: float) -> Dict[str, float]:
+    sdk = SimulatedSDK([SimulatedDevice(time_scale=0.0, sensor_rows=IMAGE_ROWS)])
+    device = JetiSpectroEx(dll=sdk)
+    device.open_device(0)
+    try:
+        frames = device.iter_light_images(1.0, poll_interval=0.0)
+        results = {'image_frame': time_per_call(lambda: next(frames), max(int(200 * scale), 2), 5)}
+        frames.close()
+        buffer = device.new_image_buffer()
+        number = int(1000 * scale)
+        results['image_read'] = time_per_call(lambda: device.get_light_image(out=buffer), number, 5)
+        results['image_read_alloc'] = time_per_call(device.get_light_image, number, 5)
+        return results
+    finally:
+        device.close_device()
+
+
+def bench_channels(scale: float) -> Dict[str, float]:
+    results = {}
+    for channels in CHANNEL_COUNTS:
+        sdk = SimulatedSDK([SimulatedDevice(time_scale=0.0, channels=channels)])
+        device = JetiSpectroEx(dll=sdk)
+        device.open_device(0)
+        try:
+            buffer = np.empty(device.channel_shape, dtype=np.uint16)
+
+            def scan():
+                device.start_channel_light(1.0, 1)
+                device.wait_for_measurement(0.0)
+                device.get_channel_light(out=buffer)
+
+            number = max(int(500 * scale), 2)
+            results[f'channel_single_{channels}'] = time_per_call(scan, number, 5) / channels
+            stream = device.create_channel_stream(CHANNEL_BLOCK, 4, poll_interval=0.0)
+            stream.measure_dark(1.0, 1)
+            with stream:
+                per_block = time_per_call(stream.read_corrected, max(int(50 * scale), 2), 5)
+            results[f'channel_stream_{channels}'] = per_block / (CHANNEL_BLOCK * channels)
+        finally:
+            device.close_device()
+    return results
+
+
+BENCHMARKS: List[Tuple[str, Callable[[float], Dict[str, float]]]] = [
+    ('check_error', bench_check_error),
+    ('call_*', bench_calls),
+    ('spectrum_*', bench_spectrum),
+    ('get_all_values', bench_get_all_values),
+    ('wait_overshoot_*', bench_wait),
+    ('concurrent_*', bench_concurrency),
+    ('discovery_*', bench_discovery),
+    ('storage_*', bench_storage),
+    ('image_*', bench_images),
+    ('channel_*', bench_channels),
+]
+
+
+def run_benchmarks(patterns: Sequence[str] = (), quick: bool = False) -> Dict[str, float]:
+    """
+    Run the benchmarks
+
+    Args:
+        patterns: Shell-style patterns selecting benchmark names (empty = all)
+        quick: Run a tenth of the iterations
+
+    Returns:
+        Benchmark name -> seconds per operation
+    """
+    scale = 0.1 if quick else 1.0
+    results = {}
+    for names, bench in BENCHMARKS:
+        if patterns and not any(fnmatch.fnmatch(names, f"*{pattern}*") or
+                                fnmatch.fnmatch(pattern, names) for pattern in patterns):
+            continue
+        for name, value in bench(scale).items():
+            if not patterns or any(fnmatch.fnmatch(name, f"*{pattern}*") for pattern in patterns):
+                results[name] = value
+    return results
+
+
+def check_budgets(results: Dict[str, float], budgets: Dict[str, float],
+                  tolerance: float) -> List[str]:
+    """
+    Names of benchmarks slower than their budget by more than `tolerance` percent
+
+    Benchmarks without a budget are not checked.
+    """
+    return [name for name, value in results.items()
+            if name in budgets and value > budgets[name] * (1.0 + tolerance / 100.0)]
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_history(path: Path, results: Dict[str, float]):
+    """Append one run to the JSON-lines history file"""
+    entry = {
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'a') as file:
+        file.write(json.dumps(entry) + "\n")
+
+
+def last_history(path: Path) -> Optional[Dict[str, float]]:
+    """Results of the last run in the history file"""
+    if not path.exists():
+        return None
+    lines = path.read_text().splitlines()
+    return json.loads(lines[-1])['results'] if lines else None
+
+
+def _format(seconds: float, name: str = '') -> str:
+    if 'ratio' in name:
+        return f"{seconds:12.3f}"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.3f} ms"
+    return f"{seconds * 1e6:9.3f} us"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of the JETI wrapper's hot paths")
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="run only benchmarks whose name contains this pattern (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the iterations")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS,
+                        help="JSON file of budgets in seconds per operation")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown over the budget in percent (default 25)")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY,
+                        help="JSON-lines file the results are appended to")
+    parser.add_argument("--no-history", action="store_true", help="do not record this run")
+    parser.add_argument("--update-budgets", action="store_true",
+                        help="write the results as the new budgets")
+    args = parser.parse_args(argv)
+
+    previous = last_history(args.history)
+    results = run_benchmarks(args.patterns, args.quick)
+    budgets = json.loads(args.budgets.read_text()) if args.budgets.exists() else {}
+    regressions = check_budgets(results, budgets, args.tolerance)
+
+    print(f"{'benchmark':28} {'result':>12} {'budget':>12} {'last run':>12}")
+    for name, value in results.items():
+        budget = _format(budgets[name], name) if name in budgets else "-"
+        last = _format(previous[name], name) if previous and name in previous else "-"
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:28} {_format(value, name):>12} {budget:>12} {last:>12}{flag}")
+
+    if not args.no_history:
+        append_history(args.history, results)
+    if args.update_budgets:
+        args.budgets.write_text(json.dumps(dict(budgets, **results), indent=2, sort_keys=True) + "\n")
+        print(f"Budgets written to {args.budgets}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) over budget by more than {args.tolerance:g} %: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
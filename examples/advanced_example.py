@@ -10,7 +10,7 @@ from pathlib import Path
 _project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(_project_root / "src"))
 
-from jeti import JetiRadioEx, JetiException
+from jeti import JetiRadioEx, JetiException, export
 import numpy as np
 from datetime import datetime
 import os
@@ -68,7 +68,7 @@ class SpectralAnalyzer:
         
         # Get spectrum
         self.spectrum_data = self.device.get_spectral_radiance(wl_start, wl_end)
-        self.wavelengths = np.arange(wl_start, wl_end + 1)
+        self.wavelengths = self.device.spectral_axis.grid(wl_start, wl_end)
         
         print(f"Acquired {len(self.spectrum_data)} spectral points")
         
@@ -186,9 +186,16 @@ class SpectralAnalyzer:
         """
         Export spectrum and analysis to CSV format
         
+        Written with jeti.export.write_csv() in its long layout: '# key: value'
+        header lines (date and analysis results), then the columns
+        id,wavelength_nm,value with id 0 for the single spectrum. Earlier
+        versions of this example wrote Wavelength_nm,SpectralRadiance_W_m2_nm
+        columns with the analysis results after the data; read files of either
+        kind by skipping '#' lines (jeti.export.read_csv() reads the new one).
+        
         Args:
             filename: Output filename
-            include_analysis: Include analysis results in separate section
+            include_analysis: Include analysis results in the header
         """
         if self.spectrum_data is None:
             print("No spectrum data to export")
@@ -198,24 +205,12 @@ class SpectralAnalyzer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"jeti_spectrum_{timestamp}.csv"
         
-        with open(filename, 'w') as f:
-            # Header
-            f.write("# JETI Spectral Measurement Data\n")
-            f.write(f"# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("\n")
-            
-            # Spectrum data
-            f.write("Wavelength_nm,SpectralRadiance_W_m2_nm\n")
-            for wl, val in zip(self.wavelengths, self.spectrum_data):
-                f.write(f"{wl},{val:.6e}\n")
-            
-            # Analysis results
-            if include_analysis:
-                f.write("\n# Analysis Results\n")
-                analysis = self.analyze_spectrum()
-                if analysis:
-                    for key, value in analysis.items():
-                        f.write(f"# {key}: {value}\n")
+        metadata = {'Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        if include_analysis:
+            metadata.update(self.analyze_spectrum() or {})
+        
+        export.write_csv(filename, self.wavelengths, self.spectrum_data,
+                         layout='long', metadata=metadata)
         
         print(f"\nCSV data exported to: {filename}")
     
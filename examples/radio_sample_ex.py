@@ -227,7 +227,7 @@ class RadioExMeasurementApp:
                         save = input("\nSave spectrum to file? (y/n): ").strip().lower()
                         if save == 'y':
                             filename = input("Filename: ").strip()
-                            wavelengths = np.arange(wl_start, wl_end + 1)
+                            wavelengths = self.device.spectral_axis.grid(wl_start, wl_end)
                             data = np.column_stack((wavelengths, spectrum))
                             np.savetxt(filename, data, fmt='%.6e', 
                                      header='Wavelength(nm)\tSpectralRadiance')
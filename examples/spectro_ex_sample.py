@@ -189,10 +189,8 @@ class SpectroExMeasurementApp:
                 save = input("\nSave spectrum to file? (y/n): ").strip().lower()
                 if save == 'y':
                     filename = input("Filename: ").strip()
-                    wavelengths = np.arange(wl_start, wl_end + step, step)
-                    # Ensure arrays have same length
-                    min_len = min(len(wavelengths), len(spectrum))
-                    data = np.column_stack((wavelengths[:min_len], spectrum[:min_len]))
+                    wavelengths = self.device.spectral_axis.grid(wl_start, wl_end, step)
+                    data = np.column_stack((wavelengths, spectrum))
                     np.savetxt(filename, data, fmt='%.6e', 
                              header='Wavelength(nm)\tLightIntensity')
                     print(f"Spectrum saved to {filename}")
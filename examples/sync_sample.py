@@ -1,7 +1,7 @@
 """
 Python version of SyncSample.c
 Demonstrates synchronized measurements with optical trigger and cycle mode
-Requires jeti_core and jeti_radio modules
+Uses the sync mode of JetiRadioEx (core sync functions via device.core)
 """
 
 import sys
@@ -12,10 +12,7 @@ from pathlib import Path
 _project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(_project_root / "src"))
 
-from jeti import JetiRadio, JetiException, _get_dll_path
-import numpy as np
-import ctypes
-from ctypes import c_float, c_uint32, c_bool, c_uint8, POINTER
+from jeti import JetiRadioEx, JetiException
 
 
 class SyncMeasurementApp:
@@ -23,32 +20,12 @@ class SyncMeasurementApp:
     
     def __init__(self):
         self.device = None
-        self._setup_core_functions()
-        
-    def _setup_core_functions(self):
-        """Setup additional core functions needed for sync mode"""
-        # We need to load jeti_core64.dll for sync functions
-        dll_path = str(_get_dll_path("jeti_core64.dll"))
-        self._core_dll = ctypes.WinDLL(dll_path)
-        
-        # Setup sync mode functions
-        self._core_dll.JETI_GetFlickerFreq.argtypes = [ctypes.c_void_p, POINTER(c_float), POINTER(c_uint32)]
-        self._core_dll.JETI_GetFlickerFreq.restype = c_uint32
-        
-        self._core_dll.JETI_SetSyncMode.argtypes = [ctypes.c_void_p, c_uint8]
-        self._core_dll.JETI_SetSyncMode.restype = c_uint32
-        
-        self._core_dll.JETI_SetSyncFreq.argtypes = [ctypes.c_void_p, c_float]
-        self._core_dll.JETI_SetSyncFreq.restype = c_uint32
-        
-        self._core_dll.JETI_GetSyncFreq.argtypes = [ctypes.c_void_p, POINTER(c_float)]
-        self._core_dll.JETI_GetSyncFreq.restype = c_uint32
         
     def initialize_device(self):
         """Initialize and open the JETI device"""
         print("\nSearching for JETI devices...")
         
-        self.device = JetiRadio()
+        self.device = JetiRadioEx()
         
         try:
             num_devices = self.device.get_num_devices()
@@ -86,19 +63,10 @@ class SyncMeasurementApp:
         Returns:
             Flicker frequency in Hz (0.0 if could not be determined)
         """
-        flicker_freq = c_float()
-        warning = c_uint32()
-        
-        error = self._core_dll.JETI_GetFlickerFreq(
-            self.device._device_handle,
-            ctypes.byref(flicker_freq),
-            ctypes.byref(warning)
-        )
-        
-        if error != 0 or flicker_freq.value == 0.0:
+        try:
+            return self.device.detect_flicker_frequency(refresh=True)
+        except JetiException:
             return 0.0
-        
-        return flicker_freq.value
     
     def set_sync_mode(self, enable: bool):
         """
@@ -107,12 +75,7 @@ class SyncMeasurementApp:
         Args:
             enable: True to enable sync mode, False to use integration time
         """
-        error = self._core_dll.JETI_SetSyncMode(
-            self.device._device_handle,
-            1 if enable else 0
-        )
-        if error != 0:
-            raise JetiException(error, "JETI_SetSyncMode")
+        self.device.set_sync_mode(enable)
     
     def set_sync_frequency(self, frequency: float):
         """
@@ -121,23 +84,11 @@ class SyncMeasurementApp:
         Args:
             frequency: Sync frequency in Hz
         """
-        error = self._core_dll.JETI_SetSyncFreq(
-            self.device._device_handle,
-            frequency
-        )
-        if error != 0:
-            raise JetiException(error, "JETI_SetSyncFreq")
+        self.device.set_sync_frequency(frequency)
     
     def get_sync_frequency(self) -> float:
         """Get current sync frequency in Hz"""
-        sync_freq = c_float()
-        error = self._core_dll.JETI_GetSyncFreq(
-            self.device._device_handle,
-            ctypes.byref(sync_freq)
-        )
-        if error != 0:
-            raise JetiException(error, "JETI_GetSyncFreq")
-        return sync_freq.value
+        return self.device.get_sync_frequency()
     
     def perform_sync_measurement(self):
         """Perform a synchronized radiometric measurement"""
@@ -220,6 +171,33 @@ class SyncMeasurementApp:
                 pass
             return None
     
+    def perform_stable_measurement(self):
+        """Run synchronized scans back-to-back until the reading is stable"""
+        print("\n" + "=" * 60)
+        print("SYNCHRONIZED SCANS UNTIL STABLE")
+        print("=" * 60)
+        
+        try:
+            acquisition = self.device.create_sync_acquisition()
+            if acquisition.frequency == 0.0:
+                print("No flicker detected, scanning without sync mode.")
+            result = acquisition.run(tolerance=1e-3, max_scans=100)
+            
+            print(f"Flicker frequency:    {result.frequency:.2f} Hz")
+            print(f"Integration time:     {result.integration_time:.3f} ms")
+            print(f"Radiometric value:    {result.radiometric:.3E} W/m²")
+            print(f"Relative error:       {result.relative_error:.2E}")
+            print(f"Scans:                {result.scans}")
+            if result.stable:
+                print(f"Time to stable:       {result.time_to_stable:.3f} s")
+            else:
+                print("Reading did not become stable within 100 scans.")
+            return result
+            
+        except JetiException as e:
+            print(f"Error during measurement: {e}")
+            return None
+    
     def display_sync_info(self):
         """Display current sync mode information"""
         try:
@@ -239,6 +217,7 @@ class SyncMeasurementApp:
             print("JETI SYNCHRONIZED MEASUREMENT - MAIN MENU")
             print("=" * 60)
             print("m) Perform synchronized radiometric measurement")
+            print("s) Synchronized scans until the reading is stable")
             print("i) Display sync mode information")
             print("\n0) Exit")
             print("=" * 60)
@@ -249,6 +228,10 @@ class SyncMeasurementApp:
                 self.perform_sync_measurement()
                 input("\nPress Enter to continue...")
                 
+            elif choice == 's':
+                self.perform_stable_measurement()
+                input("\nPress Enter to continue...")
+                
             elif choice == 'i':
                 self.display_sync_info()
                 input("\nPress Enter to continue...")
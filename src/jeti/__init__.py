@@ -11,6 +11,7 @@ Classes:
     JetiRadioEx - Extended radiometric measurements
     JetiSpectro - Spectroscopic measurements
     JetiSpectroEx - Extended spectroscopic measurements
+    SpectralAxis - Cached wavelength axis and calibrated range of a device
 
 Exceptions:
     JetiException - Main exception class
@@ -23,6 +24,7 @@ from .wrapper import (
     JetiRadioEx,
     JetiSpectro,
     JetiSpectroEx,
+    SpectralAxis,
     JetiException,
     JetiError,
     _get_dll_path,
@@ -36,6 +38,7 @@ __all__ = [
     'JetiRadioEx',
     'JetiSpectro',
     'JetiSpectroEx',
+    'SpectralAxis',
     'JetiException',
     'JetiError',
     '_get_dll_path',
@@ -0,0 +1,86 @@
+"""
+Colorimetry helpers shared by the simulator and the spectral tools
+
+CIE 1931 2° colour matching functions use the multi-lobe Gaussian fit of
+Wyman, Sloan & Shirley (2013), accurate to a few percent, which is enough
+for simulated readings and similarity metrics without shipping CIE tables.
+"""
+
+import numpy as np
+
+
+def _lobe(wavelengths: np.ndarray, mean: float, sigma_low: float, sigma_high: float) -> np.ndarray:
+    sigma = np.where(wavelengths < mean, sigma_low, sigma_high)
+    return np.exp(-0.5 * ((wavelengths - mean) / sigma) ** 2)
+
+
+def cie1931_cmf(wavelengths: np.ndarray) -> np.ndarray:
+    """
+    CIE 1931 2° colour matching functions
+
+    Args:
+        wavelengths: Wavelengths in nm
+
+    Returns:
+        Array of shape (3, N) with x̄, ȳ, z̄
+    """
+    wl = np.asarray(wavelengths, dtype=np.float64)
+    x_bar = (1.056 * _lobe(wl, 599.8, 37.9, 31.0) + 0.362 * _lobe(wl, 442.0, 16.0, 26.7)
+             - 0.065 * _lobe(wl, 501.1, 20.4, 26.2))
+    y_bar = 0.821 * _lobe(wl, 568.8, 46.9, 40.5) + 0.286 * _lobe(wl, 530.9, 16.3, 31.1)
+    z_bar = 1.217 * _lobe(wl, 437.0, 11.8, 36.0) + 0.681 * _lobe(wl, 459.0, 26.0, 13.8)
+    return np.stack((x_bar, y_bar, z_bar))
+
+
+def spectrum_to_xyz(wavelengths: np.ndarray, spectra: np.ndarray) -> np.ndarray:
+    """
+    Tristimulus values of one or more spectra
+
+    Args:
+        wavelengths: Wavelengths in nm, shape (N,)
+        spectra: Spectral values, shape (N,) or (M, N)
+
+    Returns:
+        XYZ, shape (3,) or (M, 3)
+    """
+    wl = np.asarray(wavelengths, dtype=np.float64)
+    step = np.gradient(wl) if wl.size > 1 else np.ones(1)
+    weights = cie1931_cmf(wl) * step
+    return np.asarray(spectra, dtype=np.float64) @ weights.T
+
+
+def xyz_to_xy(xyz: np.ndarray) -> np.ndarray:
+    """Chromaticity x, y from XYZ (last axis)"""
+    xyz = np.asarray(xyz, dtype=np.float64)
+    total = xyz.sum(axis=-1, keepdims=True)
+    total = np.where(total == 0.0, 1.0, total)
+    return xyz[..., :2] / total
+
+
+def xyz_to_uv(xyz: np.ndarray) -> np.ndarray:
+    """CIE 1976 u', v' from XYZ (last axis)"""
+    xyz = np.asarray(xyz, dtype=np.float64)
+    denominator = xyz[..., 0] + 15.0 * xyz[..., 1] + 3.0 * xyz[..., 2]
+    denominator = np.where(denominator == 0.0, 1.0, denominator)
+    return np.stack((4.0 * xyz[..., 0] / denominator, 9.0 * xyz[..., 1] / denominator), axis=-1)
+
+
+def xy_to_cct(xy: np.ndarray) -> np.ndarray:
+    """Correlated colour temperature in K (McCamy's approximation)"""
+    xy = np.asarray(xy, dtype=np.float64)
+    n = (xy[..., 0] - 0.3320) / (0.1858 - xy[..., 1])
+    return 449.0 * n ** 3 + 3525.0 * n ** 2 + 6823.3 * n + 5520.33
+
+
+# CIE D65 reference white (2° observer), Y = 100
+D65_WHITE = np.array([95.047, 100.0, 108.883])
+
+
+def xyz_to_lab(xyz: np.ndarray, white: np.ndarray = D65_WHITE) -> np.ndarray:
+    """CIELAB L*, a*, b* from XYZ (last axis) relative to a reference white"""
+    t = np.asarray(xyz, dtype=np.float64) / white
+    delta = 6.0 / 29.0
+    f = np.where(t > delta ** 3, np.cbrt(t), t / (3.0 * delta ** 2) + 4.0 / 29.0)
+    return np.stack((116.0 * f[..., 1] - 16.0,
+                     500.0 * (f[..., 0] - f[..., 1]),
+                     200.0 * (f[..., 1] - f[..., 2])), axis=-1)
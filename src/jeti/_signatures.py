@@ -0,0 +1,323 @@
+"""
+ctypes signatures of the JETI SDK DLL functions
+
+Generated from include/*.h by jeti.registry - do not edit.
+"""
+
+from ctypes import (
+    c_uint32, c_int32, c_int, c_float, c_double, c_char_p, c_void_p,
+    c_uint16, c_uint8, POINTER, c_ulonglong, c_wchar_p
+)
+
+
+# jeti_core.h
+CORE = {
+    'JETI_SetLicKey': (c_uint32, [c_char_p]),
+    'JETI_ImportSLM': (c_uint32, [c_char_p]),
+    'JETI_IgnoreSLM': (c_uint32, [c_uint8]),
+    'JETI_GetNumDevices': (c_uint32, [POINTER(c_uint32)]),
+    'JETI_GetSerialDevice': (c_uint32, [c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_GetDeviceInfo': (c_uint32, [c_uint32, POINTER(c_uint8), POINTER(c_uint8), c_char_p, POINTER(c_uint16), POINTER(c_uint32), c_char_p, c_char_p, POINTER(c_ulonglong)]),
+    'JETI_GetDeviceInfoEx': (c_uint32, [c_uint32, POINTER(c_uint8), POINTER(c_uint8), c_char_p, POINTER(c_uint16), POINTER(c_uint32), c_char_p, c_char_p, POINTER(c_ulonglong), c_wchar_p]),
+    'JETI_OpenDevice': (c_uint32, [c_uint32, POINTER(c_void_p)]),
+    'JETI_OpenCOMDevice': (c_uint32, [c_uint32, c_uint32, POINTER(c_void_p)]),
+    'JETI_OpenTCPDevice': (c_uint32, [c_char_p, POINTER(c_void_p)]),
+    'JETI_OpenFTDIDevice': (c_uint32, [c_char_p, POINTER(c_void_p)]),
+    'JETI_OpenBTDevice': (c_uint32, [c_ulonglong, POINTER(c_void_p)]),
+    'JETI_OpenBTLEDevice': (c_uint32, [c_wchar_p, POINTER(c_void_p)]),
+    'JETI_CloseDevice': (c_uint32, [c_void_p]),
+    'JETI_GetIdentifier': (c_uint32, [c_void_p, c_char_p]),
+    'JETI_ArbitraryCommand': (c_uint32, [c_void_p, c_char_p, c_char_p]),
+    'JETI_DeviceWrite': (c_uint32, [c_void_p, c_char_p, c_uint32, c_uint32]),
+    'JETI_DeviceRead': (c_uint32, [c_void_p, c_char_p, c_uint32, POINTER(c_uint32), c_uint32]),
+    'JETI_DeviceReadTerm': (c_uint32, [c_void_p, c_char_p, c_uint32, c_uint32]),
+    'JETI_DataReceived': (c_uint32, [c_void_p, c_int]),
+    'JETI_Reset': (c_uint32, [c_void_p]),
+    'JETI_HardReset': (c_uint32, [c_void_p]),
+    'JETI_Break': (c_uint32, [c_void_p]),
+    'JETI_InitMeasure': (c_uint32, [c_void_p]),
+    'JETI_PreTrigMeasure': (c_uint32, [c_void_p]),
+    'JETI_MeasureStatusCore': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_WaitReadTrigger': (c_uint32, [c_void_p, POINTER(c_int32), c_uint32]),
+    'JETI_StartAdaption': (c_uint32, [c_void_p, c_int32]),
+    'JETI_CheckAdaptionStat': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_uint16), POINTER(c_int32)]),
+    'JETI_ReadCalib': (c_uint32, [c_void_p, c_uint32, c_char_p, c_char_p, POINTER(c_uint32), POINTER(c_uint32), POINTER(c_uint32), POINTER(c_uint32), POINTER(c_double)]),
+    'JETI_WriteCalib': (c_uint32, [c_void_p, c_uint32, c_char_p, c_char_p, c_uint32, c_uint32, c_uint32, c_uint32, POINTER(c_double)]),
+    'JETI_DeleteCalib': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetCalibRange': (c_uint32, [c_void_p, POINTER(c_uint32), POINTER(c_uint32), POINTER(c_uint32)]),
+    'JETI_SetCalib': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetCalib': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_MeasCompDark': (c_uint32, [c_void_p]),
+    'JETI_GetComPortHandle': (c_uint32, [c_void_p, POINTER(c_void_p)]),
+    'JETI_MeasureADC1': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_MeasureADC2': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_ReadUserData64': (c_uint32, [c_void_p, POINTER(c_uint8), c_uint32, c_uint32]),
+    'JETI_WriteUserData64': (c_uint32, [c_void_p, POINTER(c_uint8), c_uint32]),
+    'JETI_GetCoreDLLVersion': (c_uint32, [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]),
+    'JETI_GetFirmwareVersion': (c_uint32, [c_void_p, c_char_p]),
+    'JETI_GetDeviceType': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetBatteryStat': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_uint8), POINTER(c_uint8)]),
+    'JETI_GetLastError': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_GetEnquiry': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_SetCallbackFunction': (c_uint32, [c_void_p, c_uint8, c_void_p]),
+    'JETI_GetPixel': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_GetPixelBinning': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetFit': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetSDelay': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_SetSDelay': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetTint': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetADCRes': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetSplitTime': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_GetBorder': (c_uint32, [c_void_p, POINTER(c_uint8), POINTER(c_uint8)]),
+    'JETI_GetDistance': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_SetDistance': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetParamBlock': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetParamBlock': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetOptTrigg': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetLaserIntensity': (c_uint32, [c_void_p, c_uint32, c_uint32]),
+    'JETI_SetTrigger': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetTrigTimeout': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_SetTrigTimeout': (c_uint32, [c_void_p, c_uint16]),
+    'JETI_SetFlashMode': (c_uint32, [c_void_p, c_int32]),
+    'JETI_SetFlashCycle': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetCorrectionStat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetCorrectionStat': (c_uint32, [c_void_p, c_int32]),
+    'JETI_GetCorrectionRange': (c_uint32, [c_void_p, POINTER(c_uint32), POINTER(c_uint32)]),
+    'JETI_SetCorrectionRange': (c_uint32, [c_void_p, c_uint32, c_uint32]),
+    'JETI_GetOffsetCorrRange': (c_uint32, [c_void_p, POINTER(c_uint32), POINTER(c_uint32)]),
+    'JETI_SetOffsetCorrRange': (c_uint32, [c_void_p, c_uint32, c_uint32]),
+    'JETI_GetCorrectionCoeff': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_SetCorrectionCoeff': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetCutoffStat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetCutoffStat': (c_uint32, [c_void_p, c_int32]),
+    'JETI_GetBaudrate': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_GetSLMEnable': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetSLMEnable': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_SetChannelConf': (c_uint32, [c_void_p, c_char_p]),
+    'JETI_GetChannelConf': (c_uint32, [c_void_p, c_char_p]),
+    'JETI_SetLampMode': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetLampMode': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetFlash': (c_uint32, [c_void_p, c_float, c_float]),
+    'JETI_GetFlash': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_GetLaserStat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetLaserStat': (c_uint32, [c_void_p, c_int32]),
+    'JETI_GetShutterStat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetShutterStat': (c_uint32, [c_void_p, c_int32]),
+    'JETI_GetMeasHead': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetAux1Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetAux1Stat': (c_uint32, [c_void_p, c_int32]),
+    'JETI_GetAux2Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SetAux2Stat': (c_uint32, [c_void_p, c_int32]),
+    'JETI_AuxOut1': (c_uint32, [c_void_p, c_int32]),
+    'JETI_AuxOut1Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_AuxOut2': (c_uint32, [c_void_p, c_int32]),
+    'JETI_AuxOut2Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_AuxOut3': (c_uint32, [c_void_p, c_int32]),
+    'JETI_AuxOut3Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_AuxOut4': (c_uint32, [c_void_p, c_int32]),
+    'JETI_AuxOut4Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_AuxOut5': (c_uint32, [c_void_p, c_int32]),
+    'JETI_AuxOut5Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_AuxIn1Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_AuxIn2Stat': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_GetFlickerFreq': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_uint32)]),
+    'JETI_SetSyncFreq': (c_uint32, [c_void_p, c_float]),
+    'JETI_GetSyncFreq': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_SetSyncMode': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetSyncMode': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetDIOIn': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_GetDIOOut': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetDIOOut': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_SetDIOOutPin': (c_uint32, [c_void_p, c_uint8, c_int32]),
+    'JETI_GetTemperature': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetDarkmodeConf': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetDarkmodeConf': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetExposureConf': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetExposureConf': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetFunctionConf': (c_uint32, [c_void_p, POINTER(c_uint8), POINTER(c_uint8)]),
+    'JETI_SetFunctionConf': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetFormatConf': (c_uint32, [c_void_p, POINTER(c_uint8), POINTER(c_uint8)]),
+    'JETI_SetFormatConf': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetTintConf': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_SetTintConf': (c_uint32, [c_void_p, c_float]),
+    'JETI_GetMaxTintConf': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_SetMaxTintConf': (c_uint32, [c_void_p, c_float]),
+    'JETI_GetMaxAverConf': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_SetMaxAverConf': (c_uint32, [c_void_p, c_uint16]),
+    'JETI_GetMinTintConf': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetImageMinTintConf': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetChanMinTintConf': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetContMinTintConf': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetContChanMinTintConf': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetAverConf': (c_uint32, [c_void_p, POINTER(c_uint16), POINTER(c_uint16)]),
+    'JETI_SetAverConf': (c_uint32, [c_void_p, c_uint16]),
+    'JETI_GetAdaptConf': (c_uint32, [c_void_p, POINTER(c_uint8)]),
+    'JETI_SetAdaptConf': (c_uint32, [c_void_p, c_uint8]),
+    'JETI_GetWranConf': (c_uint32, [c_void_p, POINTER(c_uint32), POINTER(c_uint32), POINTER(c_uint32)]),
+    'JETI_SetWranConf': (c_uint32, [c_void_p, c_uint32, c_uint32, c_uint32]),
+    'JETI_GetPDARowConf': (c_uint32, [c_void_p, POINTER(c_uint32), POINTER(c_uint32)]),
+    'JETI_SetPDARowConf': (c_uint32, [c_void_p, c_uint32, c_uint32]),
+    'JETI_SetDefault': (c_uint32, [c_void_p]),
+    'JETI_GetLevel': (c_uint32, [c_void_p, POINTER(c_uint32), POINTER(c_uint32)]),
+    'JETI_FetchDark': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_FetchLight': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_FetchRefer': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_FetchTransRefl': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_FetchSprad': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchSpradHiRes': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchRadio': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchPhoto': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchChromxy': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_FetchChromuv': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_FetchDWLPE': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_FetchCCT': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchDuv': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchCRI': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchXYZ': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+    'JETI_FetchTiAdapt': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_FetchAverAdapt': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_CalcLintDark': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcSplinDark': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcLintLight': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcSplinLight': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcLintRefer': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcSplinRefer': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcLintTransRefl': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcSplinTransRefl': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_CalcRadio': (c_uint32, [c_void_p, c_uint32, c_uint32, POINTER(c_float)]),
+    'JETI_CalcPhoto': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_CalcChromxy': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcChromxy10': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcChromuv': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcDWLPE': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcCCT': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_CalcDuv': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_CalcCRI': (c_uint32, [c_void_p, c_float, POINTER(c_float)]),
+    'JETI_CalcXYZ': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcAllValue': (c_uint32, [c_void_p, c_uint32, c_uint32, POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcTM30': (c_uint32, [c_void_p, c_uint8, POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double)]),
+    'JETI_CalcPeakFWHM': (c_uint32, [c_void_p, c_float, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CalcBlueMeasurement': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+}
+
+# jeti_radio.h
+RADIO = {
+    'JETI_GetNumRadio': (c_uint32, [POINTER(c_uint32)]),
+    'JETI_GetSerialRadio': (c_uint32, [c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_OpenRadio': (c_uint32, [c_uint32, POINTER(c_void_p)]),
+    'JETI_CloseRadio': (c_uint32, [c_void_p]),
+    'JETI_Measure': (c_uint32, [c_void_p]),
+    'JETI_MeasureAdapt': (c_uint32, [c_void_p]),
+    'JETI_PrepareMeasure': (c_uint32, [c_void_p]),
+    'JETI_MeasureStatus': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_MeasureAdaptStatus': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_uint16), POINTER(c_int32)]),
+    'JETI_MeasureBreak': (c_uint32, [c_void_p]),
+    'JETI_SpecRad': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_Radio': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_Photo': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_Chromxy': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_Chromxy10': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_Chromuv': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_ChromXYZ': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+    'JETI_DWLPE': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CCT': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_Duv': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_CRI': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_RadioTint': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_SetMeasDist': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetMeasDist': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_GetRadioDLLVersion': (c_uint32, [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]),
+}
+
+# jeti_radio_ex.h
+RADIO_EX = {
+    'JETI_GetNumRadioEx': (c_uint32, [POINTER(c_uint32)]),
+    'JETI_GetSerialRadioEx': (c_uint32, [c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_OpenRadioEx': (c_uint32, [c_uint32, POINTER(c_void_p)]),
+    'JETI_CloseRadioEx': (c_uint32, [c_void_p]),
+    'JETI_MeasureEx': (c_uint32, [c_void_p, c_float, c_uint16, c_uint32]),
+    'JETI_MeasureAdaptEx': (c_uint32, [c_void_p, c_uint16, c_uint32]),
+    'JETI_PrepareMeasureEx': (c_uint32, [c_void_p, c_float, c_uint16, c_uint32]),
+    'JETI_MeasureStatusEx': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_MeasureAdaptStatusEx': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_uint16), POINTER(c_int32)]),
+    'JETI_MeasureBreakEx': (c_uint32, [c_void_p]),
+    'JETI_SpecRadEx': (c_uint32, [c_void_p, c_uint32, c_uint32, POINTER(c_float)]),
+    'JETI_SpecRadHiResEx': (c_uint32, [c_void_p, c_uint32, c_uint32, POINTER(c_float)]),
+    'JETI_SaveSpecRadSPCEx': (c_uint32, [c_void_p, c_uint32, c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_SaveSpecRadCSVEx': (c_uint32, [c_void_p, c_uint32, c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_RadioEx': (c_uint32, [c_void_p, c_uint32, c_uint32, POINTER(c_float)]),
+    'JETI_PhotoEx': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_ChromxyEx': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_Chromxy10Ex': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_ChromuvEx': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_ChromXYZEx': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+    'JETI_DWLPEEx': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float)]),
+    'JETI_CCTEx': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_DuvEx': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_CRIEx': (c_uint32, [c_void_p, c_float, POINTER(c_float)]),
+    'JETI_TM30Ex': (c_uint32, [c_void_p, c_uint8, POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double)]),
+    'JETI_PeakFWHMEx': (c_uint32, [c_void_p, c_float, POINTER(c_float), POINTER(c_float)]),
+    'JETI_BlueMeasurementEx': (c_uint32, [c_void_p, POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float), POINTER(c_float)]),
+    'JETI_RadioTintEx': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_SetMeasDistEx': (c_uint32, [c_void_p, c_uint32]),
+    'JETI_GetMeasDistEx': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_GetRadioExDLLVersion': (c_uint32, [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]),
+}
+
+# jeti_spectro.h
+SPECTRO = {
+    'JETI_GetNumSpectro': (c_uint32, [POINTER(c_uint32)]),
+    'JETI_GetSerialSpectro': (c_uint32, [c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_OpenSpectro': (c_uint32, [c_uint32, POINTER(c_void_p)]),
+    'JETI_CloseSpectro': (c_uint32, [c_void_p]),
+    'JETI_DarkSpec': (c_uint32, [c_void_p, c_float, POINTER(c_float)]),
+    'JETI_LightSpec': (c_uint32, [c_void_p, c_float, POINTER(c_float)]),
+    'JETI_ReferSpec': (c_uint32, [c_void_p, c_float, POINTER(c_float)]),
+    'JETI_TransReflSpec': (c_uint32, [c_void_p, c_float, POINTER(c_float)]),
+    'JETI_SpectroTint': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetSpectroDLLVersion': (c_uint32, [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]),
+}
+
+# jeti_spectro_ex.h
+SPECTRO_EX = {
+    'JETI_GetNumSpectroEx': (c_uint32, [POINTER(c_uint32)]),
+    'JETI_GetSerialSpectroEx': (c_uint32, [c_uint32, c_char_p, c_char_p, c_char_p]),
+    'JETI_OpenSpectroEx': (c_uint32, [c_uint32, POINTER(c_void_p)]),
+    'JETI_CloseSpectroEx': (c_uint32, [c_void_p]),
+    'JETI_StartDarkEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_DarkPixEx': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_DarkWaveEx': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_StartLightEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_PrepareLightEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_LightPixEx': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_LightWaveEx': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_StartReferEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_PrepareReferEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_ReferPixEx': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_ReferWaveEx': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_StartTransReflEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_PrepareTransReflEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_TransReflPixEx': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_TransReflWaveEx': (c_uint32, [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]),
+    'JETI_StartDarkImageEx': (c_uint32, [c_void_p, c_float]),
+    'JETI_DarkImageEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartLightImageEx': (c_uint32, [c_void_p, c_float]),
+    'JETI_LightImageEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartChannelDarkEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_ChannelDarkEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartChannelLightEx': (c_uint32, [c_void_p, c_float, c_uint16]),
+    'JETI_ChannelLightEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartContDarkEx': (c_uint32, [c_void_p, c_float, c_uint32]),
+    'JETI_ContDarkEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartContLightEx': (c_uint32, [c_void_p, c_float, c_uint32]),
+    'JETI_ContLightEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartContChannelDarkEx': (c_uint32, [c_void_p, c_float, c_uint32]),
+    'JETI_ContChannelDarkEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_StartContChannelLightEx': (c_uint32, [c_void_p, c_float, c_uint32]),
+    'JETI_ContChannelLightEx': (c_uint32, [c_void_p, POINTER(c_uint16)]),
+    'JETI_SpectroStatusEx': (c_uint32, [c_void_p, POINTER(c_int32)]),
+    'JETI_SpectroBreakEx': (c_uint32, [c_void_p]),
+    'JETI_PixelCountEx': (c_uint32, [c_void_p, POINTER(c_uint32)]),
+    'JETI_SpectroTintEx': (c_uint32, [c_void_p, POINTER(c_float)]),
+    'JETI_GetSpectroExDLLVersion': (c_uint32, [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]),
+}
@@ -0,0 +1,256 @@
+"""
+Fetch-based acquisition engine on the JETI core DLL
+
+The core DLL separates measurement from retrieval: JETI_InitMeasure starts a
+measurement with the configured integration time and averaging,
+JETI_MeasureStatusCore reports completion and the JETI_Fetch* functions
+transfer individual results. CoreAcquisition runs that cycle and transfers
+only the quantities the caller asked for, into buffers allocated once.
+"""
+
+import ctypes
+import time
+from ctypes import c_float, c_int32
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .wrapper import JetiError, JetiException, SpectralAxis, _check_error
+
+
+class AcquisitionTiming(NamedTuple):
+    """
+    Duration of the phases of one acquisition in seconds
+
+    exposure: JETI_InitMeasure until the status polls report completion
+    transfer: the JETI_Fetch* calls (including any evaluation the DLL does
+        inside them)
+    compute: assembly of the result dictionary in Python only
+    """
+    exposure: float
+    transfer: float
+    compute: float
+
+    @property
+    def total(self) -> float:
+        return self.exposure + self.transfer + self.compute
+
+
+# Quantity -> (fetch function, buffer kind, number of values)
+#   pixels:   INT32 array of pixel_count values
+#   spectrum: FLOAT array over the configured wavelength range
+#   floats:   FLOAT outputs (one per value)
+#   array:    FLOAT array of the given size
+QUANTITIES = {
+    'dark': ('JETI_FetchDark', 'pixels', 0),
+    'light': ('JETI_FetchLight', 'pixels', 0),
+    'refer': ('JETI_FetchRefer', 'pixels', 0),
+    'sprad': ('JETI_FetchSprad', 'spectrum', 0),
+    'radio': ('JETI_FetchRadio', 'floats', 1),
+    'photo': ('JETI_FetchPhoto', 'floats', 1),
+    'xy': ('JETI_FetchChromxy', 'floats', 2),
+    'uv': ('JETI_FetchChromuv', 'floats', 2),
+    'dwl_pe': ('JETI_FetchDWLPE', 'floats', 2),
+    'cct': ('JETI_FetchCCT', 'floats', 1),
+    'duv': ('JETI_FetchDuv', 'floats', 1),
+    'xyz': ('JETI_FetchXYZ', 'floats', 3),
+    'cri': ('JETI_FetchCRI', 'array', 15),
+    'tint': ('JETI_FetchTiAdapt', 'floats', 1),
+}
+
+
+class CoreAcquisition:
+    """
+    Repeated measurements through the core measure/fetch cycle
+
+    Buffers and ctypes argument objects are created once; each acquire()
+    only issues JETI_InitMeasure, the status polls and one fetch per
+    requested quantity. Array results are views of the reused buffers.
+    The device handle is read on every call and the DLL functions are
+    resolved again when the device's core library changes (e.g. after
+    set_retry_policy()), so an acquisition keeps working after the device
+    was reopened (e.g. by a DeviceSession reconnect).
+
+    Example:
+        acquisition = device.create_acquisition(('sprad', 'xy', 'cct'),
+                                                integration_time=50.0)
+        values = acquisition.acquire()
+        print(values['cct'], acquisition.last_timing)
+    """
+
+    def __init__(self, device, quantities: Iterable[str] = ('sprad',),
+                 integration_time: Optional[float] = None,
+                 average: Optional[int] = None,
+                 wavelength_range: Optional[Tuple[int, int, int]] = None,
+                 poll_interval: float = 0.001):
+        """
+        Args:
+            device: Opened JetiCore (or other wrapper with a core property)
+            quantities: Names from QUANTITIES to fetch after each measurement
+            integration_time: Integration time in ms written with JETI_SetTintConf
+                (None keeps the device configuration)
+            average: Number of averages written with JETI_SetAverConf
+            wavelength_range: (begin, end, step) in nm written with JETI_SetWranConf;
+                a narrower range shortens the JETI_FetchSprad transfer
+            poll_interval: Time between status checks in seconds
+        """
+        self.quantities = tuple(quantities)
+        unknown = [name for name in self.quantities if name not in QUANTITIES]
+        if unknown:
+            raise ValueError(f"Unknown quantities {unknown}; expected names from {sorted(QUANTITIES)}")
+
+        self._device = device
+        self._core = device.core
+        self.poll_interval = poll_interval
+        self.expected_exposure = 0.0
+
+        if wavelength_range is not None:
+            device.spectral_axis.validate(wavelength_range[0], wavelength_range[1], wavelength_range[2])
+            error = self._core.JETI_SetWranConf(self._handle, *wavelength_range)
+            _check_error(error, "JETI_SetWranConf")
+            device._spectral_axis = None
+        if integration_time is not None:
+            error = self._core.JETI_SetTintConf(self._handle, integration_time)
+            _check_error(error, "JETI_SetTintConf")
+        if average is not None:
+            error = self._core.JETI_SetAverConf(self._handle, average)
+            _check_error(error, "JETI_SetAverConf")
+        if integration_time is not None:
+            self.expected_exposure = integration_time * (average or 1) / 1000.0
+
+        self.spectral_axis: SpectralAxis = device.spectral_axis
+        self._status = c_int32()
+        self._status_ref = ctypes.byref(self._status)
+        self._fetchers = []
+        self._buffers: Dict[str, object] = {}
+        for name in self.quantities:
+            function_name, kind, size = QUANTITIES[name]
+            function = getattr(self._core, function_name)
+            if kind in ('pixels', 'spectrum', 'array'):
+                if kind == 'pixels':
+                    buffer = (c_int32 * self.spectral_axis.pixel_count)()
+                elif kind == 'spectrum':
+                    axis = self.spectral_axis
+                    count = SpectralAxis.num_points(axis.range_begin, axis.range_end, axis.range_step)
+                    buffer = (c_float * count)()
+                else:
+                    buffer = (c_float * size)()
+                self._buffers[name] = np.ctypeslib.as_array(buffer)
+                arguments = (buffer,)
+            else:
+                outputs = [c_float() for _ in range(size)]
+                self._buffers[name] = outputs
+                arguments = tuple(ctypes.byref(output) for output in outputs)
+            self._fetchers.append((name, function, function_name, arguments))
+
+        self.count = 0
+        self.last_timing: Optional[AcquisitionTiming] = None
+        self.total_timing = AcquisitionTiming(0.0, 0.0, 0.0)
+
+    @property
+    def wavelengths(self) -> np.ndarray:
+        """Wavelength grid of the 'sprad' result (read-only)"""
+        return self.spectral_axis.wavelengths
+
+    @property
+    def mean_timing(self) -> AcquisitionTiming:
+        """Mean phase durations over all acquisitions"""
+        count = max(self.count, 1)
+        return AcquisitionTiming(*(value / count for value in self.total_timing))
+
+    @property
+    def _handle(self):
+        # Read on every call: the handle changes when the device is reopened
+        return self._device._device_handle
+
+    def _rebind(self):
+        """Resolve the fetch functions again if the device's core library was replaced"""
+        core = self._device.core
+        if core is self._core:
+            return
+        self._core = core
+        self._fetchers = [(name, getattr(core, function_name), function_name, arguments)
+                          for name, _, function_name, arguments in self._fetchers]
+
+    def start(self):
+        """Start a measurement (JETI_InitMeasure)"""
+        self._rebind()
+        error = self._core.JETI_InitMeasure(self._handle)
+        _check_error(error, "JETI_InitMeasure")
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Wait for the running measurement to finish
+
+        Sleeps for the expected exposure first, then polls JETI_MeasureStatusCore.
+
+        Args:
+            timeout: Maximum time in seconds (None waits indefinitely)
+        """
+        start = time.perf_counter()
+        self._rebind()
+        if self.expected_exposure > 0.0:
+            time.sleep(self.expected_exposure)
+        while True:
+            error = self._core.JETI_MeasureStatusCore(self._handle, self._status_ref)
+            _check_error(error, "JETI_MeasureStatusCore")
+            if not self._status.value:
+                return
+            if timeout is not None and time.perf_counter() - start > timeout:
+                raise JetiException(JetiError.TIMEOUT, f"measurement not finished after {timeout} s")
+            time.sleep(self.poll_interval)
+
+    def fetch(self, copy: bool = False) -> Dict[str, object]:
+        """
+        Transfer the requested quantities of the last measurement
+
+        Args:
+            copy: Return copies of array results instead of views of the
+                reused buffers (views are overwritten by the next fetch)
+
+        Returns:
+            Dictionary keyed by quantity name
+        """
+        self._rebind()
+        transfer_start = time.perf_counter()
+        handle = self._handle
+        for _, function, function_name, arguments in self._fetchers:
+            error = function(handle, *arguments)
+            _check_error(error, function_name)
+        compute_start = time.perf_counter()
+        values = {}
+        for name in self.quantities:
+            buffer = self._buffers[name]
+            if isinstance(buffer, np.ndarray):
+                values[name] = buffer.copy() if copy else buffer
+            elif len(buffer) == 1:
+                values[name] = buffer[0].value
+            else:
+                values[name] = tuple(output.value for output in buffer)
+        end = time.perf_counter()
+        self._transfer = compute_start - transfer_start
+        self._compute = end - compute_start
+        return values
+
+    def acquire(self, copy: bool = False, timeout: Optional[float] = None) -> Dict[str, object]:
+        """
+        Measure once and fetch the requested quantities
+
+        Args:
+            copy: Return copies of array results (see fetch())
+            timeout: Maximum measurement time in seconds
+
+        Returns:
+            Dictionary keyed by quantity name; phase durations in last_timing
+        """
+        exposure_start = time.perf_counter()
+        self.start()
+        self.wait(timeout)
+        exposure = time.perf_counter() - exposure_start
+        values = self.fetch(copy)
+        self.last_timing = AcquisitionTiming(exposure, self._transfer, self._compute)
+        self.total_timing = AcquisitionTiming(
+            *(total + value for total, value in zip(self.total_timing, self.last_timing))
+        )
+        self.count += 1
+        return values
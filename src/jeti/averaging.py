@@ -0,0 +1,144 @@
+"""
+Adaptive averaging to a target signal-to-noise ratio
+
+A fixed average count over-averages bright samples and under-averages dim
+ones. average_to_snr() takes short repeated scans, keeps a per-pixel running
+mean and variance (Welford's algorithm) and stops as soon as the requested
+SNR in a wavelength band is reached or the time budget would be exceeded.
+"""
+
+import time
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class RunningStatistics:
+    """
+    Per-element running mean and variance (Welford's algorithm)
+
+    Numerically stable for long runs; each update() costs a few vectorized
+    operations on preallocated arrays.
+    """
+
+    def __init__(self, shape):
+        """
+        Args:
+            shape: Shape of the accumulated arrays (e.g. number of pixels)
+        """
+        self.count = 0
+        self.mean = np.zeros(shape, dtype=np.float64)
+        self._m2 = np.zeros(shape, dtype=np.float64)
+        self._delta = np.zeros(shape, dtype=np.float64)
+
+    def update(self, values: np.ndarray):
+        """Add one sample"""
+        self.count += 1
+        np.subtract(values, self.mean, out=self._delta)
+        self.mean += self._delta / self.count
+        # m2 += delta * (values - new mean)
+        self._m2 += self._delta * (values - self.mean)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance (zeros before the second sample)"""
+        if self.count < 2:
+            return np.zeros_like(self._m2)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def standard_error(self) -> np.ndarray:
+        """Standard error of the mean"""
+        if self.count < 2:
+            return np.full_like(self._m2, np.inf)
+        return np.sqrt(self.variance / self.count)
+
+
+class AveragingResult(NamedTuple):
+    """Result of average_to_snr()"""
+    wavelengths: np.ndarray
+    mean: np.ndarray
+    uncertainty: np.ndarray
+    scans: int
+    snr: float
+    converged: bool
+    elapsed: float
+
+
+def band_snr(stats: RunningStatistics, mask: np.ndarray) -> float:
+    """
+    SNR of the band-integrated mean signal
+
+    Args:
+        stats: Running statistics of the spectra
+        mask: Boolean mask of the band on the spectral grid
+
+    Returns:
+        |sum of mean| / standard error of that sum (0.0 before the second scan)
+    """
+    if stats.count < 2:
+        return 0.0
+    noise = np.sqrt(stats.variance[mask].sum() / stats.count)
+    signal = abs(stats.mean[mask].sum())
+    return signal / noise if noise > 0.0 else np.inf
+
+
+def average_to_snr(scan: Callable[[], np.ndarray], wavelengths: np.ndarray,
+                   target_snr: Optional[float] = None,
+                   relative_error: Optional[float] = None,
+                   band: Optional[Tuple[float, float]] = None,
+                   time_budget: Optional[float] = None,
+                   min_scans: int = 3, max_scans: int = 10000) -> AveragingResult:
+    """
+    Repeat scans until the band SNR reaches a target
+
+    Args:
+        scan: Callable measuring one spectrum on the `wavelengths` grid
+        wavelengths: Wavelength grid of the scans in nm
+        target_snr: SNR of the band-integrated signal to reach
+        relative_error: Alternative to target_snr: relative standard error
+            to reach (target_snr = 1 / relative_error)
+        band: (begin, end) in nm the SNR is evaluated in (None = whole grid)
+        time_budget: Maximum time in seconds; no scan is started that would
+            end after the budget (judged by the mean scan duration)
+        min_scans: Minimum number of scans (at least 2 for an uncertainty)
+        max_scans: Maximum number of scans
+
+    Returns:
+        AveragingResult with the mean spectrum, per-pixel standard error,
+        the number of scans and the reached SNR
+    """
+    if (target_snr is None) == (relative_error is None):
+        raise ValueError("Pass exactly one of target_snr and relative_error")
+    if target_snr is None:
+        target_snr = 1.0 / relative_error
+    wavelengths = np.asarray(wavelengths, dtype=np.float64)
+    mask = np.ones(wavelengths.shape, dtype=bool) if band is None else \
+        (wavelengths >= band[0]) & (wavelengths <= band[1])
+    if not mask.any():
+        raise ValueError(f"Band {band} does not overlap the wavelength grid")
+    min_scans = max(min_scans, 2)
+
+    stats = RunningStatistics(wavelengths.shape)
+    snr = 0.0
+    start = time.perf_counter()
+    while stats.count < max_scans:
+        elapsed = time.perf_counter() - start
+        if time_budget is not None and stats.count:
+            if elapsed + elapsed / stats.count > time_budget:
+                break
+        stats.update(scan())
+        if stats.count >= min_scans:
+            snr = band_snr(stats, mask)
+            if snr >= target_snr:
+                break
+
+    return AveragingResult(
+        wavelengths=wavelengths,
+        mean=stats.mean,
+        uncertainty=stats.standard_error,
+        scans=stats.count,
+        snr=snr,
+        converged=snr >= target_snr,
+        elapsed=time.perf_counter() - start,
+    )
@@ -0,0 +1,201 @@
+"""
+Continuous acquisition of multi-channel spectra on JetiSpectroEx
+
+A multi-channel device measures one spectrum per active channel in each
+scan. ChannelStream runs continuous channel measurements in blocks of
+`block` scans and transfers each block in one DLL call, straight into the
+next slot of a ring allocated once:
+
+    ring:       (blocks, block, channels, pixels) uint16
+    pipelining: the next block is started as soon as a block is transferred,
+                so the device measures while the caller processes
+    dark:       subtracted per channel by broadcasting one
+                (channels, pixels) dark frame over the whole block
+
+Example:
+    stream = device.create_channel_stream(block=32, blocks=4, dark=dark)
+    with stream:
+        for _ in range(100):
+            spectra = stream.read_corrected()    # (32, channels, pixels) float32
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def subtract_dark(counts: np.ndarray, dark: np.ndarray,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Subtract a dark spectrum per channel
+
+    Args:
+        counts: Raw counts, shape (..., channels, pixels)
+        dark: Dark counts, shape (channels, pixels)
+        out: float32 array of the shape of `counts` to write to
+
+    Returns:
+        Dark-corrected counts as float32 (`out` if given)
+    """
+    return np.subtract(counts, dark, out=out, dtype=np.float32)
+
+
+class ChannelStream:
+    """
+    Block-wise continuous channel measurement into a preallocated ring
+
+    A block returned by read() is a view of the ring and is overwritten
+    `blocks` reads later; copy blocks that are kept longer. The ring is
+    sized for the channel configuration at creation: after
+    set_channel_conf() changes the number of channels, create a new stream.
+
+    Attributes:
+        ring: All blocks, shape (blocks, block, channels, pixels)
+        dark: Dark counts subtracted by read_corrected(), shape (channels, pixels)
+        blocks_read: Blocks transferred
+    """
+
+    def __init__(self, device, block: int = 16, blocks: int = 8, interval: float = 0.0,
+                 dark: Optional[np.ndarray] = None, poll_interval: float = 0.001):
+        """
+        Args:
+            device: Opened JetiSpectroEx
+            block: Scans per transfer
+            blocks: Transfers kept in the ring
+            interval: Time between scan starts in ms (0: back to back)
+            dark: Dark counts per channel, shape (channels, pixels)
+                (None: measure them with measure_dark())
+            poll_interval: Time between status checks in seconds
+        """
+        if block < 1 or blocks < 1:
+            raise ValueError(f"block and blocks must be positive, got {block} and {blocks}")
+        self.device = device
+        self.block = int(block)
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.shape = device.channel_shape
+        self.ring = np.zeros((int(blocks), self.block, *self.shape), dtype=np.uint16)
+        self._corrected = np.empty((self.block, *self.shape), dtype=np.float32)
+        self.dark = None
+        if dark is not None:
+            self.set_dark(dark)
+        self.blocks_read = 0
+        self.running = False
+
+    @property
+    def scans_read(self) -> int:
+        """Scans transferred"""
+        return self.blocks_read * self.block
+
+    def set_dark(self, dark: np.ndarray):
+        """Set the dark counts per channel, shape (channels, pixels)"""
+        dark = np.asarray(dark)
+        if dark.shape != self.shape:
+            raise ValueError(f"dark must have shape {self.shape}, got {dark.shape}")
+        self.dark = dark.astype(np.float32)
+
+    def measure_dark(self, integration_time: float, average: int = 10) -> np.ndarray:
+        """
+        Measure and keep the dark counts of all channels
+
+        Args:
+            integration_time: Integration time in ms (that of the stream's scans)
+            average: Number of averages
+
+        Returns:
+            Dark counts, shape (channels, pixels)
+        """
+        if self.running:
+            raise RuntimeError("stop the stream before measuring a dark")
+        self.device.start_channel_dark(integration_time, average)
+        self.device.wait_for_measurement(self.poll_interval)
+        dark = self.device.get_channel_dark()
+        self.set_dark(dark)
+        return dark
+
+    def _check_shape(self):
+        shape = self.device.channel_shape
+        if shape != self.shape:
+            raise RuntimeError(
+                f"channel configuration changed: the ring holds {self.shape} spectra, "
+                f"the device measures {shape}; create a new stream"
+            )
+
+    def start(self):
+        """
+        Start the first block
+
+        Raises:
+            RuntimeError: If the channel shape changed since the stream was created
+        """
+        self._check_shape()
+        if not self.running:
+            self.device.start_continuous_channel_light(self.interval, self.block)
+            self.running = True
+
+    def stop(self):
+        """Cancel the block in progress"""
+        if self.running:
+            self.running = False
+            self.device.break_measurement()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def read(self) -> np.ndarray:
+        """
+        Wait for the current block, transfer it into the ring and start the next
+
+        Returns:
+            Raw counts, shape (block, channels, pixels) (a view of the ring)
+
+        Raises:
+            RuntimeError: If the channel shape changed since the stream was created
+        """
+        self.start()
+        device = self.device
+        device.wait_for_measurement(self.poll_interval)
+        slot = self.blocks_read % len(self.ring)
+        device.get_continuous_channel_light(self.block, out=self.ring[slot])
+        device.start_continuous_channel_light(self.interval, self.block)
+        self.blocks_read += 1
+        return self.ring[slot]
+
+    def read_corrected(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        read() with the dark counts subtracted per channel
+
+        Args:
+            out: float32 array of shape (block, channels, pixels) to write to
+                (None: a buffer reused by every call)
+
+        Returns:
+            Dark-corrected counts as float32, shape (block, channels, pixels)
+        """
+        if self.dark is None:
+            raise RuntimeError("no dark counts: pass dark= or call measure_dark()")
+        return subtract_dark(self.read(), self.dark, self._corrected if out is None else out)
+
+    def recent(self, scans: int) -> np.ndarray:
+        """
+        Copy of the last scans in the ring, oldest first
+
+        Args:
+            scans: Number of scans (at most the ring's capacity)
+
+        Returns:
+            Raw counts, shape (scans, channels, pixels)
+        """
+        blocks = len(self.ring)
+        available = min(self.blocks_read, blocks) * self.block
+        scans = min(int(scans), available)
+        if scans <= 0:
+            return np.empty((0, *self.shape), dtype=np.uint16)
+        order = [(self.blocks_read - count) % blocks
+                 for count in range(min(self.blocks_read, blocks), 0, -1)]
+        return self.ring[order].reshape(-1, *self.shape)[-scans:]
@@ -0,0 +1,371 @@
+"""
+jeti-acquire: headless acquisition to a binary stream file
+
+Runs the core measure/fetch cycle (jeti.acquisition.CoreAcquisition) in a
+tight loop on a fixed-interval schedule, appends every result to a binary
+stream file and prints live throughput and latency percentiles.
+
+Scheduling: scan k is due at start + k × interval. A scan that overruns
+its slot delays only the next start; when the loop falls more than a whole
+interval behind, the missed slots are skipped (and counted) instead of
+being run back to back, so the schedule never drifts. With interval 0 the
+scans run back to back. A scan's latency is the time from its scheduled
+start to its fetched data, so it includes the exposure.
+
+Wavelength range: the device is configured in whole nm (JETI_SetWranConf).
+A --range with a fractional BEGIN, END or STEP is measured at 1 nm over the
+enclosing whole-nm range and interpolated onto the requested grid.
+
+Stream file: the magic bytes b'JETIACQ1', a little-endian uint32 header
+length, a JSON header (device, settings, wavelengths, record dtype) and
+fixed-size records (index, timestamp, latency, values). read_stream()
+memory-maps the records.
+
+Usage:
+    python -m jeti.cli --simulate --integration-time 5 --count 1000 -o run.jacq
+    python -m jeti.cli --serial 123456 -t 20 -a 4 --range 380 780 1 \\
+        --interval 0.1 --duration 3600 -o burn_in.jacq
+
+(Installed packages expose the same command as the jeti-acquire script,
+entry point jeti.cli:main.)
+"""
+
+import argparse
+import json
+import math
+import struct
+import sys
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .monitor import WindowedQuantiles
+from .wrapper import JetiCore, JetiException
+
+STREAM_MAGIC = b'JETIACQ1'
+
+# Latency percentiles reported in the live line and the summary
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def record_dtype(points: int, raw: bool = False) -> np.dtype:
+    """
+    dtype of one stream record
+
+    Args:
+        points: Number of values per scan
+        raw: Raw pixel counts (int32) instead of spectral radiance (float32)
+    """
+    return np.dtype([
+        ('index', '<u8'),
+        ('timestamp', '<f8'),
+        ('latency', '<f8'),
+        ('values', '<i4' if raw else '<f4', (points,)),
+    ])
+
+
+class StreamWriter:
+    """Appends fixed-size scan records to a stream file"""
+
+    def __init__(self, path, dtype: np.dtype, header: Dict[str, object]):
+        """
+        Args:
+            path: Output file (overwritten)
+            dtype: Record dtype (see record_dtype())
+            header: JSON-serialisable metadata; the record dtype is added
+        """
+        self._file = open(path, 'wb')
+        header = dict(header, dtype=dtype.descr)
+        text = json.dumps(header).encode('utf-8')
+        self._file.write(STREAM_MAGIC + struct.pack('<I', len(text)) + text)
+        self._record = np.zeros((), dtype=dtype)
+        self.records = 0
+
+    def write(self, index: int, timestamp: float, latency: float, values: np.ndarray):
+        record = self._record
+        record['index'] = index
+        record['timestamp'] = timestamp
+        record['latency'] = latency
+        record['values'] = values
+        self._file.write(record.tobytes())
+        self.records += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def read_stream(path) -> Tuple[Dict[str, object], np.ndarray]:
+    """
+    Open a stream file written by jeti-acquire
+
+    Args:
+        path: Stream file
+
+    Returns:
+        (header, memory-mapped record array with fields index, timestamp,
+        latency, values)
+    """
+    with open(path, 'rb') as file:
+        magic = file.read(len(STREAM_MAGIC))
+        if magic != STREAM_MAGIC:
+            raise ValueError(f"{path} is not a jeti-acquire stream file")
+        length, = struct.unpack('<I', file.read(4))
+        header = json.loads(file.read(length))
+    dtype = np.dtype([(name, kind, tuple(shape[0]) if shape else ())
+                      for name, kind, *shape in header['dtype']])
+    offset = len(STREAM_MAGIC) + 4 + length
+    count = (_file_size(path) - offset) // dtype.itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+
+def _file_size(path) -> int:
+    with open(path, 'rb') as file:
+        return file.seek(0, 2)
+
+
+class IntervalScheduler:
+    """
+    Fixed-interval start times that compensate for overruns
+
+    Attributes:
+        overruns: Scans that started after their slot
+        skipped: Slots dropped because the loop was a whole interval behind
+    """
+
+    def __init__(self, interval: float, clock=time.perf_counter, sleep=time.sleep):
+        """
+        Args:
+            interval: Time between scan starts in seconds (0 = back to back)
+            clock: Monotonic clock in seconds
+            sleep: Sleep function
+        """
+        self.interval = interval
+        self._clock = clock
+        self._sleep = sleep
+        self.start: Optional[float] = None
+        self.slot = 0
+        self.overruns = 0
+        self.skipped = 0
+
+    def wait(self) -> float:
+        """
+        Sleep until the next slot
+
+        Returns:
+            Scheduled start time of the scan (clock time)
+        """
+        now = self._clock()
+        if self.start is None:
+            self.start = now
+            return now
+        if self.interval <= 0.0:
+            return now
+        self.slot += 1
+        due = self.start + self.slot * self.interval
+        if now <= due:
+            self._sleep(due - now)
+            return due
+        self.overruns += 1
+        behind = int((now - due) // self.interval)
+        if behind:
+            self.slot += behind
+            self.skipped += behind
+            due += behind * self.interval
+        return due
+
+
+def _percentiles_ms(quantiles: WindowedQuantiles) -> str:
+    values = quantiles.values()
+    return " ".join(f"p{round(q * 100)} {values[q] * 1000.0:.2f}" for q in PERCENTILES)
+
+
+def _open_device(args) -> Tuple[JetiCore, int]:
+    if args.simulate:
+        from .simulator import SimulatedDevice, SimulatedSDK
+        devices = [SimulatedDevice(serial=f"SIM{number + 1:05d}", seed=number)
+                   for number in range(args.simulate)]
+        device = JetiCore(dll=SimulatedSDK(devices))
+    else:
+        device = JetiCore(args.dll_path)
+
+    if args.list:
+        return device, -1
+    number = args.device
+    if args.serial is not None:
+        for candidate in range(device.get_num_devices()):
+            if args.serial in device.get_serial_device(candidate):
+                number = candidate
+                break
+        else:
+            raise SystemExit(f"jeti-acquire: no device with serial {args.serial}")
+    device.open_device(number)
+    return device, number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="jeti-acquire",
+        description="Headless fixed-interval acquisition to a binary stream file",
+    )
+    selection = parser.add_argument_group("device")
+    selection.add_argument("--device", "-d", type=int, default=0, help="device number (default 0)")
+    selection.add_argument("--serial", "-s", help="open the device with this board, spectrometer or device serial")
+    selection.add_argument("--list", action="store_true", help="list connected devices and exit")
+    selection.add_argument("--dll-path", help="path of jeti_core64.dll")
+    selection.add_argument("--simulate", type=int, nargs="?", const=1, default=0, metavar="N",
+                           help="use N simulated devices instead of the DLL (default 1)")
+
+    measurement = parser.add_argument_group("measurement")
+    measurement.add_argument("--integration-time", "-t", type=float, default=10.0,
+                             help="integration time in ms (default 10)")
+    measurement.add_argument("--average", "-a", type=int, default=1, help="number of averages (default 1)")
+    measurement.add_argument("--range", "-r", type=float, nargs=3, metavar=("BEGIN", "END", "STEP"),
+                             help="wavelength range in nm, e.g. 380 780 0.5 (default: device configuration)")
+    measurement.add_argument("--raw", action="store_true",
+                             help="stream raw pixel counts instead of spectral radiance")
+
+    run = parser.add_argument_group("run")
+    stop = run.add_mutually_exclusive_group()
+    stop.add_argument("--count", "-n", type=int, help="number of scans")
+    stop.add_argument("--duration", "-D", type=float, help="run time in seconds")
+    run.add_argument("--interval", "-i", type=float, default=0.0,
+                     help="time between scan starts in seconds (default 0: back to back)")
+    run.add_argument("--output", "-o", help="stream file (default: no file)")
+    run.add_argument("--report", type=float, default=1.0,
+                     help="seconds between live status lines (0 disables them)")
+    run.add_argument("--window", type=int, default=10000,
+                     help="number of recent scans the latency percentiles cover")
+    return parser
+
+
+def _device_range(wavelength_range: Sequence[float]) -> Tuple[int, int, int]:
+    """
+    Range written with JETI_SetWranConf for a --range BEGIN END STEP
+
+    The device takes whole nm; any other range is measured at 1 nm over the
+    enclosing whole-nm range and interpolated onto the requested grid.
+    """
+    begin, end, step = wavelength_range
+    if all(float(value).is_integer() for value in wavelength_range):
+        return int(begin), int(end), int(step)
+    return math.floor(begin), math.ceil(end), 1
+
+
+def run(args, out=sys.stdout) -> Dict[str, object]:
+    """
+    Run an acquisition as configured by parsed command-line arguments
+
+    Returns:
+        Summary with scans, elapsed, rate, overruns, skipped and latency percentiles
+    """
+    device, number = _open_device(args)
+    try:
+        if args.list:
+            for number in range(device.get_num_devices()):
+                board, spectrometer, serial = device.get_serial_device(number)
+                print(f"{number}: device {serial}  spectrometer {spectrometer}  board {board}", file=out)
+            return {'scans': 0}
+
+        quantity = 'light' if args.raw else 'sprad'
+        device_range = _device_range(args.range) if args.range else None
+        acquisition = device.create_acquisition(
+            (quantity,), integration_time=args.integration_time, average=args.average,
+            wavelength_range=device_range,
+        )
+        axis = acquisition.spectral_axis
+        resample = device_range is not None and device_range != tuple(args.range)
+        wavelengths = axis.grid(*args.range) if resample else axis.wavelengths
+        points = axis.pixel_count if args.raw else wavelengths.size
+        header = {
+            'serial': device.get_serial_device(number)[2],
+            'quantity': quantity,
+            'integration_time': args.integration_time,
+            'average': args.average,
+            'interval': args.interval,
+            'wavelength_range': list(args.range) if resample else
+                                [axis.range_begin, axis.range_end, axis.range_step],
+            'wavelengths': None if args.raw else wavelengths.tolist(),
+            'started': time.time(),
+        }
+        writer = StreamWriter(args.output, record_dtype(points, args.raw), header) if args.output else None
+        grids = (axis.wavelengths, wavelengths) if resample and not args.raw else None
+        return _loop(args, acquisition, quantity, writer, out, grids)
+    finally:
+        device.close_device()
+
+
+def _loop(args, acquisition, quantity: str, writer: Optional[StreamWriter], out,
+          grids: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, object]:
+    scheduler = IntervalScheduler(args.interval)
+    latencies = WindowedQuantiles(args.window, PERCENTILES)
+    scans = 0
+    start = time.perf_counter()
+    next_report = start + args.report
+    report_scans = 0
+    report_start = start
+    try:
+        while args.count is None or scans < args.count:
+            if args.duration is not None and time.perf_counter() - start >= args.duration:
+                break
+            due = scheduler.wait()
+            timestamp = time.time()
+            values = acquisition.acquire()[quantity]
+            if grids is not None:
+                values = np.interp(grids[1], grids[0], values)
+            latency = time.perf_counter() - due
+            latencies.update(latency)
+            if writer is not None:
+                writer.write(scans, timestamp, latency, values)
+            scans += 1
+
+            now = time.perf_counter()
+            if args.report > 0.0 and now >= next_report:
+                rate = (scans - report_scans) / (now - report_start)
+                print(f"{scans} scans  {rate:.1f} scans/s  latency ms {_percentiles_ms(latencies)}  "
+                      f"overruns {scheduler.overruns}  skipped {scheduler.skipped}", file=out, flush=True)
+                report_scans, report_start = scans, now
+                next_report = now + args.report
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'scans': scans,
+        'elapsed': elapsed,
+        'rate': scans / elapsed if elapsed > 0.0 else 0.0,
+        'overruns': scheduler.overruns,
+        'skipped': scheduler.skipped,
+        'latency': latencies.values(),
+    }
+    print(f"done: {scans} scans in {elapsed:.2f} s ({summary['rate']:.1f} scans/s)  "
+          f"latency ms {_percentiles_ms(latencies)}  overruns {scheduler.overruns}  "
+          f"skipped {scheduler.skipped}", file=out, flush=True)
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Console entry point of jeti-acquire"""
+    args = build_parser().parse_args(argv)
+    try:
+        run(args)
+    except JetiException as exc:
+        print(f"jeti-acquire: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Device configuration snapshot and diff
+
+Each JETI_Set*Conf call is a round-trip to the device (slow on serial and
+Bluetooth links). DeviceConfig reads the configuration once, compares a
+requested recipe with that snapshot and writes only the fields that differ.
+"""
+
+import ctypes
+import math
+import time
+from ctypes import c_float, c_uint8, c_uint16, c_uint32
+from typing import Dict, Iterable, Optional
+
+from .wrapper import _check_error
+
+
+# Size of the block read/written by JETI_GetParamBlock / JETI_SetParamBlock
+PARAM_BLOCK_SIZE = 256
+
+# Field -> (getter, setter, ctypes type, number of getter outputs, index of the
+#           configured value among the getter outputs; None = all outputs)
+# Listed in write order: calibration and range before exposure settings.
+FIELDS = {
+    'calib': ('JETI_GetCalib', 'JETI_SetCalib', c_uint8, 1, 0),
+    'wavelength_range': ('JETI_GetWranConf', 'JETI_SetWranConf', c_uint32, 3, None),
+    'exposure_mode': ('JETI_GetExposureConf', 'JETI_SetExposureConf', c_uint8, 1, 0),
+    'adapt_mode': ('JETI_GetAdaptConf', 'JETI_SetAdaptConf', c_uint8, 1, 0),
+    'dark_mode': ('JETI_GetDarkmodeConf', 'JETI_SetDarkmodeConf', c_uint8, 1, 0),
+    'max_integration_time': ('JETI_GetMaxTintConf', 'JETI_SetMaxTintConf', c_float, 1, 0),
+    'integration_time': ('JETI_GetTintConf', 'JETI_SetTintConf', c_float, 2, 1),
+    'max_average': ('JETI_GetMaxAverConf', 'JETI_SetMaxAverConf', c_uint16, 1, 0),
+    'average': ('JETI_GetAverConf', 'JETI_SetAverConf', c_uint16, 2, 1),
+}
+
+# Fields that change the device's spectral axis when written
+_AXIS_FIELDS = ('calib', 'wavelength_range')
+
+
+def _same(current, requested) -> bool:
+    """Compare a device value with a requested one (float32 tolerant)"""
+    if isinstance(current, tuple):
+        return current == tuple(requested)
+    if isinstance(current, float):
+        return math.isclose(current, requested, rel_tol=1e-6, abs_tol=1e-6)
+    return current == requested
+
+
+class DeviceConfig:
+    """
+    Configuration snapshot of an opened device
+
+    Example:
+        config = DeviceConfig(device)
+        config.read()
+        changed = config.apply({'integration_time': 50.0, 'average': 4})
+        print(changed, config.last_switch_time)
+    """
+
+    def __init__(self, device):
+        """
+        Args:
+            device: Opened wrapper object (any class with a core property)
+        """
+        self._device = device
+        self.snapshot: Dict[str, object] = {}
+        self.param_block: Optional[bytes] = None
+        self.switch_count = 0
+        self.writes = 0
+        self.writes_skipped = 0
+        self.last_switch_time = 0.0
+        self.total_switch_time = 0.0
+
+    @property
+    def _core(self):
+        # Resolved on every call: set_retry_policy() replaces the device's library
+        return self._device.core
+
+    @property
+    def _handle(self):
+        return self._device._device_handle
+
+    @property
+    def mean_switch_time(self) -> float:
+        """Mean duration of apply() in seconds"""
+        return self.total_switch_time / self.switch_count if self.switch_count else 0.0
+
+    def _read_field(self, name: str):
+        getter, _, ctype, outputs, index = FIELDS[name]
+        values = [ctype() for _ in range(outputs)]
+        error = getattr(self._core, getter)(self._handle, *(ctypes.byref(value) for value in values))
+        _check_error(error, getter)
+        if index is None:
+            return tuple(value.value for value in values)
+        return values[index].value
+
+    def _write_field(self, name: str, value):
+        _, setter, _, _, index = FIELDS[name]
+        arguments = tuple(value) if index is None else (value,)
+        error = getattr(self._core, setter)(self._handle, *arguments)
+        _check_error(error, setter)
+
+    def read(self, fields: Optional[Iterable[str]] = None) -> Dict[str, object]:
+        """
+        Read configuration fields from the device into the snapshot
+
+        Args:
+            fields: Field names from FIELDS (None reads all)
+
+        Returns:
+            The snapshot
+        """
+        for name in (FIELDS if fields is None else fields):
+            if name not in FIELDS:
+                raise ValueError(f"Unknown configuration field {name!r}; expected one of {list(FIELDS)}")
+            self.snapshot[name] = self._read_field(name)
+        return self.snapshot
+
+    def diff(self, recipe: Dict[str, object]) -> Dict[str, object]:
+        """
+        Fields of a recipe that differ from the device configuration
+
+        Fields missing from the snapshot are read first.
+
+        Args:
+            recipe: Requested field values
+
+        Returns:
+            Dictionary of the fields to write, in write order
+        """
+        missing = [name for name in recipe if name not in self.snapshot]
+        if missing:
+            self.read(missing)
+        return {
+            name: recipe[name] for name in FIELDS
+            if name in recipe and not _same(self.snapshot[name], recipe[name])
+        }
+
+    def apply(self, recipe: Dict[str, object]) -> Dict[str, object]:
+        """
+        Switch to a recipe, writing only the changed fields
+
+        Args:
+            recipe: Requested field values
+
+        Returns:
+            Dictionary of the fields written
+        """
+        start = time.perf_counter()
+        changes = self.diff(recipe)
+        for name, value in changes.items():
+            self._write_field(name, value)
+            self.snapshot[name] = tuple(value) if isinstance(value, (list, tuple)) else value
+        if changes:
+            self.param_block = None
+        if any(name in changes for name in _AXIS_FIELDS):
+            self._device._spectral_axis = None
+        self.writes += len(changes)
+        self.writes_skipped += len(recipe) - len(changes)
+        self.last_switch_time = time.perf_counter() - start
+        self.total_switch_time += self.last_switch_time
+        self.switch_count += 1
+        return changes
+
+    def invalidate(self, fields: Optional[Iterable[str]] = None):
+        """Forget snapshot values (e.g. after the device was reset)"""
+        if fields is None:
+            self.snapshot.clear()
+            self.param_block = None
+        else:
+            for name in fields:
+                self.snapshot.pop(name, None)
+
+    def read_param_block(self) -> bytes:
+        """Read the parameter block (JETI_GetParamBlock) in one transfer"""
+        block = (c_uint8 * PARAM_BLOCK_SIZE)()
+        error = self._core.JETI_GetParamBlock(self._handle, block)
+        _check_error(error, "JETI_GetParamBlock")
+        self.param_block = bytes(block)
+        return self.param_block
+
+    def apply_param_block(self, block: bytes) -> bool:
+        """
+        Write a parameter block (JETI_SetParamBlock) if it differs from the device's
+
+        Args:
+            block: PARAM_BLOCK_SIZE bytes, e.g. from read_param_block()
+
+        Returns:
+            True if the block was written
+        """
+        if len(block) != PARAM_BLOCK_SIZE:
+            raise ValueError(f"Parameter block must be {PARAM_BLOCK_SIZE} bytes, got {len(block)}")
+        start = time.perf_counter()
+        if self.param_block is None:
+            self.read_param_block()
+        written = bytes(block) != self.param_block
+        if written:
+            buffer = (c_uint8 * PARAM_BLOCK_SIZE).from_buffer_copy(block)
+            error = self._core.JETI_SetParamBlock(self._handle, buffer)
+            _check_error(error, "JETI_SetParamBlock")
+            self.param_block = bytes(block)
+            # The block covers the individual fields as well
+            self.snapshot.clear()
+            self._device._spectral_axis = None
+            self.writes += 1
+        else:
+            self.writes_skipped += 1
+        self.last_switch_time = time.perf_counter() - start
+        self.total_switch_time += self.last_switch_time
+        self.switch_count += 1
+        return written
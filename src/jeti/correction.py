@@ -0,0 +1,185 @@
+"""
+Stray-light matrix correction of pixel spectra
+
+The core DLL applies its stray-light matrix (JETI_ImportSLM /
+JETI_SetSLMEnable) only to the live spectrum. StrayLightCorrection applies
+the same kind of correction to archived raw pixel spectra: with the
+stray-light distribution matrix D, a measured signal is m = (I + D) s, so
+s = C m with C = (I + D)^-1. C is computed once per matrix file and cached;
+a batch of N spectra is then corrected with a single matrix multiply.
+
+Matrix files are read as NumPy .npy files or as whitespace/comma separated
+text with one matrix row per line.
+
+Example:
+    from jeti.correction import StrayLightCorrection
+
+    slm = StrayLightCorrection.from_file("straylight.txt")
+    corrected = slm.apply(raw_spectra, dark=dark)   # (N, pixels)
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def load_matrix(path) -> np.ndarray:
+    """
+    Read a square matrix from a .npy or text file
+
+    Args:
+        path: Matrix file
+
+    Returns:
+        float64 array of shape (pixels, pixels)
+    """
+    path = Path(path)
+    if path.suffix == '.npy':
+        matrix = np.load(path)
+    else:
+        with open(path) as file:
+            first = file.readline()
+        matrix = np.loadtxt(path, delimiter=',' if ',' in first else None)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"Stray-light matrix in {path} must be square, got shape {matrix.shape}")
+    return matrix
+
+
+# (resolved path, modification time, kind) -> correction, so each file is read
+# and inverted once per process
+_cache: Dict[Tuple[str, int, str], 'StrayLightCorrection'] = {}
+
+
+class StrayLightCorrection:
+    """
+    Cached stray-light correction matrix
+
+    Attributes:
+        correction: C = (I + D)^-1, shape (pixels, pixels), read-only
+    """
+
+    def __init__(self, matrix: np.ndarray, kind: str = 'distribution'):
+        """
+        Args:
+            matrix: Square matrix
+            kind: 'distribution' for the stray-light distribution matrix D,
+                'system' for I + D, or 'correction' for C itself
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Stray-light matrix must be square, got shape {matrix.shape}")
+        if kind == 'distribution':
+            correction = np.linalg.inv(np.eye(matrix.shape[0]) + matrix)
+        elif kind == 'system':
+            correction = np.linalg.inv(matrix)
+        elif kind == 'correction':
+            correction = matrix.copy()
+        else:
+            raise ValueError(f"Unknown matrix kind {kind!r}; expected 'distribution', 'system' or 'correction'")
+        correction.flags.writeable = False
+        self.kind = kind
+        self.correction = correction
+        # Row-vector spectra are multiplied from the left: S_corr = S @ C.T
+        self._right = np.ascontiguousarray(correction.T)
+
+    @classmethod
+    def from_file(cls, path, kind: str = 'distribution') -> 'StrayLightCorrection':
+        """
+        Load and invert a matrix file once per process
+
+        The cache is keyed by path and modification time, so an updated file
+        is read again.
+
+        Args:
+            path: Matrix file (.npy or text)
+            kind: See __init__
+
+        Returns:
+            Cached StrayLightCorrection
+        """
+        resolved = os.path.realpath(path)
+        key = (resolved, os.stat(resolved).st_mtime_ns, kind)
+        correction = _cache.get(key)
+        if correction is None:
+            correction = cls(load_matrix(resolved), kind)
+            _cache[key] = correction
+        return correction
+
+    @property
+    def pixel_count(self) -> int:
+        return self.correction.shape[0]
+
+    def apply(self, spectra: np.ndarray, dark: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Correct one spectrum or a batch of spectra
+
+        Stray light is a property of the signal, so the dark offset is removed
+        first; pass `dark` for raw counts.
+
+        Args:
+            spectra: Pixel spectra, shape (pixels,) or (N, pixels)
+            dark: Dark spectrum subtracted before the correction, shape (pixels,)
+
+        Returns:
+            Corrected dark-free signal, float64, same shape as spectra
+        """
+        spectra = np.asarray(spectra, dtype=np.float64)
+        if spectra.shape[-1] != self.pixel_count:
+            raise ValueError(f"Spectra have {spectra.shape[-1]} pixels, matrix has {self.pixel_count}")
+        if dark is not None:
+            spectra = spectra - np.asarray(dark, dtype=np.float64)
+        return spectra @ self._right
+
+    def compare_with_device(self, device, integration_time: float = 100.0,
+                            average: int = 1, threshold: float = 0.05) -> Dict[str, float]:
+        """
+        Compare the correction with the DLL's own stray-light correction
+
+        Measures a dark spectrum, a light spectrum with the device's SLM
+        correction disabled and one with it enabled (the matrix must have
+        been imported with import_slm()). The disabled scan is corrected here
+        and compared with the enabled one.
+
+        Args:
+            device: Opened JetiSpectroEx
+            integration_time: Integration time in ms
+            average: Number of averages per scan
+            threshold: Pixels below this fraction of the peak signal are
+                left out of the relative deviation
+
+        Returns:
+            max_abs: Largest absolute deviation in counts
+            max_rel: Largest relative deviation of the compared pixels
+            rms_rel: RMS relative deviation of the compared pixels
+        """
+        def scan(dark: bool = False) -> np.ndarray:
+            if dark:
+                device.start_dark_measurement(integration_time, average)
+            else:
+                device.start_light_measurement(integration_time, average)
+            device.wait_for_measurement(0.001)
+            pixels = device.get_dark_spectrum_pixel() if dark else device.get_light_spectrum_pixel()
+            return pixels.astype(np.float64)
+
+        enabled = device.get_slm_enable()
+        try:
+            dark = scan(dark=True)
+            device.set_slm_enable(False)
+            raw = scan()
+            device.set_slm_enable(True)
+            reference = scan() - dark
+        finally:
+            device.set_slm_enable(enabled)
+
+        corrected = self.apply(raw, dark)
+        deviation = corrected - reference
+        mask = reference > threshold * reference.max()
+        relative = deviation[mask] / reference[mask]
+        return {
+            'max_abs': float(np.abs(deviation).max()),
+            'max_rel': float(np.abs(relative).max()),
+            'rms_rel': float(np.sqrt(np.mean(relative ** 2))),
+        }
@@ -0,0 +1,276 @@
+"""
+Decimation of live spectrum streams for display
+
+A UI cannot plot every scan at full 1 nm or pixel resolution. Decimator sits
+between the acquisition loop and the displays:
+
+    binning:   each spectrum is reduced to `bins` wavelength bins; per bin the
+               mean of the newest scan and the minimum and maximum are kept,
+               so a one-pixel peak still shows at its full height
+    rate:      scans are merged and published at most `max_rate` times per
+               second; the newest scan wins, while the minimum/maximum
+               envelope covers every scan merged, so no peak is dropped
+    fan-out:   push() costs the same however many displays subscribe; at each
+               publication (at most max_rate per second) the frame is merged
+               into every subscription, which a display reads at its own rate
+    payload:   optionally float16, scaled to the frame's largest magnitude;
+               maxima are rounded up and minima down
+
+Example:
+    from jeti.decimation import Decimator
+
+    decimator = Decimator(device.spectral_axis.grid(380, 780, 1), bins=200, max_rate=30.0)
+    device.add_measurement_hook(lambda device: decimator.push(device.get_spectral_radiance()))
+
+    display = decimator.subscribe(max_rate=10.0, float16=True)
+    while True:                                  # UI thread
+        frame = display.get(timeout=1.0)
+        if frame is not None:
+            plot(frame.axis, frame.latest * frame.scale, frame.maximum * frame.scale)
+"""
+
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+
+class DecimatedFrame(NamedTuple):
+    """
+    Binned spectra merged since a display's previous frame
+
+    Values are multiplied by `scale` (1.0 unless the payload is float16).
+    """
+    sequence: int
+    timestamp: float
+    scans: int
+    axis: np.ndarray
+    latest: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    scale: float
+
+
+def bin_edges(values: int, bins: int) -> np.ndarray:
+    """
+    Start index of each of `bins` near-equal bins over `values` samples
+
+    Returns:
+        Bin start indices (at most `values` bins)
+    """
+    bins = max(min(int(bins), values), 1)
+    return np.unique(np.linspace(0, values, bins + 1).astype(np.intp)[:-1])
+
+
+def bin_min_max(spectrum: np.ndarray, starts: np.ndarray):
+    """
+    Mean, minimum and maximum of each bin
+
+    Args:
+        spectrum: Values, shape (values,)
+        starts: Bin start indices (see bin_edges())
+
+    Returns:
+        (mean, minimum, maximum), one value per bin
+    """
+    spectrum = np.asarray(spectrum, dtype=np.float32)
+    counts = np.diff(np.append(starts, spectrum.size))
+    mean = np.add.reduceat(spectrum, starts) / counts
+    return mean, np.minimum.reduceat(spectrum, starts), np.maximum.reduceat(spectrum, starts)
+
+
+def _float16(values: np.ndarray, scale: float, direction: float) -> np.ndarray:
+    """values / scale as float16, rounded towards `direction` where inexact"""
+    scaled = values / scale
+    converted = scaled.astype(np.float16)
+    if direction:
+        inexact = converted.astype(np.float32) * direction < scaled * direction
+        converted[inexact] = np.nextafter(converted[inexact], np.float16(direction * np.inf))
+    return converted
+
+
+class _Envelope:
+    """Newest binned scan plus the min/max envelope of all merged scans"""
+
+    def __init__(self, bins: int):
+        self.latest = np.zeros(bins, dtype=np.float32)
+        self.minimum = np.full(bins, np.inf, dtype=np.float32)
+        self.maximum = np.full(bins, -np.inf, dtype=np.float32)
+        self.scans = 0
+        self.timestamp = 0.0
+
+    def merge(self, latest, minimum, maximum, scans: int, timestamp: float):
+        self.latest[:] = latest
+        np.minimum(self.minimum, minimum, out=self.minimum)
+        np.maximum(self.maximum, maximum, out=self.maximum)
+        self.scans += scans
+        self.timestamp = timestamp
+
+    def reset(self):
+        self.minimum.fill(np.inf)
+        self.maximum.fill(-np.inf)
+        self.scans = 0
+
+
+class Subscription:
+    """
+    A display's view of a Decimator
+
+    Attributes:
+        frames: Frames returned by get()
+        scans: Scans merged into those frames
+    """
+
+    def __init__(self, decimator: 'Decimator', max_rate: Optional[float], float16: bool):
+        self._decimator = decimator
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        self.float16 = float16
+        self._pending = _Envelope(len(decimator.axis))
+        self._next = 0.0
+        self.frames = 0
+        self.scans = 0
+
+    def get(self, timeout: Optional[float] = None) -> Optional[DecimatedFrame]:
+        """
+        Wait for scans newer than the previous frame and return them merged
+
+        Returns at most max_rate frames per second.
+
+        Args:
+            timeout: Seconds to wait (None: forever)
+
+        Returns:
+            The frame, or None on timeout
+        """
+        decimator = self._decimator
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with decimator._condition:
+            while True:
+                now = time.monotonic()
+                decimator._publish_if_due(now)
+                if self._pending.scans and now >= self._next:
+                    break
+                wake = [decimator._next_publish(now), self._next if self._pending.scans else None, deadline]
+                wake = [moment for moment in wake if moment is not None]
+                if deadline is not None and now >= deadline:
+                    return None
+                decimator._condition.wait(max(min(wake) - now, 0.0) if wake else None)
+            pending = self._pending
+            self._next = now + self.interval
+            self.frames += 1
+            self.scans += pending.scans
+            frame = self._frame(pending)
+            pending.reset()
+            return frame
+
+    def _frame(self, pending: _Envelope) -> DecimatedFrame:
+        latest, minimum, maximum = pending.latest, pending.minimum, pending.maximum
+        if self.float16:
+            scale = float(max(np.abs(minimum).max(), np.abs(maximum).max())) or 1.0
+            latest = _float16(latest, scale, 0.0)
+            minimum = _float16(minimum, scale, -1.0)
+            maximum = _float16(maximum, scale, 1.0)
+        else:
+            scale = 1.0
+            latest, minimum, maximum = latest.copy(), minimum.copy(), maximum.copy()
+        return DecimatedFrame(self.frames, pending.timestamp, pending.scans,
+                              self._decimator.axis, latest, minimum, maximum, scale)
+
+    def close(self):
+        """Stop receiving frames"""
+        self._decimator._unsubscribe(self)
+
+
+class Decimator:
+    """
+    Min/max-preserving binning and rate limiting of a spectrum stream
+
+    push() is called from the acquisition loop, get() of each Subscription
+    from its display.
+
+    Attributes:
+        axis: Bin centres
+        scans: Scans pushed
+        publications: Merged frames handed to the subscriptions
+    """
+
+    def __init__(self, axis: np.ndarray, bins: int = 256, max_rate: float = 30.0):
+        """
+        Args:
+            axis: Wavelengths (or pixel indices) of the pushed spectra
+            bins: Number of bins (at most len(axis))
+            max_rate: Publications per second (0: publish every scan)
+        """
+        axis = np.asarray(axis, dtype=np.float64)
+        self.starts = bin_edges(axis.size, bins)
+        self.values = axis.size
+        self.axis = np.add.reduceat(axis, self.starts) / np.diff(np.append(self.starts, axis.size))
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        self._pending = _Envelope(len(self.starts))
+        self._last_publish = -np.inf
+        self._subscriptions: List[Subscription] = []
+        self._condition = threading.Condition()
+        self.scans = 0
+        self.publications = 0
+
+    def subscribe(self, max_rate: Optional[float] = None, float16: bool = False) -> Subscription:
+        """
+        Add a display
+
+        Args:
+            max_rate: Frames per second returned to this display (None: every publication)
+            float16: Return float16 values scaled to the frame's largest magnitude
+        """
+        subscription = Subscription(self, max_rate, float16)
+        with self._condition:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._condition:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def push(self, spectrum: np.ndarray, timestamp: Optional[float] = None):
+        """
+        Add a scan
+
+        Args:
+            spectrum: Values, one per axis value
+            timestamp: Acquisition time (None: now)
+        """
+        if len(spectrum) != self.values:
+            raise ValueError(f"Expected {self.values} values, got {len(spectrum)}")
+        binned = bin_min_max(spectrum, self.starts)
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._condition:
+            self._pending.merge(*binned, 1, timestamp)
+            self.scans += 1
+            self._publish_if_due(time.monotonic())
+
+    def flush(self):
+        """Publish the merged scans now"""
+        with self._condition:
+            self._publish(time.monotonic())
+
+    def _next_publish(self, now: float) -> Optional[float]:
+        if not self._pending.scans:
+            return None
+        return self._last_publish + self.interval
+
+    def _publish_if_due(self, now: float):
+        if self._pending.scans and now - self._last_publish >= self.interval:
+            self._publish(now)
+
+    def _publish(self, now: float):
+        pending = self._pending
+        if not pending.scans:
+            return
+        for subscription in self._subscriptions:
+            subscription._pending.merge(pending.latest, pending.minimum, pending.maximum,
+                                        pending.scans, pending.timestamp)
+        pending.reset()
+        self._last_publish = now
+        self.publications += 1
+        self._condition.notify_all()
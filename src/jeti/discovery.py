@@ -0,0 +1,233 @@
+"""
+Device discovery with a cached inventory
+
+A full enumeration (JETI_GetNumDevices) probes every USB, COM and Bluetooth
+link and can take seconds. DeviceInventory caches the connection details of
+each device found (JETI_GetDeviceInfoEx) in a JSON file keyed by device
+serial. The next start opens cached devices directly by address
+(JETI_OpenTCPDevice, JETI_OpenFTDIDevice, JETI_OpenCOMDevice, ...), several
+in parallel, and only enumerates when a device cannot be reached where it
+was last seen.
+
+Direct opens go through the core DLL, so opened devices are JetiCore
+objects. The Ex DLLs open devices by enumeration number only; use
+enumerate() and DeviceInfo.number for them.
+
+Example:
+    from jeti.discovery import DeviceInventory
+
+    inventory = DeviceInventory()            # loads ~/.jeti/devices.json
+    devices = inventory.open_many(["123456", "123457"])
+    print(inventory.stats())
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .wrapper import ConnectionType, DeviceInfo, JetiCore, JetiError, JetiException
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".jeti" / "devices.json"
+
+_FORMAT_VERSION = 1
+
+
+def enumerate_devices(core: JetiCore) -> List[DeviceInfo]:
+    """
+    Enumerate all connected devices
+
+    Args:
+        core: JetiCore wrapper (need not be opened)
+
+    Returns:
+        DeviceInfo of each device, in enumeration order
+    """
+    return [core.get_device_info(number) for number in range(core.get_num_devices())]
+
+
+def open_direct(core: JetiCore, record: DeviceInfo) -> bool:
+    """
+    Open a device at the address in its record, without enumerating
+
+    The identifier of the opened device must contain the record's serial as
+    a whole word (serial 12345 does not match a device 112345):
+    addresses move (DHCP leases, renumbered COM ports), and another device
+    answering at the old address is closed again.
+
+    Args:
+        core: Unopened JetiCore wrapper
+        record: Cached DeviceInfo
+
+    Returns:
+        True if the device was opened, False if its connection type has no
+        direct open, the device did not answer at that address or another
+        device answered there
+    """
+    connection = record.connection
+    try:
+        if connection == ConnectionType.TCP and record.ip_address:
+            core.open_tcp_device(record.ip_address)
+        elif connection == ConnectionType.USB and record.usb_serial:
+            core.open_ftdi_device(record.usb_serial)
+        elif connection == ConnectionType.COM and record.com_port:
+            core.open_com_device(record.com_port, record.baudrate or 115200)
+        elif connection == ConnectionType.BLUETOOTH and record.bt_address:
+            core.open_bt_device(record.bt_address)
+        elif connection == ConnectionType.BLUETOOTH_LE and record.btle_path:
+            core.open_btle_device(record.btle_path)
+        else:
+            return False
+    except JetiException:
+        return False
+    try:
+        identifier = core.get_identifier()
+    except JetiException:
+        identifier = ""
+    if record.serial not in identifier.split():
+        core.close_device()
+        return False
+    return True
+
+
+class DeviceInventory:
+    """
+    Device records cached on disk, with direct opens before enumeration
+
+    Attributes:
+        records: DeviceInfo by device serial (devices seen now or earlier)
+        direct_opens: Devices opened at their cached address
+        fallbacks: Devices that needed an enumeration to be opened
+        enumerations: Full enumerations run
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, dll_path: Optional[str] = None,
+                 dll=None, max_workers: int = 8):
+        """
+        Args:
+            path: Cache file (None: do not cache)
+            dll_path: Path to jeti_core64.dll (see JetiCore)
+            dll: Already loaded library to use instead (e.g. jeti.simulator.SimulatedSDK)
+            max_workers: Direct opens run in parallel
+        """
+        self.path = Path(path) if path is not None else None
+        self._dll_path = dll_path
+        self._dll = dll
+        self.max_workers = max_workers
+        self.records: Dict[str, DeviceInfo] = {}
+        self.direct_opens = 0
+        self.fallbacks = 0
+        self.enumerations = 0
+        self.load()
+
+    def _core(self) -> JetiCore:
+        return JetiCore(self._dll_path, self._dll)
+
+    def load(self):
+        """Read the cache file; a missing or unreadable file gives an empty inventory"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            content = json.loads(self.path.read_text(encoding='utf-8'))
+            if content.get('version') != _FORMAT_VERSION:
+                return
+            records = [DeviceInfo(**record) for record in content['devices']]
+        except (OSError, ValueError, TypeError, KeyError):
+            return
+        self.records = {record.serial: record for record in records}
+
+    def save(self):
+        """Write the cache file (atomically)"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        content = {
+            'version': _FORMAT_VERSION,
+            'devices': [asdict(record) for record in self.records.values()],
+        }
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        temporary.write_text(json.dumps(content, indent=2), encoding='utf-8')
+        os.replace(temporary, self.path)
+
+    def enumerate(self) -> List[DeviceInfo]:
+        """
+        Enumerate all connected devices and update the cache
+
+        Returns:
+            DeviceInfo of each connected device
+        """
+        found = enumerate_devices(self._core())
+        self.enumerations += 1
+        self.records.update((record.serial, record) for record in found)
+        self.save()
+        return found
+
+    def _open_cached(self, serial: str) -> Optional[JetiCore]:
+        core = self._core()
+        return core if open_direct(core, self.records[serial]) else None
+
+    def open(self, serial: str) -> JetiCore:
+        """
+        Open one device by serial
+
+        Returns:
+            Opened JetiCore
+        """
+        return self.open_many([serial])[serial]
+
+    def open_many(self, serials: Sequence[str]) -> Dict[str, JetiCore]:
+        """
+        Open devices by serial
+
+        Devices in the cache are opened directly, in parallel. The others,
+        and cached devices that did not answer at their address, are opened
+        after a single enumeration.
+
+        Args:
+            serials: Device serials
+
+        Returns:
+            Opened JetiCore by serial
+
+        Raises:
+            JetiException: NOT_CONNECTED if a device is not found; devices
+                opened by this call are closed again
+        """
+        opened: Dict[str, JetiCore] = {}
+        cached = [serial for serial in serials if serial in self.records]
+        if cached:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(cached))) as pool:
+                for serial, core in zip(cached, pool.map(self._open_cached, cached)):
+                    if core is not None:
+                        opened[serial] = core
+        self.direct_opens += len(opened)
+
+        missing = [serial for serial in serials if serial not in opened]
+        if missing:
+            found = {record.serial: record for record in self.enumerate()}
+            try:
+                for serial in missing:
+                    record = found.get(serial)
+                    if record is None:
+                        raise JetiException(JetiError.NOT_CONNECTED, f"device {serial} not found")
+                    core = self._core()
+                    core.open_device(record.number)
+                    opened[serial] = core
+                    self.fallbacks += 1
+            except JetiException:
+                for core in opened.values():
+                    core.close_device()
+                raise
+        return opened
+
+    def stats(self) -> Dict[str, int]:
+        """Open and enumeration counters"""
+        return {
+            'devices': len(self.records),
+            'direct_opens': self.direct_opens,
+            'fallbacks': self.fallbacks,
+            'enumerations': self.enumerations,
+        }
@@ -0,0 +1,319 @@
+"""
+Vectorized CSV/JSON export of many spectra
+
+Formatting one value per f.write() call (or per %-operation) spends nearly
+all the time in per-value Python and printf work. The writers here produce
+the text of a whole block of spectra with NumPy: every value is encoded
+into a fixed-width byte field in the '%.{precision}e' notation, ids and
+delimiters are laid out around them, padding is dropped and the block is
+written with one call.
+
+Layouts:
+    wide: one row per spectrum, one column per wavelength
+          id,380,381,...
+    long: one row per (spectrum, wavelength) value
+          id,wavelength_nm,value
+
+Example:
+    from jeti import export
+
+    export.write_csv("run.csv", wavelengths, spectra, ids=timestamps,
+                     metadata={'device': serial, 'integration_time': 50.0})
+    export.write_json("run.json", wavelengths, spectra)
+
+The DLL's own single-spectrum files are written with
+JetiRadioEx.save_spectral_radiance_csv() / save_spectral_radiance_spc().
+Arrow IPC and Parquet files are written incrementally by jeti.sink.
+"""
+
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+LAYOUTS = ('wide', 'long')
+
+# Spectra encoded per block
+CHUNK_ROWS = 1024
+
+_PAD = 0
+
+
+# Scaled mantissas this close (relative) to a .5 tie are formatted by printf
+_TIE_TOLERANCE = 1e-14
+
+
+def _scale(magnitude: np.ndarray, power: np.ndarray) -> np.ndarray:
+    """magnitude * 10 ** power, before rounding"""
+    # 10.0 ** power is exact for the usual value ranges, so this rounds once;
+    # subnormal magnitudes need a power beyond the float range and are scaled in two steps
+    large = power > 300
+    factor = 10.0 ** np.where(large, 300, power)
+    scaled = magnitude * factor
+    if large.any():
+        scaled[large] *= 10.0 ** (power[large] - 300)
+    return scaled
+
+
+def _round(magnitude: np.ndarray, power: np.ndarray) -> np.ndarray:
+    """rint(magnitude * 10 ** power) as int64"""
+    return np.rint(_scale(magnitude, power)).astype(np.int64)
+
+
+def encode_scientific(values: np.ndarray, precision: int = 6,
+                      non_finite: Optional[Dict[str, str]] = None) -> np.ndarray:
+    """
+    Encode values as '%.{precision}e' text in fixed-width byte fields
+
+    Each field is NUL-padded on the right of the sign and after the
+    exponent, so the text of a field is its bytes with the NULs removed.
+    With precision <= 9 and magnitudes from 10**(precision - 22) to
+    10**(precision + 1), the text equals printf's; otherwise the last digit
+    may differ by one. The scaled mantissa is rounded in float64, where a
+    value just below a tie can land on it (9.9999995e-05 would give
+    1.000000e-04, printf gives 9.999999e-05): values within rounding error
+    of a tie are therefore formatted with printf, one by one.
+
+    Args:
+        values: Values of any shape
+        precision: Digits after the decimal point
+        non_finite: Text of 'nan', 'inf' and '-inf' (default: those words)
+
+    Returns:
+        uint8 array of shape values.shape + (precision + 8,)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    magnitude = np.abs(np.where(finite, values, 0.0))
+    nonzero = magnitude > 0.0
+    exponent = np.floor(np.log10(magnitude, out=np.zeros_like(magnitude), where=nonzero))
+    exponent = exponent.astype(np.int64)
+    limit = 10 ** precision
+    scaled = _scale(magnitude, precision - exponent)
+    mantissa = np.rint(scaled).astype(np.int64)
+    # log10 may land one decade off next to powers of ten; rounding may carry to 10.0
+    low = nonzero & (mantissa < limit)
+    if low.any():
+        exponent[low] -= 1
+        scaled[low] = _scale(magnitude[low], precision - exponent[low])
+        mantissa[low] = np.rint(scaled[low])
+    tie = np.abs(np.abs(scaled - mantissa) - 0.5)
+    for index in np.flatnonzero(tie <= _TIE_TOLERANCE * scaled):
+        digits, power = ("%.*e" % (precision, magnitude.flat[index])).split('e')
+        mantissa.flat[index] = int(digits.replace('.', ''))
+        exponent.flat[index] = int(power)
+    high = mantissa >= 10 * limit
+    if high.any():
+        exponent[high] += 1
+        mantissa[high] = _round(magnitude[high], precision - exponent[high])
+
+    dot = 1 if precision else 0
+    width = precision + 8
+    out = np.zeros(values.shape + (width,), dtype=np.uint8)
+    out[..., 0] = np.where(np.signbit(values), ord('-'), _PAD)
+    digits = [1] + list(range(2 + dot, 2 + dot + precision))
+    for position in reversed(digits):
+        out[..., position] = ord('0') + mantissa % 10
+        mantissa //= 10
+    if dot:
+        out[..., 2] = ord('.')
+    e = 2 + dot + precision
+    out[..., e] = ord('e')
+    out[..., e + 1] = np.where(exponent < 0, ord('-'), ord('+'))
+    exponent = np.abs(exponent)
+    out[..., e + 2] = np.where(exponent >= 100, ord('0') + exponent // 100 % 10, _PAD)
+    out[..., e + 3] = ord('0') + exponent // 10 % 10
+    out[..., e + 4] = ord('0') + exponent % 10
+
+    if not finite.all():
+        words = {'nan': 'nan', 'inf': 'inf', '-inf': '-inf'}
+        words.update(non_finite or {})
+        for key, mask in (('nan', np.isnan(values)), ('inf', values == np.inf),
+                          ('-inf', values == -np.inf)):
+            if mask.any():
+                text = np.frombuffer(words[key].encode('ascii'), dtype=np.uint8)[:width]
+                out[mask] = _PAD
+                out[mask, :text.size] = text
+    return out
+
+
+def _text_field(texts: Sequence[object]) -> np.ndarray:
+    """Strings as NUL-padded byte rows, shape (len(texts), longest)"""
+    encoded = np.array([str(text).encode('utf-8') for text in texts], dtype=bytes)
+    return encoded.view(np.uint8).reshape(len(texts), encoded.dtype.itemsize)
+
+
+def _constant(text: str, shape: Tuple[int, ...]) -> np.ndarray:
+    return np.broadcast_to(np.frombuffer(text.encode('utf-8'), dtype=np.uint8),
+                           shape + (len(text.encode('utf-8')),))
+
+
+def _compact(block: np.ndarray) -> bytes:
+    flat = block.reshape(-1)
+    return flat[flat != _PAD].tobytes()
+
+
+def _prepare(wavelengths, spectra, ids) -> Tuple[np.ndarray, np.ndarray, List[object]]:
+    wavelengths = np.asarray(wavelengths, dtype=np.float64)
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=np.float64))
+    if spectra.shape[1] != wavelengths.size:
+        raise ValueError(f"Spectra have {spectra.shape[1]} values, got {wavelengths.size} wavelengths")
+    if ids is None:
+        ids = list(range(len(spectra)))
+    # NumPy scalars (e.g. ids=np.arange(n)) as Python values, for str() and json
+    ids = [value.item() if isinstance(value, np.generic) else value for value in ids]
+    if len(ids) != len(spectra):
+        raise ValueError(f"Got {len(ids)} ids for {len(spectra)} spectra")
+    return wavelengths, spectra, ids
+
+
+def write_csv(path, wavelengths: np.ndarray, spectra: np.ndarray,
+              ids: Optional[Sequence[object]] = None, layout: str = 'wide',
+              metadata: Optional[Dict[str, object]] = None, precision: int = 6,
+              delimiter: str = ',', chunk_rows: int = CHUNK_ROWS):
+    """
+    Write spectra to a CSV file
+
+    Args:
+        path: Output file
+        wavelengths: Wavelengths in nm, shape (values,)
+        spectra: Spectra, shape (values,) or (N, values)
+        ids: Identifier per spectrum (default: running numbers)
+        layout: 'wide' (row per spectrum) or 'long' (row per value)
+        metadata: Written as '# key: value' lines before the header
+        precision: Digits after the decimal point of the spectral values
+        delimiter: Column separator, one ASCII character
+        chunk_rows: Spectra encoded per block
+
+    Raises:
+        ValueError: If an id contains the delimiter, a quote or a line break
+            (fields are not quoted)
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; expected one of {LAYOUTS}")
+    if len(delimiter) != 1 or not delimiter.isascii() or delimiter in '"\r\n':
+        raise ValueError(f"delimiter must be one ASCII character other than a quote "
+                         f"or line break, got {delimiter!r}")
+    wavelengths, spectra, ids = _prepare(wavelengths, spectra, ids)
+    reserved = (delimiter, '"', '\r', '\n')
+    for value in ids:
+        text = str(value)
+        if any(character in text for character in reserved):
+            raise ValueError(f"id {text!r} contains the delimiter, a quote or a line break")
+    labels = ['%g' % wl for wl in wavelengths]
+    count = wavelengths.size
+
+    with open(path, 'wb') as file:
+        lines = [f"# {key}: {value}\n" for key, value in (metadata or {}).items()]
+        header = ['id'] + labels if layout == 'wide' else ['id', 'wavelength_nm', 'value']
+        lines.append(delimiter.join(header) + '\n')
+        file.write(''.join(lines).encode('utf-8'))
+
+        label_field = _text_field(labels)[None, :, :]
+        for start in range(0, len(spectra), chunk_rows):
+            chunk = spectra[start:start + chunk_rows]
+            rows = len(chunk)
+            values = encode_scientific(chunk, precision)
+            id_field = _text_field(ids[start:start + chunk_rows])
+            if layout == 'wide':
+                separators = np.empty((rows, count, 1), dtype=np.uint8)
+                separators[...] = ord(delimiter)
+                separators[:, -1] = ord('\n')
+                block = np.concatenate((
+                    id_field,
+                    _constant(delimiter, (rows,)),
+                    np.concatenate((values, separators), axis=2).reshape(rows, -1),
+                ), axis=1)
+            else:
+                shape = (rows, count)
+                block = np.concatenate((
+                    np.broadcast_to(id_field[:, None, :], shape + id_field.shape[1:]),
+                    _constant(delimiter, shape),
+                    np.broadcast_to(label_field, shape + label_field.shape[2:]),
+                    _constant(delimiter, shape),
+                    values,
+                    _constant('\n', shape),
+                ), axis=2)
+            file.write(_compact(block))
+
+
+def write_json(path, wavelengths: np.ndarray, spectra: np.ndarray,
+               ids: Optional[Sequence[object]] = None,
+               metadata: Optional[Dict[str, object]] = None, precision: int = 6,
+               chunk_rows: int = CHUNK_ROWS):
+    """
+    Write spectra to a JSON file
+
+    The document is {"metadata": {...}, "wavelengths": [...], "ids": [...],
+    "spectra": [[...], ...]}; non-finite values are written as null.
+
+    Args:
+        path: Output file
+        wavelengths: Wavelengths in nm, shape (values,)
+        spectra: Spectra, shape (values,) or (N, values)
+        ids: Identifier per spectrum, JSON-serialisable (default: running numbers)
+        metadata: JSON-serialisable metadata
+        precision: Digits after the decimal point of the spectral values
+        chunk_rows: Spectra encoded per block
+    """
+    wavelengths, spectra, ids = _prepare(wavelengths, spectra, ids)
+    null = {'nan': 'null', 'inf': 'null', '-inf': 'null'}
+    count = wavelengths.size
+
+    with open(path, 'wb') as file:
+        head = (f'{{"metadata": {json.dumps(metadata or {})},\n'
+                f'"wavelengths": {json.dumps(wavelengths.tolist())},\n'
+                f'"ids": {json.dumps(ids)},\n'
+                f'"spectra": [\n')
+        file.write(head.encode('utf-8'))
+        for start in range(0, len(spectra), chunk_rows):
+            chunk = spectra[start:start + chunk_rows]
+            rows = len(chunk)
+            separators = np.empty((rows, count, 1), dtype=np.uint8)
+            separators[...] = ord(',')
+            separators[:, -1] = ord(']')
+            ends = np.zeros((rows, 2), dtype=np.uint8)
+            ends[:] = np.frombuffer(b',\n', dtype=np.uint8)
+            if start + rows == len(spectra):
+                ends[-1] = (ord('\n'), _PAD)
+            block = np.concatenate((
+                _constant('[', (rows,)),
+                np.concatenate((encode_scientific(chunk, precision, null), separators),
+                               axis=2).reshape(rows, -1),
+                ends,
+            ), axis=1)
+            file.write(_compact(block))
+        file.write(b']}\n')
+
+
+def read_csv(path, delimiter: str = ','):
+    """
+    Read a file written by write_csv()
+
+    Args:
+        path: CSV file
+        delimiter: Column separator
+
+    Returns:
+        (wavelengths, spectra of shape (N, values), ids as strings, metadata as strings)
+    """
+    metadata = {}
+    with open(path, encoding='utf-8') as file:
+        line = file.readline()
+        while line.startswith('#'):
+            key, _, value = line[1:].strip().partition(': ')
+            metadata[key] = value
+            line = file.readline()
+        header = line.rstrip('\n').split(delimiter)
+        rows = np.loadtxt(file, delimiter=delimiter, dtype=str, ndmin=2)
+
+    if header == ['id', 'wavelength_nm', 'value']:
+        # Long layout: the values of one spectrum are consecutive rows
+        wavelengths = rows[:, 1].astype(np.float64)
+        restarts = np.flatnonzero(wavelengths[1:] <= wavelengths[:-1])
+        count = int(restarts[0]) + 1 if restarts.size else len(rows)
+        spectra = rows[:, 2].astype(np.float64).reshape(-1, count)
+        return wavelengths[:count], spectra, rows[::count, 0].tolist(), metadata
+    wavelengths = np.array(header[1:], dtype=np.float64)
+    return wavelengths, rows[:, 1:].astype(np.float64), rows[:, 0].tolist(), metadata
@@ -0,0 +1,211 @@
+"""
+HDR fusion of bracketed integration times on JetiSpectroEx
+
+A spectrum with a strong peak and weak tails either saturates at the peak
+or leaves the tails in the noise. HDRAcquisition scans a set of integration
+times, subtracts a dark frame per integration time and fuses the count rates
+per pixel: saturated pixels are masked and the remaining scans are weighted
+by their inverse variance (read noise plus shot noise), which weights by SNR.
+
+Scans run shortest first. The shortest scan predicts each pixel's counts at
+the longer integration times, and only the integration times that are the
+longest unsaturated one for some pixel are measured.
+"""
+
+import ctypes
+import time
+from ctypes import c_uint8
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .wrapper import _check_error
+
+
+class HDRResult(NamedTuple):
+    """Result of HDRAcquisition.acquire()"""
+    rate: np.ndarray
+    uncertainty: np.ndarray
+    saturated: np.ndarray
+    integration_times: Tuple[float, ...]
+    total_exposure: float
+    elapsed: float
+
+    def counts(self, integration_time: float) -> np.ndarray:
+        """Fused spectrum scaled to the counts of one integration time (ms)"""
+        return self.rate * integration_time
+
+
+def plan_brackets(probe_rate: np.ndarray, integration_times: Sequence[float],
+                  full_scale: np.ndarray) -> Tuple[float, ...]:
+    """
+    Integration times needed for an HDR spectrum
+
+    Args:
+        probe_rate: Dark-corrected count rate per pixel in counts/ms
+        integration_times: Available integration times in ms, ascending
+        full_scale: Usable counts per pixel (saturation level minus dark)
+
+    Returns:
+        The shortest integration time plus every integration time that is the
+        longest unsaturated one for at least one pixel, ascending
+    """
+    times = np.asarray(integration_times, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        limit = np.where(probe_rate > 0.0, full_scale / probe_rate, np.inf)
+    best = np.clip(np.searchsorted(times, limit, side='right') - 1, 0, times.size - 1)
+    needed = np.union1d(best, [0])
+    return tuple(float(times[index]) for index in needed)
+
+
+def fuse_brackets(light: np.ndarray, dark: np.ndarray, integration_times: Sequence[float],
+                  saturation: float, read_noise: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Inverse-variance fusion of bracketed scans
+
+    Args:
+        light: Raw light counts, shape (K, pixels)
+        dark: Dark counts for the same integration times, shape (K, pixels)
+        integration_times: Integration times in ms, shape (K,)
+        saturation: Raw count level from which a pixel is saturated
+        read_noise: Read noise in counts (>= 0)
+
+    Returns:
+        (rate in counts/ms, standard uncertainty of the rate,
+        mask of pixels saturated in every scan)
+
+    Raises:
+        ValueError: If read_noise is negative
+    """
+    if read_noise < 0.0:
+        raise ValueError(f"read_noise must be >= 0, got {read_noise}")
+    light = np.asarray(light, dtype=np.float64)
+    times = np.asarray(integration_times, dtype=np.float64)[:, None]
+    signal = light - dark
+    valid = light < saturation
+    # At least one count² (the ADC step): a noiseless dark pixel would give 0/0
+    variance = np.maximum(read_noise ** 2 + np.maximum(signal, 0.0), 1.0)
+    weight = np.where(valid, times ** 2 / variance, 0.0)
+    total = weight.sum(axis=0)
+    saturated = total == 0.0
+    # Pixels saturated everywhere keep the (clipped) rate of the shortest scan
+    safe_total = np.where(saturated, 1.0, total)
+    rate = np.where(saturated, signal[0] / times[0, 0], (weight * signal / times).sum(axis=0) / safe_total)
+    uncertainty = np.where(saturated, np.inf, 1.0 / np.sqrt(safe_total))
+    return rate, uncertainty, saturated
+
+
+class HDRAcquisition:
+    """
+    Bracketed light scans fused into one extended-dynamic-range spectrum
+
+    Dark frames are measured once per integration time and reused until
+    refresh_dark() is called.
+
+    Example:
+        hdr = device.create_hdr_acquisition((1.0, 4.0, 16.0, 64.0, 256.0))
+        result = hdr.acquire()
+        spectrum = result.rate            # counts/ms per pixel
+        print(result.integration_times, result.total_exposure)
+    """
+
+    def __init__(self, device, integration_times: Sequence[float] = (1.0, 4.0, 16.0, 64.0, 256.0),
+                 saturation: Optional[float] = None, read_noise: Optional[float] = None,
+                 margin: float = 0.9, dark_average: int = 1, poll_interval: float = 0.001):
+        """
+        Args:
+            device: Opened JetiSpectroEx
+            integration_times: Bracketed integration times in ms
+            saturation: Raw count level from which a pixel is saturated
+                (None: 98 % of the ADC range from JETI_GetADCRes)
+            read_noise: Read noise in counts (None: estimated from the
+                difference of two dark frames at the shortest integration time)
+            margin: Fraction of the usable counts a planned scan may reach
+            dark_average: Number of averages of each dark frame
+            poll_interval: Time between status checks in seconds
+        """
+        if not integration_times:
+            raise ValueError("At least one integration time is needed")
+        if read_noise is not None and read_noise < 0.0:
+            raise ValueError(f"read_noise must be >= 0, got {read_noise}")
+        self._device = device
+        self.integration_times = tuple(sorted(float(t) for t in integration_times))
+        self.margin = margin
+        self.dark_average = dark_average
+        self.poll_interval = poll_interval
+        self.saturation = saturation if saturation is not None else 0.98 * self._adc_max()
+        self.read_noise = read_noise
+        self.dark_frames: Dict[float, np.ndarray] = {}
+
+    def _adc_max(self) -> int:
+        bits = c_uint8()
+        error = self._device.core.JETI_GetADCRes(self._device._device_handle, ctypes.byref(bits))
+        _check_error(error, "JETI_GetADCRes")
+        return 2 ** bits.value - 1
+
+    def refresh_dark(self):
+        """Forget the dark frames (e.g. after the detector temperature changed)"""
+        self.dark_frames.clear()
+
+    def _measure_dark(self, integration_time: float) -> np.ndarray:
+        self._device.start_dark_measurement(integration_time, self.dark_average)
+        self._device.wait_for_measurement(self.poll_interval)
+        return self._device.get_dark_spectrum_pixel().astype(np.float64)
+
+    def _dark(self, integration_time: float) -> np.ndarray:
+        dark = self.dark_frames.get(integration_time)
+        if dark is None:
+            dark = self._measure_dark(integration_time)
+            self.dark_frames[integration_time] = dark
+        return dark
+
+    def _estimate_read_noise(self, integration_time: float, dark: np.ndarray) -> float:
+        # The spread of a single dark frame also holds the fixed pattern of
+        # the pixel offsets; the difference of two frames cancels it
+        difference = self._measure_dark(integration_time) - dark
+        return float(difference.std() * np.sqrt(self.dark_average / 2.0))
+
+    def _light(self, integration_time: float) -> np.ndarray:
+        self._device.start_light_measurement(integration_time, 1)
+        self._device.wait_for_measurement(self.poll_interval)
+        return self._device.get_light_spectrum_pixel()
+
+    def acquire(self) -> HDRResult:
+        """
+        Measure the needed brackets and fuse them
+
+        Returns:
+            HDRResult with the fused count rate (counts/ms) per pixel
+        """
+        start = time.perf_counter()
+        exposure = 0.0
+        probe_time = self.integration_times[0]
+        new_darks = [t for t in self.integration_times if t not in self.dark_frames]
+        probe_dark = self._dark(probe_time)
+        if self.read_noise is None:
+            self.read_noise = self._estimate_read_noise(probe_time, probe_dark)
+            exposure += probe_time * self.dark_average
+        probe = self._light(probe_time)
+        exposure += probe_time
+
+        full_scale = self.margin * (self.saturation - probe_dark)
+        plan = plan_brackets((probe - probe_dark) / probe_time, self.integration_times, full_scale)
+        lights = [probe]
+        darks = [probe_dark]
+        for integration_time in plan[1:]:
+            darks.append(self._dark(integration_time))
+            lights.append(self._light(integration_time))
+            exposure += integration_time
+        exposure += sum(t * self.dark_average for t in new_darks if t in self.dark_frames)
+
+        rate, uncertainty, saturated = fuse_brackets(
+            np.stack(lights), np.stack(darks), plan, self.saturation, self.read_noise
+        )
+        return HDRResult(
+            rate=rate,
+            uncertainty=uncertainty,
+            saturated=saturated,
+            integration_times=plan,
+            total_exposure=exposure / 1000.0,
+            elapsed=time.perf_counter() - start,
+        )
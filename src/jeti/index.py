@@ -0,0 +1,325 @@
+"""
+Spectrum similarity index for nearest-neighbour lookup of reference spectra
+
+SpectrumIndex keeps a library of reference spectra as one compact float32
+matrix of normalised (optionally PCA-reduced) spectra plus their CIELAB
+colour, and answers top-k queries with one matrix multiply per batch
+instead of a Python loop over the library.
+
+Metrics:
+    cosine:  cosine similarity of the spectra (higher is closer)
+    rms:     RMS difference of the normalised spectra (lower is closer)
+    delta_e: CIE76 ΔE*ab of the colours at equal luminance (lower is closer)
+
+An index is saved as a directory of .npy files plus index.json and loaded
+with memory mapping, so opening a large library does not read it.
+
+Example:
+    from jeti.index import SpectrumIndex
+
+    index = SpectrumIndex(wavelengths)
+    index.add(golden_spectra, ids=serial_numbers)
+    index.reduce(32)
+    index.save("golden.idx")
+
+    index = SpectrumIndex.load("golden.idx")
+    for match in index.query(device.get_spectral_radiance(), k=5):
+        print(match.id, match.score)
+"""
+
+import json
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ._colorimetry import spectrum_to_xyz, xyz_to_lab
+
+
+METRICS = ('cosine', 'rms', 'delta_e')
+
+_FORMAT_VERSION = 1
+
+
+class Match(NamedTuple):
+    """One query result"""
+    id: object
+    index: int
+    score: float
+
+
+class SpectrumIndex:
+    """
+    Library of reference spectra with top-k nearest-neighbour queries
+
+    Spectra are stored normalised (unit area, or unit peak) on a common
+    wavelength grid. After reduce(), they are stored as coordinates in a PCA
+    basis; distances and cosine similarities are then computed in that basis.
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, wavelengths: np.ndarray, normalization: str = 'area'):
+        """
+        Args:
+            wavelengths: Wavelength grid of all spectra in nm
+            normalization: 'area' (unit integral) or 'peak' (unit maximum)
+        """
+        if normalization not in ('area', 'peak'):
+            raise ValueError(f"Unknown normalization {normalization!r}; expected 'area' or 'peak'")
+        self.wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        self.normalization = normalization
+        self.mean: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.ids: List[object] = []
+        self._count = 0
+        self._vectors = np.empty((0, self.wavelengths.size), dtype=np.float32)
+        self._squared = np.empty(0, dtype=np.float32)
+        self._projected_mean = np.empty(0, dtype=np.float32)
+        self._lab = np.empty((0, 3), dtype=np.float32)
+        self._step = float(np.mean(np.diff(self.wavelengths))) if self.wavelengths.size > 1 else 1.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def dimensions(self) -> int:
+        """Stored values per spectrum"""
+        return self._vectors.shape[1]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored (normalised or PCA) vectors, shape (len, dimensions)"""
+        return self._vectors[:self._count]
+
+    # ------------------------------------------------------------------
+    # Encoding
+
+    def _normalise(self, spectra: np.ndarray) -> np.ndarray:
+        spectra = np.atleast_2d(np.asarray(spectra, dtype=np.float64))
+        if spectra.shape[1] != self.wavelengths.size:
+            raise ValueError(f"Spectra have {spectra.shape[1]} values, "
+                             f"the index grid has {self.wavelengths.size}")
+        if self.normalization == 'area':
+            scale = spectra.sum(axis=1, keepdims=True) * self._step
+        else:
+            scale = spectra.max(axis=1, keepdims=True)
+        return spectra / np.where(scale == 0.0, 1.0, scale)
+
+    def _colour(self, spectra: np.ndarray) -> np.ndarray:
+        xyz = spectrum_to_xyz(self.wavelengths, spectra)
+        luminance = xyz[:, 1:2]
+        return xyz_to_lab(100.0 * xyz / np.where(luminance == 0.0, 1.0, luminance))
+
+    def _encode(self, spectra: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(vectors, squared norms, dot with the PCA mean, Lab) of raw spectra"""
+        normalised = self._normalise(spectra)
+        if self.components is None:
+            vectors = normalised
+            projected_mean = np.zeros(len(vectors))
+        else:
+            vectors = (normalised - self.mean) @ self.components.T
+            projected_mean = vectors @ (self.components @ self.mean)
+        squared = np.einsum('ij,ij->i', vectors, vectors)
+        return vectors.astype(np.float32), squared, projected_mean, self._colour(normalised)
+
+    # ------------------------------------------------------------------
+    # Building
+
+    def _reserve(self, count: int):
+        capacity = len(self._vectors)
+        if count <= capacity:
+            return
+        capacity = max(count, 2 * capacity, self._INITIAL_CAPACITY)
+
+        def grow(array: np.ndarray) -> np.ndarray:
+            grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._count] = array[:self._count]
+            return grown
+
+        self._vectors = grow(self._vectors)
+        self._squared = grow(self._squared)
+        self._projected_mean = grow(self._projected_mean)
+        self._lab = grow(self._lab)
+
+    def add(self, spectra: np.ndarray, ids: Optional[Sequence[object]] = None) -> range:
+        """
+        Insert reference spectra
+
+        Args:
+            spectra: Spectra on the index grid, shape (values,) or (N, values)
+            ids: Identifiers of the spectra (default: running numbers); numpy
+                scalars are stored as Python scalars, and save() needs them
+                JSON-serialisable
+
+        Returns:
+            Positions of the inserted spectra
+        """
+        vectors, squared, projected_mean, lab = self._encode(spectra)
+        count = len(vectors)
+        if ids is None:
+            ids = range(self._count, self._count + count)
+        ids = [value.item() if isinstance(value, np.generic) else value for value in ids]
+        if len(ids) != count:
+            raise ValueError(f"Got {len(ids)} ids for {count} spectra")
+        start = self._count
+        self._reserve(start + count)
+        self._vectors[start:start + count] = vectors
+        self._squared[start:start + count] = squared
+        self._projected_mean[start:start + count] = projected_mean
+        self._lab[start:start + count] = lab
+        self.ids.extend(ids)
+        self._count += count
+        return range(start, start + count)
+
+    def reduce(self, components: int):
+        """
+        Replace the stored spectra by their coordinates in a PCA basis
+
+        The basis is fitted to the current library; spectra added later are
+        projected onto it.
+
+        Args:
+            components: Number of principal components to keep
+        """
+        if self.components is not None:
+            raise ValueError("Index is already PCA-reduced")
+        if not 0 < components <= min(self._count, self.dimensions):
+            raise ValueError(f"components must be in 1..{min(self._count, self.dimensions)}")
+        data = self.vectors.astype(np.float64)
+        mean = data.mean(axis=0)
+        _, _, basis = np.linalg.svd(data - mean, full_matrices=False)
+        self.mean = mean
+        self.components = basis[:components]
+        vectors = (data - mean) @ self.components.T
+        self._vectors = vectors.astype(np.float32)
+        self._squared = np.einsum('ij,ij->i', vectors, vectors).astype(np.float32)
+        self._projected_mean = (vectors @ (self.components @ mean)).astype(np.float32)
+        self._lab = self._lab[:self._count].copy()
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    def _scores(self, spectra: np.ndarray, metric: str) -> np.ndarray:
+        """Scores of each query against each library spectrum, shape (M, len)"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+        vectors, squared, projected_mean, lab = self._encode(spectra)
+        if metric == 'delta_e':
+            library = self._lab[:self._count]
+            distance = (np.einsum('ij,ij->i', lab, lab)[:, None]
+                        + np.einsum('ij,ij->i', library, library)[None, :]
+                        - 2.0 * (lab.astype(np.float32) @ library.T))
+            return np.sqrt(np.maximum(distance, 0.0))
+        dot = vectors @ self.vectors.T
+        if metric == 'rms':
+            distance = squared[:, None] + self._squared[:self._count][None, :] - 2.0 * dot
+            return np.sqrt(np.maximum(distance, 0.0) / self.wavelengths.size)
+        # cosine: a·b = |mean|² + mean·(a - mean) + mean·(b - mean) + (a - mean)·(b - mean)
+        mean_squared = 0.0 if self.mean is None else float(self.mean @ self.mean)
+        library_projected = self._projected_mean[:self._count]
+        product = mean_squared + projected_mean[:, None] + library_projected[None, :] + dot
+        norm = np.sqrt(np.maximum(mean_squared + 2.0 * projected_mean + squared, 0.0))
+        library_norm = np.sqrt(np.maximum(
+            mean_squared + 2.0 * library_projected + self._squared[:self._count], 0.0))
+        denominator = norm[:, None] * library_norm[None, :]
+        return product / np.where(denominator == 0.0, 1.0, denominator)
+
+    def query_batch(self, spectra: np.ndarray, k: int = 5,
+                    metric: str = 'cosine') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k neighbours of several spectra
+
+        Args:
+            spectra: Query spectra on the index grid, shape (M, values)
+            k: Number of neighbours
+            metric: One of METRICS
+
+        Returns:
+            (positions, scores), each of shape (M, k), best first
+        """
+        if not self._count:
+            raise ValueError("Index is empty")
+        scores = self._scores(spectra, metric)
+        k = min(k, self._count)
+        order_scores = -scores if metric == 'cosine' else scores
+        candidates = np.argpartition(order_scores, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(order_scores, candidates, axis=1)
+        order = np.argsort(candidate_scores, axis=1, kind='stable')
+        positions = np.take_along_axis(candidates, order, axis=1)
+        return positions, np.take_along_axis(scores, positions, axis=1)
+
+    def query(self, spectrum: np.ndarray, k: int = 5, metric: str = 'cosine') -> List[Match]:
+        """
+        Top-k neighbours of one spectrum
+
+        Args:
+            spectrum: Query spectrum on the index grid
+            k: Number of neighbours
+            metric: One of METRICS
+
+        Returns:
+            Matches, best first
+        """
+        positions, scores = self.query_batch(np.atleast_2d(spectrum), k, metric)
+        return [Match(self.ids[position], int(position), float(score))
+                for position, score in zip(positions[0], scores[0])]
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    def save(self, path):
+        """
+        Write the index to a directory (index.json plus one .npy file per array)
+
+        Args:
+            path: Directory, created if needed
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "wavelengths.npy", self.wavelengths)
+        np.save(path / "vectors.npy", self.vectors)
+        np.save(path / "squared.npy", self._squared[:self._count])
+        np.save(path / "projected_mean.npy", self._projected_mean[:self._count])
+        np.save(path / "lab.npy", self._lab[:self._count])
+        if self.components is not None:
+            np.save(path / "mean.npy", self.mean)
+            np.save(path / "components.npy", self.components)
+        metadata = {
+            'version': _FORMAT_VERSION,
+            'normalization': self.normalization,
+            'count': self._count,
+            'reduced': self.components is not None,
+            'ids': self.ids,
+        }
+        (path / "index.json").write_text(json.dumps(metadata))
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> 'SpectrumIndex':
+        """
+        Open an index written by save()
+
+        Args:
+            path: Index directory
+            mmap: Memory-map the arrays instead of reading them (they are
+                copied into memory on the first add())
+
+        Returns:
+            SpectrumIndex
+        """
+        path = Path(path)
+        metadata = json.loads((path / "index.json").read_text())
+        if metadata['version'] != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version {metadata['version']}")
+        mode = 'r' if mmap else None
+        index = cls(np.load(path / "wavelengths.npy"), metadata['normalization'])
+        if metadata['reduced']:
+            index.mean = np.load(path / "mean.npy")
+            index.components = np.load(path / "components.npy")
+        index._vectors = np.load(path / "vectors.npy", mmap_mode=mode)
+        index._squared = np.load(path / "squared.npy", mmap_mode=mode)
+        index._projected_mean = np.load(path / "projected_mean.npy", mmap_mode=mode)
+        index._lab = np.load(path / "lab.npy", mmap_mode=mode)
+        index.ids = list(metadata['ids'])
+        index._count = metadata['count']
+        return index
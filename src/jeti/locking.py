@@ -0,0 +1,242 @@
+"""
+Per-handle locking of DLL calls
+
+The JETI DLLs talk to the device over one serial/USB link per handle and
+are not safe against two threads using the same handle at once: commands
+interleave on the wire and fail with ERROR_NAK or CHECKSUM_ERROR. Every
+wrapper class therefore calls the DLLs through a LockedLibrary, which
+serialises the calls per device handle. Calls without a handle
+(JETI_GetNumDevices, JETI_OpenDevice, JETI_ImportSLM, ...) touch DLL-global
+state and share one global lock, except for the direct opens
+(JETI_OpenTCPDevice, JETI_OpenFTDIDevice, ...), which are serialised per
+address so devices on different links can be opened in parallel. Calls on
+different handles run concurrently.
+
+The lock is held for one DLL call only, so polling loops such as
+wait_for_measurement() never block other threads for longer than one call.
+Blocking calls hold it for their whole duration: JETI_WaitReadTrigger of a
+running TriggerCapture holds the handle lock for up to its timeout. Waiting
+threads are served in arrival order, so a thread calling again right after
+its release (the capture thread re-arming) cannot skip a waiting thread,
+which therefore waits for at most one call per thread queued before it.
+Each lock counts how often it was taken and how long callers waited:
+
+    from jeti import locking
+
+    print(device.lock_stats())
+    for name, stats in locking.contention_stats().items():
+        print(name, stats.contended, stats.wait_time)
+"""
+
+import threading
+import time
+from collections import deque
+from ctypes import c_void_p
+from typing import Dict, NamedTuple, Optional
+
+
+class LockStats(NamedTuple):
+    """Contention counters of one lock"""
+    acquisitions: int
+    contended: int
+    wait_time: float
+    max_wait: float
+
+
+class HandleLock:
+    """
+    FIFO mutex with contention counters
+
+    Waiting threads get the lock in the order they asked for it: release()
+    hands it directly to the first waiter. An acquisition is contended if
+    the lock was held by another thread; wait_time sums the time contended
+    callers waited, in seconds. The counters are kept under a short internal
+    mutex, so stats() never waits for the lock itself.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Name shown in contention_stats()
+        """
+        self.name = name
+        self._mutex = threading.Lock()
+        self._held = False
+        self._waiters = deque()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self):
+        with self._mutex:
+            if not self._held:
+                self._held = True
+                self.acquisitions += 1
+                return
+            waiter = threading.Lock()
+            waiter.acquire()
+            self._waiters.append(waiter)
+        start = time.perf_counter()
+        waiter.acquire()  # released by release(), which passes the lock on
+        waited = time.perf_counter() - start
+        with self._mutex:
+            self.acquisitions += 1
+            self.contended += 1
+            self.wait_time += waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+
+    def release(self):
+        with self._mutex:
+            if not self._held:
+                raise RuntimeError("release unlocked lock")
+            if self._waiters:
+                self._waiters.popleft().release()
+            else:
+                self._held = False
+
+    def locked(self) -> bool:
+        return self._held
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    def stats(self) -> LockStats:
+        """Consistent snapshot of the counters; does not wait for a running call"""
+        with self._mutex:
+            return LockStats(self.acquisitions, self.contended, self.wait_time, self.max_wait)
+
+    def reset(self):
+        """Zero the counters"""
+        with self._mutex:
+            self.acquisitions = 0
+            self.contended = 0
+            self.wait_time = 0.0
+            self.max_wait = 0.0
+
+
+# Lock of the calls without a device handle
+GLOBAL_LOCK = HandleLock("global")
+
+# Opens addressing one device by its link; locked per (function, address)
+ADDRESSED_OPENS = frozenset({
+    'JETI_OpenCOMDevice',
+    'JETI_OpenTCPDevice',
+    'JETI_OpenFTDIDevice',
+    'JETI_OpenBTDevice',
+    'JETI_OpenBTLEDevice',
+})
+
+_handle_locks: Dict[object, HandleLock] = {}
+_registry_lock = threading.Lock()
+
+
+def _handle_key(handle) -> Optional[int]:
+    if isinstance(handle, c_void_p):
+        return handle.value
+    return None
+
+
+def _lock(key, name: str) -> HandleLock:
+    lock = _handle_locks.get(key)
+    if lock is None:
+        with _registry_lock:
+            lock = _handle_locks.get(key)
+            if lock is None:
+                lock = _handle_locks[key] = HandleLock(name)
+    return lock
+
+
+def address_lock(function_name: str, address) -> HandleLock:
+    """
+    Lock of a direct open of one device address
+
+    Args:
+        function_name: One of ADDRESSED_OPENS
+        address: COM port, IP address, FTDI serial, Bluetooth address or path
+    """
+    address = getattr(address, 'value', address)
+    if isinstance(address, bytes):
+        address = address.decode('ascii', 'replace')
+    return _lock((function_name, address), f"{function_name}({address})")
+
+
+def handle_lock(handle) -> HandleLock:
+    """
+    Lock of a device handle
+
+    All wrapper objects (and the core DLL) using the same handle share it.
+    A NULL handle maps to GLOBAL_LOCK.
+
+    Args:
+        handle: Device handle (c_void_p) or its integer value
+    """
+    key = handle if isinstance(handle, int) else _handle_key(handle)
+    if key is None:
+        return GLOBAL_LOCK
+    return _lock(key, f"{key:#x}")
+
+
+def contention_stats() -> Dict[str, LockStats]:
+    """Counters of the global lock and every handle and address lock, by lock name"""
+    with _registry_lock:
+        locks = [GLOBAL_LOCK] + list(_handle_locks.values())
+    return {lock.name: lock.stats() for lock in locks}
+
+
+def reset_contention_stats():
+    """Zero the counters of all locks"""
+    with _registry_lock:
+        locks = [GLOBAL_LOCK] + list(_handle_locks.values())
+    for lock in locks:
+        lock.reset()
+
+
+class LockedLibrary:
+    """
+    Library proxy serialising calls per device handle
+
+    A call whose first argument is a device handle (c_void_p) holds that
+    handle's lock, a direct open holds the lock of its address and any
+    other call holds GLOBAL_LOCK.
+    """
+
+    def __init__(self, library):
+        """
+        Args:
+            library: Loaded DLL, BoundLibrary or SimulatedSDK
+        """
+        self.library = library
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        function = getattr(self.library, name)
+
+        if name in ADDRESSED_OPENS:
+            def call(*args):
+                with address_lock(name, args[0]):
+                    return function(*args)
+        else:
+            def call(*args):
+                key = _handle_key(args[0]) if args else None
+                if key is None:
+                    lock = GLOBAL_LOCK
+                else:
+                    lock = _handle_locks.get(key) or handle_lock(key)
+                lock.acquire()
+                try:
+                    return function(*args)
+                finally:
+                    lock.release()
+
+        call.__name__ = name
+        call.__wrapped__ = function
+        setattr(self, name, call)
+        return call
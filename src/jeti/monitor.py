@@ -0,0 +1,383 @@
+"""
+Incremental drift monitoring of a live measurement stream
+
+Burn-in rigs measure every few seconds for weeks. DriftMonitor consumes each
+result as it arrives and keeps constant-memory statistics per quantity:
+
+    Welford:   running mean and standard deviation of the whole run
+    EWMA:      exponentially weighted mean and deviation (recent level)
+    window:    quantiles of the last `window` values (ring buffer)
+    CUSUM:     two-sided cumulative sum of the deviation from the baseline,
+               flagging a change-point once it exceeds `cusum_threshold`
+
+The baseline (mean and standard deviation) of each quantity is frozen after
+the first `warmup` values. Values outside the configured limits are flagged
+as threshold breaches. The spectrum itself is reduced to one quantity, its
+relative RMS deviation from the baseline spectrum.
+
+Example:
+    monitor = device.create_drift_monitor(limits={'cct': (2900.0, 3100.0)})
+    while True:
+        device.measure(0.0, 1)
+        device.wait_for_measurement()      # runs the monitor as a hook
+        for event in monitor.pending_events():
+            log.warning(event)
+        print(monitor.state()['cct'].ewma)
+"""
+
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .averaging import RunningStatistics
+
+
+# Quantities read from a JetiRadioEx by DriftMonitor.observe()
+DEVICE_QUANTITIES = ('radio', 'photo', 'x', 'y', 'cct')
+
+SPECTRAL_DEVIATION = 'spectral_deviation'
+
+
+class DriftEvent(NamedTuple):
+    """A threshold breach or change-point of one quantity"""
+    timestamp: float
+    sample: int
+    quantity: str
+    kind: str
+    value: float
+    reference: float
+
+
+class QuantityState(NamedTuple):
+    """Current statistics of one monitored quantity"""
+    count: int
+    last: float
+    mean: float
+    std: float
+    ewma: float
+    ewm_std: float
+    minimum: float
+    maximum: float
+    quantiles: Dict[float, float]
+    cusum: Tuple[float, float]
+    baseline: Optional[Tuple[float, float]]
+
+
+class EWMA:
+    """Exponentially weighted moving mean and variance"""
+
+    def __init__(self, alpha: float):
+        """
+        Args:
+            alpha: Weight of the newest value (0 < alpha <= 1)
+        """
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.mean: Optional[float] = None
+        self.variance = 0.0
+
+    def update(self, value: float):
+        if self.mean is None:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += self.alpha * delta
+        self.variance = (1.0 - self.alpha) * (self.variance + self.alpha * delta * delta)
+
+
+class WindowedQuantiles:
+    """Quantiles of the last `window` values, kept in a ring buffer"""
+
+    def __init__(self, window: int, quantiles: Iterable[float] = (0.05, 0.5, 0.95)):
+        """
+        Args:
+            window: Number of most recent values kept
+            quantiles: Quantiles reported by values()
+        """
+        self.quantiles = tuple(quantiles)
+        self._buffer = np.empty(window, dtype=np.float64)
+        self._count = 0
+
+    def update(self, value: float):
+        self._buffer[self._count % len(self._buffer)] = value
+        self._count += 1
+
+    def values(self) -> Dict[float, float]:
+        filled = self._buffer[:min(self._count, len(self._buffer))]
+        if not filled.size:
+            return {q: float('nan') for q in self.quantiles}
+        return dict(zip(self.quantiles, np.quantile(filled, self.quantiles).tolist()))
+
+
+class CUSUM:
+    """
+    Two-sided CUSUM change-point detector on standardised values
+
+    Each statistic accumulates the deviation beyond `drift` standard
+    deviations; a change-point is flagged when one exceeds `threshold`, after
+    which both restart from zero.
+    """
+
+    def __init__(self, threshold: float = 5.0, drift: float = 0.5):
+        """
+        Args:
+            threshold: Decision limit in standard deviations
+            drift: Allowance per sample in standard deviations
+        """
+        self.threshold = threshold
+        self.drift = drift
+        self.upper = 0.0
+        self.lower = 0.0
+
+    def update(self, z: float) -> int:
+        """
+        Add one standardised value
+
+        Returns:
+            +1 for an upward change-point, -1 for a downward one, else 0
+        """
+        self.upper = max(0.0, self.upper + z - self.drift)
+        self.lower = max(0.0, self.lower - z - self.drift)
+        if self.upper > self.threshold:
+            self.upper = self.lower = 0.0
+            return 1
+        if self.lower > self.threshold:
+            self.upper = self.lower = 0.0
+            return -1
+        return 0
+
+
+class _Quantity:
+    """Statistics of one scalar quantity"""
+
+    def __init__(self, alpha: float, window: int, quantiles: Iterable[float],
+                 warmup: int, cusum_threshold: float, cusum_drift: float,
+                 limits: Optional[Tuple[Optional[float], Optional[float]]]):
+        self.stats = RunningStatistics(())
+        self.warmup_stats = RunningStatistics(())
+        self.ewma = EWMA(alpha)
+        self.window = WindowedQuantiles(window, quantiles)
+        self.cusum = CUSUM(cusum_threshold, cusum_drift)
+        self.warmup = warmup
+        self.limits = limits
+        self.baseline: Optional[Tuple[float, float]] = None
+        self.last = float('nan')
+        self.minimum = float('inf')
+        self.maximum = float('-inf')
+
+    def update(self, value: float) -> List[Tuple[str, float]]:
+        """Add a value; returns (kind, reference) of the flagged events"""
+        self.last = value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.stats.update(value)
+        self.ewma.update(value)
+        self.window.update(value)
+
+        events = []
+        if self.limits is not None:
+            low, high = self.limits
+            if low is not None and value < low:
+                events.append(('below_limit', low))
+            if high is not None and value > high:
+                events.append(('above_limit', high))
+
+        if self.baseline is None:
+            self.warmup_stats.update(value)
+            if self.warmup_stats.count >= self.warmup:
+                mean = float(self.warmup_stats.mean)
+                std = float(np.sqrt(self.warmup_stats.variance))
+                # A perfectly steady warm-up would make every later change infinite
+                self.baseline = (mean, max(std, 1e-9 * abs(mean), 1e-12))
+        else:
+            mean, std = self.baseline
+            direction = self.cusum.update((value - mean) / std)
+            if direction:
+                events.append(('change_up' if direction > 0 else 'change_down', mean))
+        return events
+
+    def state(self) -> QuantityState:
+        return QuantityState(
+            count=self.stats.count,
+            last=self.last,
+            mean=float(self.stats.mean),
+            std=float(np.sqrt(self.stats.variance)),
+            ewma=float('nan') if self.ewma.mean is None else self.ewma.mean,
+            ewm_std=float(np.sqrt(self.ewma.variance)),
+            minimum=self.minimum,
+            maximum=self.maximum,
+            quantiles=self.window.values(),
+            cusum=(self.cusum.upper, self.cusum.lower),
+            baseline=self.baseline,
+        )
+
+
+class DriftMonitor:
+    """
+    Constant-memory drift statistics and alarms over a measurement stream
+
+    Feed it with update(), or register it as a measurement hook of a
+    JetiRadioEx (device.add_measurement_hook(monitor) or
+    device.create_drift_monitor()), which calls observe() after every
+    completed wait_for_measurement().
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+                 alpha: float = 0.05, window: int = 256,
+                 quantiles: Iterable[float] = (0.05, 0.5, 0.95), warmup: int = 20,
+                 cusum_threshold: float = 5.0, cusum_drift: float = 0.5,
+                 quantities: Iterable[str] = DEVICE_QUANTITIES, spectrum: bool = True,
+                 wavelength_range: Tuple[int, int] = (380, 780),
+                 on_event: Optional[Callable[[DriftEvent], None]] = None,
+                 history: int = 1000):
+        """
+        Args:
+            limits: Quantity -> (low, high) threshold limits (None for no limit)
+            alpha: EWMA weight of the newest value
+            window: Number of recent values the quantiles are taken over
+            quantiles: Quantiles reported per quantity
+            warmup: Number of values the baseline is taken from
+            cusum_threshold: Change-point decision limit in baseline standard deviations
+            cusum_drift: CUSUM allowance per sample in baseline standard deviations
+            quantities: Quantities read by observe() (see DEVICE_QUANTITIES)
+            spectrum: Also read the spectral radiance in observe() and track its deviation
+            wavelength_range: (begin, end) in nm of the spectral radiance
+            on_event: Called with each DriftEvent as it is flagged
+            history: Number of events kept in `events`
+        """
+        self.limits = dict(limits or {})
+        self.alpha = alpha
+        self.window = window
+        self.quantiles = tuple(quantiles)
+        self.warmup = warmup
+        self.cusum_threshold = cusum_threshold
+        self.cusum_drift = cusum_drift
+        self.quantities = tuple(quantities)
+        self.spectrum = spectrum
+        self.wavelength_range = tuple(wavelength_range)
+        self.on_event = on_event
+        self.samples = 0
+        self.events: deque = deque(maxlen=history)
+        self._pending: List[DriftEvent] = []
+        self._quantities: Dict[str, _Quantity] = {}
+        self.spectrum_stats: Optional[RunningStatistics] = None
+        self.spectrum_ewma: Optional[np.ndarray] = None
+        self.baseline_spectrum: Optional[np.ndarray] = None
+        self._spectrum_warmup: Optional[RunningStatistics] = None
+
+    def _quantity(self, name: str) -> _Quantity:
+        quantity = self._quantities.get(name)
+        if quantity is None:
+            quantity = _Quantity(self.alpha, self.window, self.quantiles, self.warmup,
+                                 self.cusum_threshold, self.cusum_drift, self.limits.get(name))
+            self._quantities[name] = quantity
+        return quantity
+
+    def _update_spectrum(self, spectrum: np.ndarray, values: Dict[str, float]):
+        spectrum = np.asarray(spectrum, dtype=np.float64)
+        if self.spectrum_stats is None:
+            self.spectrum_stats = RunningStatistics(spectrum.shape)
+            self.spectrum_ewma = spectrum.copy()
+        self.spectrum_stats.update(spectrum)
+        self.spectrum_ewma += self.alpha * (spectrum - self.spectrum_ewma)
+        if self.baseline_spectrum is None:
+            if self._spectrum_warmup is None:
+                self._spectrum_warmup = RunningStatistics(spectrum.shape)
+            self._spectrum_warmup.update(spectrum)
+            if self._spectrum_warmup.count >= self.warmup:
+                self.baseline_spectrum = self._spectrum_warmup.mean.copy()
+                self._spectrum_warmup = None
+        else:
+            scale = abs(self.baseline_spectrum.mean()) or 1.0
+            deviation = np.sqrt(np.mean((spectrum - self.baseline_spectrum) ** 2)) / scale
+            values[SPECTRAL_DEVIATION] = float(deviation)
+
+    def update(self, values: Dict[str, float], spectrum: Optional[np.ndarray] = None,
+               timestamp: Optional[float] = None) -> List[DriftEvent]:
+        """
+        Add one measurement
+
+        Args:
+            values: Quantity name -> value (any names; limits match by name)
+            spectrum: Spectral radiance of the measurement
+            timestamp: Time of the measurement (default: time.time())
+
+        Returns:
+            Events flagged by this measurement
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        values = dict(values)
+        if spectrum is not None:
+            self._update_spectrum(spectrum, values)
+        flagged = []
+        for name, value in values.items():
+            value = float(value)
+            for kind, reference in self._quantity(name).update(value):
+                flagged.append(DriftEvent(timestamp, self.samples, name, kind, value, reference))
+        self.samples += 1
+        for event in flagged:
+            self.events.append(event)
+            self._pending.append(event)
+            if self.on_event is not None:
+                self.on_event(event)
+        return flagged
+
+    def observe(self, device) -> List[DriftEvent]:
+        """
+        Read the results of the last measurement of a JetiRadioEx and add them
+
+        Args:
+            device: JetiRadioEx whose measurement has completed
+
+        Returns:
+            Events flagged by this measurement
+        """
+        readers = {
+            'radio': lambda: device.get_radiometric_value(*self.wavelength_range),
+            'photo': device.get_photometric_value,
+            'cct': device.get_cct,
+        }
+        values = {}
+        if 'x' in self.quantities or 'y' in self.quantities:
+            x, y = device.get_chromaticity_xy()
+            values.update((name, value) for name, value in (('x', x), ('y', y))
+                          if name in self.quantities)
+        for name in self.quantities:
+            if name in readers:
+                values[name] = readers[name]()
+        spectrum = device.get_spectral_radiance(*self.wavelength_range) if self.spectrum else None
+        return self.update(values, spectrum)
+
+    def __call__(self, device) -> List[DriftEvent]:
+        """Measurement hook: same as observe()"""
+        return self.observe(device)
+
+    def pending_events(self) -> List[DriftEvent]:
+        """Events flagged since the last call"""
+        events, self._pending = self._pending, []
+        return events
+
+    def state(self) -> Dict[str, QuantityState]:
+        """Current statistics of every quantity, without touching the history"""
+        return {name: quantity.state() for name, quantity in self._quantities.items()}
+
+    def reset_baseline(self, names: Optional[Iterable[str]] = None):
+        """
+        Take a new baseline from the next `warmup` values (e.g. after maintenance)
+
+        Args:
+            names: Quantities to reset (None = all, including the spectrum)
+        """
+        for name in (self._quantities if names is None else names):
+            quantity = self._quantities.get(name)
+            if quantity is not None:
+                quantity.baseline = None
+                quantity.warmup_stats = RunningStatistics(())
+                quantity.cusum = CUSUM(self.cusum_threshold, self.cusum_drift)
+        if names is None or SPECTRAL_DEVIATION in names:
+            self.baseline_spectrum = None
+            self._spectrum_warmup = None
@@ -0,0 +1,173 @@
+"""
+Table-driven ctypes signatures for the JETI SDK
+
+The signature tables in _signatures.py are generated from the shipped C
+headers (include/*.h). BoundLibrary uses them to bind DLL functions lazily,
+on first use, so every prototype is available without paying for the
+argtypes/restype setup of hundreds of functions at startup.
+
+Regenerate the tables after updating the headers:
+    python -m jeti.registry [include_dir] [output_file]
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import _signatures
+
+
+# C type (as written in the headers) -> ctypes expression
+C_TYPES = {
+    'DWORD': 'c_uint32',
+    'DWORD_PTR': 'c_void_p',
+    'WORD': 'c_uint16',
+    'BYTE': 'c_uint8',
+    'BOOL': 'c_int32',
+    'INT32': 'c_int32',
+    'int': 'c_int',
+    'FLOAT': 'c_float',
+    'float': 'c_float',
+    'DOUBLE': 'c_double',
+    'double': 'c_double',
+    'unsigned long long': 'c_ulonglong',
+    'HANDLE': 'c_void_p',
+    'HWND': 'c_void_p',
+    'char*': 'c_char_p',
+    'WCHAR*': 'c_wchar_p',
+}
+
+# Header file stem -> signature table name in _signatures.py
+HEADERS = {
+    'jeti_core': 'CORE',
+    'jeti_radio': 'RADIO',
+    'jeti_radio_ex': 'RADIO_EX',
+    'jeti_spectro': 'SPECTRO',
+    'jeti_spectro_ex': 'SPECTRO_EX',
+}
+
+_PROTOTYPE = re.compile(r'(\w+)\s+__stdcall\s+(JETI_\w+)\s*\(([^)]*)\)\s*;')
+_PARAMETER = re.compile(r'^(.*?)\s*(\w+)$')
+
+
+def _ctype(c_type: str) -> str:
+    """Map a C parameter type to its ctypes expression"""
+    c_type = re.sub(r'\s*\*', '*', c_type.strip())
+    if c_type in C_TYPES:
+        return C_TYPES[c_type]
+    if c_type.endswith('*') and c_type[:-1] in C_TYPES:
+        return f"POINTER({C_TYPES[c_type[:-1]]})"
+    raise ValueError(f"Unsupported C type in JETI header: {c_type!r}")
+
+
+def parse_prototypes(header_text: str) -> Dict[str, Tuple[str, List[str]]]:
+    """
+    Parse the DLL prototypes of a JETI header
+
+    Args:
+        header_text: Content of a jeti_*.h file
+
+    Returns:
+        Dictionary mapping function name to (restype, [argtypes]) as ctypes expressions
+    """
+    prototypes = {}
+    for restype, name, parameters in _PROTOTYPE.findall(header_text):
+        argtypes = []
+        for parameter in parameters.split(','):
+            parameter = parameter.strip()
+            if not parameter or parameter == 'void':
+                continue
+            c_type, _ = _PARAMETER.match(parameter).groups()
+            argtypes.append(_ctype(c_type))
+        prototypes[name] = (_ctype(restype), argtypes)
+    return prototypes
+
+
+def render_signature_module(include_dir: Path) -> str:
+    """
+    Render the source of _signatures.py from the headers in include_dir
+
+    Args:
+        include_dir: Directory containing the jeti_*.h headers
+
+    Returns:
+        Python source code
+    """
+    lines = [
+        '"""',
+        'ctypes signatures of the JETI SDK DLL functions',
+        '',
+        'Generated from include/*.h by jeti.registry - do not edit.',
+        '"""',
+        '',
+        'from ctypes import (',
+        '    c_uint32, c_int32, c_int, c_float, c_double, c_char_p, c_void_p,',
+        '    c_uint16, c_uint8, POINTER, c_ulonglong, c_wchar_p',
+        ')',
+        '',
+    ]
+    for stem, table in HEADERS.items():
+        header_text = (include_dir / f"{stem}.h").read_text(encoding='latin-1')
+        lines.append('')
+        lines.append(f"# {stem}.h")
+        lines.append(f"{table} = {{")
+        for name, (restype, argtypes) in parse_prototypes(header_text).items():
+            lines.append(f"    '{name}': ({restype}, [{', '.join(argtypes)}]),")
+        lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+class BoundLibrary:
+    """
+    Lazily bound view of a JETI DLL
+
+    A function is looked up in the signature table on first access, gets its
+    argtypes/restype set and is then cached as a plain attribute, so later
+    calls cost the same as a hand-bound ctypes function.
+    """
+
+    def __init__(self, dll, signatures: Dict[str, tuple]):
+        """
+        Args:
+            dll: Loaded library (e.g. ctypes.WinDLL)
+            signatures: Signature table from _signatures.py
+        """
+        self._dll = dll
+        self._signatures = signatures
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            restype, argtypes = self._signatures[name]
+        except KeyError:
+            raise AttributeError(f"{name} is not declared in the JETI SDK headers") from None
+        function = getattr(self._dll, name)
+        function.argtypes = argtypes
+        function.restype = restype
+        setattr(self, name, function)
+        return function
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._signatures))
+
+    @property
+    def bound_functions(self) -> List[str]:
+        """Names of the functions bound so far"""
+        return sorted(name for name in vars(self) if name.startswith('JETI_'))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Regenerate _signatures.py from the headers"""
+    argv = sys.argv[1:] if argv is None else argv
+    project_root = Path(__file__).resolve().parent.parent.parent
+    include_dir = Path(argv[0]) if argv else project_root / "include"
+    output = Path(argv[1]) if len(argv) > 1 else Path(_signatures.__file__)
+    output.write_text(render_signature_module(include_dir), encoding='utf-8')
+    print(f"Wrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
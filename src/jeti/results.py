@@ -0,0 +1,228 @@
+"""
+Compact measurement records and columnar result batches
+
+get_all_values() builds a dictionary, a tuple and a 15-element float64
+array per scan: about 600 bytes of Python objects. Long runs that keep
+every scan use these instead:
+
+    RadiometricResult: one scan in a __slots__ record, CRI as array('f')
+        (about 360 bytes per record)
+    ResultBatch: many scans in preallocated NumPy columns (80 bytes per
+        scan, plus unused capacity of at most the same size)
+
+The DLLs return single-precision floats, so the float32 columns hold every
+value exactly.
+
+Example:
+    from jeti.results import ResultBatch
+
+    batch = ResultBatch()
+    for _ in range(100000):
+        device.measure(50.0, 1)
+        device.wait_for_measurement(0.01)
+        batch.append(device.get_result())
+    print(batch.column('cct').mean(), batch.nbytes)
+    frame = batch.to_pandas()                  # requires pandas
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+# Scalar columns of a ResultBatch, in RadiometricResult field order
+SCALAR_FIELDS = ('radiometric', 'photometric', 'x', 'y', 'cct')
+
+# Names of the 15 CRI values (general index Ra, special indices R1-R14)
+CRI_NAMES = ('Ra',) + tuple(f'R{i}' for i in range(1, 15))
+
+DTYPE = np.dtype(np.float32)
+
+# Bytes per scan stored in a ResultBatch
+BYTES_PER_SCAN = (len(SCALAR_FIELDS) + len(CRI_NAMES)) * DTYPE.itemsize
+
+
+class RadiometricResult:
+    """
+    Results of one radiometric scan
+
+    Attributes:
+        radiometric: Radiometric value in W/m² (or W/sr/m²)
+        photometric: Photometric value in lx (or cd/m²)
+        x, y: CIE 1931 chromaticity coordinates
+        cct: Correlated color temperature in K
+        cri: CRI values Ra, R1-R14 as array('f')
+    """
+
+    __slots__ = SCALAR_FIELDS + ('cri',)
+
+    def __init__(self, radiometric: float, photometric: float, x: float, y: float,
+                 cct: float, cri: Iterable[float]):
+        self.radiometric = radiometric
+        self.photometric = photometric
+        self.x = x
+        self.y = y
+        self.cct = cct
+        self.cri = cri if isinstance(cri, array) else array('f', cri)
+
+    def __repr__(self):
+        return (f"RadiometricResult(radiometric={self.radiometric!r}, photometric={self.photometric!r}, "
+                f"x={self.x!r}, y={self.y!r}, cct={self.cct!r}, ra={self.cri[0]!r})")
+
+    def __eq__(self, other):
+        if not isinstance(other, RadiometricResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @property
+    def chromaticity_xy(self):
+        return (self.x, self.y)
+
+    def as_dict(self) -> Dict[str, object]:
+        """The result in the get_all_values() layout"""
+        return {
+            'radiometric': self.radiometric,
+            'photometric': self.photometric,
+            'chromaticity_xy': (self.x, self.y),
+            'cct': self.cct,
+            'cri': np.array(self.cri, dtype=np.float64),
+        }
+
+
+class ResultBatch:
+    """
+    Growable columnar storage of radiometric scans
+
+    Columns are float32 NumPy arrays preallocated to `capacity` scans and
+    doubled when full. column() and columns() return views of the filled
+    part; they stay valid until the next append that grows the batch.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: Number of scans allocated up front
+        """
+        capacity = max(int(capacity), 1)
+        self._scalars = np.empty((len(SCALAR_FIELDS), capacity), dtype=DTYPE)
+        self._cri = np.empty((capacity, len(CRI_NAMES)), dtype=DTYPE)
+        self._size = 0
+
+    @classmethod
+    def from_results(cls, results: Sequence[RadiometricResult]) -> 'ResultBatch':
+        batch = cls(len(results))
+        batch.extend(results)
+        return batch
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._scalars.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for the columns (capacity x BYTES_PER_SCAN)"""
+        return self._scalars.nbytes + self._cri.nbytes
+
+    def reserve(self, capacity: int):
+        """Grow the columns to hold at least `capacity` scans"""
+        if capacity <= self.capacity:
+            return
+        scalars = np.empty((len(SCALAR_FIELDS), capacity), dtype=DTYPE)
+        cri = np.empty((capacity, len(CRI_NAMES)), dtype=DTYPE)
+        scalars[:, :self._size] = self._scalars[:, :self._size]
+        cri[:self._size] = self._cri[:self._size]
+        self._scalars, self._cri = scalars, cri
+
+    def shrink_to_fit(self):
+        """Release the unused capacity"""
+        self._scalars = self._scalars[:, :max(self._size, 1)].copy()
+        self._cri = self._cri[:max(self._size, 1)].copy()
+
+    def clear(self):
+        """Remove all scans, keeping the capacity"""
+        self._size = 0
+
+    def append_values(self, radiometric: float, photometric: float, x: float, y: float,
+                      cct: float, cri):
+        """Add one scan from its values (cri: 15 values or a buffer of 15 floats)"""
+        index = self._size
+        if index == self.capacity:
+            self.reserve(2 * index)
+        self._scalars[:, index] = (radiometric, photometric, x, y, cct)
+        self._cri[index] = cri
+        self._size = index + 1
+
+    def append(self, result: RadiometricResult):
+        """Add one scan"""
+        self.append_values(result.radiometric, result.photometric, result.x, result.y,
+                           result.cct, result.cri)
+
+    def extend(self, results: Iterable[RadiometricResult]):
+        """Add several scans"""
+        for result in results:
+            self.append(result)
+
+    def __getitem__(self, index: int) -> RadiometricResult:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("scan index out of range")
+        scalars = self._scalars[:, index].tolist()
+        return RadiometricResult(*scalars, array('f', self._cri[index].tobytes()))
+
+    def __iter__(self) -> Iterator[RadiometricResult]:
+        for index in range(self._size):
+            yield self[index]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        View of one column
+
+        Args:
+            name: One of SCALAR_FIELDS or 'cri' (shape (n, 15))
+        """
+        if name == 'cri':
+            return self._cri[:self._size]
+        return self._scalars[SCALAR_FIELDS.index(name), :self._size]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Views of all columns by name"""
+        return {name: self.column(name) for name in SCALAR_FIELDS + ('cri',)}
+
+    def to_pandas(self, cri_columns: bool = True):
+        """
+        The scans as a pandas DataFrame (requires pandas)
+
+        Args:
+            cri_columns: One column per CRI value (Ra, R1, ...); False gives
+                one object column 'cri' of 15-value arrays
+        """
+        try:
+            import pandas as pd
+        except ImportError as exc:
+            raise ImportError("ResultBatch.to_pandas() requires pandas") from exc
+        data = {name: self.column(name) for name in SCALAR_FIELDS}
+        cri = self.column('cri')
+        if cri_columns:
+            data.update(zip(CRI_NAMES, cri.T))
+        else:
+            data['cri'] = list(cri)
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        The scans as a pyarrow Table, without copying the columns (requires
+        pyarrow); CRI is a fixed-size list column of 15 float32 values
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("ResultBatch.to_arrow() requires pyarrow") from exc
+        arrays = [pa.array(self.column(name)) for name in SCALAR_FIELDS]
+        cri = np.ascontiguousarray(self.column('cri')).reshape(-1)
+        arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(cri), len(CRI_NAMES)))
+        return pa.Table.from_arrays(arrays, names=list(SCALAR_FIELDS) + ['cri'])
@@ -0,0 +1,208 @@
+"""
+Retry policy for transient JETI SDK errors
+
+On long USB runs the DLLs occasionally return BUSY, TIMEOUT, ERROR_RECEIVE
+or CHECKSUM_ERROR for a call that succeeds when repeated. RetryPolicy
+repeats such calls at the DLL-call layer, before _check_error turns the code
+into a JetiException. Only functions flagged idempotent are repeated, so a
+measurement start (JETI_MeasureEx, JETI_InitMeasure, ...) is never replayed.
+
+Example:
+    from jeti.retry import RetryPolicy
+
+    policy = RetryPolicy(max_attempts=4, base_delay=0.02)
+    device.set_retry_policy(policy)
+    ...
+    print(policy.stats())
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from .wrapper import JetiError
+
+
+# Errors that are worth repeating the call for
+TRANSIENT_ERRORS = frozenset({
+    JetiError.BUSY,
+    JetiError.TIMEOUT,
+    JetiError.ERROR_RECEIVE,
+    JetiError.CHECKSUM_ERROR,
+})
+
+# Functions that only read state or results, or write a configuration value:
+# repeating them has the same effect as calling them once
+_IDEMPOTENT = re.compile(
+    r'^JETI_(Get|Fetch|Calc|Set|Read(?!User)|Channel(Light|Dark)Ex)'
+    r'|Status'
+    r'|^JETI_(Dark|Light|Refer|TransRefl)(Pix|Wave|Image)Ex$'
+    r'|^JETI_(SpecRad|SpecRadHiRes|Radio|Photo|Chromxy|Chromxy10|Chromuv|ChromXYZ|DWLPE|CCT|Duv|CRI'
+    r'|TM30|PeakFWHM|BlueMeasurement|RadioTint|SpectroTint|PixelCount)(Ex)?$'
+)
+
+
+def is_idempotent(function_name: str) -> bool:
+    """Default idempotency flag of a JETI DLL function"""
+    return bool(_IDEMPOTENT.search(function_name))
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter and a shared retry budget
+
+    Each retry waits a random time in [0, min(max_delay, base_delay * 2**n)]
+    and takes one token from the budget. The budget holds up to
+    `budget` tokens and refills at `budget_refill` tokens per second, so a
+    failing device cannot stall a sequence with endless retries.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.01,
+                 max_delay: float = 1.0, budget: float = 20.0,
+                 budget_refill: float = 1.0,
+                 retry_on: Iterable[int] = TRANSIENT_ERRORS,
+                 idempotent: Optional[Dict[str, bool]] = None,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            max_attempts: Maximum calls per DLL function call (including the first)
+            base_delay: Delay before the first retry in seconds (before jitter)
+            max_delay: Upper bound of the backoff delay in seconds
+            budget: Maximum retry tokens available at once
+            budget_refill: Tokens added per second
+            retry_on: Error codes that are retried
+            idempotent: Per-function overrides of is_idempotent(),
+                e.g. {'JETI_MeasureStatusEx': False}
+            seed: Seed of the jitter random generator
+        """
+        self.max_attempts = max(int(max_attempts), 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = float(budget)
+        self.budget_refill = budget_refill
+        self.retry_on = frozenset(int(code) for code in retry_on)
+        self.idempotent = dict(idempotent or {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = self.budget
+        self._refilled = time.monotonic()
+
+        self.calls_retried = 0
+        self.retries = 0
+        self.recovered = 0
+        self.give_ups = 0
+        self.budget_exhausted = 0
+        self.retries_by_function: Counter = Counter()
+        self.give_ups_by_error: Counter = Counter()
+
+    def is_idempotent(self, function_name: str) -> bool:
+        """Whether calls of a function may be repeated"""
+        flag = self.idempotent.get(function_name)
+        return is_idempotent(function_name) if flag is None else flag
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number `retry` (0-based) in seconds"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry))
+        return self._random.uniform(0.0, ceiling)
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.budget, self._tokens + (now - self._refilled) * self.budget_refill)
+            self._refilled = now
+            if self._tokens < 1.0:
+                self.budget_exhausted += 1
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def call(self, function_name: str, function, args: tuple, error: int) -> int:
+        """
+        Repeat a call that returned a retryable error
+
+        Args:
+            function_name: DLL function name
+            function: The DLL function
+            args: Arguments of the failed call
+            error: Error code of the failed call
+
+        Returns:
+            Error code of the last attempt
+        """
+        with self._lock:
+            self.calls_retried += 1
+        for retry in range(self.max_attempts - 1):
+            if not self._take_token():
+                break
+            time.sleep(self.backoff(retry))
+            with self._lock:
+                self.retries += 1
+                self.retries_by_function[function_name] += 1
+            error = function(*args)
+            if error not in self.retry_on:
+                if error == JetiError.SUCCESS:
+                    with self._lock:
+                        self.recovered += 1
+                return error
+        with self._lock:
+            self.give_ups += 1
+            self.give_ups_by_error[error] += 1
+        return error
+
+    def stats(self) -> Dict[str, object]:
+        """Retry counters"""
+        with self._lock:
+            return {
+                'calls_retried': self.calls_retried,
+                'retries': self.retries,
+                'recovered': self.recovered,
+                'give_ups': self.give_ups,
+                'budget_exhausted': self.budget_exhausted,
+                'budget_tokens': self._tokens,
+                'retries_by_function': dict(self.retries_by_function),
+                'give_ups_by_error': {JetiError(code).name if code in JetiError._value2member_map_
+                                      else hex(code): count
+                                      for code, count in self.give_ups_by_error.items()},
+            }
+
+
+class RetryingLibrary:
+    """
+    Library proxy applying a RetryPolicy to idempotent functions
+
+    Non-idempotent functions are returned unwrapped, so they cost nothing
+    extra and are never repeated.
+    """
+
+    def __init__(self, library, policy: RetryPolicy):
+        """
+        Args:
+            library: Loaded DLL or BoundLibrary
+            policy: Retry policy shared by all wrapped functions
+        """
+        self.library = library
+        self.policy = policy
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        function = getattr(self.library, name)
+        if not self.policy.is_idempotent(name):
+            setattr(self, name, function)
+            return function
+        policy = self.policy
+        retry_on = policy.retry_on
+
+        def call(*args):
+            error = function(*args)
+            if error in retry_on:
+                return policy.call(name, function, args, error)
+            return error
+
+        call.__name__ = name
+        call.__wrapped__ = function
+        setattr(self, name, call)
+        return call
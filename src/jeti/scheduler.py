@@ -0,0 +1,516 @@
+"""
+Deadline-aware measurement scheduling across shared instruments
+
+Several applications (QA spot checks, burn-in series, calibration checks)
+submit measurement jobs against the same devices. MeasurementScheduler
+queues them per device and runs them in one worker thread per device.
+
+Ordering: each device's queue is planned earliest-deadline-first. When a
+job would miss its deadline, the lowest-priority job planned so far is moved
+to the tail instead (Moore-Hodgson), which keeps as many jobs on time as
+possible. Jobs without a deadline, and jobs that cannot make theirs, run
+after the others, highest priority first.
+
+Estimates: a job is expected to take integration time x averages plus a
+per-device overhead. DurationEstimator fits the overhead and the scale of
+the exposure time to the observed runtimes of each device.
+
+Preemption: while a job is running, the worker checks whether a queued job
+of higher priority will miss its deadline if it waits, but not if the
+running job is given up. If so the running measurement is cancelled
+(JETI_MeasureBreakEx) and requeued from the start.
+
+Example:
+    from jeti.scheduler import MeasurementScheduler
+
+    with MeasurementScheduler({'bench1': radio1, 'bench2': radio2}) as scheduler:
+        spot = scheduler.submit(integration_time=20.0, priority=5, deadline=2.0)
+        burn_in = [scheduler.submit('bench1', 500.0, 10) for _ in range(100)]
+        print(spot.result(timeout=10.0))
+        print(scheduler.stats())
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .monitor import WindowedQuantiles
+from .wrapper import JetiError, JetiException
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+def _spectral_radiance(device):
+    return device.get_spectral_radiance()
+
+
+class Job:
+    """
+    One measurement submitted to a MeasurementScheduler
+
+    Attributes:
+        name: Label for logs and statistics
+        device: Key of the device the job is queued on
+        integration_time: Integration time in ms (0: automatic)
+        average: Number of averages
+        priority: Larger runs first and may preempt smaller
+        deadline: time.monotonic() the job should be done by (None: none)
+        estimate: Expected runtime in seconds
+        status: QUEUED, RUNNING, DONE, FAILED or CANCELLED
+        submitted, started, finished: time.monotonic() timestamps
+        preemptions: Number of times the job was cancelled and requeued
+    """
+
+    def __init__(self, name: str, device: str, integration_time: float, average: int,
+                 priority: int, deadline: Optional[float], estimate: float,
+                 fetch: Callable[[Any], Any], preemptible: bool, sequence: int):
+        self.name = name
+        self.device = device
+        self.integration_time = integration_time
+        self.average = average
+        self.priority = priority
+        self.deadline = deadline
+        self.estimate = estimate
+        self.fetch = fetch
+        self.preemptible = preemptible
+        self.sequence = sequence
+        self.status = QUEUED
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.preemptions = 0
+        self._result = None
+        self._error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self._scheduler: Optional['MeasurementScheduler'] = None
+
+    def __repr__(self):
+        return f"Job({self.name!r}, device={self.device!r}, priority={self.priority}, status={self.status})"
+
+    @property
+    def on_time(self) -> Optional[bool]:
+        """Whether the job finished by its deadline (None before it finished)"""
+        if self.finished is None:
+            return None
+        return self.deadline is None or self.finished <= self.deadline
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = None):
+        """
+        Wait for the job and return what its fetch returned
+
+        Raises:
+            TimeoutError: The job did not finish within timeout
+            JetiException: The measurement failed or the job was cancelled
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"job {self.name!r} not finished")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def cancel(self) -> bool:
+        """
+        Remove the job from its queue
+
+        Returns:
+            True if the job was still queued
+        """
+        scheduler = self._scheduler
+        return scheduler is not None and scheduler._cancel(self)
+
+    def _finish(self, status: str, result=None, error: Optional[BaseException] = None,
+                finished: Optional[float] = None):
+        self.status = status
+        self.finished = time.monotonic() if finished is None else finished
+        self._result = result
+        self._error = error
+        self._done.set()
+
+
+def plan(jobs: List[Job], start: float) -> List[Job]:
+    """
+    Order the jobs of one device to maximise the number finished on time
+
+    Args:
+        jobs: Queued jobs
+        start: time.monotonic() the first job can start
+
+    Returns:
+        Jobs in execution order: those planned on time by deadline, then
+        the rest by descending priority
+    """
+    by_deadline = sorted((job for job in jobs if job.deadline is not None),
+                         key=lambda job: (job.deadline, -job.priority, job.sequence))
+    on_time: List[Job] = []
+    rest = [job for job in jobs if job.deadline is None]
+    finish = start
+    for job in by_deadline:
+        if start + job.estimate > job.deadline:
+            # Late even if run first: it would only push the others past theirs
+            rest.append(job)
+            continue
+        on_time.append(job)
+        finish += job.estimate
+        while finish > job.deadline:
+            dropped = min(on_time, key=lambda late: (late.priority, -late.estimate, -late.sequence))
+            on_time.remove(dropped)
+            finish -= dropped.estimate
+            rest.append(dropped)
+    rest.sort(key=lambda job: (-job.priority, job.deadline if job.deadline is not None else np.inf,
+                               job.sequence))
+    return on_time + rest
+
+
+class DurationEstimator:
+    """
+    Runtime model of one device: overhead + scale * exposure
+
+    The exposure is integration time x averages. The model is an
+    exponentially weighted least-squares fit of the observed runtimes, so
+    it follows slow changes (other load on the link, firmware settings).
+    Until two distinct exposures were seen, only the overhead is fitted.
+    """
+
+    def __init__(self, overhead: float = 0.05, forgetting: float = 0.95,
+                 auto_exposure: float = 1.0):
+        """
+        Args:
+            overhead: Initial per-measurement overhead in seconds
+            forgetting: Weight kept by earlier observations per new one (0 < f <= 1)
+            auto_exposure: Exposure in seconds assumed for automatic integration
+                time until one was observed
+        """
+        if not 0.0 < forgetting <= 1.0:
+            raise ValueError("forgetting must be in (0, 1]")
+        self.overhead = overhead
+        self.scale = 1.0
+        self.forgetting = forgetting
+        self.auto_exposure = auto_exposure
+        self.observations = 0
+        self._sums = np.zeros(5)         # weight, x, y, xx, xy
+
+    @staticmethod
+    def exposure(integration_time: float, average: int) -> float:
+        """Integration time x averages in seconds"""
+        return integration_time * max(int(average), 1) / 1000.0
+
+    def estimate(self, integration_time: float, average: int) -> float:
+        """Expected runtime in seconds"""
+        if integration_time <= 0.0:
+            return self.overhead + self.auto_exposure * max(int(average), 1)
+        return self.overhead + self.scale * self.exposure(integration_time, average)
+
+    def observe(self, integration_time: float, average: int, runtime: float):
+        """Update the model with a completed measurement"""
+        self.observations += 1
+        if integration_time <= 0.0:
+            auto = (runtime - self.overhead) / max(int(average), 1)
+            self.auto_exposure += (1.0 - self.forgetting) * (max(auto, 0.0) - self.auto_exposure)
+            return
+        x = self.exposure(integration_time, average)
+        self._sums *= self.forgetting
+        self._sums += (1.0, x, runtime, x * x, x * runtime)
+        weight, sx, sy, sxx, sxy = self._sums
+        spread = weight * sxx - sx * sx
+        if spread > 1e-12 * max(weight * sxx, 1e-12):
+            self.scale = max((weight * sxy - sx * sy) / spread, 0.0)
+        self.overhead = max((sy - self.scale * sx) / weight, 0.0)
+
+
+class QueueStats(NamedTuple):
+    """Queue-wait and completion counters of one device (times in seconds)"""
+    queued: int
+    completed: int
+    on_time: int
+    late: int
+    failed: int
+    cancelled: int
+    preemptions: int
+    mean_wait: float
+    max_wait: float
+    wait_quantiles: Dict[float, float]
+
+
+class _DeviceQueue:
+    def __init__(self, device, estimator: DurationEstimator, window: int):
+        self.device = device
+        self.estimator = estimator
+        self.jobs: List[Job] = []
+        self.running: Optional[Job] = None
+        self.preempt = False
+        self.thread: Optional[threading.Thread] = None
+        self.completed = self.on_time = self.late = self.failed = self.cancelled = 0
+        self.preemptions = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_window = WindowedQuantiles(window, (0.5, 0.95))
+
+    def remaining(self, now: float) -> float:
+        """Estimated seconds until the running job is done"""
+        if self.running is None:
+            return 0.0
+        return max(self.running.started + self.running.estimate - now, 0.0)
+
+    def backlog(self, now: float) -> float:
+        """Estimated seconds until the queue is empty"""
+        return self.remaining(now) + sum(job.estimate for job in self.jobs)
+
+
+class MeasurementScheduler:
+    """
+    Per-device job queues with deadline-aware ordering and preemption
+
+    Devices are opened JetiRadioEx objects (or wrappers with the same
+    measure(integration_time, average), get_measure_status() and
+    break_measurement() methods). Each device is used by its worker thread
+    only while the scheduler runs. Jobs do not run the measurement hooks of
+    a JetiRadioEx; a job's fetch can feed a monitor instead.
+    """
+
+    def __init__(self, devices: Dict[str, Any], poll_interval: float = 0.01,
+                 max_preemptions: int = 3, overhead: float = 0.05,
+                 stats_window: int = 1000):
+        """
+        Args:
+            devices: Opened devices by name
+            poll_interval: Seconds between status polls of a running job
+            max_preemptions: Preemptions after which a job runs to completion
+            overhead: Initial per-measurement overhead of the runtime estimates
+            stats_window: Number of recent queue waits the quantiles are taken over
+        """
+        if not devices:
+            raise ValueError("no devices")
+        self.poll_interval = poll_interval
+        self.max_preemptions = max_preemptions
+        self._queues = {name: _DeviceQueue(device, DurationEstimator(overhead), stats_window)
+                        for name, device in devices.items()}
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+
+    def start(self) -> 'MeasurementScheduler':
+        """Start one worker thread per device"""
+        with self._condition:
+            if self._running:
+                return self
+            self._running = True
+        for name, queue in self._queues.items():
+            queue.thread = threading.Thread(target=self._work, args=(name,),
+                                            name=f"jeti-scheduler-{name}", daemon=True)
+            queue.thread.start()
+        return self
+
+    def stop(self, cancel: bool = True):
+        """
+        Stop the workers after their running jobs
+
+        Args:
+            cancel: Cancel the queued jobs (False: run them first)
+        """
+        with self._condition:
+            if cancel:
+                for queue in self._queues.values():
+                    for job in queue.jobs:
+                        self._cancelled(queue, job)
+                    queue.jobs.clear()
+            self._running = False
+            self._condition.notify_all()
+        for queue in self._queues.values():
+            if queue.thread is not None:
+                queue.thread.join()
+                queue.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop(cancel=exc_type is not None)
+        return False
+
+    # ------------------------------------------------------------------
+    # Submission
+
+    def estimator(self, device: str) -> DurationEstimator:
+        """Runtime model of a device"""
+        return self._queues[device].estimator
+
+    def submit(self, device: Optional[str] = None, integration_time: float = 0.0,
+               average: int = 1, priority: int = 0, deadline: Optional[float] = None,
+               fetch: Callable[[Any], Any] = _spectral_radiance, name: str = '',
+               preemptible: bool = True) -> Job:
+        """
+        Queue a measurement
+
+        Args:
+            device: Device name (None: the device expected to finish it first)
+            integration_time: Integration time in ms (0: automatic)
+            average: Number of averages
+            priority: Larger runs first and may preempt smaller
+            deadline: Seconds from now the result is needed by (None: no deadline)
+            fetch: Called with the device after the measurement; its return
+                value is the job result (default: get_spectral_radiance())
+            name: Label for logs
+            preemptible: Whether higher-priority jobs may cancel this one
+
+        Returns:
+            The queued Job
+        """
+        now = time.monotonic()
+        with self._condition:
+            if device is None:
+                device = min(self._queues, key=lambda key: self._queues[key].backlog(now)
+                             + self._queues[key].estimator.estimate(integration_time, average))
+            queue = self._queues[device]
+            sequence = next(self._sequence)
+            job = Job(name or f"job-{sequence}", device, integration_time, average, priority,
+                      None if deadline is None else now + deadline,
+                      queue.estimator.estimate(integration_time, average),
+                      fetch, preemptible, sequence)
+            job._scheduler = self
+            queue.jobs.append(job)
+            self._condition.notify_all()
+        return job
+
+    def _cancel(self, job: Job) -> bool:
+        with self._condition:
+            queue = self._queues[job.device]
+            if job not in queue.jobs:
+                return False
+            queue.jobs.remove(job)
+            self._cancelled(queue, job)
+            return True
+
+    @staticmethod
+    def _cancelled(queue: _DeviceQueue, job: Job):
+        queue.cancelled += 1
+        job._finish(CANCELLED, error=JetiException(JetiError.BREAK, f"job {job.name!r} cancelled"))
+
+    def queued(self, device: str) -> List[Job]:
+        """Queued jobs of a device in planned execution order"""
+        with self._condition:
+            queue = self._queues[device]
+            now = time.monotonic()
+            return plan(queue.jobs, now + queue.remaining(now))
+
+    # ------------------------------------------------------------------
+    # Workers
+
+    def _next(self, name: str) -> Optional[Job]:
+        queue = self._queues[name]
+        with self._condition:
+            while not queue.jobs:
+                if not self._running:
+                    return None
+                self._condition.wait()
+            job = plan(queue.jobs, time.monotonic())[0]
+            queue.jobs.remove(job)
+            queue.running = job
+            queue.preempt = False
+            job.status = RUNNING
+            job.started = time.monotonic()
+            if job.preemptions == 0:
+                wait = job.started - job.submitted
+                queue.waits += 1
+                queue.total_wait += wait
+                queue.max_wait = max(queue.max_wait, wait)
+                queue.wait_window.update(wait)
+            return job
+
+    def _at_risk(self, queue: _DeviceQueue, now: float) -> bool:
+        """Whether the running job should be preempted"""
+        running = queue.running
+        if not running.preemptible or running.preemptions >= self.max_preemptions:
+            return False
+        remaining = queue.remaining(now)
+        ahead = 0.0
+        for job in plan(queue.jobs, now):
+            ahead += job.estimate
+            if job.priority > running.priority and job.deadline is not None:
+                if now + remaining + ahead > job.deadline and now + ahead <= job.deadline:
+                    return True
+        return False
+
+    def _run(self, queue: _DeviceQueue, job: Job) -> bool:
+        """Run one job; False if it was preempted"""
+        device = queue.device
+        device.measure(job.integration_time, job.average)
+        while device.get_measure_status():
+            with self._condition:
+                if self._at_risk(queue, time.monotonic()):
+                    queue.preempt = True
+            if queue.preempt:
+                device.break_measurement()
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def _work(self, name: str):
+        queue = self._queues[name]
+        while True:
+            job = self._next(name)
+            if job is None:
+                return
+            try:
+                completed = self._run(queue, job)
+                result = job.fetch(queue.device) if completed else None
+            except Exception as exc:
+                with self._condition:
+                    queue.running = None
+                    queue.failed += 1
+                job._finish(FAILED, error=exc)
+                continue
+            with self._condition:
+                queue.running = None
+                if not completed:
+                    job.status = QUEUED
+                    job.preemptions += 1
+                    queue.preemptions += 1
+                    queue.jobs.append(job)
+                    continue
+                finished = time.monotonic()
+                queue.estimator.observe(job.integration_time, job.average, finished - job.started)
+                for queued in queue.jobs:
+                    queued.estimate = queue.estimator.estimate(queued.integration_time, queued.average)
+                queue.completed += 1
+                if job.deadline is None or finished <= job.deadline:
+                    queue.on_time += 1
+                else:
+                    queue.late += 1
+            job._finish(DONE, result, finished=finished)
+
+    # ------------------------------------------------------------------
+    # Statistics
+
+    def stats(self) -> Dict[str, QueueStats]:
+        """Queue-wait and completion counters by device"""
+        with self._condition:
+            return {
+                name: QueueStats(
+                    queued=len(queue.jobs),
+                    completed=queue.completed,
+                    on_time=queue.on_time,
+                    late=queue.late,
+                    failed=queue.failed,
+                    cancelled=queue.cancelled,
+                    preemptions=queue.preemptions,
+                    mean_wait=queue.total_wait / queue.waits if queue.waits else 0.0,
+                    max_wait=queue.max_wait,
+                    wait_quantiles=queue.wait_window.values(),
+                )
+                for name, queue in self._queues.items()
+            }
@@ -0,0 +1,283 @@
+"""
+Supervised device sessions with automatic reconnection
+
+When a USB device drops, every later call on its handle fails with
+NOT_CONNECTED or INVALID_HANDLE. DeviceSession runs calls and acquisition
+steps on a wrapper object and, on such an error, reopens the device by
+serial number (its enumeration number may have changed), replays the last
+known configuration and repeats the interrupted step.
+
+The wrapper object is kept across reconnects, so everything held on it
+(measurement hooks, retry policy, cached flicker frequencies) survives. The
+objects built on it that read the handle from the device on each call
+(CoreAcquisition, DeviceConfig, HDRAcquisition, ChannelStream) keep working
+too, along with state they hold, such as dark frames. A running trigger
+capture holds the old handle and must be recreated.
+
+Example:
+    from jeti import JetiRadioEx
+    from jeti.session import DeviceSession
+
+    with DeviceSession(JetiRadioEx, serial="123456") as session:
+        session.apply({'average': 4})
+
+        def step(device):
+            device.measure(50.0, 4)
+            device.wait_for_measurement(0.01)
+            return device.get_spectral_radiance(380, 780)
+
+        for spectrum in session.iterate(step, count=1000):
+            ...
+        print(session.stats())
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, TypeVar
+
+from .config import DeviceConfig
+from .wrapper import JetiError, JetiException, JetiRadioEx
+
+
+# Errors meaning the handle is gone and the device must be reopened
+CONNECTION_LOST_ERRORS = frozenset({
+    JetiError.NOT_CONNECTED,
+    JetiError.INVALID_HANDLE,
+})
+
+T = TypeVar('T')
+
+
+class ReconnectEvent(NamedTuple):
+    """One completed reconnection"""
+    timestamp: float
+    error: int
+    attempts: int
+    downtime: float
+
+
+class DeviceSession:
+    """
+    Device wrapper supervised for handle loss
+
+    Attributes:
+        device: The wrapper object (same object across reconnects)
+        serial: Device serial number the session reopens
+        config: DeviceConfig of the device; its snapshot is the configuration
+            replayed after a reconnect
+        events: Completed reconnections (the last `history`)
+        reconnects: Number of completed reconnections
+        failures: Reconnections given up after `reconnect_timeout`
+        total_downtime: Seconds from detected loss to restored session, summed
+    """
+
+    def __init__(self, device_class=JetiRadioEx, serial: Optional[str] = None,
+                 device_num: int = 0, dll_path: Optional[str] = None, dll=None,
+                 reconnect_timeout: float = 60.0, retry_interval: float = 0.5,
+                 lost_errors=CONNECTION_LOST_ERRORS,
+                 on_reconnect: Optional[Callable[[ReconnectEvent], object]] = None,
+                 history: int = 100, max_reconnects: int = 3):
+        """
+        Args:
+            device_class: Wrapper class (JetiRadioEx, JetiSpectroEx, JetiCore, ...)
+            serial: Device serial number (None: the device at device_num when opened)
+            device_num: Device number used when serial is None
+            dll_path: DLL path passed to device_class
+            dll: Already loaded library passed to device_class (e.g. SimulatedSDK)
+            reconnect_timeout: Seconds to keep trying to reopen before giving up
+            retry_interval: Seconds between reopen attempts
+            lost_errors: Error codes treated as handle loss
+            on_reconnect: Called with each ReconnectEvent
+            history: Number of ReconnectEvents kept in `events`
+            max_reconnects: Reconnects run() makes for one step before it
+                raises the handle loss (a step that keeps failing after
+                each reconnect would otherwise never return)
+        """
+        self.device = device_class(dll_path, dll)
+        self.serial = serial
+        self.device_num = device_num
+        self.reconnect_timeout = reconnect_timeout
+        self.retry_interval = retry_interval
+        self.lost_errors = frozenset(int(code) for code in lost_errors)
+        self.on_reconnect = on_reconnect
+        self.history = history
+        self.max_reconnects = max_reconnects
+        self.config = DeviceConfig(self.device)
+        self.events: List[ReconnectEvent] = []
+        self.reconnects = 0
+        self.failures = 0
+        self.total_downtime = 0.0
+        self.max_downtime = 0.0
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._opened = False
+
+    # ------------------------------------------------------------------
+    # Opening
+
+    def _find(self) -> int:
+        """Current enumeration number of the session's device"""
+        if self.serial is None:
+            return self.device_num
+        for number in range(self.device.get_num_devices()):
+            if self.device.get_serial_device(number)[2] == self.serial:
+                return number
+        raise JetiException(JetiError.NOT_CONNECTED, f"device {self.serial} not found")
+
+    def _open(self):
+        self.device.open_device(self._find())
+        if self.serial is None:
+            self.serial = self.device.get_serial_device(self.device_num)[2]
+
+    def open(self) -> 'DeviceSession':
+        """Open the device and read its configuration"""
+        with self._lock:
+            self._open()
+            self.config.invalidate()
+            self.config.read()
+            self._opened = True
+        return self
+
+    def close(self):
+        """Close the device"""
+        with self._lock:
+            self._opened = False
+            self._drop_handle()
+
+    def _drop_handle(self):
+        try:
+            self.device.close_device()
+        except JetiException:
+            pass
+        self.device._device_handle = None
+        self.device._spectral_axis = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Configuration
+
+    def apply(self, recipe: Dict[str, object]) -> Dict[str, object]:
+        """
+        Write configuration fields (see jeti.config.FIELDS) and remember them
+        for replay after a reconnect
+
+        Returns:
+            Dictionary of the fields written
+        """
+        return self.run(lambda device: self.config.apply(recipe))
+
+    # ------------------------------------------------------------------
+    # Supervised calls
+
+    def run(self, step: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run step(device, *args, **kwargs), reconnecting on handle loss
+
+        After a reconnect the step is run again from the start, so a step
+        should be a complete unit such as measure + wait + fetch.
+
+        Raises:
+            JetiException: Errors other than handle loss, and handle loss
+                when the device could not be reopened in time or the step
+                still failed after max_reconnects reconnects
+        """
+        reconnects = 0
+        while True:
+            generation = self._generation
+            try:
+                return step(self.device, *args, **kwargs)
+            except JetiException as exc:
+                if exc.error_code not in self.lost_errors or not self._opened:
+                    raise
+                if reconnects >= self.max_reconnects:
+                    raise
+                reconnects += 1
+                self.reconnect(exc, generation)
+
+    def iterate(self, step: Callable[..., T], count: Optional[int] = None,
+                stop: Optional[threading.Event] = None) -> Iterator[T]:
+        """
+        Acquisition loop: yield run(step) results until count steps or stop is set
+
+        Args:
+            step: Called with the device, e.g. measure + wait + fetch
+            count: Number of steps (None: until stopped)
+            stop: Event ending the loop
+        """
+        done = 0
+        while (count is None or done < count) and not (stop is not None and stop.is_set()):
+            yield self.run(step)
+            done += 1
+
+    def __getattr__(self, name: str):
+        """Device methods, supervised: session.get_cct() runs device.get_cct() through run()"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        device = self.__dict__.get('device')
+        method = getattr(type(device), name, None)
+        if device is None or not callable(method):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.run(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def reconnect(self, error: Optional[JetiException] = None, generation: Optional[int] = None):
+        """
+        Reopen the device and replay its configuration
+
+        Tries every retry_interval until reconnect_timeout. When several
+        threads lose the handle at once, only one reconnects.
+
+        Args:
+            error: The error that revealed the loss
+            generation: Session generation the caller saw before the error
+        """
+        detected = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._drop_handle()
+            attempts = 0
+            while True:
+                attempts += 1
+                try:
+                    self._open()
+                    replay = dict(self.config.snapshot)
+                    self.config.invalidate()
+                    self.config.apply(replay)
+                    break
+                except JetiException as exc:
+                    self._drop_handle()
+                    if time.monotonic() - detected + self.retry_interval > self.reconnect_timeout:
+                        self.failures += 1
+                        raise (error or exc)
+                    time.sleep(self.retry_interval)
+            downtime = time.monotonic() - detected
+            event = ReconnectEvent(time.time(), error.error_code if error else 0, attempts, downtime)
+            self._generation += 1
+            self.reconnects += 1
+            self.total_downtime += downtime
+            self.max_downtime = max(self.max_downtime, downtime)
+            self.events.append(event)
+            del self.events[:-self.history]
+        if self.on_reconnect is not None:
+            self.on_reconnect(event)
+
+    def stats(self) -> Dict[str, object]:
+        """Reconnect counters and downtime in seconds"""
+        return {
+            'reconnects': self.reconnects,
+            'failures': self.failures,
+            'total_downtime': self.total_downtime,
+            'max_downtime': self.max_downtime,
+            'last_downtime': self.events[-1].downtime if self.events else 0.0,
+        }
@@ -0,0 +1,1434 @@
+"""
+In-process simulated JETI SDK
+
+SimulatedSDK stands in for the JETI DLLs so the wrapper can run without
+hardware (and on non-Windows systems). It exposes the JETI_* functions under
+their DLL names with the DLL calling convention: output parameters are
+filled through ctypes.byref() objects and arrays, and every function returns
+a JetiError code.
+
+Example:
+    from jeti import JetiCore
+    from jeti.simulator import SimulatedSDK
+
+    sdk = SimulatedSDK()
+    device = JetiCore(dll=sdk)
+    device.open_device(0)
+"""
+
+import ctypes
+import itertools
+import os
+import struct
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ._colorimetry import spectrum_to_xyz, xyz_to_xy, xyz_to_uv, xy_to_cct
+from .wrapper import ConnectionType, JetiError
+
+
+def _value(argument):
+    """Unwrap a ctypes scalar or byref() object passed by the wrapper"""
+    if isinstance(argument, ctypes._SimpleCData):
+        return argument.value
+    return argument
+
+
+def _target(argument):
+    """Object behind a byref()/pointer output argument"""
+    return getattr(argument, '_obj', argument)
+
+
+def _store(argument, value):
+    """Write a value to a byref()/pointer output argument"""
+    _target(argument).value = value
+
+
+def _fill(argument, values):
+    """Write values to a ctypes array output argument"""
+    target = _target(argument)
+    np.ctypeslib.as_array(target)[:len(values)] = values
+
+
+def _write_csv(path: str, wavelengths: np.ndarray, sprad: np.ndarray, operator: str, memo: str):
+    """Spectral radiance file in the layout of JETI_SaveSpecRadCSVEx"""
+    header = f"Operator;{operator}\nMemo;{memo}\nWavelength [nm];Spectral radiance [W/(sr*m2*nm)]"
+    np.savetxt(path, np.column_stack((wavelengths, sprad)), fmt=("%.0f", "%.6e"),
+               delimiter=";", header=header, comments="")
+
+
+def _write_spc(path: str, wavelengths: np.ndarray, sprad: np.ndarray, operator: str, memo: str):
+    """Single-spectrum Galactic SPC file (new format, evenly spaced x, float32 y)"""
+    comment = f"{operator}: {memo}".encode('latin-1')[:129]
+    header = struct.pack(
+        '<BBBbIddIBBBBI9s9sH32s130s30sIIBBHf48sfIfB187s',
+        0, 0x4B, 0, -128, wavelengths.size, wavelengths[0], wavelengths[-1], 1,
+        1, 0, 0, 0, 0, b"", b"JETI SIM", 0, b"", comment, b"", 0, 0, 0, 0, 0,
+        1.0, b"", 0.0, 0, 0.0, 0, b"",
+    )
+    subheader = struct.pack('<BbHfffIIf4s', 0, -128, 0, 0.0, 0.0, 0.0, 0, 0, 0.0, b"")
+    with open(path, 'wb') as file:
+        file.write(header + subheader + np.asarray(sprad, dtype='<f4').tobytes())
+
+
+def led_spectrum(wavelengths: np.ndarray) -> np.ndarray:
+    """
+    Spectral radiance of a phosphor-converted white LED in W/(sr·m²·nm)
+
+    Narrow blue pump at 450 nm plus a broad phosphor band around 560 nm.
+    """
+    wl = np.asarray(wavelengths, dtype=np.float64)
+    blue = np.exp(-0.5 * ((wl - 450.0) / 10.0) ** 2)
+    phosphor = 0.55 * np.exp(-0.5 * ((wl - 560.0) / 50.0) ** 2)
+    return 0.01 * (blue + phosphor)
+
+
+class SimulatedDevice:
+    """
+    State and sensor model of one simulated JETI device
+
+    The sensor maps pixels linearly onto the calibrated range. Counts are
+    radiance × gain × integration time + dark offset, with read/shot noise
+    reduced by averaging and clipped at the ADC limit.
+    """
+
+    ADC_BITS = 16
+    ADC_MAX = 2 ** ADC_BITS - 1
+
+    # Settings that return to their power-on values when the device is power cycled
+    _CONFIGURATION = (
+        'wavelength_range', 'integration_time', 'average', 'max_integration_time', 'max_average',
+        'calib', 'exposure_mode', 'adapt_mode', 'dark_mode', 'param_block', 'slm_enable',
+        'sync_mode', 'sync_frequency', 'trigger_mode', 'trigger_timeout', 'flash_mode', 'flash',
+        'pda_row', 'channel_conf',
+    )
+
+    def __init__(self, serial: str = "SIM00001", pixel_count: int = 1024,
+                 calib_range: Tuple[int, int, int] = (350, 1000, 1),
+                 wavelength_range: Tuple[int, int, int] = (380, 780, 1),
+                 source: Callable[[np.ndarray], np.ndarray] = led_spectrum,
+                 gain: float = 40000.0, dark_offset: float = 1000.0,
+                 read_noise: float = 4.0, flicker_frequency: float = 0.0,
+                 flicker_depth: float = 0.0, stray_light: Optional[np.ndarray] = None,
+                 time_scale: float = 1.0, command_time: float = 0.0,
+                 connection: int = ConnectionType.USB, address=None,
+                 probe_time: float = 0.0, connect_time: float = 0.0, sensor_rows: int = 64,
+                 channels: int = 1, seed: int = 0):
+        """
+        Args:
+            serial: Device serial number
+            pixel_count: Number of sensor pixels
+            calib_range: Calibrated range (begin, end, step) in nm
+            wavelength_range: Configured range (begin, end, step) in nm
+            source: Spectral radiance of the measured source, f(wavelengths)
+            gain: Counts per (W/(sr·m²·nm) · ms)
+            dark_offset: Dark signal in counts
+            read_noise: Read noise in counts (single scan)
+            flicker_frequency: Modulation frequency of the source in Hz (0 = steady)
+            flicker_depth: Modulation depth of the source (0..1)
+            stray_light: Stray-light distribution matrix D (pixels × pixels);
+                the sensor sees (I + D) @ signal
+            time_scale: Factor applied to simulated exposure times (0 = instant)
+            command_time: Time one command occupies the device interface in seconds
+            connection: ConnectionType of the link
+            address: Link address: COM port number, IP address, FTDI serial,
+                Bluetooth address or Bluetooth LE path (default for USB: 'FT' + serial)
+            probe_time: Time device enumeration spends on this device in seconds
+            connect_time: Time a direct open of this device takes in seconds
+            sensor_rows: Rows of the 2D sensor read by image measurements
+            channels: Measuring channels; channel k sees the source at 1 / (1 + k / 2)
+            seed: Random seed of the noise generator
+        """
+        self.serial = serial
+        self.pixel_count = pixel_count
+        self.calib_range = tuple(calib_range)
+        self.wavelength_range = tuple(wavelength_range)
+        self.source = source
+        self.gain = gain
+        self.dark_offset = dark_offset
+        self.read_noise = read_noise
+        self.flicker_frequency = flicker_frequency
+        self.flicker_depth = flicker_depth
+        self.stray_light = stray_light
+        self.time_scale = time_scale
+        self.command_time = command_time
+        self.connection = int(connection)
+        if address is None and self.connection == ConnectionType.USB:
+            address = "FT" + serial
+        self.address = address
+        self.probe_time = probe_time
+        self.connect_time = connect_time
+        self.sensor_rows = sensor_rows
+        self.channels = channels
+        self.rng = np.random.default_rng(seed)
+
+        self.adc_bits = self.ADC_BITS
+        self.integration_time = 100.0
+        self.average = 1
+        self.max_integration_time = 60000.0
+        self.max_average = 65535
+        self.calib = 0
+        self.exposure_mode = 0
+        self.adapt_mode = 0
+        self.dark_mode = 0
+        self.param_block = bytes(256)
+        self.slm: Optional[np.ndarray] = None
+        self.slm_enable = 0
+        self.slm_ignore = 0
+        self.sync_mode = 0
+        self.sync_frequency = 0.0
+        self.trigger_mode = 0
+        self.trigger_timeout = 0
+        self.optical_trigger = 0
+        self.flash_mode = 0
+        self.flash = (0.0, 0.0)
+        self.pda_row = (0, sensor_rows)
+        self.channel_conf = "".join(f"{channel:X}" for channel in range(channels))
+        self.armed = False
+        self.missed_triggers = 0
+        self.trigger_times: deque = deque()
+        self.trigger_condition = threading.Condition()
+        self.last_integration_time = self.integration_time
+        self.last_average = self.average
+        self.last_modulation = 1.0
+        self.busy_until = 0.0
+        self.light: Optional[np.ndarray] = None
+        self.dark: Optional[np.ndarray] = None
+        self.sprad: Optional[np.ndarray] = None
+        self.sprad_calib: Optional[np.ndarray] = None
+        self.light_image: Optional[np.ndarray] = None
+        self.dark_image: Optional[np.ndarray] = None
+        self.channel_light: Optional[np.ndarray] = None
+        self.channel_dark: Optional[np.ndarray] = None
+        self.continuous_channel_light: Optional[np.ndarray] = None
+        self._colorimetry: Optional[Dict[str, object]] = None
+        self.connected = True
+        self.collisions = 0
+        self._interface = threading.Lock()
+        self._interface_owner: Optional[int] = None
+        self._collision_lock = threading.Lock()
+        self._power_on = {name: getattr(self, name) for name in self._CONFIGURATION}
+
+    @property
+    def pixel_wavelengths(self) -> np.ndarray:
+        """Centre wavelength of each pixel in nm"""
+        begin, end, _ = self.calib_range
+        return np.linspace(begin, end, self.pixel_count)
+
+    def range_wavelengths(self, begin: float, end: float, step: float = 1.0) -> np.ndarray:
+        """Wavelength grid of a range"""
+        count = int(np.floor((end - begin) / step + 1e-9)) + 1
+        return begin + step * np.arange(count)
+
+    def auto_integration_time(self) -> float:
+        """Integration time the automatic exposure would choose (peak at 80 % of the ADC range)"""
+        peak = float(self.source(self.pixel_wavelengths).max()) * self.gain
+        if peak <= 0.0:
+            return self.max_integration_time
+        return min(0.8 * (self.ADC_MAX - self.dark_offset) / peak, self.max_integration_time)
+
+    def modulation(self, integration_time: float, average: int) -> float:
+        """
+        Mean source intensity factor seen by `average` scans of a flickering source
+
+        Free-running scans start at a random phase; in sync mode each scan
+        starts at the same phase and so sees the same factor.
+        """
+        if not self.flicker_frequency or not self.flicker_depth or integration_time <= 0.0:
+            return 1.0
+        angle = 2.0 * np.pi * self.flicker_frequency * integration_time / 1000.0
+        if self.sync_mode and self.sync_frequency:
+            phases = np.zeros(1)
+        else:
+            phases = self.rng.uniform(0.0, 2.0 * np.pi, max(int(average), 1))
+        factors = 1.0 + self.flicker_depth * (np.cos(phases) - np.cos(phases + angle)) / angle
+        return float(factors.mean())
+
+    def start_exposure(self, integration_time: float, average: int):
+        """Start a simulated exposure"""
+        if self.sync_mode and self.sync_frequency:
+            # Sync mode integrates over whole periods of the sync frequency
+            period = 1000.0 / self.sync_frequency
+            integration_time = max(round(integration_time / period), 1) * period
+        self.last_integration_time = integration_time
+        self.last_average = max(int(average), 1)
+        self.last_modulation = self.modulation(integration_time, self.last_average)
+        duration = integration_time * self.last_average / 1000.0
+        self.busy_until = time.perf_counter() + duration * self.time_scale
+
+    def power_cycle(self):
+        """Restore the power-on configuration and drop all measurement data"""
+        for name, value in self._power_on.items():
+            setattr(self, name, value)
+        self.busy_until = 0.0
+        self.armed = False
+        self.light = self.dark = self.sprad = self.sprad_calib = None
+        self.light_image = self.dark_image = None
+        self.channel_light = self.channel_dark = self.continuous_channel_light = None
+        self._colorimetry = None
+
+    def transact(self, function, args) -> int:
+        """
+        Run one command over the device interface
+
+        A command sent while another thread's command is in progress garbles
+        the link on a real device; here it fails with ERROR_NAK and is counted
+        in `collisions`. Commands a simulated function issues itself pass through.
+        """
+        thread = threading.get_ident()
+        if self._interface_owner == thread:
+            return function(*args)
+        if not self._interface.acquire(blocking=False):
+            with self._collision_lock:
+                self.collisions += 1
+            return JetiError.ERROR_NAK
+        self._interface_owner = thread
+        try:
+            if self.command_time:
+                time.sleep(self.command_time)
+            return function(*args)
+        finally:
+            self._interface_owner = None
+            self._interface.release()
+
+    @property
+    def busy(self) -> bool:
+        return self.armed or time.perf_counter() < self.busy_until
+
+    def arm(self):
+        """Wait for the next trigger edge"""
+        with self.trigger_condition:
+            self.armed = True
+
+    def disarm(self):
+        """Cancel waiting for a trigger"""
+        with self.trigger_condition:
+            self.armed = False
+
+    def fire_trigger(self) -> bool:
+        """
+        Trigger edge at the trigger input
+
+        Returns:
+            True if the device was armed (otherwise the edge is missed)
+        """
+        with self.trigger_condition:
+            if not self.armed:
+                self.missed_triggers += 1
+                return False
+            self.armed = False
+            self.trigger_times.append(time.perf_counter())
+            self.trigger_condition.notify_all()
+            return True
+
+    def wait_trigger(self, timeout: float) -> Optional[float]:
+        """
+        Block until a trigger was received
+
+        Args:
+            timeout: Maximum time in seconds
+
+        Returns:
+            Time of the trigger edge (time.perf_counter()), None on timeout
+        """
+        with self.trigger_condition:
+            if not self.trigger_condition.wait_for(lambda: self.trigger_times, timeout):
+                return None
+            return self.trigger_times.popleft()
+
+    def counts(self, dark: bool = False) -> np.ndarray:
+        """Simulated raw counts of the last exposure"""
+        tint = self.last_integration_time
+        signal = np.full(self.pixel_count, self.dark_offset)
+        if not dark:
+            radiance = self.source(self.pixel_wavelengths) * self.last_modulation
+            light = radiance * self.gain * tint
+            if self.stray_light is not None:
+                light = light + self.stray_light @ light
+            signal = signal + light
+        noise = np.sqrt(self.read_noise ** 2 + np.maximum(signal - self.dark_offset, 0.0))
+        signal = signal + self.rng.standard_normal(self.pixel_count) * noise / np.sqrt(self.last_average)
+        return np.clip(np.rint(signal), 0, self.ADC_MAX).astype(np.int32)
+
+    def measure(self, dark: bool = False):
+        """Complete the last exposure: compute light (or dark) and spectral radiance"""
+        if dark:
+            self.dark = self.counts(dark=True)
+            return
+        self.light = self.counts()
+        if self.slm is not None and self.slm_enable and not self.slm_ignore:
+            # Stray-light correction of the DLL: solve (I + D) x = measured signal
+            signal = self.light - self.dark_offset
+            corrected = np.linalg.solve(np.eye(self.pixel_count) + self.slm, signal)
+            self.light = np.rint(corrected + self.dark_offset).astype(np.int32)
+        self.sprad_calib = self.spectral_radiance(*self.calib_range)
+        self.sprad = self.resample(*self.wavelength_range)
+        self._colorimetry = None
+
+    def image(self, dark: bool = False) -> np.ndarray:
+        """
+        Simulated raw counts (rows × pixels) of the configured sensor rows
+
+        The source illuminates a horizontal stripe centred on the sensor.
+        """
+        first_row, rows = self.pda_row
+        signal = np.full((rows, self.pixel_count), float(self.dark_offset))
+        if not dark:
+            position = (np.arange(first_row, first_row + rows) - (self.sensor_rows - 1) / 2.0)
+            profile = np.exp(-0.5 * (position / (self.sensor_rows / 4.0)) ** 2)
+            radiance = self.source(self.pixel_wavelengths) * self.last_modulation
+            signal += profile[:, None] * (radiance * self.gain * self.last_integration_time)
+        noise = np.sqrt(self.read_noise ** 2 + signal - self.dark_offset)
+        signal += self.rng.standard_normal(signal.shape) * noise
+        return np.clip(np.rint(signal), 0, self.ADC_MAX).astype(np.uint16)
+
+    def channel_counts(self, dark: bool = False, scans: int = 1) -> np.ndarray:
+        """Simulated raw counts (scans × active channels × pixels) of the last exposure"""
+        active = np.array([int(channel, 16) for channel in self.channel_conf])
+        shape = (scans, active.size, self.pixel_count)
+        signal = np.full(shape, float(self.dark_offset))
+        if not dark:
+            radiance = self.source(self.pixel_wavelengths) * self.last_modulation
+            light = radiance * self.gain * self.last_integration_time
+            signal += (1.0 / (1.0 + active / 2.0))[:, None] * light[None, :]
+        noise = np.sqrt(self.read_noise ** 2 + signal - self.dark_offset) / np.sqrt(self.last_average)
+        signal += self.rng.standard_normal(shape) * noise
+        return np.clip(np.rint(signal), 0, self.ADC_MAX).astype(np.uint16)
+
+    def spectral_radiance(self, begin: float, end: float, step: float = 1.0) -> np.ndarray:
+        """Spectral radiance seen by the last exposure, with the sensor's read and shot noise"""
+        wavelengths = self.range_wavelengths(begin, end, step)
+        radiance = self.source(wavelengths) * self.last_modulation
+        scale = self.gain * max(self.last_integration_time, 1e-6)
+        noise = np.sqrt(self.read_noise ** 2 + np.maximum(radiance * scale, 0.0)) / np.sqrt(self.last_average)
+        return radiance + self.rng.standard_normal(radiance.size) * noise / scale
+
+    def light_wavelength(self, begin: float, end: float, step: float = 1.0,
+                         dark: bool = False) -> np.ndarray:
+        """Light (or dark) counts of the last exposure on a wavelength grid"""
+        counts = self.dark if dark else self.light
+        return np.interp(self.range_wavelengths(begin, end, step), self.pixel_wavelengths, counts)
+
+    def resample(self, begin: float, end: float, step: float = 1.0) -> np.ndarray:
+        """Last spectral radiance (calibrated range) on another wavelength grid"""
+        calib_wavelengths = self.range_wavelengths(*self.calib_range)
+        return np.interp(self.range_wavelengths(begin, end, step), calib_wavelengths, self.sprad_calib)
+
+    @property
+    def overexposed(self) -> bool:
+        return self.light is not None and bool((self.light >= self.ADC_MAX).any())
+
+    def colorimetry(self) -> Dict[str, object]:
+        """Radiometric and colorimetric values of the last spectral radiance"""
+        if self._colorimetry is not None:
+            return self._colorimetry
+        begin, end, step = self.wavelength_range
+        wavelengths = self.range_wavelengths(begin, end, step)
+        xyz = spectrum_to_xyz(wavelengths, self.sprad)
+        xy = xyz_to_xy(xyz)
+        self._colorimetry = {
+            'radio': float(self.sprad.sum() * step),
+            'photo': float(683.0 * xyz[1]),
+            'xyz': tuple(float(v) for v in 683.0 * xyz),
+            'xy': tuple(float(v) for v in xy),
+            'uv': tuple(float(v) for v in xyz_to_uv(xyz)),
+            'cct': float(xy_to_cct(xy)),
+            'cri': np.linspace(90.0, 76.0, 15),
+        }
+        return self._colorimetry
+
+
+class SimulatedTriggerSource:
+    """
+    Periodic trigger edges (e.g. a strobe or line encoder) for a SimulatedDevice
+
+    Example:
+        source = SimulatedTriggerSource(device, rate=100.0, count=50)
+        source.start()
+        ...
+        source.join()
+    """
+
+    def __init__(self, device: SimulatedDevice, rate: float, count: int,
+                 jitter: float = 0.0, seed: int = 0):
+        """
+        Args:
+            device: Device receiving the trigger edges
+            rate: Trigger rate in Hz
+            count: Number of trigger edges
+            jitter: Standard deviation of the edge timing in seconds
+            seed: Random seed of the jitter
+        """
+        self.device = device
+        self.rate = rate
+        self.count = count
+        self.jitter = jitter
+        self.fired: List[float] = []
+        self.accepted = 0
+        self._rng = np.random.default_rng(seed)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SimulatedTriggerSource", daemon=True)
+
+    def _run(self):
+        start = time.perf_counter()
+        previous = start
+        for index in range(self.count):
+            due = start + (index + 1) / self.rate
+            if self.jitter:
+                due += self._rng.normal(0.0, self.jitter)
+            # A stalled host thread must not bunch the edges that follow:
+            # a strobe keeps them at least half a period apart
+            due = max(due, previous + 0.5 / self.rate)
+            if self._stop.wait(max(due - time.perf_counter(), 0.0)):
+                return
+            previous = time.perf_counter()
+            self.fired.append(previous)
+            self.accepted += self.device.fire_trigger()
+
+    def start(self):
+        """Start firing trigger edges"""
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait until all trigger edges were fired"""
+        self._thread.join(timeout)
+
+    def stop(self):
+        """Stop firing trigger edges"""
+        self._stop.set()
+        self._thread.join()
+
+
+class _SimFunction:
+    """Callable standing in for a ctypes function pointer (accepts argtypes/restype)"""
+
+    __slots__ = ('__name__', 'argtypes', 'restype', '_impl', '_sdk')
+
+    def __init__(self, name: str, impl, sdk: 'SimulatedSDK'):
+        self.__name__ = name
+        self.argtypes = None
+        self.restype = None
+        self._impl = impl
+        self._sdk = sdk
+
+    def __call__(self, *args):
+        sdk = self._sdk
+        with sdk._calls_lock:
+            sdk.calls[self.__name__] += 1
+        faults = sdk._faults.get(self.__name__)
+        if faults:
+            return faults.popleft()
+        key = _value(args[0]) if args else None
+        if isinstance(key, int):
+            device = sdk._handles.get(key)
+            if device is not None:
+                return device.transact(self._impl, args)
+            if key in sdk._lost_handles:
+                return JetiError.NOT_CONNECTED
+        return self._impl(*args)
+
+
+class SimulatedSDK:
+    """
+    Stand-in for the JETI DLLs backed by SimulatedDevice objects
+
+    One instance serves the functions of all five DLLs, so it can be passed
+    as dll= to any wrapper class. Call counts are recorded in `calls`.
+    """
+
+    # Handles are unique in the process, like the DLL's
+    _handle_numbers = itertools.count(0x1000)
+    _handle_numbers_lock = threading.Lock()
+
+    def __init__(self, devices: Optional[List[SimulatedDevice]] = None):
+        """
+        Args:
+            devices: Simulated devices (default: one SimulatedDevice)
+        """
+        self.devices = list(devices) if devices is not None else [SimulatedDevice()]
+        self.calls: Counter = Counter()
+        self._faults: Dict[str, deque] = {}
+        self._handles: Dict[int, SimulatedDevice] = {}
+        self._lost_handles: set = set()
+        self._lock = threading.Lock()
+        self._calls_lock = threading.Lock()
+        for name in dir(type(self)):
+            if name.startswith('JETI_'):
+                setattr(self, name, _SimFunction(name, getattr(self, name), self))
+
+    def inject_error(self, function_name: str, error_code: int, count: int = 1):
+        """
+        Make the next calls of a function fail
+        
+        Args:
+            function_name: DLL function name, e.g. 'JETI_FetchSprad'
+            error_code: JetiError returned instead of calling the function
+            count: Number of calls to fail
+        """
+        self._faults.setdefault(function_name, deque()).extend([error_code] * count)
+
+    def disconnect(self, device: SimulatedDevice, duration: Optional[float] = None,
+                   power_cycle: bool = True):
+        """
+        Unplug a device
+
+        Its open handles fail with NOT_CONNECTED from now on, and enumeration
+        skips it (the other devices are renumbered) until it is reconnected.
+
+        Args:
+            device: One of `devices`
+            duration: Reconnect automatically after this many seconds (None: stay unplugged)
+            power_cycle: Restore the power-on configuration when reconnected
+        """
+        with self._lock:
+            device.connected = False
+            for handle, opened in list(self._handles.items()):
+                if opened is device:
+                    del self._handles[handle]
+                    self._lost_handles.add(handle)
+        if duration is not None:
+            timer = threading.Timer(duration, self.reconnect, (device, power_cycle))
+            timer.daemon = True
+            timer.start()
+
+    def reconnect(self, device: SimulatedDevice, power_cycle: bool = True):
+        """Plug an unplugged device in again"""
+        if power_cycle:
+            device.power_cycle()
+        device.connected = True
+
+    # ------------------------------------------------------------------
+    # Helpers
+
+    def _connected(self) -> List[SimulatedDevice]:
+        """Devices found by enumeration, in enumeration order"""
+        return [device for device in self.devices if device.connected]
+
+    def _device(self, handle) -> Optional[SimulatedDevice]:
+        return self._handles.get(_value(handle))
+
+    def _open(self, device: SimulatedDevice, handle_out) -> int:
+        with self._lock:
+            if device in self._handles.values():
+                return JetiError.ERROR_OPEN
+            with self._handle_numbers_lock:
+                handle = next(self._handle_numbers)
+            self._handles[handle] = device
+        _store(handle_out, handle)
+        return JetiError.SUCCESS
+
+    def _open_address(self, connection: int, address, handle_out) -> Optional[int]:
+        """Open the device on a link address; None if no device answers there"""
+        address = _value(address)
+        if isinstance(address, bytes):
+            address = address.decode('ascii')
+        for device in self._connected():
+            if device.connection == connection and device.address == address:
+                time.sleep(device.connect_time)
+                return self._open(device, handle_out)
+        return None
+
+    def _open_number(self, device_num, handle_out) -> int:
+        device_num = _value(device_num)
+        devices = self._connected()
+        if not 0 <= device_num < len(devices):
+            return JetiError.INVALID_NUMBER
+        return self._open(devices[device_num], handle_out)
+
+    def _close(self, handle) -> int:
+        with self._lock:
+            if self._handles.pop(_value(handle), None) is None:
+                return JetiError.INVALID_HANDLE
+        return JetiError.SUCCESS
+
+    def _serials(self, device_num, board, spec, device_serial) -> int:
+        device_num = _value(device_num)
+        devices = self._connected()
+        if not 0 <= device_num < len(devices):
+            return JetiError.INVALID_NUMBER
+        serial = devices[device_num].serial.encode('ascii')
+        board.value = b"B" + serial[1:]
+        spec.value = b"S" + serial[1:]
+        device_serial.value = serial
+        return JetiError.SUCCESS
+
+    @staticmethod
+    def _version(major, minor, build) -> int:
+        _store(major, 4)
+        _store(minor, 8)
+        _store(build, 10)
+        return JetiError.SUCCESS
+
+    def _fetch_value(self, handle, key: str, *outputs) -> int:
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.sprad is None:
+            return JetiError.MEASURE_FAIL
+        value = device.colorimetry()[key]
+        if len(outputs) == 1:
+            _store(outputs[0], value)
+        else:
+            for output, component in zip(outputs, value):
+                _store(output, component)
+        return JetiError.SUCCESS
+
+    # ------------------------------------------------------------------
+    # jeti_core: device handling
+
+    def JETI_GetNumDevices(self, num_devices):
+        devices = self._connected()
+        time.sleep(sum(device.probe_time for device in devices))
+        _store(num_devices, len(devices))
+        return JetiError.SUCCESS
+
+    def JETI_GetSerialDevice(self, device_num, board, spec, device_serial):
+        return self._serials(device_num, board, spec, device_serial)
+
+    def JETI_OpenDevice(self, device_num, handle_out):
+        return self._open_number(device_num, handle_out)
+
+    def JETI_GetDeviceInfo(self, device_num, conn_type, device_type, device_serial, com_port,
+                           baudrate, ip_address, usb_serial, bt_address):
+        return self.JETI_GetDeviceInfoEx(device_num, conn_type, device_type, device_serial,
+                                         com_port, baudrate, ip_address, usb_serial, bt_address, None)
+
+    def JETI_GetDeviceInfoEx(self, device_num, conn_type, device_type, device_serial, com_port,
+                             baudrate, ip_address, usb_serial, bt_address, btle_path):
+        device_num = _value(device_num)
+        devices = self._connected()
+        if not 0 <= device_num < len(devices):
+            return JetiError.INVALID_NUMBER
+        device = devices[device_num]
+        link = device.connection
+        _store(conn_type, link)
+        _store(device_type, 1)
+        device_serial.value = device.serial.encode('ascii')
+        _store(com_port, device.address if link == ConnectionType.COM else 0)
+        _store(baudrate, 921600 if link == ConnectionType.COM else 0)
+        ip_address.value = device.address.encode('ascii') if link == ConnectionType.TCP else b""
+        usb_serial.value = device.address.encode('ascii') if link == ConnectionType.USB else b""
+        _store(bt_address, device.address if link == ConnectionType.BLUETOOTH else 0)
+        if btle_path is not None:
+            btle_path.value = device.address if link == ConnectionType.BLUETOOTH_LE else ""
+        return JetiError.SUCCESS
+
+    def JETI_OpenCOMDevice(self, com_port, baudrate, handle_out):
+        result = self._open_address(ConnectionType.COM, com_port, handle_out)
+        if result is None:
+            # Devices not declared on a COM port answer on COM<number + 1>
+            return self._open_number(_value(com_port) - 1, handle_out)
+        return result
+
+    def JETI_OpenTCPDevice(self, ip_address, handle_out):
+        result = self._open_address(ConnectionType.TCP, ip_address, handle_out)
+        return JetiError.ERROR_OPEN if result is None else result
+
+    def JETI_OpenFTDIDevice(self, usb_serial, handle_out):
+        result = self._open_address(ConnectionType.USB, usb_serial, handle_out)
+        return JetiError.ERROR_OPEN if result is None else result
+
+    def JETI_OpenBTDevice(self, bt_address, handle_out):
+        result = self._open_address(ConnectionType.BLUETOOTH, bt_address, handle_out)
+        return JetiError.ERROR_OPEN if result is None else result
+
+    def JETI_OpenBTLEDevice(self, btle_path, handle_out):
+        result = self._open_address(ConnectionType.BLUETOOTH_LE, btle_path, handle_out)
+        return JetiError.ERROR_OPEN if result is None else result
+
+    def JETI_CloseDevice(self, handle):
+        return self._close(handle)
+
+    def JETI_GetIdentifier(self, handle, identifier):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        identifier.value = f"JETI simulated spectroradiometer {device.serial}".encode('ascii')
+        return JetiError.SUCCESS
+
+    def JETI_GetFirmwareVersion(self, handle, version):
+        if self._device(handle) is None:
+            return JetiError.INVALID_HANDLE
+        version.value = b"SIM 1.0"
+        return JetiError.SUCCESS
+
+    def JETI_Reset(self, handle):
+        return JetiError.SUCCESS if self._device(handle) else JetiError.INVALID_HANDLE
+
+    def JETI_Break(self, handle):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.busy_until = 0.0
+        device.disarm()
+        return JetiError.SUCCESS
+
+    def JETI_GetCoreDLLVersion(self, major, minor, build):
+        return self._version(major, minor, build)
+
+    # ------------------------------------------------------------------
+    # jeti_core: stray-light matrix
+
+    def JETI_ImportSLM(self, matrix_file):
+        path = _value(matrix_file)
+        path = path.decode() if isinstance(path, bytes) else path
+        try:
+            matrix = np.load(path) if path.endswith('.npy') else np.loadtxt(path, delimiter=None)
+        except OSError:
+            return JetiError.FILE_NOT_FOUND
+        for device in self.devices:
+            if matrix.shape != (device.pixel_count, device.pixel_count):
+                return JetiError.NO_STRAYLIGHT
+        for device in self.devices:
+            device.slm = matrix
+        return JetiError.SUCCESS
+
+    def JETI_IgnoreSLM(self, ignore):
+        for device in self.devices:
+            device.slm_ignore = _value(ignore)
+        return JetiError.SUCCESS
+
+    def JETI_GetSLMEnable(self, handle, enable):
+        return self._get_setting(handle, 'slm_enable', enable)
+
+    def JETI_SetSLMEnable(self, handle, enable):
+        return self._set_setting(handle, 'slm_enable', enable)
+
+    # ------------------------------------------------------------------
+    # jeti_core: parameters and configuration
+
+    def JETI_GetPixel(self, handle, pixel_count):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(pixel_count, device.pixel_count)
+        return JetiError.SUCCESS
+
+    def JETI_GetADCRes(self, handle, bits):
+        return self._get_setting(handle, 'adc_bits', bits)
+
+    def JETI_GetTint(self, handle, tint):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(tint, device.last_integration_time)
+        return JetiError.SUCCESS
+
+    def JETI_GetCalibRange(self, handle, begin, end, step):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        for output, value in zip((begin, end, step), device.calib_range):
+            _store(output, value)
+        return JetiError.SUCCESS
+
+    def JETI_GetWranConf(self, handle, begin, end, step):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        for output, value in zip((begin, end, step), device.wavelength_range):
+            _store(output, value)
+        return JetiError.SUCCESS
+
+    def JETI_SetWranConf(self, handle, begin, end, step):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        begin, end, step = _value(begin), _value(end), _value(step)
+        calib_begin, calib_end, _ = device.calib_range
+        if begin < calib_begin or end > calib_end or begin > end or step < 1:
+            return JetiError.ERROR_PARAMETER
+        device.wavelength_range = (begin, end, step)
+        return JetiError.SUCCESS
+
+    def JETI_GetPDARowConf(self, handle, first_row, rows):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(first_row, device.pda_row[0])
+        _store(rows, device.pda_row[1])
+        return JetiError.SUCCESS
+
+    def JETI_SetPDARowConf(self, handle, first_row, rows):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        first_row, rows = _value(first_row), _value(rows)
+        if rows < 1 or first_row + rows > device.sensor_rows:
+            return JetiError.ERROR_PARAMETER
+        device.pda_row = (first_row, rows)
+        return JetiError.SUCCESS
+
+    def JETI_GetChannelConf(self, handle, conf):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        conf.value = device.channel_conf.encode('ascii')
+        return JetiError.SUCCESS
+
+    def JETI_SetChannelConf(self, handle, conf):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        conf = _value(conf).decode('ascii').upper()
+        try:
+            active = [int(channel, 16) for channel in conf]
+        except ValueError:
+            return JetiError.ERROR_PARAMETER
+        if not active or len(set(active)) != len(active) or max(active) >= device.channels:
+            return JetiError.ERROR_PARAMETER
+        device.channel_conf = conf
+        return JetiError.SUCCESS
+
+    def JETI_GetTintConf(self, handle, previous, configured):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(previous, device.last_integration_time)
+        _store(configured, device.integration_time)
+        return JetiError.SUCCESS
+
+    def JETI_SetTintConf(self, handle, tint):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.integration_time = float(_value(tint))
+        return JetiError.SUCCESS
+
+    def JETI_GetAverConf(self, handle, previous, configured):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(previous, device.last_average)
+        _store(configured, device.average)
+        return JetiError.SUCCESS
+
+    def JETI_SetAverConf(self, handle, average):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.average = int(_value(average))
+        return JetiError.SUCCESS
+
+    def _get_setting(self, handle, attribute: str, *outputs) -> int:
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        for output in outputs:
+            _store(output, getattr(device, attribute))
+        return JetiError.SUCCESS
+
+    def _set_setting(self, handle, attribute: str, value) -> int:
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        setattr(device, attribute, _value(value))
+        return JetiError.SUCCESS
+
+    def JETI_GetCalib(self, handle, calib):
+        return self._get_setting(handle, 'calib', calib)
+
+    def JETI_SetCalib(self, handle, calib):
+        return self._set_setting(handle, 'calib', calib)
+
+    def JETI_GetExposureConf(self, handle, mode):
+        return self._get_setting(handle, 'exposure_mode', mode)
+
+    def JETI_SetExposureConf(self, handle, mode):
+        return self._set_setting(handle, 'exposure_mode', mode)
+
+    def JETI_GetAdaptConf(self, handle, mode):
+        return self._get_setting(handle, 'adapt_mode', mode)
+
+    def JETI_SetAdaptConf(self, handle, mode):
+        return self._set_setting(handle, 'adapt_mode', mode)
+
+    def JETI_GetDarkmodeConf(self, handle, mode):
+        return self._get_setting(handle, 'dark_mode', mode)
+
+    def JETI_SetDarkmodeConf(self, handle, mode):
+        return self._set_setting(handle, 'dark_mode', mode)
+
+    def JETI_GetMaxTintConf(self, handle, tint):
+        return self._get_setting(handle, 'max_integration_time', tint)
+
+    def JETI_SetMaxTintConf(self, handle, tint):
+        return self._set_setting(handle, 'max_integration_time', tint)
+
+    def JETI_GetMaxAverConf(self, handle, average):
+        return self._get_setting(handle, 'max_average', average)
+
+    def JETI_SetMaxAverConf(self, handle, average):
+        return self._set_setting(handle, 'max_average', average)
+
+    def JETI_SetTrigger(self, handle, mode):
+        return self._set_setting(handle, 'trigger_mode', mode)
+
+    def JETI_GetTrigTimeout(self, handle, timeout):
+        return self._get_setting(handle, 'trigger_timeout', timeout)
+
+    def JETI_SetTrigTimeout(self, handle, timeout):
+        return self._set_setting(handle, 'trigger_timeout', timeout)
+
+    def JETI_GetOptTrigg(self, handle, optical_trigger):
+        return self._get_setting(handle, 'optical_trigger', optical_trigger)
+
+    def JETI_SetFlashMode(self, handle, mode):
+        return self._set_setting(handle, 'flash_mode', mode)
+
+    def JETI_SetFlash(self, handle, interval, pulse_length):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.flash = (_value(interval), _value(pulse_length))
+        return JetiError.SUCCESS
+
+    def JETI_GetFlash(self, handle, interval, pulse_length):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(interval, device.flash[0])
+        _store(pulse_length, device.flash[1])
+        return JetiError.SUCCESS
+
+    def JETI_GetParamBlock(self, handle, block):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _fill(block, np.frombuffer(device.param_block, dtype=np.uint8))
+        return JetiError.SUCCESS
+
+    def JETI_SetParamBlock(self, handle, block):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.param_block = bytes(_target(block))
+        return JetiError.SUCCESS
+
+    # ------------------------------------------------------------------
+    # jeti_core: measurement and fetch
+
+    def JETI_InitMeasure(self, handle):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.trigger_mode:
+            device.arm()
+            return JetiError.SUCCESS
+        device.start_exposure(device.integration_time, device.average)
+        device.measure()
+        return JetiError.SUCCESS
+
+    def JETI_PreTrigMeasure(self, handle):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.arm()
+        return JetiError.SUCCESS
+
+    def JETI_WaitReadTrigger(self, handle, spec, timeout):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.wait_trigger(_value(timeout) / 1000.0) is None:
+            return JetiError.TIMEOUT
+        device.start_exposure(device.integration_time, device.average)
+        remaining = device.busy_until - time.perf_counter()
+        if remaining > 0.0:
+            time.sleep(remaining)
+        device.measure()
+        _fill(spec, device.light)
+        return JetiError.SUCCESS
+
+    def JETI_MeasureStatusCore(self, handle, status):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(status, 1 if device.busy else 0)
+        return JetiError.SUCCESS
+
+    def JETI_FetchLight(self, handle, light):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.light is None:
+            return JetiError.MEASURE_FAIL
+        _fill(light, device.light)
+        return JetiError.SUCCESS
+
+    def JETI_FetchDark(self, handle, dark):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.dark is None:
+            device.measure(dark=True)
+        _fill(dark, device.dark)
+        return JetiError.SUCCESS
+
+    def JETI_FetchSprad(self, handle, sprad):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.sprad is None:
+            return JetiError.MEASURE_FAIL
+        _fill(sprad, device.sprad)
+        return JetiError.SUCCESS
+
+    def JETI_FetchRadio(self, handle, radio):
+        return self._fetch_value(handle, 'radio', radio)
+
+    def JETI_FetchPhoto(self, handle, photo):
+        return self._fetch_value(handle, 'photo', photo)
+
+    def JETI_FetchChromxy(self, handle, x, y):
+        return self._fetch_value(handle, 'xy', x, y)
+
+    def JETI_FetchChromuv(self, handle, u, v):
+        return self._fetch_value(handle, 'uv', u, v)
+
+    def JETI_FetchXYZ(self, handle, x, y, z):
+        return self._fetch_value(handle, 'xyz', x, y, z)
+
+    def JETI_FetchCCT(self, handle, cct):
+        return self._fetch_value(handle, 'cct', cct)
+
+    def JETI_FetchCRI(self, handle, cri):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.sprad is None:
+            return JetiError.MEASURE_FAIL
+        _fill(cri, device.colorimetry()['cri'])
+        return JetiError.SUCCESS
+
+    def JETI_FetchTiAdapt(self, handle, tint):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        _store(tint, device.last_integration_time)
+        return JetiError.SUCCESS
+
+    # ------------------------------------------------------------------
+    # jeti_core: flicker and sync mode
+
+    def JETI_GetFlickerFreq(self, handle, frequency, warning):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        detected = device.flicker_frequency if device.flicker_depth else 0.0
+        _store(frequency, round(detected, 2))
+        _store(warning, 0 if detected else 1)
+        return JetiError.SUCCESS
+
+    def JETI_GetSyncFreq(self, handle, frequency):
+        return self._get_setting(handle, 'sync_frequency', frequency)
+
+    def JETI_SetSyncFreq(self, handle, frequency):
+        if _value(frequency) <= 0.0:
+            return JetiError.ERROR_PARAMETER
+        return self._set_setting(handle, 'sync_frequency', frequency)
+
+    def JETI_GetSyncMode(self, handle, mode):
+        return self._get_setting(handle, 'sync_mode', mode)
+
+    def JETI_SetSyncMode(self, handle, mode):
+        return self._set_setting(handle, 'sync_mode', mode)
+
+    # ------------------------------------------------------------------
+    # jeti_radio
+
+    def JETI_GetNumRadio(self, num_devices):
+        return self.JETI_GetNumDevices(num_devices)
+
+    def JETI_GetSerialRadio(self, device_num, board, spec, device_serial):
+        return self._serials(device_num, board, spec, device_serial)
+
+    def JETI_OpenRadio(self, device_num, handle_out):
+        return self._open_number(device_num, handle_out)
+
+    def JETI_CloseRadio(self, handle):
+        return self._close(handle)
+
+    def JETI_GetRadioDLLVersion(self, major, minor, build):
+        return self._version(major, minor, build)
+
+    def JETI_Measure(self, handle):
+        return self.JETI_MeasureEx(handle, 0.0, 1, 1)
+
+    def JETI_MeasureStatus(self, handle, status):
+        return self.JETI_MeasureStatusCore(handle, status)
+
+    def JETI_MeasureBreak(self, handle):
+        return self.JETI_Break(handle)
+
+    def JETI_Radio(self, handle, radio):
+        return self.JETI_FetchRadio(handle, radio)
+
+    def JETI_Photo(self, handle, photo):
+        return self.JETI_FetchPhoto(handle, photo)
+
+    def JETI_Chromxy(self, handle, x, y):
+        return self.JETI_FetchChromxy(handle, x, y)
+
+    def JETI_CCT(self, handle, cct):
+        return self.JETI_FetchCCT(handle, cct)
+
+    def JETI_CRI(self, handle, cri):
+        return self.JETI_FetchCRI(handle, cri)
+
+    # ------------------------------------------------------------------
+    # jeti_radio_ex
+
+    def JETI_GetNumRadioEx(self, num_devices):
+        return self.JETI_GetNumDevices(num_devices)
+
+    def JETI_GetSerialRadioEx(self, device_num, board, spec, device_serial):
+        return self._serials(device_num, board, spec, device_serial)
+
+    def JETI_OpenRadioEx(self, device_num, handle_out):
+        return self._open_number(device_num, handle_out)
+
+    def JETI_CloseRadioEx(self, handle):
+        return self._close(handle)
+
+    def JETI_GetRadioExDLLVersion(self, major, minor, build):
+        return self._version(major, minor, build)
+
+    def JETI_MeasureEx(self, handle, integration_time, average, step):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        integration_time = _value(integration_time)
+        if integration_time <= 0.0:
+            integration_time = device.auto_integration_time()
+        device.start_exposure(integration_time, _value(average))
+        device.measure()
+        return JetiError.SUCCESS
+
+    def JETI_MeasureStatusEx(self, handle, status):
+        return self.JETI_MeasureStatusCore(handle, status)
+
+    def JETI_MeasureBreakEx(self, handle):
+        return self.JETI_Break(handle)
+
+    def JETI_SpecRadEx(self, handle, begin, end, sprad):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.sprad_calib is None:
+            return JetiError.MEASURE_FAIL
+        _fill(sprad, device.resample(_value(begin), _value(end)))
+        return JetiError.SUCCESS
+
+    def _save_sprad(self, handle, begin, end, path, operator, memo, write) -> int:
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.sprad_calib is None:
+            return JetiError.MEASURE_FAIL
+        begin, end = _value(begin), _value(end)
+        wavelengths = np.arange(begin, end + 1, dtype=np.float64)
+        try:
+            write(os.fsdecode(_value(path)), wavelengths, device.resample(begin, end),
+                  (_value(operator) or b"").decode('latin-1'), (_value(memo) or b"").decode('latin-1'))
+        except OSError:
+            return JetiError.FILE_NOT_FOUND
+        return JetiError.SUCCESS
+
+    def JETI_SaveSpecRadCSVEx(self, handle, begin, end, path, operator, memo):
+        return self._save_sprad(handle, begin, end, path, operator, memo, _write_csv)
+
+    def JETI_SaveSpecRadSPCEx(self, handle, begin, end, path, operator, memo):
+        return self._save_sprad(handle, begin, end, path, operator, memo, _write_spc)
+
+    def JETI_RadioEx(self, handle, begin, end, radio):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.sprad_calib is None:
+            return JetiError.MEASURE_FAIL
+        _store(radio, float(device.resample(_value(begin), _value(end)).sum()))
+        return JetiError.SUCCESS
+
+    def JETI_PhotoEx(self, handle, photo):
+        return self._fetch_value(handle, 'photo', photo)
+
+    def JETI_ChromxyEx(self, handle, x, y):
+        return self._fetch_value(handle, 'xy', x, y)
+
+    def JETI_CCTEx(self, handle, cct):
+        return self._fetch_value(handle, 'cct', cct)
+
+    def JETI_CRIEx(self, handle, cct, cri):
+        return self.JETI_FetchCRI(handle, cri)
+
+    # ------------------------------------------------------------------
+    # jeti_spectro_ex
+
+    def JETI_GetNumSpectroEx(self, num_devices):
+        return self.JETI_GetNumDevices(num_devices)
+
+    def JETI_GetSerialSpectroEx(self, device_num, board, spec, device_serial):
+        return self._serials(device_num, board, spec, device_serial)
+
+    def JETI_OpenSpectroEx(self, device_num, handle_out):
+        return self._open_number(device_num, handle_out)
+
+    def JETI_CloseSpectroEx(self, handle):
+        return self._close(handle)
+
+    def JETI_GetSpectroExDLLVersion(self, major, minor, build):
+        return self._version(major, minor, build)
+
+    def JETI_StartDarkEx(self, handle, integration_time, average):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.start_exposure(_value(integration_time), _value(average))
+        device.measure(dark=True)
+        return JetiError.SUCCESS
+
+    def JETI_DarkPixEx(self, handle, dark):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.dark is None:
+            return JetiError.MEASURE_FAIL
+        _fill(dark, device.dark)
+        return JetiError.SUCCESS
+
+    def JETI_DarkWaveEx(self, handle, begin, end, step, dark):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.dark is None:
+            return JetiError.MEASURE_FAIL
+        _fill(dark, device.light_wavelength(_value(begin), _value(end), _value(step), dark=True))
+        return JetiError.SUCCESS
+
+    def JETI_StartLightEx(self, handle, integration_time, average):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        integration_time = _value(integration_time)
+        if integration_time <= 0.0:
+            integration_time = device.auto_integration_time()
+        device.start_exposure(integration_time, _value(average))
+        device.measure()
+        return JetiError.SUCCESS
+
+    def JETI_SpectroStatusEx(self, handle, status):
+        return self.JETI_MeasureStatusCore(handle, status)
+
+    def JETI_SpectroBreakEx(self, handle):
+        return self.JETI_Break(handle)
+
+    def JETI_PixelCountEx(self, handle, pixel_count):
+        return self.JETI_GetPixel(handle, pixel_count)
+
+    def JETI_LightPixEx(self, handle, light):
+        return self.JETI_FetchLight(handle, light)
+
+    def JETI_LightWaveEx(self, handle, begin, end, step, light):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.light is None:
+            return JetiError.MEASURE_FAIL
+        _fill(light, device.light_wavelength(_value(begin), _value(end), _value(step)))
+        return JetiError.SUCCESS
+
+    def JETI_StartDarkImageEx(self, handle, integration_time):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.start_exposure(_value(integration_time), 1)
+        device.dark_image = device.image(dark=True)
+        return JetiError.SUCCESS
+
+    def JETI_DarkImageEx(self, handle, dark_image):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.dark_image is None:
+            return JetiError.MEASURE_FAIL
+        _fill(dark_image, device.dark_image.ravel())
+        return JetiError.SUCCESS
+
+    def JETI_StartLightImageEx(self, handle, integration_time):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.start_exposure(_value(integration_time), 1)
+        device.light_image = device.image()
+        return JetiError.SUCCESS
+
+    def JETI_LightImageEx(self, handle, light_image):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.light_image is None:
+            return JetiError.MEASURE_FAIL
+        _fill(light_image, device.light_image.ravel())
+        return JetiError.SUCCESS
+
+    def JETI_StartChannelDarkEx(self, handle, integration_time, average):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.start_exposure(_value(integration_time), _value(average))
+        device.channel_dark = device.channel_counts(dark=True)[0]
+        return JetiError.SUCCESS
+
+    def JETI_ChannelDarkEx(self, handle, dark):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.channel_dark is None:
+            return JetiError.MEASURE_FAIL
+        _fill(dark, device.channel_dark.ravel())
+        return JetiError.SUCCESS
+
+    def JETI_StartChannelLightEx(self, handle, integration_time, average):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        device.start_exposure(_value(integration_time), _value(average))
+        device.channel_light = device.channel_counts()[0]
+        return JetiError.SUCCESS
+
+    def JETI_ChannelLightEx(self, handle, light):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.channel_light is None:
+            return JetiError.MEASURE_FAIL
+        _fill(light, device.channel_light.ravel())
+        return JetiError.SUCCESS
+
+    def JETI_StartContChannelLightEx(self, handle, interval, count):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        count = _value(count)
+        if count < 1:
+            return JetiError.ERROR_PARAMETER
+        # Scans start every `interval` ms, or back to back if they take longer
+        period = max(_value(interval), device.integration_time)
+        device.start_exposure(device.integration_time, 1)
+        device.busy_until += (period * count - device.last_integration_time) / 1000.0 * device.time_scale
+        device.continuous_channel_light = device.channel_counts(scans=count)
+        return JetiError.SUCCESS
+
+    def JETI_ContChannelLightEx(self, handle, light):
+        device = self._device(handle)
+        if device is None:
+            return JetiError.INVALID_HANDLE
+        if device.continuous_channel_light is None:
+            return JetiError.MEASURE_FAIL
+        _fill(light, device.continuous_channel_light.ravel())
+        return JetiError.SUCCESS
@@ -0,0 +1,359 @@
+"""
+Incremental Arrow IPC / Parquet output of spectra and colorimetric results
+
+Building a DataFrame row by row from per-scan arrays and dictionaries is
+slow and holds the whole run in memory. SpectrumSink copies each spectrum
+into a preallocated float32 block of `batch_rows` rows and, when the block
+is full, writes it as one Arrow record batch:
+
+    spectrum          fixed_size_list<float32>[len(axis)]
+    timestamp         float64 (time.time() unless given)
+    <columns>         metadata columns declared up front (serial, run, ...)
+    radiometric ... cct, cri
+                      colorimetric results (results=True), float32 and
+                      fixed_size_list<float32>[15]
+
+Memory is bounded by one block: batch_rows x (4 x len(axis) + columns)
+bytes. Files ending in .parquet are written as Parquet (one row group per
+batch), all others in the Arrow IPC file format (Feather v2), which
+read_spectra() and iter_spectra() memory-map without copying.
+
+The axis (wavelengths in nm, or pixel indices for get_light_spectrum_pixel())
+and the file metadata are stored in the schema metadata.
+
+Requires pyarrow.
+
+Example:
+    from jeti.sink import SpectrumSink, read_spectra
+
+    with SpectrumSink("run.arrow", device.spectral_axis.grid(380, 780, 1),
+                      columns={'serial': 'string'}, results=True,
+                      metadata={'integration_time': 50.0}) as sink:
+        for _ in range(100000):
+            device.measure(50.0, 1)
+            device.wait_for_measurement(0.01)
+            sink.append(device.get_spectral_radiance(380, 780),
+                        result=device.get_result(), serial=serial)
+
+    data = read_spectra("run.arrow")
+    print(data.spectra.shape, data.columns['cct'].mean())
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .results import CRI_NAMES, SCALAR_FIELDS, RadiometricResult, ResultBatch
+
+
+FORMATS = ('ipc', 'parquet')
+
+# Rows per record batch
+BATCH_ROWS = 1024
+
+_AXIS_KEY = b'jeti.axis'
+_AXIS_NAME_KEY = b'jeti.axis_name'
+_METADATA_KEY = b'jeti.metadata'
+
+STRING = 'string'
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("jeti.sink requires pyarrow") from exc
+    return pyarrow
+
+
+def _format(path: Path, format: Optional[str]) -> str:
+    if format is None:
+        format = 'parquet' if path.suffix.lower() == '.parquet' else 'ipc'
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}; expected one of {FORMATS}")
+    return format
+
+
+class SpectrumSink:
+    """
+    Writer of spectra and metadata columns to an Arrow IPC or Parquet file
+
+    Attributes:
+        rows_written: Rows written to the file so far
+        batches_written: Record batches written so far
+    """
+
+    def __init__(self, path, axis: np.ndarray, columns: Optional[Dict[str, object]] = None,
+                 results: bool = False, metadata: Optional[Dict[str, object]] = None,
+                 format: Optional[str] = None, batch_rows: int = BATCH_ROWS,
+                 compression: Optional[str] = None, axis_name: str = 'wavelength_nm'):
+        """
+        Args:
+            path: Output file
+            axis: Wavelengths in nm (or pixel indices), one per spectral value
+            columns: Metadata columns by name: a NumPy dtype or 'string'
+            results: Add the colorimetric columns of RadiometricResult
+            metadata: JSON-serialisable file metadata
+            format: 'ipc' or 'parquet' (None: from the file suffix)
+            batch_rows: Rows buffered per record batch
+            compression: Codec, e.g. 'zstd' or 'lz4' (compressed IPC files
+                cannot be memory-mapped without decompression)
+            axis_name: Name of the axis stored in the metadata
+        """
+        pa = _pyarrow()
+        self.path = Path(path)
+        self.format = _format(self.path, format)
+        self.axis = np.asarray(axis, dtype=np.float64)
+        self.batch_rows = max(int(batch_rows), 1)
+        self.results = results
+        self._types = {'timestamp': np.dtype(np.float64)}
+        for name, dtype in (columns or {}).items():
+            self._types[name] = STRING if dtype is str or dtype == STRING else np.dtype(dtype)
+
+        fields = [pa.field('spectrum', pa.list_(pa.float32(), self.axis.size))]
+        for name, dtype in self._types.items():
+            fields.append(pa.field(name, pa.string() if dtype is STRING else pa.from_numpy_dtype(dtype)))
+        if results:
+            fields += [pa.field(name, pa.float32()) for name in SCALAR_FIELDS]
+            fields.append(pa.field('cri', pa.list_(pa.float32(), len(CRI_NAMES))))
+        self.schema = pa.schema(fields, metadata={
+            _AXIS_KEY: json.dumps(self.axis.tolist()).encode(),
+            _AXIS_NAME_KEY: axis_name.encode(),
+            _METADATA_KEY: json.dumps(metadata or {}).encode(),
+        })
+
+        self._spectra = np.empty((self.batch_rows, self.axis.size), dtype=np.float32)
+        self._columns = {name: [None] * self.batch_rows if dtype is STRING
+                         else np.empty(self.batch_rows, dtype=dtype)
+                         for name, dtype in self._types.items()}
+        self._results = ResultBatch(self.batch_rows) if results else None
+        self._size = 0
+        self.rows_written = 0
+        self.batches_written = 0
+
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(str(self.path), self.schema,
+                                            compression=compression or 'snappy')
+            self._file = None
+        else:
+            self._file = pa.OSFile(str(self.path), 'wb')
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(self._file, self.schema, options=options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        """Rows appended (written and buffered)"""
+        return self.rows_written + self._size
+
+    def append(self, spectrum: np.ndarray, result: Optional[RadiometricResult] = None, **values):
+        """
+        Add one spectrum
+
+        Args:
+            spectrum: Spectral values, one per axis value
+            result: Colorimetric results (required if the sink has results)
+            **values: Metadata column values (timestamp defaults to now)
+        """
+        if self._writer is None:
+            raise ValueError("sink is closed")
+        index = self._size
+        self._spectra[index] = spectrum
+        for name, column in self._columns.items():
+            if name in values:
+                column[index] = values[name]
+            elif name == 'timestamp':
+                column[index] = time.time()
+            else:
+                raise ValueError(f"Missing value of column {name!r}")
+        if self._results is not None:
+            if result is None:
+                raise ValueError("Missing colorimetric result")
+            self._results.append(result)
+        self._size = index + 1
+        if self._size == self.batch_rows:
+            self.flush()
+
+    def extend(self, spectra: np.ndarray, results: Optional[Sequence[RadiometricResult]] = None,
+               **columns):
+        """
+        Add a block of spectra
+
+        Args:
+            spectra: Spectra, shape (N, len(axis))
+            results: N colorimetric results (or a ResultBatch)
+            **columns: N values per metadata column (timestamp defaults to now)
+        """
+        spectra = np.asarray(spectra)
+        if spectra.ndim != 2 or spectra.shape[1] != self.axis.size:
+            raise ValueError(f"Expected spectra of shape (N, {self.axis.size}), got {spectra.shape}")
+        rows = len(spectra)
+        for name in self._columns:
+            if name not in columns and name != 'timestamp':
+                raise ValueError(f"Missing values of column {name!r}")
+        if self._results is not None and (results is None or len(results) != rows):
+            raise ValueError(f"Expected {rows} colorimetric results")
+        start = 0
+        while start < rows:
+            count = min(rows - start, self.batch_rows - self._size)
+            target = slice(self._size, self._size + count)
+            source = slice(start, start + count)
+            self._spectra[target] = spectra[source]
+            for name, column in self._columns.items():
+                if name in columns:
+                    column[target] = columns[name][source]
+                else:
+                    column[target] = [time.time()] * count
+            if self._results is not None:
+                for index in range(start, start + count):
+                    self._results.append(results[index])
+            self._size += count
+            start += count
+            if self._size == self.batch_rows:
+                self.flush()
+
+    def _batch(self):
+        pa = _pyarrow()
+        rows = self._size
+        spectra = pa.FixedSizeListArray.from_arrays(
+            pa.array(self._spectra[:rows].reshape(-1)), self.axis.size)
+        arrays = [spectra]
+        for name, dtype in self._types.items():
+            column = self._columns[name][:rows]
+            arrays.append(pa.array(column, type=pa.string()) if dtype is STRING else pa.array(column))
+        if self._results is not None:
+            arrays += [pa.array(self._results.column(name)) for name in SCALAR_FIELDS]
+            cri = self._results.column('cri').reshape(-1)
+            arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(cri), len(CRI_NAMES)))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def flush(self):
+        """Write the buffered rows as one record batch"""
+        if not self._size:
+            return
+        batch = self._batch()
+        if self.format == 'parquet':
+            self._writer.write_table(_pyarrow().Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += self._size
+        self.batches_written += 1
+        self._size = 0
+        if self._results is not None:
+            self._results.clear()
+
+    def close(self):
+        """Write the buffered rows and finish the file"""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+        if self._file is not None:
+            self._file.close()
+
+
+class SpectraFile(NamedTuple):
+    """Contents of a file written by SpectrumSink"""
+    axis: np.ndarray
+    spectra: np.ndarray
+    columns: Dict[str, np.ndarray]
+    metadata: Dict[str, object]
+    table: object
+
+
+def _matrix(array) -> np.ndarray:
+    """(rows, size) float32 view of a fixed-size list array"""
+    values = array.flatten().to_numpy(zero_copy_only=False)
+    return values.reshape(len(array), -1) if len(array) else values.reshape(0, array.type.list_size)
+
+
+def _columns(batch) -> Dict[str, np.ndarray]:
+    columns = {}
+    for name, array in zip(batch.schema.names, batch.columns):
+        if name == 'spectrum':
+            continue
+        columns[name] = _matrix(array) if name == 'cri' else array.to_numpy(zero_copy_only=False)
+    return columns
+
+
+def _schema_metadata(schema):
+    metadata = schema.metadata or {}
+    axis = np.array(json.loads(metadata.get(_AXIS_KEY, b'[]')), dtype=np.float64)
+    return axis, json.loads(metadata.get(_METADATA_KEY, b'{}'))
+
+
+def _open_table(path: Path, format: Optional[str]):
+    pa = _pyarrow()
+    if _format(path, format) == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(str(path), memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+
+def read_spectra(path, format: Optional[str] = None) -> SpectraFile:
+    """
+    Read a file written by SpectrumSink
+
+    IPC files are memory-mapped. A file with one record batch gives arrays
+    that are views of the mapping; several batches are concatenated
+    (iter_spectra() reads them without copying).
+
+    Args:
+        path: File written by SpectrumSink
+        format: 'ipc' or 'parquet' (None: from the file suffix)
+
+    Returns:
+        SpectraFile with spectra of shape (N, len(axis)), columns by name
+        (cri of shape (N, 15)) and the pyarrow Table
+    """
+    path = Path(path)
+    table = _open_table(path, format)
+    axis, metadata = _schema_metadata(table.schema)
+    batches = table.to_batches()
+    if len(batches) == 1:
+        batch = batches[0]
+    else:
+        batch = table.combine_chunks().to_batches()[0] if batches else None
+    if batch is None:
+        spectra = np.empty((0, axis.size), dtype=np.float32)
+        columns = {name: np.empty(0) for name in table.schema.names if name != 'spectrum'}
+    else:
+        spectra = _matrix(batch.column(0))
+        columns = _columns(batch)
+    return SpectraFile(axis, spectra, columns, metadata, table)
+
+
+def iter_spectra(path, format: Optional[str] = None) -> Iterator[SpectraFile]:
+    """
+    Read a file written by SpectrumSink one record batch at a time
+
+    Batches of IPC files are views of the memory-mapped file; Parquet files
+    are decoded one row group at a time.
+
+    Yields:
+        SpectraFile per record batch (its table is the RecordBatch)
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    if _format(path, format) == 'parquet':
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(str(path), memory_map=True)
+        axis, metadata = _schema_metadata(parquet.schema_arrow)
+        batches = (parquet.read_row_group(index).combine_chunks().to_batches()[0]
+                   for index in range(parquet.num_row_groups))
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(str(path), 'r'))
+        axis, metadata = _schema_metadata(reader.schema)
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    for batch in batches:
+        yield SpectraFile(axis, _matrix(batch.column(0)), _columns(batch), metadata, batch)
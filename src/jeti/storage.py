@@ -0,0 +1,368 @@
+"""
+Chunked, compressed spectrum storage with a time-range index
+
+Continuous monitoring produces tens of GB of raw float spectra a month.
+SpectrumStore keeps them in a directory:
+
+    store.json   axis, codec and format version
+    chunks.bin   compressed chunks, appended
+    index.bin    one fixed-size record per chunk:
+                 (start time, end time, device serial, offset, length, rows)
+
+Spectra of each device are buffered and written in chunks of `chunk_rows`.
+A chunk is encoded losslessly for smooth spectra: the float32 bit patterns
+are delta-encoded along the wavelength axis (neighbouring values of a
+smooth spectrum have close bit patterns, so the deltas are small integers),
+the bytes are shuffled so that equal-significance bytes are adjacent, and
+the result is compressed with zlib or lzma.
+
+Lossless float compression is limited by the noise in the low mantissa
+bits. With `mantissa_bits` the values are first rounded to that many
+mantissa bits (relative error below 2 ** -(mantissa_bits + 1)); 12 bits
+keep errors below 1.3e-4, well under the noise of a spectrometer, and
+compress smooth spectra several times better.
+
+A time-range query for one device selects the chunks overlapping the range
+from the index (vectorized) and decompresses only those.
+
+Example:
+    from jeti.storage import SpectrumStore
+
+    with SpectrumStore("monitor.store", axis=device.spectral_axis.grid(380, 780, 1)) as store:
+        while running:
+            device.measure(50.0, 1)
+            device.wait_for_measurement(0.01)
+            store.append(serial, device.get_spectral_radiance(380, 780))
+
+    store = SpectrumStore("monitor.store")
+    timestamps, spectra = store.query(serial, start=time.time() - 3600, end=time.time())
+    print(store.stats().ratio)
+"""
+
+import json
+import lzma
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+CODECS = ('zlib', 'lzma', 'none')
+
+# Spectra per chunk and device
+CHUNK_ROWS = 256
+
+SERIAL_LENGTH = 32
+
+INDEX_DTYPE = np.dtype([
+    ('start', '<f8'),
+    ('end', '<f8'),
+    ('serial', f'S{SERIAL_LENGTH}'),
+    ('offset', '<u8'),
+    ('length', '<u8'),
+    ('rows', '<u4'),
+])
+
+_FORMAT_VERSION = 1
+
+
+def round_mantissa(bits: np.ndarray, mantissa_bits: int) -> np.ndarray:
+    """
+    Round float32 bit patterns to the nearest value with `mantissa_bits`
+    mantissa bits (infinities and NaNs are kept)
+
+    Args:
+        bits: float32 values viewed as uint32
+        mantissa_bits: Mantissa bits kept (0-23)
+    """
+    drop = 23 - mantissa_bits
+    if drop <= 0:
+        return bits
+    half = np.uint32(1 << (drop - 1))
+    mask = np.uint32(0xFFFFFFFF ^ ((1 << drop) - 1))
+    finite = (bits & np.uint32(0x7F800000)) != np.uint32(0x7F800000)
+    return np.where(finite, (bits + half) & mask, bits)
+
+
+def encode_chunk(timestamps: np.ndarray, spectra: np.ndarray, codec: str = 'zlib',
+                 level: Optional[int] = None, mantissa_bits: Optional[int] = None) -> bytes:
+    """
+    Encode a chunk of spectra
+
+    Args:
+        timestamps: Timestamps, shape (rows,)
+        spectra: Spectra, shape (rows, values); stored as float32
+        codec: One of CODECS
+        level: Compression level (None: codec default)
+        mantissa_bits: Round the values to this many mantissa bits first
+            (None: lossless)
+
+    Returns:
+        Encoded chunk
+    """
+    bits = np.ascontiguousarray(spectra, dtype='<f4').view('<u4')
+    if mantissa_bits is not None:
+        bits = round_mantissa(bits, mantissa_bits)
+    deltas = bits.copy()
+    # Wrapping uint32 differences; undone by a wrapping cumulative sum
+    np.subtract(bits[:, 1:], bits[:, :-1], out=deltas[:, 1:])
+    shuffled = deltas.view(np.uint8).reshape(-1, 4).T.tobytes()
+    payload = np.ascontiguousarray(timestamps, dtype='<f8').tobytes() + shuffled
+    if codec == 'zlib':
+        return zlib.compress(payload, 6 if level is None else level)
+    if codec == 'lzma':
+        return lzma.compress(payload, preset=6 if level is None else level)
+    if codec == 'none':
+        return payload
+    raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}")
+
+
+def decode_chunk(data: bytes, rows: int, values: int, codec: str = 'zlib') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a chunk written by encode_chunk()
+
+    Returns:
+        timestamps (rows,) float64 and spectra (rows, values) float32
+    """
+    if codec == 'zlib':
+        data = zlib.decompress(data)
+    elif codec == 'lzma':
+        data = lzma.decompress(data)
+    elif codec != 'none':
+        raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}")
+    timestamps = np.frombuffer(data, dtype='<f8', count=rows)
+    shuffled = np.frombuffer(data, dtype=np.uint8, offset=rows * 8).reshape(4, -1)
+    deltas = np.ascontiguousarray(shuffled.T).view('<u4').reshape(rows, values)
+    bits = np.cumsum(deltas, axis=1, dtype=np.uint32)
+    return timestamps.astype(np.float64), bits.view(np.float32)
+
+
+class _Buffer:
+    def __init__(self, rows: int, values: int):
+        self.timestamps = np.empty(rows, dtype=np.float64)
+        self.spectra = np.empty((rows, values), dtype=np.float32)
+        self.size = 0
+
+
+class StoreStats(NamedTuple):
+    """Size and read counters of a SpectrumStore"""
+    chunks: int
+    rows: int
+    raw_bytes: int
+    stored_bytes: int
+    ratio: float
+    chunks_read: int
+
+
+class SpectrumStore:
+    """
+    Directory of compressed spectrum chunks with a time-range index
+
+    One SpectrumStore object may append to a store at a time. Appended
+    spectra are visible to query() at once, also before their chunk is
+    written.
+
+    Attributes:
+        axis: Wavelengths (or pixel indices) shared by all spectra
+        codec: Compressor of the chunks
+        mantissa_bits: Mantissa bits kept per value (None: lossless)
+        chunks_read: Chunks decompressed by queries so far
+    """
+
+    def __init__(self, path, axis: Optional[np.ndarray] = None, codec: str = 'zlib',
+                 level: Optional[int] = None, chunk_rows: int = CHUNK_ROWS,
+                 mantissa_bits: Optional[int] = None):
+        """
+        Args:
+            path: Store directory (created if axis is given and it does not exist)
+            axis: Axis of the spectra; required for a new store
+            codec: One of CODECS (an existing store keeps its own)
+            level: Compression level of new chunks (None: codec default)
+            chunk_rows: Spectra per chunk
+            mantissa_bits: Mantissa bits kept per value (None: lossless; an
+                existing store keeps its own)
+        """
+        self.path = Path(path)
+        self.level = level
+        self.chunk_rows = max(int(chunk_rows), 1)
+        self.chunks_read = 0
+        settings = self.path / "store.json"
+        if settings.exists():
+            content = json.loads(settings.read_text(encoding='utf-8'))
+            if content.get('version') != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported store version {content.get('version')!r}")
+            self.axis = np.array(content['axis'], dtype=np.float64)
+            self.codec = content['codec']
+            self.mantissa_bits = content.get('mantissa_bits')
+        else:
+            if axis is None:
+                raise FileNotFoundError(f"No spectrum store at {self.path}")
+            if codec not in CODECS:
+                raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}")
+            if mantissa_bits is not None and not 0 <= mantissa_bits <= 23:
+                raise ValueError("mantissa_bits must be in 0-23")
+            self.axis = np.asarray(axis, dtype=np.float64)
+            self.codec = codec
+            self.mantissa_bits = mantissa_bits
+            self.path.mkdir(parents=True, exist_ok=True)
+            settings.write_text(json.dumps({'version': _FORMAT_VERSION, 'codec': codec,
+                                            'mantissa_bits': mantissa_bits,
+                                            'axis': self.axis.tolist()}), encoding='utf-8')
+        self._chunks_path = self.path / "chunks.bin"
+        self._index_path = self.path / "index.bin"
+        self.index = self._load_index()
+        self._buffers: Dict[bytes, _Buffer] = {}
+        self._chunks = None
+        self._index_file = None
+
+    def _load_index(self) -> np.ndarray:
+        """
+        Index records whose chunk was completely written
+
+        Records left by an interrupted write are cut from the index file.
+        """
+        if not self._index_path.exists():
+            return np.empty(0, dtype=INDEX_DTYPE)
+        raw = self._index_path.read_bytes()
+        index = np.frombuffer(raw[:len(raw) - len(raw) % INDEX_DTYPE.itemsize], dtype=INDEX_DTYPE)
+        size = self._chunks_path.stat().st_size if self._chunks_path.exists() else 0
+        index = index[np.cumprod(index['offset'] + index['length'] <= size, dtype=bool)].copy()
+        if index.nbytes != len(raw):
+            os.truncate(self._index_path, index.nbytes)
+        return index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Writing
+
+    @staticmethod
+    def _key(serial: str) -> bytes:
+        key = serial.encode('utf-8')
+        if len(key) > SERIAL_LENGTH:
+            raise ValueError(f"Serial {serial!r} longer than {SERIAL_LENGTH} bytes")
+        return key
+
+    def append(self, serial: str, spectrum: np.ndarray, timestamp: Optional[float] = None):
+        """
+        Add one spectrum of a device
+
+        Args:
+            serial: Device serial number
+            spectrum: Spectral values, one per axis value
+            timestamp: Acquisition time in seconds since the epoch (None: now);
+                non-decreasing per device
+        """
+        key = self._key(serial)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = _Buffer(self.chunk_rows, self.axis.size)
+        index = buffer.size
+        buffer.timestamps[index] = time.time() if timestamp is None else timestamp
+        buffer.spectra[index] = spectrum
+        buffer.size = index + 1
+        if buffer.size == self.chunk_rows:
+            self._write(key, buffer)
+
+    def extend(self, serial: str, spectra: np.ndarray, timestamps: np.ndarray):
+        """Add spectra of a device, shape (N, len(axis)), with N timestamps"""
+        for spectrum, timestamp in zip(spectra, timestamps):
+            self.append(serial, spectrum, float(timestamp))
+
+    def _write(self, key: bytes, buffer: _Buffer):
+        rows = buffer.size
+        if not rows:
+            return
+        data = encode_chunk(buffer.timestamps[:rows], buffer.spectra[:rows], self.codec, self.level,
+                            self.mantissa_bits)
+        if self._chunks is None:
+            self._chunks = open(self._chunks_path, 'ab')
+            self._index_file = open(self._index_path, 'ab')
+        offset = self._chunks.seek(0, os.SEEK_END)
+        self._chunks.write(data)
+        self._chunks.flush()
+        record = np.array([(buffer.timestamps[:rows].min(), buffer.timestamps[:rows].max(), key,
+                            offset, len(data), rows)], dtype=INDEX_DTYPE)
+        self._index_file.write(record.tobytes())
+        self._index_file.flush()
+        self.index = np.concatenate((self.index, record))
+        buffer.size = 0
+
+    def flush(self):
+        """Write the buffered spectra of every device as chunks"""
+        for key, buffer in self._buffers.items():
+            self._write(key, buffer)
+
+    def close(self):
+        """Write the buffered spectra and close the files"""
+        self.flush()
+        if self._chunks is not None:
+            self._chunks.close()
+            self._index_file.close()
+            self._chunks = self._index_file = None
+
+    # ------------------------------------------------------------------
+    # Reading
+
+    def serials(self) -> List[str]:
+        """Serials of the devices in the store"""
+        keys = set(self.index['serial'].tolist()) | {key for key, buffer in self._buffers.items()
+                                                     if buffer.size}
+        return sorted(key.decode('utf-8') for key in keys)
+
+    def chunks(self, serial: str, start: float = -np.inf, end: float = np.inf) -> np.ndarray:
+        """Index records of the chunks of a device overlapping [start, end]"""
+        index = self.index
+        selected = (index['serial'] == self._key(serial)) & (index['end'] >= start) & (index['start'] <= end)
+        return index[selected]
+
+    def query(self, serial: str, start: float = -np.inf,
+              end: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Spectra of a device acquired in [start, end]
+
+        Args:
+            serial: Device serial number
+            start, end: Time range in seconds since the epoch
+
+        Returns:
+            timestamps (N,) and spectra (N, len(axis)), in acquisition order
+        """
+        records = self.chunks(serial, start, end)
+        timestamps = []
+        spectra = []
+        if len(records):
+            with open(self._chunks_path, 'rb') as file:
+                for record in records:
+                    file.seek(int(record['offset']))
+                    chunk_times, chunk_spectra = decode_chunk(
+                        file.read(int(record['length'])), int(record['rows']), self.axis.size, self.codec)
+                    self.chunks_read += 1
+                    selected = (chunk_times >= start) & (chunk_times <= end)
+                    timestamps.append(chunk_times[selected])
+                    spectra.append(chunk_spectra[selected])
+        buffer = self._buffers.get(self._key(serial))
+        if buffer is not None and buffer.size:
+            buffered = buffer.timestamps[:buffer.size]
+            selected = (buffered >= start) & (buffered <= end)
+            timestamps.append(buffered[selected].copy())
+            spectra.append(buffer.spectra[:buffer.size][selected])
+        if not timestamps:
+            return np.empty(0), np.empty((0, self.axis.size), dtype=np.float32)
+        return np.concatenate(timestamps), np.concatenate(spectra)
+
+    def stats(self) -> StoreStats:
+        """Chunk count, stored rows and the compression ratio (raw / stored bytes)"""
+        rows = int(self.index['rows'].sum())
+        raw = rows * (self.axis.size * 4 + 8)
+        stored = int(self.index['length'].sum())
+        return StoreStats(len(self.index), rows, raw, stored, raw / stored if stored else 0.0,
+                          self.chunks_read)
@@ -0,0 +1,186 @@
+"""
+Flicker-synchronised acquisition on JetiRadioEx
+
+PWM-driven and mains-powered sources modulate their output. A scan whose
+integration time is not a whole number of modulation periods sees a
+phase-dependent share of the light, so repeated readings scatter and the
+average converges slowly. SyncAcquisition detects the flicker frequency once
+per source, rounds the integration time to whole periods, enables the
+device's sync mode and runs back-to-back scans until the running mean is
+stable.
+"""
+
+import ctypes
+import math
+import time
+from ctypes import c_float
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .wrapper import _check_error
+
+
+class SyncResult(NamedTuple):
+    """Result of SyncAcquisition.run()"""
+    radiometric: float
+    spectrum: Optional[np.ndarray]
+    relative_error: float
+    scans: int
+    stable: bool
+    time_to_stable: Optional[float]
+    frequency: float
+    integration_time: float
+
+
+def whole_periods(integration_time: float, frequency: float) -> float:
+    """
+    Largest whole number of flicker periods within an integration time (at least one)
+
+    Args:
+        integration_time: Integration time in ms
+        frequency: Flicker frequency in Hz (0 returns integration_time unchanged)
+
+    Returns:
+        Integration time in ms
+    """
+    if frequency <= 0.0:
+        return integration_time
+    period = 1000.0 / frequency
+    return max(math.floor(integration_time / period + 1e-9), 1) * period
+
+
+class SyncAcquisition:
+    """
+    Back-to-back synchronised scans until the reading is stable
+
+    Example:
+        acquisition = device.create_sync_acquisition('PWM panel')
+        result = acquisition.run(tolerance=1e-3)
+        print(result.radiometric, result.scans, result.time_to_stable)
+    """
+
+    def __init__(self, device, source=None, frequency: Optional[float] = None,
+                 integration_time: Optional[float] = None,
+                 wavelength_range: Tuple[int, int] = (380, 780),
+                 synchronize: bool = True, poll_interval: float = 0.001):
+        """
+        Args:
+            device: Opened JetiRadioEx
+            source: Key of the light source for the flicker frequency cache
+            frequency: Flicker frequency in Hz (None detects it with
+                device.detect_flicker_frequency(source))
+            integration_time: Integration time in ms before rounding to whole
+                periods (None uses the time chosen by an automatic measurement)
+            wavelength_range: (begin, end) in nm of the radiometric value and spectrum
+            synchronize: Use sync mode and whole periods (False runs free scans
+                with the same integration time, for comparison)
+            poll_interval: Time between status checks in seconds
+        """
+        self._device = device
+        self.source = source
+        self.wavelength_range = tuple(wavelength_range)
+        self.synchronize = synchronize
+        self.poll_interval = poll_interval
+        device.spectral_axis.validate(*self.wavelength_range)
+
+        setup_start = time.perf_counter()
+        if frequency is None:
+            frequency = device.detect_flicker_frequency(source) if synchronize else 0.0
+        self.frequency = frequency
+        if integration_time is None:
+            integration_time = self._auto_integration_time()
+        self.integration_time = (whole_periods(integration_time, frequency)
+                                 if synchronize else integration_time)
+        self.setup_time = time.perf_counter() - setup_start
+
+    def _auto_integration_time(self) -> float:
+        """Integration time chosen by one automatic measurement (JETI_GetTint)"""
+        self._device.measure(0.0, 1)
+        self._wait(0.0)
+        tint = c_float()
+        error = self._device.core.JETI_GetTint(self._device._device_handle, ctypes.byref(tint))
+        _check_error(error, "JETI_GetTint")
+        return tint.value
+
+    def _wait(self, exposure: float):
+        if exposure > 0.0:
+            time.sleep(exposure)
+        while self._device.get_measure_status():
+            time.sleep(self.poll_interval)
+
+    def scan(self, spectrum: bool = False) -> Tuple[float, Optional[np.ndarray]]:
+        """
+        One scan with the synchronised integration time
+
+        Args:
+            spectrum: Also read the spectral radiance
+
+        Returns:
+            (radiometric value, spectral radiance or None)
+        """
+        self._device.measure(self.integration_time, 1)
+        self._wait(self.integration_time / 1000.0)
+        begin, end = self.wavelength_range
+        radio = self._device.get_radiometric_value(begin, end)
+        sprad = self._device.get_spectral_radiance(begin, end) if spectrum else None
+        return radio, sprad
+
+    def run(self, tolerance: float = 1e-3, min_scans: int = 3, max_scans: int = 100,
+            spectrum: bool = False) -> SyncResult:
+        """
+        Scan back-to-back until the running mean is stable
+
+        The reading is stable when the standard error of the mean radiometric
+        value relative to the mean is at most `tolerance`.
+
+        Args:
+            tolerance: Relative standard error of the mean to reach
+            min_scans: Minimum number of scans
+            max_scans: Maximum number of scans
+            spectrum: Also average the spectral radiance
+
+        Returns:
+            SyncResult (time_to_stable in seconds, None if never stable)
+        """
+        synced = self.synchronize and self.frequency > 0.0
+        if synced:
+            self._device.set_sync_frequency(self.frequency)
+            self._device.set_sync_mode(True)
+
+        start = time.perf_counter()
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        spectrum_sum = None
+        relative_error = math.inf
+        time_to_stable = None
+        try:
+            while count < max_scans:
+                radio, sprad = self.scan(spectrum)
+                # Welford update of mean and sum of squared deviations
+                count += 1
+                delta = radio - mean
+                mean += delta / count
+                m2 += delta * (radio - mean)
+                if sprad is not None:
+                    spectrum_sum = sprad if spectrum_sum is None else spectrum_sum + sprad
+                if count >= max(min_scans, 2) and mean != 0.0:
+                    relative_error = math.sqrt(m2 / (count - 1) / count) / abs(mean)
+                    if relative_error <= tolerance:
+                        time_to_stable = time.perf_counter() - start
+                        break
+        finally:
+            if synced:
+                self._device.set_sync_mode(False)
+
+        return SyncResult(
+            radiometric=mean,
+            spectrum=spectrum_sum / count if spectrum_sum is not None else None,
+            relative_error=relative_error,
+            scans=count,
+            stable=time_to_stable is not None,
+            time_to_stable=time_to_stable,
+            frequency=self.frequency,
+            integration_time=self.integration_time,
+        )
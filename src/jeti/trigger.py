@@ -0,0 +1,259 @@
+"""
+Hardware-trigger burst capture
+
+For flash and strobe sources the exposure must start on the trigger input,
+not on a software call. TriggerCapture arms the device (JETI_InitMeasure in
+trigger mode, or JETI_PreTrigMeasure), blocks in JETI_WaitReadTrigger until
+the triggered scan has been read, re-arms immediately and hands the raw
+counts to a queue. A consumer thread takes readouts from the queue, so
+processing never delays the next arm.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from ctypes import c_int32
+from typing import Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from .config import DeviceConfig
+from .wrapper import JetiError, _check_error
+
+
+class TriggeredReadout(NamedTuple):
+    """Raw counts of one triggered scan"""
+    index: int
+    trigger_time: float
+    readout_time: float
+    counts: np.ndarray
+
+    @property
+    def latency(self) -> float:
+        """
+        Exposure plus host overhead in seconds
+
+        Time from the estimated trigger edge (see TriggerCapture) to the
+        readout being queued: the configured exposure, then re-arm, copy and
+        queueing on the host. The scan transfer inside JETI_WaitReadTrigger is
+        not included, as the edge is not timestamped by the device.
+        """
+        return self.readout_time - self.trigger_time
+
+
+def _latency_stats(latencies) -> Dict[str, float]:
+    if not latencies:
+        return {'count': 0}
+    values = np.fromiter(latencies, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(values.max()),
+    }
+
+
+class TriggerCapture:
+    """
+    Trigger-armed capture with queued readout
+
+    The trigger edge time is not reported by the device. trigger_time is an
+    estimate: the return of JETI_WaitReadTrigger minus the configured exposure
+    (integration time × average). Latencies are therefore the configured
+    exposure plus the host overhead after the scan arrived, not a measured
+    edge-to-data time.
+
+    Example:
+        with device.create_trigger_capture(integration_time=5.0) as capture:
+            for _ in range(100):
+                readout = capture.get(timeout=1.0)
+                process(readout.counts)
+        print(capture.latency_stats())
+    """
+
+    # Number of latencies kept for the statistics
+    HISTORY = 10000
+
+    def __init__(self, device, trigger_mode: int = 1, pre_trigger: bool = False,
+                 timeout: float = 0.1, queue_size: int = 256,
+                 integration_time: Optional[float] = None,
+                 average: Optional[int] = None):
+        """
+        Args:
+            device: Opened wrapper object (any class with a core property)
+            trigger_mode: Mode written with JETI_SetTrigger while capturing
+            pre_trigger: Arm with JETI_PreTrigMeasure instead of JETI_InitMeasure
+            timeout: Time in seconds JETI_WaitReadTrigger blocks before the
+                capture thread checks for stop() and waits again; it holds the
+                handle lock meanwhile, so a call on the device from another
+                thread waits up to this long (see jeti.locking)
+            queue_size: Maximum number of readouts waiting for the consumer;
+                further readouts are dropped (and counted) rather than delaying
+                the next arm
+            integration_time: Integration time in ms (None keeps the device configuration)
+            average: Number of averages (None keeps the device configuration)
+        """
+        self._device = device
+        self.trigger_mode = trigger_mode
+        self.pre_trigger = pre_trigger
+        self.timeout_ms = max(int(timeout * 1000), 1)
+        self.queue_size = queue_size
+        self.queue: queue.Queue = queue.Queue()
+
+        config = DeviceConfig(device)
+        recipe = {}
+        if integration_time is not None:
+            recipe['integration_time'] = integration_time
+        if average is not None:
+            recipe['average'] = average
+        config.apply(recipe)
+        values = config.read(('integration_time', 'average'))
+        self.exposure = values['integration_time'] * values['average'] / 1000.0
+
+        self._buffer = (c_int32 * device.spectral_axis.pixel_count)()
+        self._counts = np.ctypeslib.as_array(self._buffer)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+        # Counters are written by the capture thread and read by others
+        self._lock = threading.Lock()
+        self.captured = 0
+        self.dropped = 0
+        self.timeouts = 0
+        self._latencies: deque = deque(maxlen=self.HISTORY)
+        self._delivery: deque = deque(maxlen=self.HISTORY)
+
+    # Library and handle are read from the device when a capture starts, so a
+    # capture object keeps working after the device was reopened
+    @property
+    def _core(self):
+        return self._device.core
+
+    @property
+    def _handle(self):
+        return self._device._device_handle
+
+    def _arm(self, core, handle):
+        if self.pre_trigger:
+            error = core.JETI_PreTrigMeasure(handle)
+            _check_error(error, "JETI_PreTrigMeasure")
+        else:
+            error = core.JETI_InitMeasure(handle)
+            _check_error(error, "JETI_InitMeasure")
+
+    def _run(self):
+        core = self._core
+        handle = self._handle
+        wait_read = core.JETI_WaitReadTrigger
+        buffer = self._buffer
+        try:
+            self._arm(core, handle)
+            while not self._stop.is_set():
+                error = wait_read(handle, buffer, self.timeout_ms)
+                if error == JetiError.TIMEOUT:
+                    with self._lock:
+                        self.timeouts += 1
+                    continue
+                _check_error(error, "JETI_WaitReadTrigger")
+                trigger_time = time.perf_counter() - self.exposure
+                # Re-arm first: the buffer is only written by the next
+                # JETI_WaitReadTrigger, so copying after the arm is safe and
+                # no edge is missed while the copy runs
+                self._arm(core, handle)
+                counts = self._counts.copy()
+                with self._lock:
+                    index = self.captured
+                    self.captured += 1
+                    full = self.queue.qsize() >= self.queue_size
+                    if full:
+                        self.dropped += 1
+                readout = TriggeredReadout(index, trigger_time, time.perf_counter(), counts)
+                self._latencies.append(readout.latency)
+                if not full:
+                    self.queue.put(readout)
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            # End marker for the consumer
+            self.queue.put(None)
+
+    def start(self):
+        """Enable trigger mode and start the capture thread"""
+        if self._thread is not None:
+            raise RuntimeError("capture already started")
+        error = self._core.JETI_SetTrigger(self._handle, self.trigger_mode)
+        _check_error(error, "JETI_SetTrigger")
+        self._thread = threading.Thread(target=self._run, name="TriggerCapture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop capturing, cancel the armed measurement and disable trigger mode"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        error = self._core.JETI_Break(self._handle)
+        _check_error(error, "JETI_Break")
+        error = self._core.JETI_SetTrigger(self._handle, 0)
+        _check_error(error, "JETI_SetTrigger")
+
+    def get(self, timeout: Optional[float] = None) -> Optional[TriggeredReadout]:
+        """
+        Next readout from the queue (consumer side)
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            TriggeredReadout, or None once the capture has stopped and the
+            queue is drained
+
+        Raises:
+            JetiException: If the capture thread stopped on an error
+            queue.Empty: If no readout arrived within the timeout
+        """
+        readout = self.queue.get(timeout=timeout)
+        if readout is None:
+            # Keep the end marker for further calls
+            self.queue.put(None)
+            if self.error is not None:
+                raise self.error
+            return None
+        self._delivery.append(time.perf_counter() - readout.trigger_time)
+        return readout
+
+    def __iter__(self) -> Iterator[TriggeredReadout]:
+        while True:
+            readout = self.get()
+            if readout is None:
+                return
+            yield readout
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Latency statistics in seconds, from the estimated trigger edge
+
+        Both include the configured exposure (see TriggeredReadout.latency).
+
+        Returns:
+            {'queued': exposure + host overhead until the readout was queued,
+            'delivered': exposure + host overhead until the consumer took it};
+            each with count, mean, p50, p95, p99, max
+        """
+        return {
+            'queued': _latency_stats(self._latencies),
+            'delivered': _latency_stats(self._delivery),
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
@@ -8,15 +8,25 @@ Date: 2025
 """
 
 import ctypes
+import os
+from array import array
+from collections import deque
 from ctypes import (
     c_uint32, c_int32, c_float, c_double, c_char_p, c_void_p, c_bool,
     c_uint16, c_uint8, POINTER, c_ulonglong, c_wchar_p
 )
 import numpy as np
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict
 from enum import IntEnum
 
+from . import _signatures
+from .locking import LockedLibrary, handle_lock, LockStats
+from .registry import BoundLibrary
+from .results import RadiometricResult
+
 
 def _get_dll_path(dll_name: str) -> Path:
     """
@@ -91,67 +101,445 @@ class JetiException(Exception):
         super().__init__(self.message)
 
 
+class ConnectionType(IntEnum):
+    """Connection types reported by JETI_GetDeviceInfoEx (bConnType)"""
+    COM = 0
+    USB = 1
+    TCP = 2
+    BLUETOOTH = 3
+    BLUETOOTH_LE = 4
+
+
 def _check_error(error_code: int, function_name: str = ""):
     """Check error code and raise exception if not successful"""
     if error_code != JetiError.SUCCESS:
         raise JetiException(error_code, f"in {function_name}" if function_name else "")
 
 
-class JetiCore:
+# The DLLs take file names as ANSI char *; os.fsencode would give UTF-8 on Windows
+_WINDOWS = os.name == 'nt'
+_ANSI_CODEC = 'mbcs'
+
+
+def _ansi_path(path) -> bytes:
     """
-    Core functionality for JETI devices
-    Provides low-level device communication and control
+    Encode a file path for a DLL char * argument
+    
+    On Windows the path is encoded in the ANSI code page; elsewhere as the
+    file system encoding.
+    
+    Raises:
+        ValueError: The path contains characters the ANSI code page lacks
+    """
+    path = os.fspath(path)
+    if isinstance(path, bytes):
+        return path
+    if not _WINDOWS:
+        return os.fsencode(path)
+    try:
+        return path.encode(_ANSI_CODEC, 'strict')
+    except UnicodeEncodeError as exc:
+        raise ValueError(f"Path {path!r} cannot be encoded in the ANSI code page") from exc
+
+
+@dataclass(frozen=True)
+class DeviceInfo:
     """
+    Connection details of an enumerated device (JETI_GetDeviceInfoEx)
+    
+    Attributes:
+        number: Device number in the enumeration it was read from
+        serial: Device serial number
+        connection: ConnectionType value
+        device_type: Device type code
+        com_port: COM port number (COM connections)
+        baudrate: Baudrate (COM connections)
+        ip_address: IP address (TCP connections)
+        usb_serial: FTDI serial number of the USB interface (USB connections)
+        bt_address: Bluetooth address (Bluetooth connections)
+        btle_path: Device path (Bluetooth LE connections)
+    """
+    number: int
+    serial: str
+    connection: int
+    device_type: int = 0
+    com_port: int = 0
+    baudrate: int = 0
+    ip_address: str = ""
+    usb_serial: str = ""
+    bt_address: int = 0
+    btle_path: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class SpectralAxis:
+    """
+    Immutable spectral axis of an opened device
+    
+    Built once per device from JETI_GetCalibRange, JETI_GetWranConf and
+    JETI_GetPixel. Wavelength grids are cached and returned read-only, so a
+    single array is shared by every spectrum measured over the same range.
     
-    def __init__(self, dll_path: Optional[str] = None):
+    Attributes:
+        calib_begin, calib_end, calib_step: Calibrated wavelength range in nm
+        range_begin, range_end, range_step: Configured wavelength range in nm
+        pixel_count: Number of sensor pixels
+    """
+    calib_begin: int
+    calib_end: int
+    calib_step: int
+    range_begin: int
+    range_end: int
+    range_step: int
+    pixel_count: int
+    _grids: Dict[Tuple[float, float, float], np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    @staticmethod
+    def num_points(wavelength_start: float, wavelength_end: float,
+                   step: float = 1.0) -> int:
         """
-        Initialize JETI Core wrapper
+        Number of values the SDK returns for a wavelength range
         
-        Args:
-            dll_path: Path to jeti_core64.dll. If None, looks in package dlls/ folder
+        Uses a small tolerance so float steps (e.g. 0.1 nm) do not lose the
+        last point to rounding, as int((end - start) / step) + 1 does.
+        """
+        return int(math.floor((wavelength_end - wavelength_start) / step + 1e-9)) + 1
+    
+    def validate(self, wavelength_start: float, wavelength_end: float,
+                 step: float = 1.0):
         """
-        if dll_path is None:
-            dll_path = str(_get_dll_path("jeti_core64.dll"))
+        Check a requested wavelength range against the calibrated range
         
-        self._dll = ctypes.WinDLL(dll_path)
-        self._device_handle = None
-        self._setup_functions()
+        Raises:
+            JetiException: INVALID_STEPWIDTH or ERROR_PARAMETER, without any DLL call
+        """
+        if not step > 0:
+            raise JetiException(JetiError.INVALID_STEPWIDTH, f"step {step} nm must be positive")
+        if wavelength_start > wavelength_end:
+            raise JetiException(
+                JetiError.ERROR_PARAMETER,
+                f"wavelength start {wavelength_start} nm is above end {wavelength_end} nm"
+            )
+        if wavelength_start < self.calib_begin or wavelength_end > self.calib_end:
+            raise JetiException(
+                JetiError.ERROR_PARAMETER,
+                f"wavelength range {wavelength_start}-{wavelength_end} nm outside "
+                f"calibrated range {self.calib_begin}-{self.calib_end} nm"
+            )
+    
+    def grid(self, wavelength_start: float, wavelength_end: float,
+             step: float = 1.0) -> np.ndarray:
+        """
+        Get the wavelength grid for a range (validated, cached, read-only)
+        
+        Args:
+            wavelength_start: Start wavelength in nm
+            wavelength_end: End wavelength in nm
+            step: Step width in nm
+            
+        Returns:
+            Read-only numpy array of wavelengths in nm
+        """
+        key = (float(wavelength_start), float(wavelength_end), float(step))
+        wavelengths = self._grids.get(key)
+        if wavelengths is None:
+            self.validate(wavelength_start, wavelength_end, step)
+            count = self.num_points(wavelength_start, wavelength_end, step)
+            wavelengths = wavelength_start + step * np.arange(count, dtype=np.float64)
+            wavelengths.flags.writeable = False
+            self._grids[key] = wavelengths
+        return wavelengths
+    
+    @property
+    def wavelengths(self) -> np.ndarray:
+        """Wavelength grid of the configured range (read-only)"""
+        return self.grid(self.range_begin, self.range_end, self.range_step)
+
+
+_shared_core_dll = None
+
+
+def _core_library() -> BoundLibrary:
+    """
+    Get the core DLL shared by all wrappers
+    
+    The core DLL is loaded once per process and bound lazily from the
+    jeti_core.h signature table; its functions accept the device handles
+    returned by the higher-level DLLs.
+    """
+    global _shared_core_dll
+    if _shared_core_dll is None:
+        dll = ctypes.WinDLL(str(_get_dll_path("jeti_core64.dll")))
+        _shared_core_dll = BoundLibrary(dll, _signatures.CORE)
+    return _shared_core_dll
+
+
+def _load_library(dll_name: str, dll_path: Optional[str] = None, dll=None):
+    """
+    Load one of the JETI DLLs
+    
+    Args:
+        dll_name: DLL file name (e.g. 'jeti_radio_ex64.dll')
+        dll_path: Explicit path to the DLL, or None for the package dlls/ folder
+        dll: Already loaded library to use as is (e.g. jeti.simulator.SimulatedSDK)
+    """
+    if dll is not None:
+        return dll
+    if dll_path is None:
+        dll_path = str(_get_dll_path(dll_name))
+    return ctypes.WinDLL(dll_path)
+
+
+def _preloaded_core(dll) -> Optional[BoundLibrary]:
+    """Bind the core functions of a preloaded library that also exports them"""
+    if dll is not None and hasattr(dll, "JETI_InitMeasure"):
+        return LockedLibrary(BoundLibrary(dll, _signatures.CORE))
+    return None
+
+
+class _CoreAccess:
+    """
+    Core DLL access for an opened device handle
+    Provides the calibrated range and the cached SpectralAxis
+    """
+    
+    _device_handle = None
+    _core_dll = None
+    _spectral_axis: Optional[SpectralAxis] = None
+    _retry_policy = None
     
-    def _setup_functions(self):
-        """Setup function signatures for the DLL"""
-        # Device handling
-        self._dll.JETI_GetNumDevices.argtypes = [POINTER(c_uint32)]
-        self._dll.JETI_GetNumDevices.restype = c_uint32
+    @property
+    def core(self) -> BoundLibrary:
+        """
+        Core DLL bound to the full jeti_core.h surface
         
-        self._dll.JETI_GetSerialDevice.argtypes = [c_uint32, c_char_p, c_char_p, c_char_p]
-        self._dll.JETI_GetSerialDevice.restype = c_uint32
+        Functions are bound on first use and accept this object's device
+        handle, e.g. device.core.JETI_GetTemperature(handle, byref(temp)).
+        """
+        if self._core_dll is None:
+            self._core_dll = LockedLibrary(_core_library())
+            if self._retry_policy is not None:
+                from .retry import RetryingLibrary
+                self._core_dll = RetryingLibrary(self._core_dll, self._retry_policy)
+        return self._core_dll
+    
+    @property
+    def retry_policy(self):
+        """RetryPolicy applied to DLL calls (None if calls are not retried)"""
+        return self._retry_policy
+    
+    def set_retry_policy(self, policy):
+        """
+        Retry transient errors (BUSY, TIMEOUT, ...) of idempotent DLL calls
         
-        self._dll.JETI_OpenDevice.argtypes = [c_uint32, POINTER(c_void_p)]
-        self._dll.JETI_OpenDevice.restype = c_uint32
+        Args:
+            policy: jeti.retry.RetryPolicy, or None to stop retrying
+        """
+        from .retry import RetryingLibrary
+        
+        def unwrap(library):
+            return library.library if isinstance(library, RetryingLibrary) else library
+        
+        shared = self._core_dll is self._dll
+        self._dll = unwrap(self._dll)
+        self._core_dll = self._dll if shared else unwrap(self._core_dll)
+        if policy is not None:
+            self._dll = RetryingLibrary(self._dll, policy)
+            if shared:
+                self._core_dll = self._dll
+            elif self._core_dll is not None:
+                self._core_dll = RetryingLibrary(self._core_dll, policy)
+        self._retry_policy = policy
+
+    def lock_stats(self) -> LockStats:
+        """
+        Contention counters of the opened device's handle lock
+
+        DLL calls on one handle are serialised (see jeti.locking); all
+        wrappers using the same handle share the lock and its counters.
+        Reading them does not wait for a call holding the lock.
+        """
+        if self._device_handle is None:
+            raise JetiException(JetiError.INVALID_HANDLE, "device not open")
+        return handle_lock(self._device_handle).stats()
+
+    def get_calib_range(self) -> Tuple[int, int, int]:
+        """Get calibrated wavelength range (begin, end, step) in nm"""
+        begin = c_uint32()
+        end = c_uint32()
+        step = c_uint32()
+        error = self.core.JETI_GetCalibRange(
+            self._device_handle, ctypes.byref(begin), ctypes.byref(end), ctypes.byref(step)
+        )
+        _check_error(error, "JETI_GetCalibRange")
+        return (begin.value, end.value, step.value)
+    
+    def get_wavelength_range(self) -> Tuple[int, int, int]:
+        """Get configured wavelength range (begin, end, step) in nm"""
+        begin = c_uint32()
+        end = c_uint32()
+        step = c_uint32()
+        error = self.core.JETI_GetWranConf(
+            self._device_handle, ctypes.byref(begin), ctypes.byref(end), ctypes.byref(step)
+        )
+        _check_error(error, "JETI_GetWranConf")
+        return (begin.value, end.value, step.value)
+    
+    def set_trigger_mode(self, mode: int):
+        """
+        Set trigger mode (JETI_SetTrigger)
         
-        self._dll.JETI_OpenCOMDevice.argtypes = [c_uint32, c_uint32, POINTER(c_void_p)]
-        self._dll.JETI_OpenCOMDevice.restype = c_uint32
+        Args:
+            mode: 0 = no trigger, 1 = measurements wait for the trigger input
+        """
+        error = self.core.JETI_SetTrigger(self._device_handle, mode)
+        _check_error(error, "JETI_SetTrigger")
+    
+    def get_trigger_timeout(self) -> int:
+        """Get trigger timeout in ms"""
+        timeout = c_uint16()
+        error = self.core.JETI_GetTrigTimeout(self._device_handle, ctypes.byref(timeout))
+        _check_error(error, "JETI_GetTrigTimeout")
+        return timeout.value
+    
+    def set_trigger_timeout(self, timeout: int):
+        """Set trigger timeout in ms (0 waits indefinitely)"""
+        error = self.core.JETI_SetTrigTimeout(self._device_handle, timeout)
+        _check_error(error, "JETI_SetTrigTimeout")
+    
+    def get_optical_trigger(self) -> bool:
+        """Get state of the optical trigger (JETI_GetOptTrigg)"""
+        state = c_int32()
+        error = self.core.JETI_GetOptTrigg(self._device_handle, ctypes.byref(state))
+        _check_error(error, "JETI_GetOptTrigg")
+        return bool(state.value)
+    
+    def set_flash(self, interval: float, pulse_length: float):
+        """
+        Set flash timing (JETI_SetFlash)
         
-        self._dll.JETI_CloseDevice.argtypes = [c_void_p]
-        self._dll.JETI_CloseDevice.restype = c_uint32
+        Args:
+            interval: Flash interval in ms
+            pulse_length: Flash pulse length in ms
+        """
+        error = self.core.JETI_SetFlash(self._device_handle, interval, pulse_length)
+        _check_error(error, "JETI_SetFlash")
+    
+    def set_flash_mode(self, enable: bool):
+        """Enable or disable flash mode (JETI_SetFlashMode)"""
+        error = self.core.JETI_SetFlashMode(self._device_handle, 1 if enable else 0)
+        _check_error(error, "JETI_SetFlashMode")
+    
+    def import_slm(self, matrix_file: str):
+        """
+        Import a stray-light matrix file into the core DLL (JETI_ImportSLM)
         
-        self._dll.JETI_GetIdentifier.argtypes = [c_void_p, c_char_p]
-        self._dll.JETI_GetIdentifier.restype = c_uint32
+        Args:
+            matrix_file: Path of the matrix file
         
-        self._dll.JETI_Reset.argtypes = [c_void_p]
-        self._dll.JETI_Reset.restype = c_uint32
+        Raises:
+            ValueError: On Windows, the path is not representable in the ANSI code page
+        """
+        error = self.core.JETI_ImportSLM(_ansi_path(matrix_file))
+        _check_error(error, "JETI_ImportSLM")
+    
+    def ignore_slm(self, ignore: bool):
+        """Ignore imported stray-light matrices (JETI_IgnoreSLM)"""
+        error = self.core.JETI_IgnoreSLM(1 if ignore else 0)
+        _check_error(error, "JETI_IgnoreSLM")
+    
+    def set_slm_enable(self, enable: bool):
+        """Enable or disable the stray-light correction of the device"""
+        error = self.core.JETI_SetSLMEnable(self._device_handle, 1 if enable else 0)
+        _check_error(error, "JETI_SetSLMEnable")
+    
+    def get_slm_enable(self) -> bool:
+        """Get state of the stray-light correction"""
+        enable = c_uint8()
+        error = self.core.JETI_GetSLMEnable(self._device_handle, ctypes.byref(enable))
+        _check_error(error, "JETI_GetSLMEnable")
+        return bool(enable.value)
+    
+    def pre_trigger_measure(self):
+        """Arm a measurement with pre-trigger (JETI_PreTrigMeasure)"""
+        error = self.core.JETI_PreTrigMeasure(self._device_handle)
+        _check_error(error, "JETI_PreTrigMeasure")
+    
+    @property
+    def spectral_axis(self) -> SpectralAxis:
+        """
+        Spectral axis of the opened device
         
-        self._dll.JETI_GetPixel.argtypes = [c_void_p, POINTER(c_uint32)]
-        self._dll.JETI_GetPixel.restype = c_uint32
+        Queried once after the device is opened and reused until it is closed.
+        """
+        if self._spectral_axis is None:
+            if self._device_handle is None:
+                raise JetiException(JetiError.INVALID_HANDLE, "device not open")
+            pixel_count = c_uint32()
+            error = self.core.JETI_GetPixel(self._device_handle, ctypes.byref(pixel_count))
+            _check_error(error, "JETI_GetPixel")
+            self._spectral_axis = SpectralAxis(
+                *self.get_calib_range(), *self.get_wavelength_range(), pixel_count.value
+            )
+        return self._spectral_axis
+    
+    def create_acquisition(self, quantities=('sprad',), **options):
+        """
+        Create a fetch-based acquisition engine for this device
         
-        self._dll.JETI_GetTint.argtypes = [c_void_p, POINTER(c_float)]
-        self._dll.JETI_GetTint.restype = c_uint32
+        Args:
+            quantities: Quantities to fetch after each measurement
+                (see jeti.acquisition.QUANTITIES)
+            **options: integration_time, average, wavelength_range, poll_interval
+            
+        Returns:
+            CoreAcquisition bound to the opened device
+        """
+        from .acquisition import CoreAcquisition
+        return CoreAcquisition(self, quantities, **options)
+    
+    def create_trigger_capture(self, **options):
+        """
+        Create a trigger-armed burst capture for this device
         
-        self._dll.JETI_GetCoreDLLVersion.argtypes = [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]
-        self._dll.JETI_GetCoreDLLVersion.restype = c_uint32
+        Args:
+            **options: trigger_mode, pre_trigger, timeout, queue_size,
+                integration_time, average (see jeti.trigger.TriggerCapture)
+            
+        Returns:
+            TriggerCapture bound to the opened device
+        """
+        from .trigger import TriggerCapture
+        return TriggerCapture(self, **options)
+
+
+class JetiCore(_CoreAccess):
+    """
+    Core functionality for JETI devices
+    Provides low-level device communication and control
+    """
+    
+    def __init__(self, dll_path: Optional[str] = None, dll=None):
+        """
+        Initialize JETI Core wrapper
+        
+        Args:
+            dll_path: Path to jeti_core64.dll. If None, uses the shared core DLL
+                from the package dlls/ folder
+            dll: Already loaded library to use instead (e.g. jeti.simulator.SimulatedSDK)
         
-        self._dll.JETI_GetFirmwareVersion.argtypes = [c_void_p, c_char_p]
-        self._dll.JETI_GetFirmwareVersion.restype = c_uint32
+        Functions are bound lazily from the jeti_core.h signature table.
+        """
+        if dll_path is None and dll is None:
+            self._dll = LockedLibrary(_core_library())
+        else:
+            self._dll = LockedLibrary(BoundLibrary(_load_library("jeti_core64.dll", dll_path, dll),
+                                                   _signatures.CORE))
+        self._core_dll = self._dll
+        self._device_handle = None
+        self._spectral_axis = None
     
     def get_num_devices(self) -> int:
         """Get number of connected JETI devices"""
@@ -185,6 +573,46 @@ class JetiCore:
             device_serial.value.decode('ascii')
         )
     
+    def get_device_info(self, device_num: int) -> DeviceInfo:
+        """
+        Get connection details of an enumerated device (JETI_GetDeviceInfoEx)
+        
+        Args:
+            device_num: Device number (0-based), after get_num_devices()
+            
+        Returns:
+            DeviceInfo
+        """
+        connection = c_uint8()
+        device_type = c_uint8()
+        serial = ctypes.create_string_buffer(16)
+        com_port = c_uint16()
+        baudrate = c_uint32()
+        ip_address = ctypes.create_string_buffer(16)
+        usb_serial = ctypes.create_string_buffer(16)
+        bt_address = c_ulonglong()
+        btle_path = ctypes.create_unicode_buffer(256)
+        
+        error = self._dll.JETI_GetDeviceInfoEx(
+            device_num, ctypes.byref(connection), ctypes.byref(device_type), serial,
+            ctypes.byref(com_port), ctypes.byref(baudrate), ip_address, usb_serial,
+            ctypes.byref(bt_address), btle_path
+        )
+        _check_error(error, "JETI_GetDeviceInfoEx")
+        
+        return DeviceInfo(
+            number=device_num,
+            serial=serial.value.decode('ascii'),
+            connection=connection.value,
+            device_type=device_type.value,
+            com_port=com_port.value,
+            baudrate=baudrate.value,
+            ip_address=ip_address.value.decode('ascii'),
+            usb_serial=usb_serial.value.decode('ascii'),
+            bt_address=bt_address.value,
+            btle_path=btle_path.value,
+        )
+    
     def open_device(self, device_num: int = 0):
         """
         Open a JETI device
@@ -196,6 +624,7 @@ class JetiCore:
         error = self._dll.JETI_OpenDevice(device_num, ctypes.byref(device_handle))
         _check_error(error, "JETI_OpenDevice")
         self._device_handle = device_handle
+        self._spectral_axis = None
     
     def open_com_device(self, com_port: int, baudrate: int = 115200):
         """
@@ -209,6 +638,60 @@ class JetiCore:
         error = self._dll.JETI_OpenCOMDevice(com_port, baudrate, ctypes.byref(device_handle))
         _check_error(error, "JETI_OpenCOMDevice")
         self._device_handle = device_handle
+        self._spectral_axis = None
+    
+    def open_tcp_device(self, ip_address: str):
+        """
+        Open a JETI device by its IP address, without enumerating devices
+        
+        Args:
+            ip_address: IP address, e.g. '192.168.0.20'
+        """
+        device_handle = c_void_p()
+        error = self._dll.JETI_OpenTCPDevice(ip_address.encode('ascii'), ctypes.byref(device_handle))
+        _check_error(error, "JETI_OpenTCPDevice")
+        self._device_handle = device_handle
+        self._spectral_axis = None
+    
+    def open_ftdi_device(self, usb_serial: str):
+        """
+        Open a USB JETI device by the serial number of its FTDI interface,
+        without enumerating devices
+        
+        Args:
+            usb_serial: FTDI serial number (DeviceInfo.usb_serial)
+        """
+        device_handle = c_void_p()
+        error = self._dll.JETI_OpenFTDIDevice(usb_serial.encode('ascii'), ctypes.byref(device_handle))
+        _check_error(error, "JETI_OpenFTDIDevice")
+        self._device_handle = device_handle
+        self._spectral_axis = None
+    
+    def open_bt_device(self, bt_address: int):
+        """
+        Open a Bluetooth JETI device by its address, without enumerating devices
+        
+        Args:
+            bt_address: Bluetooth address (DeviceInfo.bt_address)
+        """
+        device_handle = c_void_p()
+        error = self._dll.JETI_OpenBTDevice(bt_address, ctypes.byref(device_handle))
+        _check_error(error, "JETI_OpenBTDevice")
+        self._device_handle = device_handle
+        self._spectral_axis = None
+    
+    def open_btle_device(self, btle_path: str):
+        """
+        Open a Bluetooth LE JETI device by its device path, without enumerating devices
+        
+        Args:
+            btle_path: Device path (DeviceInfo.btle_path)
+        """
+        device_handle = c_void_p()
+        error = self._dll.JETI_OpenBTLEDevice(btle_path, ctypes.byref(device_handle))
+        _check_error(error, "JETI_OpenBTLEDevice")
+        self._device_handle = device_handle
+        self._spectral_axis = None
     
     def close_device(self):
         """Close the device connection"""
@@ -216,6 +699,7 @@ class JetiCore:
             error = self._dll.JETI_CloseDevice(self._device_handle)
             _check_error(error, "JETI_CloseDevice")
             self._device_handle = None
+            self._spectral_axis = None
     
     def get_identifier(self) -> str:
         """Get device identifier string"""
@@ -275,19 +759,21 @@ class JetiRadio(JetiCore):
     Extends JetiCore with radiometric measurement capabilities
     """
     
-    def __init__(self, dll_path: Optional[str] = None):
+    def __init__(self, dll_path: Optional[str] = None, dll=None):
         """
         Initialize JETI Radio wrapper
         
         Args:
             dll_path: Path to jeti_radio64.dll. If None, looks in package dlls/ folder
+            dll: Already loaded library to use instead (e.g. jeti.simulator.SimulatedSDK);
+                if it also exports the core functions it is used for `core` too
         """
-        if dll_path is None:
-            dll_path = str(_get_dll_path("jeti_radio64.dll"))
-        
-        self._dll = ctypes.WinDLL(dll_path)
+        self._dll = _load_library("jeti_radio64.dll", dll_path, dll)
+        self._core_dll = _preloaded_core(dll)
         self._device_handle = None
+        self._spectral_axis = None
         self._setup_radio_functions()
+        self._dll = LockedLibrary(self._dll)
     
     def _setup_radio_functions(self):
         """Setup function signatures for radio DLL"""
@@ -363,6 +849,7 @@ class JetiRadio(JetiCore):
         error = self._dll.JETI_OpenRadio(device_num, ctypes.byref(device_handle))
         _check_error(error, "JETI_OpenRadio")
         self._device_handle = device_handle
+        self._spectral_axis = None
     
     def close_device(self):
         """Close the device connection"""
@@ -370,6 +857,7 @@ class JetiRadio(JetiCore):
             error = self._dll.JETI_CloseRadio(self._device_handle)
             _check_error(error, "JETI_CloseRadio")
             self._device_handle = None
+            self._spectral_axis = None
     
     def measure(self):
         """Start a radiometric measurement with automatic integration time"""
@@ -460,6 +948,18 @@ class JetiRadio(JetiCore):
             'cri': self.get_cri()
         }
     
+    def get_result(self) -> RadiometricResult:
+        """
+        Get all measurement results as a compact record
+        
+        Returns:
+            RadiometricResult (add it to a jeti.results.ResultBatch to keep many)
+        """
+        x, y = self.get_chromaticity_xy()
+        cri = np.asarray(self.get_cri(), dtype=np.float32)
+        return RadiometricResult(self.get_radiometric_value(), self.get_photometric_value(),
+                                 x, y, self.get_cct(), array('f', cri.tobytes()))
+    
     def get_dll_version(self) -> Tuple[int, int, int]:
         """Get DLL version (major, minor, build)"""
         major = c_uint16()
@@ -478,19 +978,27 @@ class JetiRadioEx(JetiRadio):
     Provides more control over measurement parameters
     """
     
-    def __init__(self, dll_path: Optional[str] = None):
+    # Number of measurement hook errors kept in hook_errors
+    HOOK_ERROR_HISTORY = 100
+    
+    def __init__(self, dll_path: Optional[str] = None, dll=None):
         """
         Initialize JETI Radio Ex wrapper
         
         Args:
             dll_path: Path to jeti_radio_ex64.dll. If None, looks in package dlls/ folder
+            dll: Already loaded library to use instead (e.g. jeti.simulator.SimulatedSDK);
+                if it also exports the core functions it is used for `core` too
         """
-        if dll_path is None:
-            dll_path = str(_get_dll_path("jeti_radio_ex64.dll"))
-        
-        self._dll = ctypes.WinDLL(dll_path)
+        self._dll = _load_library("jeti_radio_ex64.dll", dll_path, dll)
+        self._core_dll = _preloaded_core(dll)
         self._device_handle = None
+        self._spectral_axis = None
+        self._flicker_frequencies: Dict[object, float] = {}
+        self._measurement_hooks: List[Callable[['JetiRadioEx'], object]] = []
+        self.hook_errors: deque = deque(maxlen=self.HOOK_ERROR_HISTORY)
         self._setup_radio_ex_functions()
+        self._dll = LockedLibrary(self._dll)
     
     def _setup_radio_ex_functions(self):
         """Setup function signatures for radio ex DLL"""
@@ -521,6 +1029,12 @@ class JetiRadioEx(JetiRadio):
         self._dll.JETI_SpecRadEx.argtypes = [c_void_p, c_uint32, c_uint32, POINTER(c_float)]
         self._dll.JETI_SpecRadEx.restype = c_uint32
         
+        self._dll.JETI_SaveSpecRadSPCEx.argtypes = [c_void_p, c_uint32, c_uint32, c_char_p, c_char_p, c_char_p]
+        self._dll.JETI_SaveSpecRadSPCEx.restype = c_uint32
+        
+        self._dll.JETI_SaveSpecRadCSVEx.argtypes = [c_void_p, c_uint32, c_uint32, c_char_p, c_char_p, c_char_p]
+        self._dll.JETI_SaveSpecRadCSVEx.restype = c_uint32
+        
         self._dll.JETI_RadioEx.argtypes = [c_void_p, c_uint32, c_uint32, POINTER(c_float)]
         self._dll.JETI_RadioEx.restype = c_uint32
         
@@ -569,6 +1083,7 @@ class JetiRadioEx(JetiRadio):
         error = self._dll.JETI_OpenRadioEx(device_num, ctypes.byref(device_handle))
         _check_error(error, "JETI_OpenRadioEx")
         self._device_handle = device_handle
+        self._spectral_axis = None
     
     def close_device(self):
         """Close the device connection"""
@@ -576,6 +1091,7 @@ class JetiRadioEx(JetiRadio):
             error = self._dll.JETI_CloseRadioEx(self._device_handle)
             _check_error(error, "JETI_CloseRadioEx")
             self._device_handle = None
+            self._spectral_axis = None
     
     def measure(self, integration_time: float = 0.0, average: int = 1, step: int = 1):
         """
@@ -606,6 +1122,43 @@ class JetiRadioEx(JetiRadio):
         error = self._dll.JETI_MeasureBreakEx(self._device_handle)
         _check_error(error, "JETI_MeasureBreakEx")
     
+    def wait_for_measurement(self, poll_interval: float = 0.1, run_hooks: bool = True):
+        """
+        Wait for measurement to complete, then run the measurement hooks
+        
+        A hook that raises does not fail the measurement: the exception is
+        recorded in hook_errors as (hook, exception) and the remaining hooks
+        still run.
+        
+        Args:
+            poll_interval: Time between status checks in seconds
+            run_hooks: False for internal scans (e.g. the scans averaged by
+                measure_to_snr) that hooks should not see
+        """
+        super().wait_for_measurement(poll_interval)
+        if not run_hooks:
+            return
+        for hook in list(self._measurement_hooks):
+            try:
+                hook(self)
+            except Exception as exc:
+                self.hook_errors.append((hook, exc))
+    
+    def add_measurement_hook(self, hook: Callable[['JetiRadioEx'], object]):
+        """
+        Register a callable run with this device after every completed
+        wait_for_measurement() (e.g. a jeti.monitor.DriftMonitor)
+        
+        Args:
+            hook: Called as hook(device); it may read any result of the
+                measurement. Exceptions are recorded in hook_errors.
+        """
+        self._measurement_hooks.append(hook)
+    
+    def remove_measurement_hook(self, hook: Callable[['JetiRadioEx'], object]):
+        """Unregister a measurement hook"""
+        self._measurement_hooks.remove(hook)
+    
     def get_spectral_radiance(self, wavelength_start: int = 380, 
                               wavelength_end: int = 780) -> np.ndarray:
         """
@@ -616,8 +1169,13 @@ class JetiRadioEx(JetiRadio):
             wavelength_end: End wavelength in nm
             
         Returns:
-            numpy array with spectral radiance values
+            numpy array with spectral radiance values (wavelengths: spectral_axis.grid(start, end))
+            
+        Raises:
+            JetiException: If the range is outside the calibrated range
+                (checked against spectral_axis, without a DLL call)
         """
+        self.spectral_axis.validate(wavelength_start, wavelength_end)
         num_values = wavelength_end - wavelength_start + 1
         sprad_array = (c_float * num_values)()
         error = self._dll.JETI_SpecRadEx(
@@ -626,6 +1184,54 @@ class JetiRadioEx(JetiRadio):
         _check_error(error, "JETI_SpecRadEx")
         return np.array([sprad_array[i] for i in range(num_values)])
     
+    def _save_spectral_radiance(self, function: str, path: str, wavelength_start: int,
+                                wavelength_end: int, operator: str, memo: str):
+        self.spectral_axis.validate(wavelength_start, wavelength_end)
+        error = getattr(self._dll, function)(
+            self._device_handle, wavelength_start, wavelength_end, _ansi_path(path),
+            operator.encode('latin-1'), memo.encode('latin-1')
+        )
+        _check_error(error, function)
+    
+    def save_spectral_radiance_csv(self, path: str, wavelength_start: int = 380,
+                                   wavelength_end: int = 780, operator: str = "",
+                                   memo: str = ""):
+        """
+        Save the spectral radiance of the last measurement as a CSV file (JETI_SaveSpecRadCSVEx)
+        
+        Args:
+            path: Output file
+            wavelength_start: Start wavelength in nm
+            wavelength_end: End wavelength in nm
+            operator: Operator name stored in the file
+            memo: Comment stored in the file
+        
+        Raises:
+            ValueError: On Windows, the path is not representable in the ANSI code page
+        """
+        self._save_spectral_radiance("JETI_SaveSpecRadCSVEx", path, wavelength_start,
+                                     wavelength_end, operator, memo)
+    
+    def save_spectral_radiance_spc(self, path: str, wavelength_start: int = 380,
+                                   wavelength_end: int = 780, operator: str = "",
+                                   memo: str = ""):
+        """
+        Save the spectral radiance of the last measurement as a Galactic SPC file
+        (JETI_SaveSpecRadSPCEx)
+        
+        Args:
+            path: Output file
+            wavelength_start: Start wavelength in nm
+            wavelength_end: End wavelength in nm
+            operator: Operator name stored in the file
+            memo: Comment stored in the file
+        
+        Raises:
+            ValueError: On Windows, the path is not representable in the ANSI code page
+        """
+        self._save_spectral_radiance("JETI_SaveSpecRadSPCEx", path, wavelength_start,
+                                     wavelength_end, operator, memo)
+    
     def get_radiometric_value(self, wavelength_start: int = 380, 
                              wavelength_end: int = 780) -> float:
         """
@@ -638,6 +1244,7 @@ class JetiRadioEx(JetiRadio):
         Returns:
             Radiometric value in W/m²
         """
+        self.spectral_axis.validate(wavelength_start, wavelength_end)
         radio = c_float()
         error = self._dll.JETI_RadioEx(
             self._device_handle, wavelength_start, wavelength_end, ctypes.byref(radio)
@@ -685,6 +1292,128 @@ class JetiRadioEx(JetiRadio):
         _check_error(error, "JETI_CRIEx")
         return np.array([cri_array[i] for i in range(15)])
     
+    def get_flicker_frequency(self) -> float:
+        """
+        Determine the flicker frequency of the measured source (JETI_GetFlickerFreq)
+        
+        Returns:
+            Flicker frequency in Hz (0.0 if no flicker was detected)
+        """
+        frequency = c_float()
+        warning = c_uint32()
+        error = self.core.JETI_GetFlickerFreq(
+            self._device_handle, ctypes.byref(frequency), ctypes.byref(warning)
+        )
+        _check_error(error, "JETI_GetFlickerFreq")
+        return frequency.value
+    
+    def detect_flicker_frequency(self, source=None, refresh: bool = False) -> float:
+        """
+        Flicker frequency of a source, detected once and cached
+        
+        Args:
+            source: Key identifying the light source (e.g. a lamp name)
+            refresh: Detect again even if the frequency is cached
+            
+        Returns:
+            Flicker frequency in Hz (0.0 for a steady source)
+        """
+        if refresh or source not in self._flicker_frequencies:
+            self._flicker_frequencies[source] = self.get_flicker_frequency()
+        return self._flicker_frequencies[source]
+    
+    def set_sync_mode(self, enable: bool):
+        """
+        Enable or disable sync mode (JETI_SetSyncMode)
+        
+        Args:
+            enable: True to integrate over whole periods of the sync frequency
+        """
+        error = self.core.JETI_SetSyncMode(self._device_handle, 1 if enable else 0)
+        _check_error(error, "JETI_SetSyncMode")
+    
+    def get_sync_mode(self) -> bool:
+        """Get sync mode state"""
+        mode = c_uint8()
+        error = self.core.JETI_GetSyncMode(self._device_handle, ctypes.byref(mode))
+        _check_error(error, "JETI_GetSyncMode")
+        return bool(mode.value)
+    
+    def set_sync_frequency(self, frequency: float):
+        """Set sync frequency in Hz"""
+        error = self.core.JETI_SetSyncFreq(self._device_handle, frequency)
+        _check_error(error, "JETI_SetSyncFreq")
+    
+    def get_sync_frequency(self) -> float:
+        """Get sync frequency in Hz"""
+        frequency = c_float()
+        error = self.core.JETI_GetSyncFreq(self._device_handle, ctypes.byref(frequency))
+        _check_error(error, "JETI_GetSyncFreq")
+        return frequency.value
+    
+    def create_sync_acquisition(self, source=None, **options):
+        """
+        Create a flicker-synchronised acquisition for this device
+        
+        Args:
+            source: Key of the light source; its flicker frequency is detected once
+            **options: frequency, integration_time, wavelength_range, synchronize,
+                poll_interval (see jeti.sync.SyncAcquisition)
+            
+        Returns:
+            SyncAcquisition bound to the opened device
+        """
+        from .sync import SyncAcquisition
+        return SyncAcquisition(self, source, **options)
+    
+    def measure_to_snr(self, target_snr: float = 100.0, integration_time: float = 10.0,
+                       wavelength_range: Tuple[int, int] = (380, 780),
+                       band: Optional[Tuple[float, float]] = None, **options):
+        """
+        Average short scans of spectral radiance until a target SNR is reached
+        
+        Args:
+            target_snr: SNR of the band-integrated spectral radiance to reach
+            integration_time: Integration time of each scan in ms
+            wavelength_range: (begin, end) in nm of the spectral radiance
+            band: (begin, end) in nm the SNR is evaluated in (None = whole range)
+            **options: relative_error (instead of target_snr), time_budget,
+                min_scans, max_scans (see jeti.averaging.average_to_snr)
+            
+        Returns:
+            AveragingResult with mean, per-pixel uncertainty and number of scans
+        """
+        from .averaging import average_to_snr
+        begin, end = wavelength_range
+        self.spectral_axis.validate(begin, end)
+        
+        def scan():
+            self.measure(integration_time, 1)
+            self.wait_for_measurement(0.001, run_hooks=False)
+            return self.get_spectral_radiance(begin, end)
+        
+        if options.get('relative_error') is not None:
+            target_snr = None
+        return average_to_snr(scan, self.spectral_axis.grid(begin, end), target_snr,
+                              band=band, **options)
+    
+    def create_drift_monitor(self, **options):
+        """
+        Create a drift monitor and register it as a measurement hook
+        
+        Args:
+            **options: limits, alpha, window, quantiles, warmup, cusum_threshold,
+                cusum_drift, quantities, spectrum, wavelength_range, on_event,
+                history (see jeti.monitor.DriftMonitor)
+            
+        Returns:
+            DriftMonitor fed after every wait_for_measurement()
+        """
+        from .monitor import DriftMonitor
+        monitor = DriftMonitor(**options)
+        self.add_measurement_hook(monitor)
+        return monitor
+    
     def get_dll_version(self) -> Tuple[int, int, int]:
         """Get DLL version (major, minor, build)"""
         major = c_uint16()
@@ -697,25 +1426,27 @@ class JetiRadioEx(JetiRadio):
         return (major.value, minor.value, build.value)
 
 
-class JetiSpectro:
+class JetiSpectro(_CoreAccess):
     """
     Spectrometer functionality for JETI devices
     Provides spectral measurement capabilities
     """
     
-    def __init__(self, dll_path: Optional[str] = None):
+    def __init__(self, dll_path: Optional[str] = None, dll=None):
         """
         Initialize JETI Spectro wrapper
         
         Args:
             dll_path: Path to jeti_spectro64.dll. If None, looks in package dlls/ folder
+            dll: Already loaded library to use instead (e.g. jeti.simulator.SimulatedSDK);
+                if it also exports the core functions it is used for `core` too
         """
-        if dll_path is None:
-            dll_path = str(_get_dll_path("jeti_spectro64.dll"))
-        
-        self._dll = ctypes.WinDLL(dll_path)
+        self._dll = _load_library("jeti_spectro64.dll", dll_path, dll)
+        self._core_dll = _preloaded_core(dll)
         self._device_handle = None
+        self._spectral_axis = None
         self._setup_spectro_functions()
+        self._dll = LockedLibrary(self._dll)
     
     def _setup_spectro_functions(self):
         """Setup function signatures for spectro DLL"""
@@ -766,6 +1497,7 @@ class JetiSpectro:
         error = self._dll.JETI_OpenSpectro(device_num, ctypes.byref(device_handle))
         _check_error(error, "JETI_OpenSpectro")
         self._device_handle = device_handle
+        self._spectral_axis = None
     
     def close_device(self):
         """Close the device connection"""
@@ -773,6 +1505,7 @@ class JetiSpectro:
             error = self._dll.JETI_CloseSpectro(self._device_handle)
             _check_error(error, "JETI_CloseSpectro")
             self._device_handle = None
+            self._spectral_axis = None
     
     def get_dll_version(self) -> Tuple[int, int, int]:
         """Get DLL version (major, minor, build)"""
@@ -793,25 +1526,29 @@ class JetiSpectro:
         return False
 
 
-class JetiSpectroEx:
+class JetiSpectroEx(_CoreAccess):
     """
     Extended spectrometer functionality for JETI devices
     Provides advanced spectral measurement capabilities
     """
     
-    def __init__(self, dll_path: Optional[str] = None):
+    def __init__(self, dll_path: Optional[str] = None, dll=None):
         """
         Initialize JETI Spectro Ex wrapper
         
         Args:
             dll_path: Path to jeti_spectro_ex64.dll. If None, looks in package dlls/ folder
+            dll: Already loaded library to use instead (e.g. jeti.simulator.SimulatedSDK);
+                if it also exports the core functions it is used for `core` too
         """
-        if dll_path is None:
-            dll_path = str(_get_dll_path("jeti_spectro_ex64.dll"))
-        
-        self._dll = ctypes.WinDLL(dll_path)
+        self._dll = _load_library("jeti_spectro_ex64.dll", dll_path, dll)
+        self._core_dll = _preloaded_core(dll)
         self._device_handle = None
+        self._spectral_axis = None
+        self._image_shape = None
+        self._channel_shape = None
         self._setup_spectro_ex_functions()
+        self._dll = LockedLibrary(self._dll)
     
     def _setup_spectro_ex_functions(self):
         """Setup function signatures for spectro ex DLL"""
@@ -829,6 +1566,9 @@ class JetiSpectroEx:
         self._dll.JETI_CloseSpectroEx.restype = c_uint32
         
         # Measurement functions
+        self._dll.JETI_StartDarkEx.argtypes = [c_void_p, c_float, c_uint16]
+        self._dll.JETI_StartDarkEx.restype = c_uint32
+        
         self._dll.JETI_StartLightEx.argtypes = [c_void_p, c_float, c_uint16]
         self._dll.JETI_StartLightEx.restype = c_uint32
         
@@ -847,6 +1587,44 @@ class JetiSpectroEx:
         self._dll.JETI_LightPixEx.argtypes = [c_void_p, POINTER(c_int32)]
         self._dll.JETI_LightPixEx.restype = c_uint32
         
+        self._dll.JETI_DarkWaveEx.argtypes = [c_void_p, c_uint32, c_uint32, c_float, POINTER(c_float)]
+        self._dll.JETI_DarkWaveEx.restype = c_uint32
+        
+        self._dll.JETI_DarkPixEx.argtypes = [c_void_p, POINTER(c_int32)]
+        self._dll.JETI_DarkPixEx.restype = c_uint32
+        
+        # Image functions (2D WORD frames of the configured PDA rows)
+        self._dll.JETI_StartLightImageEx.argtypes = [c_void_p, c_float]
+        self._dll.JETI_StartLightImageEx.restype = c_uint32
+        
+        self._dll.JETI_LightImageEx.argtypes = [c_void_p, POINTER(c_uint16)]
+        self._dll.JETI_LightImageEx.restype = c_uint32
+        
+        self._dll.JETI_StartDarkImageEx.argtypes = [c_void_p, c_float]
+        self._dll.JETI_StartDarkImageEx.restype = c_uint32
+        
+        self._dll.JETI_DarkImageEx.argtypes = [c_void_p, POINTER(c_uint16)]
+        self._dll.JETI_DarkImageEx.restype = c_uint32
+        
+        # Channel functions (one spectrum per active channel of a multi-channel device)
+        self._dll.JETI_StartChannelDarkEx.argtypes = [c_void_p, c_float, c_uint16]
+        self._dll.JETI_StartChannelDarkEx.restype = c_uint32
+        
+        self._dll.JETI_ChannelDarkEx.argtypes = [c_void_p, POINTER(c_uint16)]
+        self._dll.JETI_ChannelDarkEx.restype = c_uint32
+        
+        self._dll.JETI_StartChannelLightEx.argtypes = [c_void_p, c_float, c_uint16]
+        self._dll.JETI_StartChannelLightEx.restype = c_uint32
+        
+        self._dll.JETI_ChannelLightEx.argtypes = [c_void_p, POINTER(c_uint16)]
+        self._dll.JETI_ChannelLightEx.restype = c_uint32
+        
+        self._dll.JETI_StartContChannelLightEx.argtypes = [c_void_p, c_float, c_uint32]
+        self._dll.JETI_StartContChannelLightEx.restype = c_uint32
+        
+        self._dll.JETI_ContChannelLightEx.argtypes = [c_void_p, POINTER(c_uint16)]
+        self._dll.JETI_ContChannelLightEx.restype = c_uint32
+        
         self._dll.JETI_GetSpectroExDLLVersion.argtypes = [POINTER(c_uint16), POINTER(c_uint16), POINTER(c_uint16)]
         self._dll.JETI_GetSpectroExDLLVersion.restype = c_uint32
     
@@ -880,6 +1658,9 @@ class JetiSpectroEx:
         error = self._dll.JETI_OpenSpectroEx(device_num, ctypes.byref(device_handle))
         _check_error(error, "JETI_OpenSpectroEx")
         self._device_handle = device_handle
+        self._spectral_axis = None
+        self._image_shape = None
+        self._channel_shape = None
     
     def close_device(self):
         """Close the device connection"""
@@ -887,6 +1668,9 @@ class JetiSpectroEx:
             error = self._dll.JETI_CloseSpectroEx(self._device_handle)
             _check_error(error, "JETI_CloseSpectroEx")
             self._device_handle = None
+            self._spectral_axis = None
+            self._image_shape = None
+            self._channel_shape = None
     
     def start_light_measurement(self, integration_time: float = 100.0, average: int = 1):
         """
@@ -899,6 +1683,17 @@ class JetiSpectroEx:
         error = self._dll.JETI_StartLightEx(self._device_handle, integration_time, average)
         _check_error(error, "JETI_StartLightEx")
     
+    def start_dark_measurement(self, integration_time: float = 100.0, average: int = 1):
+        """
+        Start a dark measurement (shutter closed)
+        
+        Args:
+            integration_time: Integration time in ms
+            average: Number of averages
+        """
+        error = self._dll.JETI_StartDarkEx(self._device_handle, integration_time, average)
+        _check_error(error, "JETI_StartDarkEx")
+    
     def get_status(self) -> bool:
         """
         Get measurement status
@@ -939,9 +1734,14 @@ class JetiSpectroEx:
             step: Step width in nm
             
         Returns:
-            numpy array with light spectrum
+            numpy array with light spectrum (wavelengths: spectral_axis.grid(start, end, step))
+            
+        Raises:
+            JetiException: If the range or step is invalid
+                (checked against spectral_axis, without a DLL call)
         """
-        num_values = int((wavelength_end - wavelength_start) / step) + 1
+        self.spectral_axis.validate(wavelength_start, wavelength_end, step)
+        num_values = SpectralAxis.num_points(wavelength_start, wavelength_end, step)
         light_array = (c_float * num_values)()
         error = self._dll.JETI_LightWaveEx(
             self._device_handle, wavelength_start, wavelength_end, step, light_array
@@ -969,6 +1769,340 @@ class JetiSpectroEx:
         _check_error(error, "JETI_LightPixEx")
         return np.array([light_array[i] for i in range(pixel_count)], dtype=np.int32)
     
+    def get_dark_spectrum_wavelength(self, wavelength_start: int = 380,
+                                     wavelength_end: int = 780,
+                                     step: float = 5.0) -> np.ndarray:
+        """
+        Get dark spectrum in wavelength domain
+        
+        Args:
+            wavelength_start: Start wavelength in nm
+            wavelength_end: End wavelength in nm
+            step: Step width in nm
+            
+        Returns:
+            numpy array with dark spectrum (wavelengths: spectral_axis.grid(start, end, step))
+        """
+        self.spectral_axis.validate(wavelength_start, wavelength_end, step)
+        num_values = SpectralAxis.num_points(wavelength_start, wavelength_end, step)
+        dark_array = (c_float * num_values)()
+        error = self._dll.JETI_DarkWaveEx(
+            self._device_handle, wavelength_start, wavelength_end, step, dark_array
+        )
+        _check_error(error, "JETI_DarkWaveEx")
+        return np.ctypeslib.as_array(dark_array).astype(np.float64)
+    
+    def get_dark_spectrum_pixel(self) -> np.ndarray:
+        """
+        Get dark spectrum in pixel domain
+        
+        Returns:
+            numpy array with raw pixel values
+        """
+        dark_array = (c_int32 * self.spectral_axis.pixel_count)()
+        error = self._dll.JETI_DarkPixEx(self._device_handle, dark_array)
+        _check_error(error, "JETI_DarkPixEx")
+        return np.ctypeslib.as_array(dark_array)
+    
+    def get_pda_row_conf(self) -> Tuple[int, int]:
+        """Get the sensor rows read by image measurements (first row, number of rows)"""
+        first_row = c_uint32()
+        rows = c_uint32()
+        error = self.core.JETI_GetPDARowConf(
+            self._device_handle, ctypes.byref(first_row), ctypes.byref(rows)
+        )
+        _check_error(error, "JETI_GetPDARowConf")
+        return (first_row.value, rows.value)
+    
+    def set_pda_row_conf(self, first_row: int, rows: int):
+        """
+        Set the sensor rows read by image measurements
+        
+        Args:
+            first_row: First sensor row
+            rows: Number of rows
+        """
+        error = self.core.JETI_SetPDARowConf(self._device_handle, first_row, rows)
+        _check_error(error, "JETI_SetPDARowConf")
+        self._image_shape = None
+    
+    @property
+    def image_shape(self) -> Tuple[int, int]:
+        """
+        Shape (rows, pixels) of image frames
+        
+        Queried once after the device is opened and reused until it is
+        closed or the row configuration is changed.
+        """
+        if self._image_shape is None:
+            _, rows = self.get_pda_row_conf()
+            self._image_shape = (rows, self.spectral_axis.pixel_count)
+        return self._image_shape
+    
+    def new_image_buffer(self) -> np.ndarray:
+        """Allocate a frame for get_light_image(out=...) / get_dark_image(out=...)"""
+        return np.empty(self.image_shape, dtype=np.uint16)
+    
+    def start_light_image(self, integration_time: float = 100.0):
+        """
+        Start a light image measurement
+        
+        Args:
+            integration_time: Integration time in ms
+        """
+        error = self._dll.JETI_StartLightImageEx(self._device_handle, integration_time)
+        _check_error(error, "JETI_StartLightImageEx")
+    
+    def start_dark_image(self, integration_time: float = 100.0):
+        """
+        Start a dark image measurement (shutter closed)
+        
+        Args:
+            integration_time: Integration time in ms
+        """
+        error = self._dll.JETI_StartDarkImageEx(self._device_handle, integration_time)
+        _check_error(error, "JETI_StartDarkImageEx")
+    
+    def _read_frame(self, function_name: str, shape: Tuple[int, ...],
+                    out: Optional[np.ndarray]) -> np.ndarray:
+        """Read WORD values straight into `out` (or a new array), without a copy"""
+        if out is None:
+            buffer = (c_uint16 * math.prod(shape))()
+            out = np.ctypeslib.as_array(buffer).reshape(shape)
+        elif (out.dtype != np.uint16 or out.shape != shape or not out.flags.c_contiguous
+              or not out.flags.writeable):
+            raise ValueError(
+                f"out must be a writeable C-contiguous uint16 array of shape {shape}, "
+                f"got {out.dtype} {out.shape}"
+            )
+        else:
+            buffer = (c_uint16 * out.size).from_buffer(out)
+        error = getattr(self._dll, function_name)(self._device_handle, buffer)
+        _check_error(error, function_name)
+        return out
+    
+    def get_light_image(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the light image in raw counts
+        
+        Args:
+            out: Frame to fill (see new_image_buffer()); reusing one avoids
+                an allocation per frame
+            
+        Returns:
+            uint16 array of shape image_shape (`out` if given)
+        """
+        return self._read_frame("JETI_LightImageEx", self.image_shape, out)
+    
+    def get_dark_image(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the dark image in raw counts
+        
+        Args:
+            out: Frame to fill (see new_image_buffer())
+            
+        Returns:
+            uint16 array of shape image_shape (`out` if given)
+        """
+        return self._read_frame("JETI_DarkImageEx", self.image_shape, out)
+    
+    def iter_light_images(self, integration_time: float = 100.0, count: Optional[int] = None,
+                          buffers: int = 2, poll_interval: float = 0.001):
+        """
+        Measure light images one after another
+        
+        Frames are read into `buffers` preallocated arrays in turn, so a frame
+        is overwritten `buffers` frames later; copy frames that are kept longer.
+        
+        Args:
+            integration_time: Integration time in ms
+            count: Number of frames (None: until the generator is closed)
+            buffers: Number of frames reused in turn
+            poll_interval: Time between status checks in seconds
+            
+        Yields:
+            uint16 arrays of shape image_shape
+        """
+        frames = [self.new_image_buffer() for _ in range(max(int(buffers), 1))]
+        number = 0
+        while count is None or number < count:
+            self.start_light_image(integration_time)
+            self.wait_for_measurement(poll_interval)
+            yield self.get_light_image(out=frames[number % len(frames)])
+            number += 1
+    
+    def get_channel_conf(self) -> str:
+        """Get the channel configuration (one character per active channel, e.g. '0123')"""
+        conf = ctypes.create_string_buffer(64)
+        error = self.core.JETI_GetChannelConf(self._device_handle, conf)
+        _check_error(error, "JETI_GetChannelConf")
+        return conf.value.decode('ascii')
+    
+    def set_channel_conf(self, conf: str):
+        """
+        Set the active channels of a multi-channel device
+        
+        Args:
+            conf: Channel configuration, one character per active channel (e.g. '02')
+        """
+        error = self.core.JETI_SetChannelConf(self._device_handle, conf.encode('ascii'))
+        _check_error(error, "JETI_SetChannelConf")
+        self._channel_shape = None
+    
+    @property
+    def channel_shape(self) -> Tuple[int, int]:
+        """
+        Shape (channels, pixels) of channel spectra
+        
+        Queried once after the device is opened and reused until it is
+        closed or the channel configuration is changed.
+        """
+        if self._channel_shape is None:
+            self._channel_shape = (len(self.get_channel_conf()), self.spectral_axis.pixel_count)
+        return self._channel_shape
+    
+    def start_channel_light(self, integration_time: float = 100.0, average: int = 1):
+        """
+        Start a light measurement of all active channels
+        
+        Args:
+            integration_time: Integration time in ms
+            average: Number of averages
+        """
+        error = self._dll.JETI_StartChannelLightEx(self._device_handle, integration_time, average)
+        _check_error(error, "JETI_StartChannelLightEx")
+    
+    def start_channel_dark(self, integration_time: float = 100.0, average: int = 1):
+        """
+        Start a dark measurement of all active channels (shutter closed)
+        
+        Args:
+            integration_time: Integration time in ms
+            average: Number of averages
+        """
+        error = self._dll.JETI_StartChannelDarkEx(self._device_handle, integration_time, average)
+        _check_error(error, "JETI_StartChannelDarkEx")
+    
+    def get_channel_light(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the light spectra of all active channels in one transfer
+        
+        Args:
+            out: uint16 array of shape channel_shape to fill
+            
+        Returns:
+            uint16 array of raw counts, shape channel_shape (`out` if given)
+        """
+        return self._read_frame("JETI_ChannelLightEx", self.channel_shape, out)
+    
+    def get_channel_dark(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the dark spectra of all active channels in one transfer
+        
+        Args:
+            out: uint16 array of shape channel_shape to fill
+            
+        Returns:
+            uint16 array of raw counts, shape channel_shape (`out` if given)
+        """
+        return self._read_frame("JETI_ChannelDarkEx", self.channel_shape, out)
+    
+    def start_continuous_channel_light(self, interval: float, count: int):
+        """
+        Start `count` light scans of all active channels, one per `interval`
+        
+        The scans use the configured integration time (JETI_SetTintConf).
+        
+        Args:
+            interval: Time between scan starts in ms (0: back to back)
+            count: Number of scans
+        """
+        error = self._dll.JETI_StartContChannelLightEx(self._device_handle, interval, count)
+        _check_error(error, "JETI_StartContChannelLightEx")
+    
+    def get_continuous_channel_light(self, count: int,
+                                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the scans of a finished continuous channel measurement in one transfer
+        
+        Args:
+            count: Number of scans started
+            out: uint16 array of shape (count, channels, pixels) to fill
+            
+        Returns:
+            uint16 array of raw counts, shape (count, channels, pixels) (`out` if given)
+        """
+        return self._read_frame("JETI_ContChannelLightEx", (count, *self.channel_shape), out)
+    
+    def create_channel_stream(self, block: int = 16, blocks: int = 8, **options):
+        """
+        Create a continuous stream of channel spectra into a preallocated ring
+        
+        Args:
+            block: Scans per transfer
+            blocks: Transfers kept in the ring
+            **options: interval, dark, poll_interval (see jeti.channels.ChannelStream)
+            
+        Returns:
+            ChannelStream bound to the opened device
+        """
+        from .channels import ChannelStream
+        return ChannelStream(self, block, blocks, **options)
+    
+    def measure_to_snr(self, target_snr: float = 100.0, integration_time: float = 10.0,
+                       wavelength_range: Tuple[int, int, float] = (380, 780, 1.0),
+                       band: Optional[Tuple[float, float]] = None,
+                       dark_average: int = 10, **options):
+        """
+        Average short light scans until a target SNR is reached
+        
+        Args:
+            target_snr: SNR of the band-integrated light spectrum to reach
+            integration_time: Integration time of each scan in ms
+            wavelength_range: (begin, end, step) in nm of the light spectrum
+            band: (begin, end) in nm the SNR is evaluated in (None = whole range)
+            dark_average: Averages of the dark spectrum taken once before the
+                scans and subtracted from each of them
+            **options: relative_error (instead of target_snr), time_budget,
+                min_scans, max_scans (see jeti.averaging.average_to_snr)
+            
+        Returns:
+            AveragingResult with the mean dark-corrected light spectrum,
+            per-pixel uncertainty and number of scans
+        """
+        from .averaging import average_to_snr
+        begin, end, step = wavelength_range
+        self.spectral_axis.validate(begin, end, step)
+        
+        self.start_dark_measurement(integration_time, dark_average)
+        self.wait_for_measurement(0.001)
+        dark = self.get_dark_spectrum_wavelength(begin, end, step)
+        
+        def scan():
+            self.start_light_measurement(integration_time, 1)
+            self.wait_for_measurement(0.001)
+            return self.get_light_spectrum_wavelength(begin, end, step) - dark
+        
+        if options.get('relative_error') is not None:
+            target_snr = None
+        return average_to_snr(scan, self.spectral_axis.grid(begin, end, step), target_snr,
+                              band=band, **options)
+    
+    def create_hdr_acquisition(self, integration_times=(1.0, 4.0, 16.0, 64.0, 256.0), **options):
+        """
+        Create an HDR acquisition fusing bracketed integration times
+        
+        Args:
+            integration_times: Bracketed integration times in ms
+            **options: saturation, read_noise, margin, dark_average, poll_interval
+                (see jeti.hdr.HDRAcquisition)
+            
+        Returns:
+            HDRAcquisition bound to the opened device
+        """
+        from .hdr import HDRAcquisition
+        return HDRAcquisition(self, integration_times, **options)
+    
     def get_dll_version(self) -> Tuple[int, int, int]:
         """Get DLL version (major, minor, build)"""
         major = c_uint16()
@@ -0,0 +1,60 @@
+"""
+Shared fixtures: one simulated device, its SDK and an opened wrapper on it
+
+A test module picks the wrapper class and the SimulatedDevice options by
+overriding the device_class and device_options fixtures, e.g.
+
+    @pytest.fixture
+    def device_class():
+        return JetiRadioEx
+
+    @pytest.fixture
+    def device_options():
+        return {'time_scale': 0.0, 'pixel_count': 256}
+
+Single tests can also parametrize them indirectly:
+
+    @pytest.mark.parametrize('device_class', [JetiCore, JetiRadioEx], indirect=True)
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+
+from jeti import JetiCore
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+
+
+@pytest.fixture
+def device_class(request):
+    """Wrapper class opened by the device fixture (default JetiCore)"""
+    return getattr(request, 'param', JetiCore)
+
+
+@pytest.fixture
+def device_options(request):
+    """Keyword arguments of the SimulatedDevice (default: no simulated delays)"""
+    return getattr(request, 'param', {'time_scale': 0.0})
+
+
+@pytest.fixture
+def simulated(device_options):
+    return SimulatedDevice(**device_options)
+
+
+@pytest.fixture
+def sdk(simulated):
+    return SimulatedSDK([simulated])
+
+
+@pytest.fixture
+def device(sdk, device_class):
+    device = device_class(dll=sdk)
+    device.open_device(0)
+    yield device
+    device.close_device()
@@ -0,0 +1,114 @@
+"""
+Tests for the fetch-based acquisition engine
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiException, JetiError
+from jeti.acquisition import AcquisitionTiming, CoreAcquisition
+from jeti.retry import RetryPolicy
+
+
+class TestCoreAcquisition:
+    """Test the measure/fetch cycle"""
+    
+    def test_fetches_only_requested(self, sdk, device):
+        """Test that only the requested Fetch* functions are called"""
+        acquisition = device.create_acquisition(('sprad', 'cct'))
+        values = acquisition.acquire()
+        assert set(values) == {'sprad', 'cct'}
+        assert sdk.calls['JETI_FetchSprad'] == 1
+        assert sdk.calls['JETI_FetchCCT'] == 1
+        assert sdk.calls['JETI_FetchXYZ'] == 0
+        assert sdk.calls['JETI_InitMeasure'] == 1
+    
+    def test_result_shapes(self, device):
+        """Test result types and buffer sizes"""
+        acquisition = device.create_acquisition(('sprad', 'light', 'xy', 'xyz', 'cri'))
+        values = acquisition.acquire()
+        assert values['sprad'].shape == acquisition.wavelengths.shape == (401,)
+        assert values['light'].shape == (1024,)
+        assert values['cri'].shape == (15,)
+        assert len(values['xy']) == 2
+        assert len(values['xyz']) == 3
+    
+    def test_buffers_reused(self, device):
+        """Test that array results are views of one preallocated buffer"""
+        acquisition = device.create_acquisition(('sprad',))
+        first = acquisition.acquire()['sprad']
+        second = acquisition.acquire()['sprad']
+        assert np.shares_memory(first, second)
+        kept = acquisition.acquire(copy=True)['sprad']
+        assert not np.shares_memory(kept, second)
+    
+    def test_wavelength_range_shortens_transfer(self, device):
+        """Test that a narrower range shrinks the sprad buffer"""
+        acquisition = device.create_acquisition(('sprad',), wavelength_range=(400, 700, 5))
+        assert acquisition.acquire()['sprad'].shape == (61,)
+        assert acquisition.wavelengths[0] == 400.0
+    
+    def test_configuration_written(self, sdk, device):
+        """Test that integration time and average are configured once"""
+        acquisition = device.create_acquisition(('radio',), integration_time=2.0, average=3)
+        acquisition.acquire()
+        acquisition.acquire()
+        assert sdk.devices[0].last_integration_time == 2.0
+        assert sdk.devices[0].last_average == 3
+        assert sdk.calls['JETI_SetTintConf'] == 1
+    
+    def test_timing(self, device):
+        """Test per-phase timing"""
+        acquisition = device.create_acquisition(('sprad', 'xy'))
+        acquisition.acquire()
+        acquisition.acquire()
+        assert isinstance(acquisition.last_timing, AcquisitionTiming)
+        assert acquisition.count == 2
+        assert acquisition.mean_timing.total > 0.0
+        assert all(value >= 0.0 for value in acquisition.last_timing)
+    
+    def test_unknown_quantity(self, device):
+        """Test that unknown quantities are rejected"""
+        with pytest.raises(ValueError):
+            CoreAcquisition(device, ('spectrum',))
+    
+    def test_invalid_range(self, device):
+        """Test that ranges outside calibration fail before any DLL call"""
+        with pytest.raises(JetiException) as exc_info:
+            device.create_acquisition(('sprad',), wavelength_range=(200, 700, 1))
+        assert exc_info.value.error_code == JetiError.ERROR_PARAMETER
+    
+    def test_timeout(self, sdk, device):
+        """Test that a measurement exceeding the timeout raises TIMEOUT"""
+        sdk.devices[0].time_scale = 1.0
+        acquisition = device.create_acquisition(('radio',), integration_time=500.0)
+        acquisition.expected_exposure = 0.0
+        with pytest.raises(JetiException) as exc_info:
+            acquisition.acquire(timeout=0.01)
+        assert exc_info.value.error_code == JetiError.TIMEOUT
+    
+    def test_retry_policy_set_later(self, sdk, device):
+        """Test that a retry policy set after creation applies to the fetches"""
+        acquisition = device.create_acquisition(('sprad', 'cct'))
+        acquisition.acquire()
+        device.set_retry_policy(RetryPolicy(max_attempts=3, base_delay=0.0))
+        sdk.inject_error('JETI_FetchSprad', JetiError.BUSY)
+        values = acquisition.acquire()
+        assert values['sprad'].shape == acquisition.wavelengths.shape
+        assert sdk.calls['JETI_FetchSprad'] == 3
+    
+    def test_device_reopened(self, device):
+        """Test that an acquisition follows the handle of a reopened device"""
+        acquisition = device.create_acquisition(('sprad', 'cct'))
+        acquisition.acquire()
+        device.close_device()
+        device.open_device(0)
+        assert acquisition.acquire()['cct'] > 0.0
@@ -0,0 +1,102 @@
+"""
+Tests for adaptive averaging to a target SNR
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiRadioEx, JetiSpectroEx
+from jeti.averaging import RunningStatistics, average_to_snr
+from jeti.simulator import SimulatedDevice, SimulatedSDK, led_spectrum
+
+
+def _spectro(scale: float) -> JetiSpectroEx:
+    source = lambda wavelengths: scale * led_spectrum(wavelengths)
+    device = JetiSpectroEx(dll=SimulatedSDK([SimulatedDevice(source=source, time_scale=0.0)]))
+    device.open_device(0)
+    return device
+
+
+class TestRunningStatistics:
+    """Test the per-pixel Welford accumulator"""
+    
+    def test_matches_numpy(self):
+        """Test mean, variance and standard error against NumPy"""
+        samples = np.random.default_rng(1).normal(5.0, 2.0, size=(50, 8))
+        stats = RunningStatistics(8)
+        for sample in samples:
+            stats.update(sample)
+        assert stats.count == 50
+        np.testing.assert_allclose(stats.mean, samples.mean(axis=0))
+        np.testing.assert_allclose(stats.variance, samples.var(axis=0, ddof=1))
+        np.testing.assert_allclose(stats.standard_error, samples.std(axis=0, ddof=1) / np.sqrt(50))
+    
+    def test_single_sample(self):
+        """Test that one sample has no uncertainty estimate"""
+        stats = RunningStatistics(3)
+        stats.update(np.ones(3))
+        assert np.isinf(stats.standard_error).all()
+
+
+class TestAverageToSnr:
+    """Test the stopping rules"""
+    
+    def test_requires_one_target(self):
+        """Test that exactly one of target_snr and relative_error is needed"""
+        with pytest.raises(ValueError):
+            average_to_snr(lambda: np.ones(3), np.arange(3.0))
+        with pytest.raises(ValueError):
+            average_to_snr(lambda: np.ones(3), np.arange(3.0), 10.0, relative_error=0.1)
+    
+    def test_relative_error(self):
+        """Test stopping on the relative standard error"""
+        rng = np.random.default_rng(2)
+        result = average_to_snr(lambda: 100.0 + rng.normal(0.0, 1.0, 10), np.arange(10.0),
+                                relative_error=1e-3)
+        assert result.converged
+        assert result.snr >= 1000.0
+        assert result.scans >= 3
+    
+    def test_time_budget(self):
+        """Test that the time budget ends an unreachable target"""
+        rng = np.random.default_rng(3)
+        result = average_to_snr(lambda: rng.normal(0.0, 1.0, 10), np.arange(10.0),
+                                target_snr=1e9, time_budget=0.05)
+        assert not result.converged
+        assert result.elapsed < 0.1
+        assert result.scans >= 2
+
+
+class TestDeviceAveraging:
+    """Test SNR-driven averaging on the Ex wrappers"""
+    
+    def test_dim_sample_takes_more_scans(self):
+        """Test that the number of scans follows the brightness"""
+        bright = _spectro(1.0).measure_to_snr(2000.0, integration_time=5.0, band=(430, 470))
+        dim = _spectro(0.05).measure_to_snr(2000.0, integration_time=5.0, band=(430, 470))
+        assert bright.converged and dim.converged
+        assert bright.scans < dim.scans
+    
+    def test_result_shapes(self):
+        """Test mean and uncertainty on the requested grid"""
+        result = _spectro(1.0).measure_to_snr(500.0, integration_time=5.0,
+                                              wavelength_range=(400, 700, 5.0))
+        assert result.mean.shape == result.uncertainty.shape == result.wavelengths.shape == (61,)
+        assert (result.uncertainty > 0.0).all()
+    
+    @pytest.mark.parametrize('device_class', [JetiRadioEx], indirect=True)
+    def test_radio_ex(self, device):
+        """Test SNR-driven averaging of spectral radiance"""
+        result = device.measure_to_snr(relative_error=1e-3, integration_time=5.0)
+        assert result.converged
+        assert result.mean.shape == (401,)
+        np.testing.assert_allclose(result.mean, led_spectrum(result.wavelengths),
+                                   rtol=0.05, atol=2e-4)
@@ -0,0 +1,70 @@
+"""
+Tests for the benchmark runner in benchmarks/bench_wrapper.py
+Runs a quick subset only; the timings themselves are not checked
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src and benchmarks directories to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+sys.path.insert(0, str(_project_root / "benchmarks"))
+
+import bench_wrapper
+
+
+class TestBudgets:
+    """Test the regression check"""
+
+    def test_over_tolerance_is_regression(self):
+        """Only results above budget × (1 + tolerance) are regressions"""
+        budgets = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        results = {'a': 1.2, 'b': 1.3, 'c': 0.5, 'unbudgeted': 100.0}
+        assert bench_wrapper.check_budgets(results, budgets, 25.0) == ['b']
+        assert bench_wrapper.check_budgets(results, budgets, 50.0) == []
+
+    def test_committed_budgets_cover_all_benchmarks(self):
+        """budgets.json has a budget for every benchmark"""
+        budgets = json.loads(bench_wrapper.DEFAULT_BUDGETS.read_text())
+        results = bench_wrapper.run_benchmarks(['check_error', 'spectrum'], quick=True)
+        assert set(results) <= set(budgets)
+        assert {'get_all_values', 'concurrent_4_devices', 'wait_overshoot_1ms'} <= set(budgets)
+
+
+class TestRunner:
+    """Test running benchmarks and recording history"""
+
+    def test_pattern_selects_benchmarks(self):
+        """-k patterns select benchmarks by name"""
+        results = bench_wrapper.run_benchmarks(['spectrum_4', 'get_all'], quick=True)
+        assert set(results) == {'spectrum_401', 'get_all_values'}
+        assert all(value > 0.0 for value in results.values())
+
+    def test_main_fails_on_regression(self, tmp_path, capsys):
+        """main() exits with 1 when a budget is exceeded and records history"""
+        budgets = tmp_path / "budgets.json"
+        history = tmp_path / "history.jsonl"
+        budgets.write_text(json.dumps({'check_error': 1e-12}))
+        argv = ["--quick", "-k", "check_error", "--budgets", str(budgets), "--history", str(history)]
+        assert bench_wrapper.main(argv) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+
+        budgets.write_text(json.dumps({'check_error': 1.0}))
+        assert bench_wrapper.main(argv) == 0
+        entries = [json.loads(line) for line in history.read_text().splitlines()]
+        assert len(entries) == 2
+        assert set(entries[-1]['results']) == {'check_error'}
+        assert bench_wrapper.last_history(history) == entries[-1]['results']
+
+    def test_update_budgets(self, tmp_path):
+        """--update-budgets merges the results into the budgets file"""
+        budgets = tmp_path / "budgets.json"
+        budgets.write_text(json.dumps({'other': 2.0}))
+        argv = ["--quick", "-k", "check_error", "--budgets", str(budgets), "--no-history",
+                "--update-budgets"]
+        assert bench_wrapper.main(argv) == 0
+        written = json.loads(budgets.read_text())
+        assert written['other'] == 2.0
+        assert 'check_error' in written
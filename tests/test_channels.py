@@ -0,0 +1,132 @@
+"""
+Tests for multi-channel acquisition on JetiSpectroEx
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiError, JetiException, JetiSpectroEx
+from jeti.channels import subtract_dark
+
+
+@pytest.fixture
+def device_class():
+    return JetiSpectroEx
+
+
+@pytest.fixture
+def device_options():
+    return {'serial': "SIM00001", 'pixel_count': 256, 'channels': 4, 'time_scale': 0.0, 'seed': 1}
+
+
+class TestChannelReadout:
+    """Test single and continuous channel measurements"""
+
+    def test_all_channels_in_one_transfer(self, sdk, device):
+        """Test that light and dark spectra of all channels come in one call"""
+        assert device.get_channel_conf() == "0123"
+        assert device.channel_shape == (4, 256)
+        device.start_channel_light(10.0, 4)
+        device.wait_for_measurement(0.001)
+        light = device.get_channel_light()
+        assert light.shape == (4, 256) and light.dtype == np.uint16
+        assert sdk.calls['JETI_ChannelLightEx'] == 1
+        peaks = light.max(axis=1).astype(float)
+        assert np.all(np.diff(peaks) < 0)
+
+        device.start_channel_dark(10.0, 4)
+        device.wait_for_measurement(0.001)
+        buffer = np.empty((4, 256), dtype=np.uint16)
+        assert device.get_channel_dark(out=buffer) is buffer
+        assert abs(float(buffer.mean()) - 1000.0) < 5.0
+
+    def test_channel_conf(self, device):
+        """Test that the active channels set the shape and invalid sets fail"""
+        device.set_channel_conf("13")
+        assert device.get_channel_conf() == "13"
+        assert device.channel_shape == (2, 256)
+        for conf in ("", "11", "4", "x"):
+            with pytest.raises(JetiException) as exc_info:
+                device.set_channel_conf(conf)
+            assert exc_info.value.error_code == JetiError.ERROR_PARAMETER
+        assert device.channel_shape == (2, 256)
+
+    def test_continuous_scans(self, sdk, device):
+        """Test that continuous scans are transferred as one block"""
+        device.start_continuous_channel_light(0.0, 5)
+        device.wait_for_measurement(0.001)
+        scans = device.get_continuous_channel_light(5)
+        assert scans.shape == (5, 4, 256)
+        assert sdk.calls['JETI_ContChannelLightEx'] == 1
+        assert not np.array_equal(scans[0], scans[1])
+
+
+class TestChannelStream:
+    """Test the ring, pipelining and dark subtraction"""
+
+    def test_subtract_dark_broadcasts_per_channel(self):
+        """Test that one dark frame is subtracted from every scan's channels"""
+        rng = np.random.default_rng(0)
+        counts = rng.integers(900, 5000, (6, 3, 50), dtype=np.uint16)
+        dark = rng.integers(990, 1010, (3, 50), dtype=np.uint16)
+        corrected = subtract_dark(counts, dark)
+        assert corrected.dtype == np.float32
+        for scan in range(6):
+            for channel in range(3):
+                np.testing.assert_array_equal(
+                    corrected[scan, channel],
+                    counts[scan, channel].astype(np.float32) - dark[channel])
+
+    def test_ring_and_pipelining(self, sdk, device):
+        """Test that blocks fill the ring in turn and the next block is started early"""
+        stream = device.create_channel_stream(block=4, blocks=3)
+        ring = stream.ring
+        copies = []
+        with stream:
+            for _ in range(5):
+                block = stream.read()
+                assert np.shares_memory(block, ring)
+                copies.append(block.copy())
+                assert sdk.calls['JETI_StartContChannelLightEx'] == stream.blocks_read + 1
+        assert sdk.calls['JETI_SpectroBreakEx'] == 1
+        assert stream.ring is ring and stream.scans_read == 20
+        np.testing.assert_array_equal(stream.recent(12), np.concatenate(copies[2:]))
+        np.testing.assert_array_equal(stream.recent(6), np.concatenate(copies[3:])[-6:])
+        assert stream.recent(100).shape == (12, 4, 256)
+
+    def test_read_corrected(self, device):
+        """Test dark-corrected blocks against the measured dark"""
+        stream = device.create_channel_stream(block=2, blocks=2)
+        with pytest.raises(RuntimeError):
+            stream.read_corrected()
+        dark = stream.measure_dark(100.0, 10)
+        with stream:
+            raw = stream.read().copy()
+            corrected = stream.read_corrected()
+        assert corrected.shape == (2, 4, 256)
+        assert corrected is stream._corrected
+        assert abs(float(np.median(corrected[:, :, :20]))) < 20.0
+        assert float(raw[:, 0].max()) - float(dark[0].max()) > 1000.0
+        with pytest.raises(ValueError):
+            stream.set_dark(np.zeros((3, 256)))
+    
+    def test_channel_conf_changed(self, sdk, device):
+        """Test that a stream refuses to run after the channel count changed"""
+        stream = device.create_channel_stream(block=2, blocks=2)
+        device.set_channel_conf("012")
+        with pytest.raises(RuntimeError):
+            stream.start()
+        with pytest.raises(RuntimeError):
+            stream.read()
+        assert sdk.calls['JETI_StartContChannelLightEx'] == 0
+        device.set_channel_conf("0123")
+        with stream:
+            assert stream.read().shape == (2, 4, 256)
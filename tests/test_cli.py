@@ -0,0 +1,145 @@
+"""
+Tests for the jeti-acquire command line
+Runs against the in-process simulated SDK
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import cli
+
+
+def _run(*argv):
+    out = io.StringIO()
+    summary = cli.run(cli.build_parser().parse_args(list(argv)), out)
+    return summary, out.getvalue()
+
+
+class FakeClock:
+    """Manually advanced clock; sleep() advances it"""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestIntervalScheduler:
+    """Test fixed-interval scheduling"""
+    
+    def test_on_time_slots(self):
+        """Test that fast scans start exactly on the slot grid"""
+        clock = FakeClock()
+        scheduler = cli.IntervalScheduler(0.1, clock, clock.sleep)
+        starts = []
+        for _ in range(5):
+            starts.append(scheduler.wait())
+            clock.now += 0.03
+        assert starts == pytest.approx([100.0, 100.1, 100.2, 100.3, 100.4])
+        assert scheduler.overruns == 0
+    
+    def test_overrun_compensated(self):
+        """Test that an overrun delays one start and the grid is kept"""
+        clock = FakeClock()
+        scheduler = cli.IntervalScheduler(0.1, clock, clock.sleep)
+        scheduler.wait()
+        clock.now += 0.15
+        assert scheduler.wait() == pytest.approx(100.1)
+        clock.now += 0.01
+        assert scheduler.wait() == pytest.approx(100.2)
+        assert clock.now == pytest.approx(100.2)
+        assert (scheduler.overruns, scheduler.skipped) == (1, 0)
+    
+    def test_missed_slots_skipped(self):
+        """Test that slots a whole interval behind are skipped, not caught up"""
+        clock = FakeClock()
+        scheduler = cli.IntervalScheduler(0.1, clock, clock.sleep)
+        scheduler.wait()
+        clock.now += 0.35
+        assert scheduler.wait() == pytest.approx(100.3)
+        assert (scheduler.overruns, scheduler.skipped) == (1, 2)
+        clock.now += 0.01
+        assert scheduler.wait() == pytest.approx(100.4)
+
+
+class TestAcquire:
+    """Test complete runs on simulated devices"""
+    
+    def test_count_to_stream(self, tmp_path):
+        """Test that every scan is streamed and can be read back"""
+        path = tmp_path / "run.jacq"
+        summary, output = _run("--simulate", "-t", "1", "-n", "25", "--range", "400", "700", "2",
+                               "-o", str(path), "--report", "0")
+        assert summary['scans'] == 25
+        assert output.startswith("done: 25 scans")
+        header, records = cli.read_stream(path)
+        assert header['serial'] == "SIM00001"
+        assert header['wavelength_range'] == [400, 700, 2]
+        assert len(header['wavelengths']) == 151
+        assert records.shape == (25,)
+        np.testing.assert_array_equal(records['index'], np.arange(25))
+        assert records['values'].shape == (25, 151)
+        assert (records['values'] > 0).any()
+        assert np.all(np.diff(records['timestamp']) >= 0)
+        assert np.all(records['latency'] > 0)
+    
+    def test_fractional_step(self, tmp_path):
+        """Test that a fractional STEP is measured at 1 nm and interpolated onto its grid"""
+        path = tmp_path / "half.jacq"
+        _run("--simulate", "-t", "1", "-n", "2", "--range", "400", "700", "0.5",
+             "-o", str(path), "--report", "0")
+        _run("--simulate", "-t", "1", "-n", "1", "--range", "400", "700", "1",
+             "-o", str(tmp_path / "whole.jacq"), "--report", "0")
+        header, records = cli.read_stream(path)
+        assert header['wavelength_range'] == [400, 700, 0.5]
+        np.testing.assert_allclose(header['wavelengths'], np.arange(400.0, 700.25, 0.5))
+        assert records['values'].shape == (2, 601)
+        _, reference = cli.read_stream(tmp_path / "whole.jacq")
+        np.testing.assert_allclose(records['values'][0, ::2], reference['values'][0], rtol=1e-6)
+    
+    def test_raw_counts_by_serial(self, tmp_path):
+        """Test serial selection and raw pixel streaming"""
+        path = tmp_path / "raw.jacq"
+        _run("--simulate", "3", "--serial", "SIM00003", "--raw", "-t", "1", "-n", "3",
+             "-o", str(path), "--report", "0")
+        header, records = cli.read_stream(path)
+        assert header['serial'] == "SIM00003"
+        assert header['quantity'] == 'light'
+        assert records['values'].dtype == np.int32
+        assert records['values'].shape == (3, 1024)
+    
+    def test_duration_with_interval(self):
+        """Test a timed run on a fixed interval with live status lines"""
+        summary, output = _run("--simulate", "-t", "1", "--duration", "0.3", "--interval", "0.02",
+                               "--report", "0.1")
+        assert 5 <= summary['scans'] <= 16
+        assert "scans/s" in output.splitlines()[0]
+        assert set(summary['latency']) == set(cli.PERCENTILES)
+    
+    def test_list_devices(self):
+        """Test device listing"""
+        _, output = _run("--simulate", "2", "--list")
+        assert output.splitlines() == [
+            "0: device SIM00001  spectrometer SIM00001  board BIM00001",
+            "1: device SIM00002  spectrometer SIM00002  board BIM00002",
+        ]
+    
+    def test_main_exit_codes(self, tmp_path, capsys):
+        """Test the console entry point"""
+        assert cli.main(["--simulate", "-t", "1", "-n", "2", "--report", "0"]) == 0
+        assert cli.main(["--simulate", "-t", "1", "-n", "2", "--range", "100", "2000", "1"]) == 1
+        assert "jeti-acquire:" in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            cli.main(["--simulate", "--serial", "NOPE"])
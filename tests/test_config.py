@@ -0,0 +1,84 @@
+"""
+Tests for the configuration snapshot/diff
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+
+from jeti import JetiError
+from jeti.config import DeviceConfig, FIELDS, PARAM_BLOCK_SIZE
+from jeti.retry import RetryPolicy
+
+
+def _set_calls(sdk):
+    return sum(count for name, count in sdk.calls.items() if name.startswith('JETI_Set'))
+
+
+class TestDeviceConfig:
+    """Test reading, diffing and writing recipes"""
+    
+    def test_read_all(self, device):
+        """Test snapshot of every field"""
+        snapshot = DeviceConfig(device).read()
+        assert set(snapshot) == set(FIELDS)
+        assert snapshot['wavelength_range'] == (380, 780, 1)
+        assert snapshot['integration_time'] == 100.0
+    
+    def test_apply_writes_only_changes(self, sdk, device):
+        """Test that unchanged fields are not written"""
+        config = DeviceConfig(device)
+        config.read()
+        changed = config.apply({'integration_time': 100.0, 'average': 4, 'calib': 0})
+        assert changed == {'average': 4}
+        assert _set_calls(sdk) == 1
+        assert sdk.devices[0].average == 4
+        assert config.writes_skipped == 2
+    
+    def test_repeated_recipe_is_free(self, sdk, device):
+        """Test that re-applying a recipe writes nothing"""
+        config = DeviceConfig(device)
+        recipe = {'integration_time': 12.3, 'average': 2, 'wavelength_range': (400, 700, 5)}
+        config.apply(recipe)
+        writes = _set_calls(sdk)
+        assert config.apply(recipe) == {}
+        assert _set_calls(sdk) == writes
+        assert config.switch_count == 2
+        assert config.last_switch_time >= 0.0
+    
+    def test_range_change_resets_axis(self, device):
+        """Test that a wavelength range change refreshes the spectral axis"""
+        assert device.spectral_axis.range_end == 780
+        DeviceConfig(device).apply({'wavelength_range': (400, 700, 1)})
+        assert device.spectral_axis.range_end == 700
+    
+    def test_unknown_field(self, device):
+        """Test that unknown fields are rejected"""
+        with pytest.raises(ValueError):
+            DeviceConfig(device).diff({'gain': 2})
+    
+    def test_param_block(self, sdk, device):
+        """Test block writes only happen when the block changed"""
+        config = DeviceConfig(device)
+        block = bytearray(config.read_param_block())
+        assert len(block) == PARAM_BLOCK_SIZE
+        assert not config.apply_param_block(bytes(block))
+        block[3] = 7
+        assert config.apply_param_block(bytes(block))
+        assert sdk.calls['JETI_SetParamBlock'] == 1
+        assert sdk.devices[0].param_block[3] == 7
+    
+    def test_retry_policy_set_later(self, sdk, device):
+        """Test that a retry policy set after creation applies to the writes"""
+        config = DeviceConfig(device)
+        config.read()
+        device.set_retry_policy(RetryPolicy(base_delay=0.0))
+        sdk.inject_error('JETI_SetTintConf', JetiError.BUSY)
+        assert config.apply({'integration_time': 37.0}) == {'integration_time': 37.0}
+        assert config.read(['integration_time'])['integration_time'] == 37.0
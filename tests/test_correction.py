@@ -0,0 +1,119 @@
+"""
+Tests for the stray-light matrix correction
+Checked against the simulated DLL's own correction
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiSpectroEx, JetiException, JetiError
+from jeti.correction import StrayLightCorrection, load_matrix
+
+PIXELS = 256
+
+
+def _distribution(pixels: int = PIXELS) -> np.ndarray:
+    index = np.arange(pixels)
+    matrix = 2e-4 * np.exp(-np.abs(index[:, None] - index[None, :]) / 60.0)
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+@pytest.fixture
+def matrix_file(tmp_path):
+    path = tmp_path / "straylight.txt"
+    np.savetxt(path, _distribution())
+    return path
+
+
+@pytest.fixture
+def device_class():
+    return JetiSpectroEx
+
+
+@pytest.fixture
+def device_options():
+    return {'pixel_count': PIXELS, 'stray_light': _distribution(), 'time_scale': 0.0}
+
+
+class TestStrayLightCorrection:
+    """Test loading, caching and applying the correction"""
+    
+    def test_inverse(self):
+        """Test that the correction undoes (I + D)"""
+        distribution = _distribution()
+        correction = StrayLightCorrection(distribution)
+        signal = np.random.default_rng(0).uniform(0.0, 1000.0, (5, PIXELS))
+        measured = signal @ (np.eye(PIXELS) + distribution).T
+        np.testing.assert_allclose(correction.apply(measured), signal, rtol=1e-9, atol=1e-9)
+    
+    def test_matrix_kinds(self):
+        """Test distribution, system and correction matrices give the same result"""
+        distribution = _distribution(16)
+        system = np.eye(16) + distribution
+        spectra = np.ones((2, 16))
+        expected = StrayLightCorrection(distribution).apply(spectra)
+        np.testing.assert_allclose(StrayLightCorrection(system, 'system').apply(spectra), expected)
+        np.testing.assert_allclose(
+            StrayLightCorrection(np.linalg.inv(system), 'correction').apply(spectra), expected)
+        with pytest.raises(ValueError):
+            StrayLightCorrection(distribution, 'unknown')
+    
+    def test_file_cached(self, matrix_file):
+        """Test that a file is loaded and inverted once"""
+        first = StrayLightCorrection.from_file(matrix_file)
+        assert StrayLightCorrection.from_file(str(matrix_file)) is first
+        assert first.pixel_count == PIXELS
+        assert not first.correction.flags.writeable
+    
+    def test_load_formats(self, tmp_path):
+        """Test .npy and comma separated files"""
+        matrix = _distribution(8)
+        np.save(tmp_path / "m.npy", matrix)
+        np.savetxt(tmp_path / "m.csv", matrix, delimiter=',')
+        np.testing.assert_allclose(load_matrix(tmp_path / "m.npy"), matrix)
+        np.testing.assert_allclose(load_matrix(tmp_path / "m.csv"), matrix)
+        np.savetxt(tmp_path / "bad.txt", np.ones((2, 3)))
+        with pytest.raises(ValueError):
+            load_matrix(tmp_path / "bad.txt")
+    
+    def test_dark_and_shape(self):
+        """Test dark subtraction and pixel count check"""
+        correction = StrayLightCorrection(np.zeros((4, 4)))
+        np.testing.assert_allclose(correction.apply(np.full(4, 110.0), dark=np.full(4, 10.0)),
+                                   np.full(4, 100.0))
+        with pytest.raises(ValueError):
+            correction.apply(np.ones(5))
+
+
+class TestAgainstDLL:
+    """Test the correction against the (simulated) DLL correction"""
+    
+    def test_matches_dll(self, device, matrix_file):
+        """Test that the corrected raw scan matches the DLL-corrected scan"""
+        device.import_slm(matrix_file)
+        correction = StrayLightCorrection.from_file(matrix_file)
+        result = correction.compare_with_device(device, integration_time=50.0, average=100)
+        assert result['rms_rel'] < 0.005
+        assert result['max_rel'] < 0.03
+        assert device.get_slm_enable() is False
+    
+    def test_uncorrected_differs(self, device, matrix_file):
+        """Test that the comparison detects a missing correction"""
+        device.import_slm(matrix_file)
+        identity = StrayLightCorrection(np.zeros((PIXELS, PIXELS)))
+        result = identity.compare_with_device(device, integration_time=50.0, average=100)
+        assert result['max_rel'] > 0.05
+    
+    def test_import_missing_file(self, device, tmp_path):
+        """Test the DLL error for a missing matrix file"""
+        with pytest.raises(JetiException) as exc_info:
+            device.import_slm(tmp_path / "missing.txt")
+        assert exc_info.value.error_code == JetiError.FILE_NOT_FOUND
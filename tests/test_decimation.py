@@ -0,0 +1,148 @@
+"""
+Tests for decimation of live spectrum streams
+Runs against the in-process simulated SDK
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiSpectroEx
+from jeti.decimation import Decimator, bin_edges, bin_min_max
+
+
+AXIS = np.arange(380.0, 781.0)
+
+
+def _flat(level: float = 1.0) -> np.ndarray:
+    return np.full(AXIS.size, level, dtype=np.float32)
+
+
+class TestBinning:
+    """Test min/max-preserving wavelength binning"""
+
+    def test_bins_cover_all_values(self):
+        """Test that bins are contiguous and near-equal"""
+        starts = bin_edges(401, 100)
+        assert len(starts) == 100 and starts[0] == 0
+        assert set(np.diff(np.append(starts, 401))) <= {4, 5}
+        assert len(bin_edges(10, 100)) == 10
+
+    def test_single_pixel_peak_survives(self):
+        """Test that a one-pixel peak keeps its height in the bin maximum"""
+        spectrum = _flat()
+        spectrum[123] = 50.0
+        spectrum[300] = -5.0
+        mean, minimum, maximum = bin_min_max(spectrum, bin_edges(spectrum.size, 40))
+        assert maximum.max() == 50.0 and minimum.min() == -5.0
+        assert mean.max() < 50.0
+        assert Decimator(AXIS, bins=40).axis[0] == pytest.approx(AXIS[:10].mean())
+
+
+class TestDecimator:
+    """Test rate limiting, fan-out and payloads"""
+
+    def test_rate_limit_keeps_latest_and_envelope(self):
+        """Test that scans between frames are merged, newest wins, peaks kept"""
+        decimator = Decimator(AXIS, bins=50, max_rate=20.0)
+        display = decimator.subscribe()
+        spike = _flat(2.0)
+        spike[200] = 100.0
+        start = time.monotonic()
+        for scan in range(200):
+            decimator.push(spike if scan == 57 else _flat(3.0 if scan == 199 else 2.0))
+        decimator.flush()
+        elapsed = time.monotonic() - start
+        assert decimator.publications <= elapsed * 20.0 + 2
+
+        frames = []
+        while (frame := display.get(timeout=0.0)) is not None:
+            frames.append(frame)
+        assert sum(frame.scans for frame in frames) == 200
+        assert max(frame.maximum.max() for frame in frames) == 100.0
+        assert np.all(frames[-1].latest == 3.0)
+
+    def test_display_rate_independent_of_acquisition(self):
+        """Test that a slow display gets few frames covering all scans"""
+        decimator = Decimator(AXIS, bins=50, max_rate=0.0)
+        fast = decimator.subscribe()
+        slow = decimator.subscribe(max_rate=10.0)
+        stop = threading.Event()
+
+        def acquire():
+            while not stop.is_set():
+                decimator.push(_flat())
+                time.sleep(0.0005)
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        frames = []
+        deadline = time.monotonic() + 0.35
+        while time.monotonic() < deadline:
+            frames.append(slow.get(timeout=0.5))
+        stop.set()
+        thread.join()
+        decimator.flush()
+        while slow.get(timeout=0.0) is not None:
+            pass
+        assert 3 <= len(frames) <= 6
+        assert slow.scans == decimator.scans
+        assert decimator.publications == decimator.scans
+        assert fast.get(timeout=0.0).scans == decimator.scans
+
+    def test_push_cost_independent_of_subscribers(self):
+        """Test that pushes between publications do not touch the subscriptions"""
+        decimator = Decimator(AXIS, bins=50, max_rate=1.0)
+        displays = [decimator.subscribe() for _ in range(50)]
+        for _ in range(100):
+            decimator.push(_flat())
+        assert decimator.publications == 1
+        assert all(display._pending.scans == 1 for display in displays)
+        displays[0].close()
+        decimator.flush()
+        assert displays[0]._pending.scans == 1
+        assert displays[1]._pending.scans == 100
+
+    def test_float16_payload(self):
+        """Test that float16 frames are scaled and keep peaks rounded outwards"""
+        decimator = Decimator(AXIS, bins=50, max_rate=0.0)
+        display = decimator.subscribe(float16=True)
+        spectrum = np.linspace(1e-5, 3e-3, AXIS.size).astype(np.float32)
+        spectrum[100] = 7.77777e-3
+        decimator.push(spectrum)
+        frame = display.get(timeout=0.0)
+        assert frame.maximum.dtype == np.float16
+        assert frame.scale == pytest.approx(7.77777e-3)
+        _, minimum, maximum = bin_min_max(spectrum, decimator.starts)
+        assert np.all(frame.maximum.astype(np.float32) * frame.scale >= maximum * (1 - 1e-6))
+        assert np.all(frame.minimum.astype(np.float32) * frame.scale <= minimum * (1 + 1e-6))
+        np.testing.assert_allclose(frame.latest.astype(np.float32) * frame.scale,
+                                   bin_min_max(spectrum, decimator.starts)[0], rtol=1e-3)
+
+    def test_timeout_and_length_check(self):
+        """Test that get() times out without scans and wrong lengths are rejected"""
+        decimator = Decimator(AXIS)
+        assert decimator.subscribe().get(timeout=0.01) is None
+        with pytest.raises(ValueError):
+            decimator.push(np.zeros(10))
+
+    @pytest.mark.parametrize('device_class', [JetiSpectroEx], indirect=True)
+    def test_pixel_stream_from_device(self, device):
+        """Test decimating raw pixel spectra of a simulated JetiSpectroEx"""
+        decimator = Decimator(np.arange(device.get_pixel_count()), bins=128, max_rate=0.0)
+        display = decimator.subscribe()
+        for _ in range(3):
+            device.start_light_measurement(10.0, 1)
+            device.wait_for_measurement(0.001)
+            decimator.push(device.get_light_spectrum_pixel())
+        frame = display.get(timeout=0.0)
+        assert frame.scans == 3 and len(frame.maximum) == 128
+        assert np.all(frame.maximum >= frame.minimum)
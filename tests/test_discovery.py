@@ -0,0 +1,193 @@
+"""
+Tests for device discovery and the cached inventory
+Runs against the in-process simulated SDK
+"""
+
+import dataclasses
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+
+from jeti import JetiCore, JetiException, JetiError
+from jeti.discovery import DeviceInventory, enumerate_devices, open_direct
+from jeti.wrapper import ConnectionType
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+
+
+def _devices(connect_time=0.0, probe_time=0.0):
+    return [
+        SimulatedDevice(serial="SIM00001", connection=ConnectionType.USB,
+                        connect_time=connect_time, probe_time=probe_time),
+        SimulatedDevice(serial="SIM00002", connection=ConnectionType.TCP, address="10.0.0.12",
+                        connect_time=connect_time, probe_time=probe_time),
+        SimulatedDevice(serial="SIM00003", connection=ConnectionType.COM, address=7,
+                        connect_time=connect_time, probe_time=probe_time),
+        SimulatedDevice(serial="SIM00004", connection=ConnectionType.BLUETOOTH, address=0x0012_3456_789A,
+                        connect_time=connect_time, probe_time=probe_time),
+    ]
+
+
+SERIALS = ["SIM00001", "SIM00002", "SIM00003", "SIM00004"]
+
+
+@pytest.fixture
+def sdk():
+    return SimulatedSDK(_devices())
+
+
+def _close(devices):
+    for device in devices.values():
+        device.close_device()
+
+
+class TestDeviceInfo:
+    """Test JETI_GetDeviceInfoEx and the direct opens"""
+
+    def test_device_info(self, sdk):
+        """Test that each connection type reports its address"""
+        records = enumerate_devices(JetiCore(dll=sdk))
+        assert [record.serial for record in records] == SERIALS
+        usb, tcp, com, bt = records
+        assert usb.connection == ConnectionType.USB and usb.usb_serial == "FTSIM00001"
+        assert tcp.connection == ConnectionType.TCP and tcp.ip_address == "10.0.0.12"
+        assert com.connection == ConnectionType.COM and com.com_port == 7 and com.baudrate > 0
+        assert bt.connection == ConnectionType.BLUETOOTH and bt.bt_address == 0x0012_3456_789A
+        assert tcp.number == 1
+
+    def test_direct_opens(self, sdk):
+        """Test opening by IP address and FTDI serial without enumeration"""
+        core = JetiCore(dll=sdk)
+        core.open_tcp_device("10.0.0.12")
+        assert "SIM00002" in core.get_identifier()
+        core.close_device()
+        core.open_ftdi_device("FTSIM00001")
+        assert "SIM00001" in core.get_identifier()
+        core.close_device()
+        with pytest.raises(JetiException) as info:
+            core.open_tcp_device("10.0.0.99")
+        assert info.value.error_code == JetiError.ERROR_OPEN
+        assert sdk.calls['JETI_GetNumDevices'] == 0
+
+    def test_direct_open_matches_whole_serial(self):
+        """Test that a device whose serial merely contains the record's is closed again"""
+        sdk = SimulatedSDK([SimulatedDevice(serial="112345", connection=ConnectionType.TCP,
+                                            address="10.0.0.12")])
+        record, = enumerate_devices(JetiCore(dll=sdk))
+        core = JetiCore(dll=sdk)
+        assert not open_direct(core, dataclasses.replace(record, serial="12345"))
+        assert sdk.calls['JETI_CloseDevice'] == 1
+        assert open_direct(core, record)
+        core.close_device()
+
+
+class TestDeviceInventory:
+    """Test cold and warm starts"""
+
+    def test_cold_start_enumerates_and_caches(self, sdk, tmp_path):
+        """Test that an empty cache enumerates once and writes the records"""
+        path = tmp_path / "devices.json"
+        inventory = DeviceInventory(path, dll=sdk)
+        devices = inventory.open_many(SERIALS)
+        assert sorted(devices) == SERIALS
+        assert "SIM00003" in devices["SIM00003"].get_identifier()
+        assert inventory.stats() == {'devices': 4, 'direct_opens': 0, 'fallbacks': 4, 'enumerations': 1}
+        cached = json.loads(path.read_text())
+        assert [record['serial'] for record in cached['devices']] == SERIALS
+        _close(devices)
+
+    def test_warm_start_opens_directly(self, sdk, tmp_path):
+        """Test that cached devices are opened without enumeration"""
+        path = tmp_path / "devices.json"
+        DeviceInventory(path, dll=sdk).enumerate()
+        calls = sdk.calls['JETI_GetNumDevices']
+
+        inventory = DeviceInventory(path, dll=sdk)
+        devices = inventory.open_many(SERIALS)
+        assert sdk.calls['JETI_GetNumDevices'] == calls
+        assert inventory.stats()['direct_opens'] == 4
+        for serial, device in devices.items():
+            assert serial in device.get_identifier()
+        _close(devices)
+
+    def test_moved_device_falls_back(self, sdk, tmp_path):
+        """Test that a device no longer at its cached address is found by enumeration"""
+        path = tmp_path / "devices.json"
+        DeviceInventory(path, dll=sdk).enumerate()
+        sdk.devices[1].address = "10.0.0.13"
+
+        inventory = DeviceInventory(path, dll=sdk)
+        device = inventory.open("SIM00002")
+        assert "SIM00002" in device.get_identifier()
+        assert inventory.stats()['fallbacks'] == 1
+        assert inventory.records["SIM00002"].ip_address == "10.0.0.13"
+        device.close_device()
+
+    def test_swapped_addresses_fall_back(self, tmp_path):
+        """Test that a different device at a cached address is not taken for the cached one"""
+        sdk = SimulatedSDK([
+            SimulatedDevice(serial="SIM00001", connection=ConnectionType.TCP, address="10.0.0.11"),
+            SimulatedDevice(serial="SIM00002", connection=ConnectionType.TCP, address="10.0.0.12"),
+        ])
+        path = tmp_path / "devices.json"
+        DeviceInventory(path, dll=sdk).enumerate()
+        sdk.devices[0].address, sdk.devices[1].address = "10.0.0.12", "10.0.0.11"
+
+        inventory = DeviceInventory(path, dll=sdk)
+        devices = inventory.open_many(["SIM00001"])
+        assert "SIM00001" in devices["SIM00001"].get_identifier()
+        assert inventory.stats()['direct_opens'] == 0
+        assert inventory.stats()['fallbacks'] == 1
+        assert inventory.records["SIM00001"].ip_address == "10.0.0.12"
+        assert sdk.calls['JETI_CloseDevice'] == 1
+        _close(devices)
+
+        sdk.devices[0].connection = sdk.devices[1].connection = ConnectionType.COM
+        sdk.devices[0].address, sdk.devices[1].address = 3, 4
+        inventory.enumerate()
+        sdk.devices[0].address, sdk.devices[1].address = 4, 3
+        devices = inventory.open_many(["SIM00002"])
+        assert "SIM00002" in devices["SIM00002"].get_identifier()
+        assert inventory.stats()['fallbacks'] == 2
+        _close(devices)
+
+    def test_missing_device(self, sdk, tmp_path):
+        """Test that a missing device raises NOT_CONNECTED and closes the others"""
+        inventory = DeviceInventory(tmp_path / "devices.json", dll=sdk)
+        with pytest.raises(JetiException) as info:
+            inventory.open_many(["SIM00001", "SIM09999"])
+        assert info.value.error_code == JetiError.NOT_CONNECTED
+        assert sdk._handles == {}
+
+    def test_unreadable_cache(self, sdk, tmp_path):
+        """Test that a corrupt cache file is ignored"""
+        path = tmp_path / "devices.json"
+        path.write_text("{not json")
+        inventory = DeviceInventory(path, dll=sdk)
+        assert inventory.records == {}
+        inventory.open("SIM00001").close_device()
+        assert json.loads(path.read_text())['version'] == 1
+
+    def test_direct_opens_run_in_parallel(self, tmp_path):
+        """Test that warm opens overlap and beat a cold start"""
+        sdk = SimulatedSDK(_devices(connect_time=0.05, probe_time=0.05))
+        path = tmp_path / "devices.json"
+
+        start = time.perf_counter()
+        devices = DeviceInventory(path, dll=sdk).open_many(SERIALS)
+        cold = time.perf_counter() - start
+        _close(devices)
+
+        start = time.perf_counter()
+        devices = DeviceInventory(path, dll=sdk).open_many(SERIALS)
+        warm = time.perf_counter() - start
+        _close(devices)
+        # Cold: 0.2 s enumeration; serial direct opens would take 0.2 s
+        assert cold >= 0.2
+        assert warm < 0.15
@@ -0,0 +1,206 @@
+"""
+Tests for the vectorized spectrum export
+Checked against Python's own %-formatting and JSON parser
+"""
+
+import json
+import struct
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiRadioEx, export, wrapper
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+
+WAVELENGTHS = np.arange(380.0, 781.0, 5.0)
+
+
+def _text(fields: np.ndarray) -> list:
+    return [bytes(field[field != 0]).decode() for field in fields]
+
+
+@pytest.fixture
+def spectra():
+    rng = np.random.default_rng(0)
+    return rng.lognormal(-3.0, 2.0, (50, WAVELENGTHS.size)) * rng.choice((-1.0, 1.0), (50, 1))
+
+
+class TestEncodeScientific:
+    """Test the fixed-width number encoder"""
+    
+    def test_matches_printf(self):
+        """Test the encoded text against %.Ne where the scaling is exact"""
+        rng = np.random.default_rng(1)
+        for precision in (0, 3, 6, 9):
+            values = np.concatenate((
+                rng.normal(0.0, 1.0, 20000) * 10.0 ** rng.integers(precision - 21, precision, 20000),
+                [0.0, -0.0, 1.0, 0.1, 1e-5, 9.99999949],
+            ))
+            expected = [f"%.{precision}e" % value for value in values]
+            assert _text(export.encode_scientific(values, precision)) == expected
+    
+    def test_rounding_ties(self):
+        """Test values next to a decimal rounding tie against printf"""
+        rng = np.random.default_rng(3)
+        for precision in (0, 3, 6, 9):
+            digits = rng.integers(10 ** precision, 10 ** (precision + 1), 5000)
+            powers = rng.integers(-20, 5, 5000)
+            values = np.array([float(f"{digit}5e{power - precision - 1}")
+                               for digit, power in zip(digits, powers)])
+            values = np.concatenate((values, [9.9999995e-05, 2.5, 0.125, -9.9999995e-05]))
+            expected = [f"%.{precision}e" % value for value in values]
+            assert _text(export.encode_scientific(values, precision)) == expected
+    
+    def test_extreme_magnitudes(self):
+        """Test that huge and subnormal values keep their exponent and all but the last digit"""
+        rng = np.random.default_rng(2)
+        values = np.concatenate((
+            rng.normal(0.0, 1.0, 20000) * 10.0 ** rng.integers(-300, 300, 20000),
+            [1e100, -1e-100, 5e-324, 1.7e308],
+        ))
+        text = _text(export.encode_scientific(values, 6))
+        assert [t.split('e')[1] for t in text] == [("%.6e" % value).split('e')[1] for value in values]
+        np.testing.assert_allclose(np.array(text, dtype=np.float64), values, rtol=1.1e-6)
+    
+    def test_non_finite(self):
+        """Test the text of non-finite values"""
+        values = np.array([np.nan, np.inf, -np.inf, 2.5])
+        assert _text(export.encode_scientific(values)) == ['nan', 'inf', '-inf', '2.500000e+00']
+        null = {'nan': 'null', 'inf': 'null', '-inf': 'null'}
+        assert _text(export.encode_scientific(values, 2, null)) == ['null', 'null', 'null', '2.50e+00']
+
+
+class TestWriteCsv:
+    """Test CSV layouts"""
+    
+    def test_wide(self, tmp_path, spectra):
+        """Test one row per spectrum against a %-formatted reference"""
+        path = tmp_path / "wide.csv"
+        ids = [f"run-{i}" for i in range(len(spectra))]
+        export.write_csv(path, WAVELENGTHS, spectra, ids=ids, metadata={'device': 'SIM00001'},
+                         chunk_rows=16)
+        lines = path.read_text().splitlines()
+        assert lines[0] == "# device: SIM00001"
+        assert lines[1] == "id," + ",".join("%g" % wl for wl in WAVELENGTHS)
+        assert lines[2:] == [ids[i] + "," + ",".join("%.6e" % v for v in row)
+                             for i, row in enumerate(spectra)]
+        
+        wavelengths, read, read_ids, metadata = export.read_csv(path)
+        np.testing.assert_array_equal(wavelengths, WAVELENGTHS)
+        np.testing.assert_allclose(read, spectra, rtol=1e-6)
+        assert read_ids == ids
+        assert metadata == {'device': 'SIM00001'}
+    
+    def test_long(self, tmp_path, spectra):
+        """Test one row per value, with a custom delimiter and precision"""
+        path = tmp_path / "long.csv"
+        export.write_csv(path, WAVELENGTHS, spectra[:3], layout='long', precision=3,
+                         delimiter=';')
+        lines = path.read_text().splitlines()
+        assert lines[0] == "id;wavelength_nm;value"
+        assert len(lines) == 1 + 3 * WAVELENGTHS.size
+        assert lines[1 + WAVELENGTHS.size] == "1;380;%.3e" % spectra[1, 0]
+        
+        wavelengths, read, ids, _ = export.read_csv(path, delimiter=';')
+        np.testing.assert_array_equal(wavelengths, WAVELENGTHS)
+        np.testing.assert_allclose(read, spectra[:3], rtol=1e-3)
+        assert ids == ['0', '1', '2']
+    
+    def test_single_spectrum(self, tmp_path):
+        """Test that a 1-D spectrum is written as one row"""
+        path = tmp_path / "one.csv"
+        export.write_csv(path, WAVELENGTHS, np.ones(WAVELENGTHS.size))
+        assert len(path.read_text().splitlines()) == 2
+    
+    def test_invalid_arguments(self, tmp_path, spectra):
+        """Test that mismatched shapes, ids and layouts are rejected"""
+        with pytest.raises(ValueError):
+            export.write_csv(tmp_path / "x.csv", WAVELENGTHS[:-1], spectra)
+        with pytest.raises(ValueError):
+            export.write_csv(tmp_path / "x.csv", WAVELENGTHS, spectra, ids=[1, 2])
+        with pytest.raises(ValueError):
+            export.write_csv(tmp_path / "x.csv", WAVELENGTHS, spectra, layout='tall')
+        with pytest.raises(ValueError):
+            export.write_csv(tmp_path / "x.csv", WAVELENGTHS, spectra, delimiter=', ')
+    
+    def test_unsafe_ids(self, tmp_path):
+        """Test that ids that would break the columns are rejected, numpy ids accepted"""
+        two = np.ones((2, WAVELENGTHS.size))
+        for ids in (['a,b', 'c'], ['a"', 'c'], ['a\nb', 'c']):
+            with pytest.raises(ValueError):
+                export.write_csv(tmp_path / "x.csv", WAVELENGTHS, two, ids=ids)
+        path = tmp_path / "ok.csv"
+        export.write_csv(path, WAVELENGTHS, two, ids=['a,b', 'c'], delimiter=';')
+        assert export.read_csv(path, delimiter=';')[2] == ['a,b', 'c']
+        export.write_csv(path, WAVELENGTHS, two, ids=np.array([5, 6]))
+        assert export.read_csv(path)[2] == ['5', '6']
+
+
+def test_write_json(tmp_path, spectra):
+    """Test that the JSON document parses and holds every value"""
+    spectra = spectra.copy()
+    spectra[2, 5] = np.nan
+    path = tmp_path / "run.json"
+    export.write_json(path, WAVELENGTHS, spectra, ids=list(range(100, 150)),
+                      metadata={'operator': 'QA'}, chunk_rows=7)
+    document = json.loads(path.read_text())
+    assert document['metadata'] == {'operator': 'QA'}
+    assert document['ids'] == list(range(100, 150))
+    export.write_json(path, WAVELENGTHS, spectra, ids=np.arange(50))
+    assert json.loads(path.read_text())['ids'] == list(range(50))
+    assert document['wavelengths'] == WAVELENGTHS.tolist()
+    assert document['spectra'][2][5] is None
+    read = np.array(document['spectra'], dtype=np.float64)
+    np.testing.assert_allclose(read, spectra, rtol=1e-6)
+
+
+class TestDeviceSave:
+    """Test the DLL's own spectrum files through the simulated SDK"""
+    
+    @pytest.fixture
+    def device(self):
+        device = JetiRadioEx(dll=SimulatedSDK([SimulatedDevice(time_scale=0.0)]))
+        device.open_device(0)
+        device.measure(10.0, 1)
+        device.wait_for_measurement(0.0)
+        yield device
+        device.close_device()
+    
+    def test_save_csv(self, tmp_path, device):
+        """Test JETI_SaveSpecRadCSVEx"""
+        path = tmp_path / "sprad.csv"
+        device.save_spectral_radiance_csv(str(path), 400, 700, operator="QA", memo="lot 7")
+        lines = path.read_text().splitlines()
+        assert lines[:2] == ["Operator;QA", "Memo;lot 7"]
+        values = np.loadtxt(lines[3:], delimiter=';')
+        np.testing.assert_array_equal(values[:, 0], np.arange(400, 701))
+        np.testing.assert_allclose(values[:, 1], device.get_spectral_radiance(400, 700), rtol=1e-6)
+    
+    def test_save_spc(self, tmp_path, device):
+        """Test JETI_SaveSpecRadSPCEx"""
+        path = tmp_path / "sprad.spc"
+        device.save_spectral_radiance_spc(str(path), 380, 780)
+        data = path.read_bytes()
+        points, first, last = struct.unpack_from('<Idd', data, 4)
+        assert (data[1], points, first, last) == (0x4B, 401, 380.0, 780.0)
+        values = np.frombuffer(data, dtype='<f4', offset=512 + 32)
+        np.testing.assert_allclose(values, device.get_spectral_radiance(), rtol=1e-6)
+    
+    def test_ansi_path(self, tmp_path, device, monkeypatch):
+        """Test that Windows paths are passed in the ANSI code page, not as UTF-8"""
+        monkeypatch.setattr(wrapper, '_WINDOWS', True)
+        monkeypatch.setattr(wrapper, '_ANSI_CODEC', 'cp1252')
+        assert wrapper._ansi_path(tmp_path / "spektrum_ä.csv") == \
+            str(tmp_path / "spektrum_ä.csv").encode('cp1252')
+        path = tmp_path / "спектр.csv"
+        with pytest.raises(ValueError, match="ANSI code page"):
+            device.save_spectral_radiance_csv(str(path), 400, 700)
+        with pytest.raises(ValueError, match="ANSI code page"):
+            device.import_slm(path)
+        assert not path.exists()
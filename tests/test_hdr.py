@@ -0,0 +1,105 @@
+"""
+Tests for HDR fusion of bracketed integration times
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiSpectroEx
+from jeti.hdr import fuse_brackets, plan_brackets
+
+
+@pytest.fixture
+def device_class():
+    return JetiSpectroEx
+
+
+class TestFusion:
+    """Test the vectorized planning and fusion"""
+    
+    def test_plan_skips_unneeded_brackets(self):
+        """Test that only the longest unsaturated time per pixel is planned"""
+        rates = np.array([500.0, 300.0, 1.0])
+        plan = plan_brackets(rates, (1.0, 4.0, 16.0, 64.0, 256.0), np.full(3, 60000.0))
+        assert plan == (1.0, 64.0, 256.0)
+    
+    def test_saturated_scan_masked(self):
+        """Test that saturated scans do not contribute"""
+        light = np.array([[1100.0, 1010.0], [65535.0, 1100.0]])
+        dark = np.full((2, 2), 1000.0)
+        rate, uncertainty, saturated = fuse_brackets(light, dark, (1.0, 10.0), 64000.0, 4.0)
+        assert rate[0] == pytest.approx(100.0)
+        assert not saturated.any()
+        # Pixel 1: both scans valid, the longer one dominates
+        assert rate[1] == pytest.approx(10.0, rel=0.05)
+        assert uncertainty[1] < uncertainty[0]
+    
+    def test_noiseless_dark_pixel(self):
+        """Test that a zero variance does not turn the rate into NaN"""
+        light = np.array([[1000.0, 1200.0], [1000.0, 1400.0]])
+        rate, uncertainty, _ = fuse_brackets(light, np.full((2, 2), 1000.0), (1.0, 2.0), 64000.0, 0.0)
+        assert np.isfinite(rate).all() and np.isfinite(uncertainty).all()
+        assert rate[0] == 0.0
+        with pytest.raises(ValueError):
+            fuse_brackets(light, np.zeros((2, 2)), (1.0, 2.0), 64000.0, -1.0)
+    
+    def test_all_saturated(self):
+        """Test the mask of pixels saturated in every scan"""
+        light = np.full((2, 1), 65535.0)
+        _, uncertainty, saturated = fuse_brackets(light, np.zeros((2, 1)), (1.0, 2.0), 64000.0, 4.0)
+        assert saturated.all()
+        assert np.isinf(uncertainty).all()
+
+
+class TestHDRAcquisition:
+    """Test HDR acquisition on JetiSpectroEx"""
+    
+    def test_bracket_plan_and_exposure(self, device):
+        """Test that intermediate brackets are skipped"""
+        result = device.create_hdr_acquisition((1.0, 4.0, 16.0, 64.0, 256.0)).acquire()
+        assert result.integration_times == (1.0, 64.0, 256.0)
+        assert result.total_exposure < (1 + 4 + 16 + 64 + 256) / 1000.0 * 2
+        assert not result.saturated.any()
+    
+    def test_fused_rate(self, simulated, device):
+        """Test the fused spectrum against the simulated source"""
+        result = device.create_hdr_acquisition((1.0, 4.0, 16.0, 64.0, 256.0)).acquire()
+        expected = simulated.source(simulated.pixel_wavelengths) * simulated.gain
+        # Within 5 standard uncertainties everywhere, also at the saturating peak
+        assert (np.abs(result.rate - expected) < 5 * result.uncertainty + 1e-9).all()
+        assert simulated.light.max() == simulated.ADC_MAX
+    
+    def test_better_than_single_scan(self, simulated, device):
+        """Test that the tails are less noisy than in the longest unsaturated single scan"""
+        result = device.create_hdr_acquisition((1.0, 64.0, 256.0)).acquire()
+        single = device.create_hdr_acquisition((64.0,)).acquire()
+        tails = simulated.pixel_wavelengths > 750.0
+        assert np.median(result.uncertainty[tails]) < 0.6 * np.median(single.uncertainty[tails])
+    
+    def test_read_noise_from_dark_difference(self, simulated, device):
+        """Test that the estimate is not inflated by a fixed pattern in the dark"""
+        simulated.dark_offset = 1000.0 + 50.0 * np.sin(np.arange(simulated.pixel_count))
+        hdr = device.create_hdr_acquisition((1.0, 64.0))
+        hdr.acquire()
+        assert hdr.read_noise == pytest.approx(simulated.read_noise, rel=0.15)
+        with pytest.raises(ValueError):
+            device.create_hdr_acquisition((1.0,), read_noise=-1.0)
+    
+    def test_dark_frames_reused(self, device):
+        """Test that dark frames are measured once per integration time"""
+        hdr = device.create_hdr_acquisition((1.0, 64.0, 256.0))
+        hdr.acquire()
+        first = dict(hdr.dark_frames)
+        hdr.acquire()
+        assert hdr.dark_frames.keys() == first.keys()
+        assert all(hdr.dark_frames[t] is first[t] for t in first)
+        hdr.refresh_dark()
+        assert not hdr.dark_frames
@@ -0,0 +1,156 @@
+"""
+Tests for the reference spectrum index
+Checked against brute-force comparisons of every library spectrum
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti._colorimetry import spectrum_to_xyz, xyz_to_lab
+from jeti.index import SpectrumIndex
+
+WAVELENGTHS = np.arange(380.0, 781.0, 2.0)
+
+
+def _library(count: int = 500, seed: int = 1) -> np.ndarray:
+    """Two-peak LED-like spectra with random peaks, widths and weights"""
+    rng = np.random.default_rng(seed)
+    peaks = rng.uniform(420.0, 680.0, (count, 2))
+    widths = rng.uniform(8.0, 40.0, (count, 2))
+    weights = rng.uniform(0.2, 1.0, (count, 2))
+    wl = WAVELENGTHS[None, None, :]
+    lobes = weights[..., None] * np.exp(-0.5 * ((wl - peaks[..., None]) / widths[..., None]) ** 2)
+    return lobes.sum(axis=1) * rng.uniform(0.1, 10.0, (count, 1))
+
+
+def _normalised(spectra: np.ndarray) -> np.ndarray:
+    return spectra / (spectra.sum(axis=-1, keepdims=True) * 2.0)
+
+
+@pytest.fixture
+def library():
+    return _library()
+
+
+@pytest.fixture
+def index(library):
+    index = SpectrumIndex(WAVELENGTHS)
+    index.add(library, ids=[f"LED{i:04d}" for i in range(len(library))])
+    return index
+
+
+def test_query_finds_scaled_copy(index, library):
+    """Normalisation makes a scaled copy of a library spectrum its best match"""
+    for metric in ('cosine', 'rms', 'delta_e'):
+        match = index.query(library[123] * 42.0, k=3, metric=metric)[0]
+        assert match.id == "LED0123"
+        assert match.index == 123
+
+
+def test_scores_match_brute_force(index, library):
+    """Top-k positions and scores equal a full brute-force ranking"""
+    query = _library(4, seed=2)
+    a = _normalised(query)
+    b = _normalised(library)
+
+    cosine = (a @ b.T) / np.outer(np.linalg.norm(a, axis=1), np.linalg.norm(b, axis=1))
+    positions, scores = index.query_batch(query, k=5, metric='cosine')
+    np.testing.assert_array_equal(positions, np.argsort(-cosine, axis=1)[:, :5])
+    np.testing.assert_allclose(scores, np.take_along_axis(cosine, positions, axis=1), rtol=1e-5)
+
+    rms = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).mean(axis=2))
+    positions, scores = index.query_batch(query, k=5, metric='rms')
+    np.testing.assert_array_equal(positions, np.argsort(rms, axis=1)[:, :5])
+    np.testing.assert_allclose(scores, np.take_along_axis(rms, positions, axis=1), rtol=1e-3)
+
+    def lab(spectra):
+        xyz = spectrum_to_xyz(WAVELENGTHS, spectra)
+        return xyz_to_lab(100.0 * xyz / xyz[:, 1:2])
+
+    delta_e = np.linalg.norm(lab(query)[:, None, :] - lab(library)[None, :, :], axis=2)
+    positions, scores = index.query_batch(query, k=5, metric='delta_e')
+    np.testing.assert_allclose(scores, np.sort(delta_e, axis=1)[:, :5], atol=1e-2)
+
+
+def test_xyz_to_lab_white_point():
+    """The reference white maps to L* = 100, a* = b* = 0"""
+    np.testing.assert_allclose(xyz_to_lab(np.array([95.047, 100.0, 108.883])), [100.0, 0.0, 0.0], atol=1e-12)
+
+
+def test_incremental_add(library):
+    """Spectra added in several batches give the same index as one batch"""
+    index = SpectrumIndex(WAVELENGTHS)
+    for chunk in np.array_split(library, 7):
+        index.add(chunk)
+    assert len(index) == len(library)
+    assert index.ids == list(range(len(library)))
+    positions, _ = index.query_batch(library[:10], k=1)
+    np.testing.assert_array_equal(positions[:, 0], np.arange(10))
+
+
+def test_pca_reduction(index, library):
+    """A reduced index keeps the ranking and accepts further spectra"""
+    index.reduce(24)
+    assert index.dimensions == 24
+    positions, scores = index.query_batch(library[:20] * 3.0, k=1, metric='cosine')
+    np.testing.assert_array_equal(positions[:, 0], np.arange(20))
+    np.testing.assert_allclose(scores[:, 0], 1.0, atol=1e-4)
+
+    extra = _library(3, seed=3)
+    added = index.add(extra, ids=["new0", "new1", "new2"])
+    assert list(added) == [500, 501, 502]
+    assert index.query(extra[1], k=1)[0].id == "new1"
+
+    with pytest.raises(ValueError):
+        index.reduce(8)
+
+
+def test_save_and_memory_mapped_load(index, library, tmp_path):
+    """A saved index loads memory-mapped, answers identically and can grow"""
+    index.reduce(16)
+    index.save(tmp_path / "golden.idx")
+    loaded = SpectrumIndex.load(tmp_path / "golden.idx")
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.ids == index.ids
+
+    query = _library(5, seed=4)
+    for metric in ('cosine', 'rms', 'delta_e'):
+        expected = index.query_batch(query, k=4, metric=metric)
+        actual = loaded.query_batch(query, k=4, metric=metric)
+        np.testing.assert_array_equal(actual[0], expected[0])
+        np.testing.assert_allclose(actual[1], expected[1])
+
+    loaded.add(query[:1], ids=["extra"])
+    assert not isinstance(loaded.vectors, np.memmap)
+    assert loaded.query(query[0], k=1)[0].id == "extra"
+
+
+def test_numpy_ids_saved(library, tmp_path):
+    """Numpy ids are stored as Python scalars and survive save() and load()"""
+    index = SpectrumIndex(WAVELENGTHS)
+    index.add(library[:2], ids=np.array([5, 6]))
+    index.add(library[2:4], ids=np.array(["a", "b"]))
+    assert index.ids == [5, 6, "a", "b"]
+    index.save(tmp_path / "ids.idx")
+    assert SpectrumIndex.load(tmp_path / "ids.idx").ids == [5, 6, "a", "b"]
+
+
+def test_invalid_arguments(index):
+    """Wrong grids, metrics and id counts are rejected"""
+    with pytest.raises(ValueError):
+        index.query(np.ones(10))
+    with pytest.raises(ValueError):
+        index.query(np.ones(WAVELENGTHS.size), metric='euclid')
+    with pytest.raises(ValueError):
+        index.add(np.ones((2, WAVELENGTHS.size)), ids=["one"])
+    with pytest.raises(ValueError):
+        SpectrumIndex(WAVELENGTHS, normalization='max')
+    with pytest.raises(ValueError):
+        SpectrumIndex(WAVELENGTHS).query(np.ones(WAVELENGTHS.size))
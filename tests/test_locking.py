@@ -0,0 +1,196 @@
+"""
+Tests for per-handle locking of DLL calls
+Runs against the in-process simulated SDK
+"""
+
+import ctypes
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiCore, JetiRadioEx, JetiError
+from jeti import locking
+from jeti.locking import GLOBAL_LOCK, HandleLock, handle_lock
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+
+
+def _run_threads(target, count):
+    errors = []
+
+    def run(number):
+        try:
+            target(number)
+        except Exception as exc:  # collected and re-raised in the test thread
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.fixture
+def device_class():
+    return JetiRadioEx
+
+
+@pytest.fixture
+def device_options():
+    return {'time_scale': 0.0, 'command_time': 0.0002}
+
+
+class TestHandleLock:
+    """Test the contention counters"""
+
+    def test_contended_acquisition_counted(self):
+        """Test that waiting for a held lock is counted with its wait time"""
+        lock = HandleLock("test")
+        lock.acquire()
+        waiter = threading.Thread(target=lambda: lock.acquire() or lock.release())
+        waiter.start()
+        time.sleep(0.02)
+        lock.release()
+        waiter.join()
+        stats = lock.stats()
+        assert stats.acquisitions == 2
+        assert stats.contended == 1
+        assert stats.wait_time >= 0.01
+        assert stats.max_wait == stats.wait_time
+        lock.reset()
+        assert lock.stats() == (0, 0, 0.0, 0.0)
+
+    def test_waiters_served_in_order(self):
+        """Test that a thread re-acquiring right after its release cannot skip a waiter"""
+        lock = HandleLock("test")
+        order = []
+        lock.acquire()
+        waiter = threading.Thread(target=lambda: lock.acquire() or order.append("waiter") or lock.release(),
+                                  daemon=True)
+        waiter.start()
+        time.sleep(0.02)
+        lock.release()
+        lock.acquire()
+        order.append("holder")
+        lock.release()
+        waiter.join(timeout=1.0)
+        assert order == ["waiter", "holder"]
+
+    def test_stats_while_held(self):
+        """Test that reading the counters does not wait for the holder"""
+        lock = HandleLock("test")
+        lock.acquire()
+        reader = threading.Thread(target=lock.stats, daemon=True)
+        reader.start()
+        reader.join(timeout=1.0)
+        alive = reader.is_alive()
+        lock.release()
+        assert not alive
+
+    def test_locks_by_handle(self):
+        """Test that a handle maps to one lock and a NULL handle to the global lock"""
+        assert handle_lock(ctypes.c_void_p(0x7FFF0001)) is handle_lock(0x7FFF0001)
+        assert handle_lock(ctypes.c_void_p(0x7FFF0001)) is not handle_lock(0x7FFF0002)
+        assert handle_lock(ctypes.c_void_p()) is GLOBAL_LOCK
+        assert "0x7fff0001" in locking.contention_stats()
+
+
+class TestLockedCalls:
+    """Test DLL calls through the wrapper from several threads"""
+
+    def test_simulator_detects_interleaved_commands(self, simulated):
+        """Test that unlocked concurrent calls on one handle fail with ERROR_NAK"""
+        sdk = SimulatedSDK([simulated])
+        handle = ctypes.c_void_p()
+        assert sdk.JETI_OpenDevice(0, ctypes.byref(handle)) == JetiError.SUCCESS
+        results = []
+
+        def poll(_):
+            tint = ctypes.c_float()
+            for _ in range(50):
+                results.append(sdk.JETI_GetTint(handle, ctypes.byref(tint)))
+
+        _run_threads(poll, 4)
+        assert simulated.collisions > 0
+        assert results.count(JetiError.ERROR_NAK) == simulated.collisions
+
+    def test_status_poll_during_measurement(self, simulated, device):
+        """Test a UI thread polling status while a worker measures"""
+        stop = threading.Event()
+
+        def worker():
+            for _ in range(20):
+                device.measure(1.0, 1)
+                device.wait_for_measurement(0.0)
+            stop.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        polls = 0
+        while not stop.is_set():
+            device.get_measure_status()
+            polls += 1
+        thread.join()
+        assert polls > 0
+        assert simulated.collisions == 0
+        assert device.lock_stats().contended > 0
+
+    def test_heavy_load_results_correct(self, simulated, device):
+        """Test that many threads reading one device all get the measured data"""
+        device.measure(10.0, 1)
+        device.wait_for_measurement(0.0)
+        reference = device.get_spectral_radiance(380, 780)
+        cct = device.get_cct()
+        before = device.lock_stats().acquisitions
+
+        def read(number):
+            for _ in range(25):
+                if number % 2:
+                    np.testing.assert_array_equal(device.get_spectral_radiance(380, 780), reference)
+                else:
+                    assert device.get_cct() == cct
+                    assert device.core.JETI_GetTint(device._device_handle,
+                                                    ctypes.byref(ctypes.c_float())) == 0
+
+        _run_threads(read, 8)
+        assert simulated.collisions == 0
+        stats = device.lock_stats()
+        # get_spectral_radiance is one call, the others two
+        assert stats.acquisitions - before == 4 * 25 + 4 * 25 * 2
+        assert stats.contended > 0
+
+    def test_handles_run_concurrently(self):
+        """Test that calls on different handles do not wait for each other"""
+        devices = [SimulatedDevice(serial=f"SIM0000{number}", time_scale=0.0, command_time=0.01)
+                   for number in range(2)]
+        sdk = SimulatedSDK(devices)
+        opened = [JetiCore(dll=sdk) for _ in devices]
+        for number, device in enumerate(opened):
+            device.open_device(number)
+
+        start = time.perf_counter()
+        _run_threads(lambda number: [opened[number].get_integration_time() for _ in range(10)], 2)
+        elapsed = time.perf_counter() - start
+        for device in opened:
+            assert device.lock_stats().contended == 0
+            device.close_device()
+        # Serialised calls would take 0.2 s
+        assert elapsed < 0.17
+
+    def test_global_calls_use_global_lock(self):
+        """Test that calls without a handle take the global lock"""
+        core = JetiCore(dll=SimulatedSDK())
+        before = GLOBAL_LOCK.stats().acquisitions
+        core.get_num_devices()
+        core.get_dll_version()
+        assert GLOBAL_LOCK.stats().acquisitions == before + 2
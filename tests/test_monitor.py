@@ -0,0 +1,164 @@
+"""
+Tests for the incremental drift monitor
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiRadioEx
+from jeti.monitor import CUSUM, EWMA, DriftMonitor, WindowedQuantiles, SPECTRAL_DEVIATION
+from jeti.simulator import led_spectrum
+
+
+@pytest.fixture
+def device_class():
+    return JetiRadioEx
+
+
+class TestStatistics:
+    """Test the streaming statistics"""
+    
+    def test_ewma_converges(self):
+        """Test that the EWMA follows a level change"""
+        ewma = EWMA(0.2)
+        for value in [1.0] * 50 + [2.0] * 50:
+            ewma.update(value)
+        assert ewma.mean == pytest.approx(2.0, abs=1e-4)
+        assert ewma.variance < 1e-4
+    
+    def test_window_quantiles(self):
+        """Test that quantiles cover only the last window of values"""
+        window = WindowedQuantiles(100, (0.0, 0.5, 1.0))
+        for value in range(1000):
+            window.update(float(value))
+        assert window.values() == {0.0: 900.0, 0.5: 949.5, 1.0: 999.0}
+    
+    def test_cusum_detects_shift(self):
+        """Test that a one-sigma shift is flagged within a few samples"""
+        cusum = CUSUM(threshold=5.0, drift=0.5)
+        assert all(cusum.update(z) == 0 for z in np.random.default_rng(0).normal(0, 0.2, 200))
+        directions = [cusum.update(-1.0) for _ in range(20)]
+        assert -1 in directions
+        assert directions.index(-1) < 12
+
+
+class TestDriftMonitor:
+    """Test the monitor on value streams"""
+    
+    def test_state_matches_batch_statistics(self):
+        """Test that the running state equals statistics over the whole stream"""
+        values = np.random.default_rng(1).normal(3000.0, 5.0, 500)
+        monitor = DriftMonitor(window=50, warmup=30)
+        for value in values:
+            monitor.update({'cct': value})
+        state = monitor.state()['cct']
+        assert state.count == 500
+        assert state.mean == pytest.approx(values.mean())
+        assert state.std == pytest.approx(values.std(ddof=1))
+        assert state.minimum == values.min()
+        assert state.maximum == values.max()
+        assert state.quantiles[0.5] == pytest.approx(np.median(values[-50:]))
+        assert state.baseline[0] == pytest.approx(values[:30].mean())
+    
+    def test_threshold_breach(self):
+        """Test that limit violations are flagged and queued"""
+        seen = []
+        monitor = DriftMonitor(limits={'x': (0.30, 0.32)}, on_event=seen.append)
+        assert monitor.update({'x': 0.31}) == []
+        events = monitor.update({'x': 0.33})
+        assert [(event.quantity, event.kind, event.reference) for event in events] == \
+            [('x', 'above_limit', 0.32)]
+        assert events[0].sample == 1
+        assert seen == events
+        assert monitor.pending_events() == events
+        assert monitor.pending_events() == []
+    
+    def test_change_point(self):
+        """Test that a slow drift is flagged as a change-point, not the noise"""
+        rng = np.random.default_rng(2)
+        monitor = DriftMonitor(warmup=50, cusum_threshold=8.0)
+        for value in rng.normal(100.0, 1.0, 300):
+            monitor.update({'radio': value})
+        assert monitor.pending_events() == []
+        for step in range(100):
+            monitor.update({'radio': rng.normal(100.0 - 0.05 * step, 1.0)})
+        kinds = {event.kind for event in monitor.pending_events()}
+        assert kinds == {'change_down'}
+    
+    def test_reset_baseline(self):
+        """Test that a reset takes a new baseline from the next values"""
+        monitor = DriftMonitor(warmup=5)
+        for value in [1.0, 1.1, 0.9, 1.0, 1.0]:
+            monitor.update({'photo': value})
+        monitor.reset_baseline()
+        assert monitor.state()['photo'].baseline is None
+        for value in [2.0, 2.1, 1.9, 2.0, 2.0]:
+            monitor.update({'photo': value})
+        assert monitor.state()['photo'].baseline[0] == pytest.approx(2.0)
+        assert monitor.state()['photo'].count == 10
+
+
+class TestMeasurementHook:
+    """Test the monitor as a JetiRadioEx measurement hook"""
+    
+    def _measure(self, device, count):
+        for _ in range(count):
+            device.measure(10.0, 1)
+            device.wait_for_measurement(0.0)
+    
+    def test_hook_runs_after_measurement(self, device):
+        """Test that every completed measurement reaches the monitor"""
+        monitor = device.create_drift_monitor(warmup=5)
+        self._measure(device, 8)
+        state = monitor.state()
+        assert monitor.samples == 8
+        assert set(state) == {'radio', 'photo', 'x', 'y', 'cct', SPECTRAL_DEVIATION}
+        assert state['cct'].count == 8
+        assert state[SPECTRAL_DEVIATION].count == 3
+        assert monitor.spectrum_stats.mean.shape == (401,)
+        
+        device.remove_measurement_hook(monitor)
+        self._measure(device, 2)
+        assert monitor.samples == 8
+    
+    def test_hook_errors_recorded(self, device):
+        """Test that a failing hook is recorded and does not stop the others"""
+        seen = []
+        def broken(device):
+            raise ValueError("hook failed")
+        device.add_measurement_hook(broken)
+        device.add_measurement_hook(seen.append)
+        self._measure(device, 3)
+        assert len(seen) == 3
+        assert len(device.hook_errors) == 3
+        hook, error = device.hook_errors[0]
+        assert hook is broken and isinstance(error, ValueError)
+    
+    def test_internal_scans_skip_hooks(self, device):
+        """Test that the scans averaged by measure_to_snr do not reach the hooks"""
+        seen = []
+        device.add_measurement_hook(seen.append)
+        result = device.measure_to_snr(50.0, integration_time=5.0, max_scans=20)
+        assert result.scans > 1
+        assert seen == []
+        device.wait_for_measurement(0.0, run_hooks=False)
+        assert seen == []
+    
+    def test_source_drift_flagged(self, simulated, device):
+        """Test that a dimming source raises change-points on the radiance"""
+        monitor = device.create_drift_monitor(warmup=20, quantities=('radio',))
+        self._measure(device, 40)
+        assert monitor.pending_events() == []
+        simulated.source = lambda wavelengths: 0.97 * led_spectrum(wavelengths)
+        self._measure(device, 10)
+        events = monitor.pending_events()
+        assert ('radio', 'change_down') in {(event.quantity, event.kind) for event in events}
+        assert SPECTRAL_DEVIATION in {event.quantity for event in events}
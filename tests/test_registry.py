@@ -0,0 +1,80 @@
+"""
+Tests for the header-generated signature registry
+Runs without DLLs or hardware
+"""
+
+import sys
+from ctypes import c_uint32, c_void_p, POINTER
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+
+from jeti import _signatures
+from jeti.registry import BoundLibrary, parse_prototypes, render_signature_module
+
+
+class _FakeDLL:
+    """Stand-in for ctypes.WinDLL: every attribute is a settable callable"""
+    
+    def __getattr__(self, name):
+        def function(*args):
+            return 0
+        setattr(self, name, function)
+        return function
+
+
+class TestGeneratedTables:
+    """Test that the generated tables match the shipped headers"""
+    
+    def test_tables_up_to_date(self):
+        """Test that _signatures.py is regenerated from include/*.h"""
+        expected = render_signature_module(_project_root / "include")
+        assert Path(_signatures.__file__).read_text(encoding='utf-8') == expected
+    
+    def test_core_surface_complete(self):
+        """Test that every jeti_core.h prototype is in the table"""
+        header = (_project_root / "include" / "jeti_core.h").read_text(encoding='latin-1')
+        assert header.count('__stdcall JETI_') == len(_signatures.CORE)
+        for name in ('JETI_FetchSprad', 'JETI_CalcAllValue', 'JETI_SetWranConf', 'JETI_SetSyncMode'):
+            assert name in _signatures.CORE
+    
+    def test_parse_prototype(self):
+        """Test parsing of pointer and handle parameters"""
+        prototypes = parse_prototypes(
+            "DWORD __stdcall JETI_OpenTCPDevice (char * cIPAddr, DWORD_PTR *dwDevice);"
+        )
+        assert prototypes['JETI_OpenTCPDevice'] == ('c_uint32', ['c_char_p', 'POINTER(c_void_p)'])
+    
+    def test_unknown_type_rejected(self):
+        """Test that unmapped C types are reported"""
+        with pytest.raises(ValueError):
+            parse_prototypes("DWORD __stdcall JETI_Foo (STRUCT *sFoo);")
+
+
+class TestBoundLibrary:
+    """Test lazy binding"""
+    
+    def test_lazy_binding(self):
+        """Test that functions are bound on first use only"""
+        library = BoundLibrary(_FakeDLL(), _signatures.CORE)
+        assert library.bound_functions == []
+        function = library.JETI_GetNumDevices
+        assert function.argtypes == [POINTER(c_uint32)]
+        assert function.restype is c_uint32
+        assert library.bound_functions == ['JETI_GetNumDevices']
+        assert library.JETI_GetNumDevices is function
+    
+    def test_handle_argument(self):
+        """Test that device handles bind as c_void_p"""
+        library = BoundLibrary(_FakeDLL(), _signatures.CORE)
+        assert library.JETI_FetchCCT.argtypes[0] is c_void_p
+    
+    def test_undeclared_function(self):
+        """Test that undeclared functions raise AttributeError"""
+        library = BoundLibrary(_FakeDLL(), _signatures.CORE)
+        with pytest.raises(AttributeError):
+            library.JETI_DoesNotExist
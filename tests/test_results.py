@@ -0,0 +1,144 @@
+"""
+Tests for compact measurement records and columnar result batches
+Runs against the in-process simulated SDK
+"""
+
+import sys
+import tracemalloc
+from array import array
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiRadioEx
+from jeti.results import BYTES_PER_SCAN, CRI_NAMES, RadiometricResult, ResultBatch
+
+
+def _result(i: int) -> RadiometricResult:
+    return RadiometricResult(1.5 + i, 100.0 + i, 0.3125, 0.375, 3000.0 + i,
+                             np.arange(15, dtype=np.float32) + i)
+
+
+def _allocated(build, count: int) -> float:
+    """Bytes allocated per object by build(i), for objects kept alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(kept) == count
+    return (after - before) / count
+
+
+@pytest.fixture
+def device_class():
+    return JetiRadioEx
+
+
+@pytest.fixture
+def device_options():
+    return {'serial': "SIM00001", 'time_scale': 0.0, 'seed': 1}
+
+
+class TestRadiometricResult:
+    """Test the slotted record"""
+
+    def test_matches_get_all_values(self, device):
+        """Test that get_result() holds the values of get_all_values()"""
+        device.measure(20.0, 1)
+        device.wait_for_measurement(0.001)
+        result = device.get_result()
+        values = device.get_all_values()
+        assert isinstance(result.cri, array) and len(result.cri) == 15
+        assert result.radiometric == values['radiometric']
+        assert result.chromaticity_xy == values['chromaticity_xy']
+        assert result.cct == values['cct']
+        np.testing.assert_array_equal(result.as_dict()['cri'], values['cri'])
+
+    def test_slots(self):
+        """Test that records carry no per-instance dictionary"""
+        result = _result(0)
+        assert not hasattr(result, '__dict__')
+        with pytest.raises(AttributeError):
+            result.timestamp = 0.0
+
+    def test_memory_per_record(self):
+        """Test the documented memory use against the dictionary layout"""
+        def as_dict(i):
+            return {'radiometric': 1.5 + i, 'photometric': 100.0 + i, 'chromaticity_xy': (0.31 + i, 0.32 + i),
+                    'cct': 3000.0 + i, 'cri': np.arange(15, dtype=np.float64) + i}
+
+        record = _allocated(lambda i: RadiometricResult(1.5 + i, 100.0 + i, 0.31 + i, 0.32 + i,
+                                                        3000.0 + i, array('f', bytes(60))), 2000)
+        dictionary = _allocated(as_dict, 2000)
+        assert record < 400
+        assert dictionary > 1.5 * record
+
+
+class TestResultBatch:
+    """Test the columnar container"""
+
+    def test_append_grows_and_round_trips(self):
+        """Test that appends past the capacity keep every scan"""
+        batch = ResultBatch(capacity=4)
+        results = [_result(i) for i in range(10)]
+        batch.extend(results)
+        assert len(batch) == 10
+        assert batch.capacity == 16
+        assert list(batch) == results
+        assert batch[-1] == results[-1]
+        with pytest.raises(IndexError):
+            batch[10]
+        np.testing.assert_array_equal(batch.column('cct'), [3000.0 + i for i in range(10)])
+        assert batch.column('cri').shape == (10, 15)
+        assert batch.column('x').base is not None
+
+    def test_memory_per_scan(self):
+        """Test that storage is BYTES_PER_SCAN per allocated scan"""
+        assert BYTES_PER_SCAN == 80
+        batch = ResultBatch(capacity=1000)
+        assert batch.nbytes == 1000 * BYTES_PER_SCAN
+        batch.extend(_result(i) for i in range(1001))
+        assert batch.nbytes == 2000 * BYTES_PER_SCAN
+        batch.shrink_to_fit()
+        assert batch.nbytes == 1001 * BYTES_PER_SCAN
+        assert batch[1000] == _result(1000)
+
+    def test_appends_from_device(self, device):
+        """Test collecting device results"""
+        batch = ResultBatch(capacity=2)
+        for _ in range(5):
+            device.measure(20.0, 1)
+            device.wait_for_measurement(0.001)
+            batch.append(device.get_result())
+        assert len(batch) == 5
+        assert np.all(batch.column('cct') > 1000.0)
+
+    def test_to_pandas(self):
+        """Test the DataFrame conversion"""
+        pytest.importorskip("pandas")
+        frame = ResultBatch.from_results([_result(i) for i in range(3)]).to_pandas()
+        assert list(frame.columns) == ['radiometric', 'photometric', 'x', 'y', 'cct', *CRI_NAMES]
+        assert frame['R14'].tolist() == [14.0, 15.0, 16.0]
+
+    def test_to_arrow(self):
+        """Test the Arrow conversion"""
+        pytest.importorskip("pyarrow")
+        table = ResultBatch.from_results([_result(i) for i in range(3)]).to_arrow()
+        assert table.num_rows == 3
+        assert table.column('cri')[1].as_py()[0] == 1.0
+
+    def test_missing_optional_dependency(self, monkeypatch):
+        """Test that conversions name the missing package"""
+        monkeypatch.setitem(sys.modules, 'pandas', None)
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+        batch = ResultBatch.from_results([_result(0)])
+        with pytest.raises(ImportError, match="pandas"):
+            batch.to_pandas()
+        with pytest.raises(ImportError, match="pyarrow"):
+            batch.to_arrow()
@@ -0,0 +1,105 @@
+"""
+Tests for the retry policy on transient DLL errors
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+
+from jeti import JetiException, JetiError
+from jeti.retry import RetryPolicy, is_idempotent
+
+
+@pytest.fixture
+def device(device):
+    device.set_retry_policy(RetryPolicy(max_attempts=4, base_delay=0.0, seed=1))
+    return device
+
+
+class TestIdempotency:
+    """Test the default idempotency flags"""
+    
+    def test_reads_are_idempotent(self):
+        """Test that getters, fetches and status polls may be repeated"""
+        for name in ('JETI_GetPixel', 'JETI_FetchSprad', 'JETI_MeasureStatusEx',
+                     'JETI_SpecRadEx', 'JETI_LightPixEx', 'JETI_SetTintConf'):
+            assert is_idempotent(name), name
+    
+    def test_measurement_starts_are_not(self):
+        """Test that measurement starts and streams are never replayed"""
+        for name in ('JETI_Measure', 'JETI_MeasureEx', 'JETI_InitMeasure',
+                     'JETI_StartLightEx', 'JETI_ContLightEx', 'JETI_OpenDevice'):
+            assert not is_idempotent(name), name
+    
+    def test_override(self):
+        """Test per-function overrides"""
+        policy = RetryPolicy(idempotent={'JETI_GetPixel': False, 'JETI_Reset': True})
+        assert not policy.is_idempotent('JETI_GetPixel')
+        assert policy.is_idempotent('JETI_Reset')
+
+
+class TestRetryPolicy:
+    """Test retries through a wrapper object"""
+    
+    def test_transient_error_recovered(self, sdk, device):
+        """Test that a BUSY getter is retried transparently"""
+        sdk.inject_error('JETI_GetPixel', JetiError.BUSY, count=2)
+        assert device.get_pixel_count() == 1024
+        stats = device.retry_policy.stats()
+        assert stats['retries'] == 2
+        assert stats['recovered'] == 1
+        assert stats['give_ups'] == 0
+    
+    def test_give_up(self, sdk, device):
+        """Test that persistent errors raise after max_attempts"""
+        sdk.inject_error('JETI_GetPixel', JetiError.CHECKSUM_ERROR, count=10)
+        with pytest.raises(JetiException) as exc_info:
+            device.get_pixel_count()
+        assert exc_info.value.error_code == JetiError.CHECKSUM_ERROR
+        assert sdk.calls['JETI_GetPixel'] == 4
+        assert device.retry_policy.stats()['give_ups_by_error'] == {'CHECKSUM_ERROR': 1}
+    
+    def test_non_transient_not_retried(self, sdk, device):
+        """Test that non-transient errors fail immediately"""
+        sdk.inject_error('JETI_GetPixel', JetiError.INVALID_HANDLE)
+        with pytest.raises(JetiException):
+            device.get_pixel_count()
+        assert sdk.calls['JETI_GetPixel'] == 1
+    
+    def test_measurement_not_replayed(self, sdk, device):
+        """Test that JETI_InitMeasure is not repeated on BUSY"""
+        sdk.inject_error('JETI_InitMeasure', JetiError.BUSY)
+        acquisition = device.create_acquisition(('radio',))
+        with pytest.raises(JetiException):
+            acquisition.acquire()
+        assert sdk.calls['JETI_InitMeasure'] == 1
+    
+    def test_retry_budget(self, sdk, device):
+        """Test that an empty budget stops retrying"""
+        device.set_retry_policy(RetryPolicy(base_delay=0.0, budget=1.0, budget_refill=0.0))
+        sdk.inject_error('JETI_GetPixel', JetiError.TIMEOUT, count=10)
+        with pytest.raises(JetiException):
+            device.get_pixel_count()
+        stats = device.retry_policy.stats()
+        assert stats['retries'] == 1
+        assert stats['budget_exhausted'] == 1
+    
+    def test_backoff_bounded(self):
+        """Test that jittered delays stay within the exponential bound"""
+        policy = RetryPolicy(base_delay=0.01, max_delay=0.05, seed=3)
+        for retry in range(6):
+            assert 0.0 <= policy.backoff(retry) <= min(0.05, 0.01 * 2 ** retry)
+    
+    def test_remove_policy(self, sdk, device):
+        """Test that removing the policy restores direct calls"""
+        device.set_retry_policy(None)
+        sdk.inject_error('JETI_GetPixel', JetiError.BUSY)
+        with pytest.raises(JetiException):
+            device.get_pixel_count()
+        assert device.retry_policy is None
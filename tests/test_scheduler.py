@@ -0,0 +1,181 @@
+"""
+Tests for the deadline-aware measurement scheduler
+Runs against the in-process simulated SDK
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiRadioEx, JetiException, JetiError
+from jeti.scheduler import (DONE, FAILED, DurationEstimator, Job, MeasurementScheduler,
+                            plan)
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+
+
+def _job(sequence, estimate, deadline=None, priority=0):
+    return Job(f"j{sequence}", 'bench', 0.0, 1, priority, deadline, estimate,
+               lambda device: None, True, sequence)
+
+
+@pytest.fixture
+def sdk():
+    return SimulatedSDK([SimulatedDevice(serial="SIM00001", seed=1),
+                         SimulatedDevice(serial="SIM00002", seed=2)])
+
+
+@pytest.fixture
+def devices(sdk):
+    opened = {}
+    for number, name in enumerate(('bench1', 'bench2')):
+        device = JetiRadioEx(dll=sdk)
+        device.open_device(number)
+        opened[name] = device
+    yield opened
+    for device in opened.values():
+        device.close_device()
+
+
+class TestPlan:
+    """Test the per-device ordering"""
+
+    def test_earliest_deadline_first(self):
+        """Test that feasible jobs run by deadline, jobs without one last"""
+        jobs = [_job(0, 1.0), _job(1, 1.0, deadline=5.0), _job(2, 1.0, deadline=2.0)]
+        assert [job.name for job in plan(jobs, 0.0)] == ['j2', 'j1', 'j0']
+
+    def test_drops_lowest_priority_to_keep_others_on_time(self):
+        """Test that an infeasible set gives up the lowest-priority job"""
+        jobs = [_job(0, 2.0, deadline=2.0, priority=1),
+                _job(1, 1.0, deadline=2.5, priority=0),
+                _job(2, 1.0, deadline=3.0, priority=2)]
+        order = [job.name for job in plan(jobs, 0.0)]
+        assert order == ['j0', 'j2', 'j1']
+
+    def test_job_late_on_its_own_runs_last(self):
+        """Test that a job missing its deadline even when run first does not delay others"""
+        jobs = [_job(0, 0.1, deadline=1.0, priority=0),
+                _job(1, 5.0, deadline=2.0, priority=5),
+                _job(2, 0.1, deadline=3.0, priority=0)]
+        assert [job.name for job in plan(jobs, 0.0)] == ['j0', 'j2', 'j1']
+
+    def test_drops_until_on_time(self):
+        """Test that one added job can give up several lower-priority jobs"""
+        jobs = [_job(0, 1.0, deadline=9.0, priority=0),
+                _job(1, 1.0, deadline=9.5, priority=0),
+                _job(2, 9.5, deadline=10.0, priority=5)]
+        assert [job.name for job in plan(jobs, 0.0)] == ['j2', 'j0', 'j1']
+
+    def test_no_deadline_by_priority(self):
+        """Test that jobs without a deadline run highest priority first"""
+        jobs = [_job(0, 1.0, priority=0), _job(1, 1.0, priority=3), _job(2, 1.0, priority=1)]
+        assert [job.name for job in plan(jobs, 0.0)] == ['j1', 'j2', 'j0']
+
+
+class TestDurationEstimator:
+    """Test the runtime model"""
+
+    def test_learns_overhead_and_scale(self):
+        """Test that the fit converges to the observed runtime model"""
+        estimator = DurationEstimator(overhead=0.0)
+        assert estimator.estimate(100.0, 5) == pytest.approx(0.5)
+        for integration_time in (10.0, 50.0, 100.0, 20.0, 80.0):
+            estimator.observe(integration_time, 2, 0.03 + 1.2 * integration_time * 2 / 1000.0)
+        assert estimator.overhead == pytest.approx(0.03)
+        assert estimator.scale == pytest.approx(1.2)
+        assert estimator.estimate(100.0, 5) == pytest.approx(0.63)
+
+    def test_single_exposure_fits_overhead(self):
+        """Test that repeated identical jobs only adjust the overhead"""
+        estimator = DurationEstimator(overhead=0.5)
+        for _ in range(3):
+            estimator.observe(10.0, 1, 0.04)
+        assert estimator.scale == 1.0
+        assert estimator.overhead == pytest.approx(0.03)
+
+
+class TestMeasurementScheduler:
+    """Test job execution, preemption and statistics"""
+
+    def test_runs_jobs_and_reports_waits(self, devices):
+        """Test that jobs return their spectra and waits are published"""
+        with MeasurementScheduler(devices, poll_interval=0.001) as scheduler:
+            jobs = [scheduler.submit('bench1', 5.0, 1) for _ in range(4)]
+            spectra = [job.result(timeout=5.0) for job in jobs]
+        assert all(isinstance(spectrum, np.ndarray) and spectrum.shape == (401,) for spectrum in spectra)
+        assert all(job.status == DONE and job.on_time for job in jobs)
+        stats = scheduler.stats()['bench1']
+        assert stats.completed == 4 and stats.on_time == 4 and stats.queued == 0
+        assert stats.max_wait >= stats.mean_wait > 0.0
+        assert set(stats.wait_quantiles) == {0.5, 0.95}
+        assert scheduler.estimator('bench1').observations == 4
+
+    def test_jobs_skip_measurement_hooks(self, devices):
+        """Test that scheduled jobs do not run the device's measurement hooks"""
+        seen = []
+        devices['bench1'].add_measurement_hook(seen.append)
+        with MeasurementScheduler(devices, poll_interval=0.001) as scheduler:
+            scheduler.submit('bench1', 5.0, 1).result(timeout=5.0)
+        assert seen == []
+
+    def test_unassigned_job_goes_to_idle_device(self, devices):
+        """Test that a job without a device goes where it finishes first"""
+        with MeasurementScheduler(devices, poll_interval=0.001) as scheduler:
+            long = scheduler.submit('bench1', 100.0, 3)
+            quick = scheduler.submit(integration_time=5.0)
+            assert quick.device == 'bench2'
+            quick.result(timeout=5.0)
+            long.result(timeout=5.0)
+
+    def test_preempts_for_urgent_job(self, sdk, devices):
+        """Test that a long job is cancelled and requeued for an urgent one"""
+        with MeasurementScheduler(devices, poll_interval=0.002) as scheduler:
+            long = scheduler.submit('bench1', 100.0, 10, name='burn-in')
+            while long.started is None:
+                time.sleep(0.001)
+            urgent = scheduler.submit('bench1', 5.0, 1, priority=5, deadline=0.3, name='spot')
+            urgent.result(timeout=5.0)
+            long.result(timeout=5.0)
+        assert urgent.on_time
+        assert long.preemptions == 1
+        assert long.finished > urgent.finished
+        assert sdk.calls['JETI_MeasureBreakEx'] == 1
+        assert scheduler.stats()['bench1'].preemptions == 1
+
+    def test_no_preemption_without_risk(self, sdk, devices):
+        """Test that a job is left running when the urgent one can wait"""
+        with MeasurementScheduler(devices, poll_interval=0.002) as scheduler:
+            running = scheduler.submit('bench1', 20.0, 1)
+            while running.started is None:
+                time.sleep(0.001)
+            later = scheduler.submit('bench1', 5.0, 1, priority=5, deadline=2.0)
+            later.result(timeout=5.0)
+        assert running.preemptions == 0
+        assert sdk.calls['JETI_MeasureBreakEx'] == 0
+
+    def test_cancel_and_failures(self, devices):
+        """Test that cancelled jobs and failing fetches finish with errors"""
+        def broken(device):
+            raise JetiException(JetiError.MEASURE_FAIL, "no data")
+
+        scheduler = MeasurementScheduler(devices)
+        queued = scheduler.submit('bench1', 5.0)
+        assert queued.cancel()
+        with pytest.raises(JetiException) as info:
+            queued.result(timeout=0.1)
+        assert info.value.error_code == JetiError.BREAK
+
+        with scheduler:
+            failing = scheduler.submit('bench1', 5.0, fetch=broken)
+            with pytest.raises(JetiException):
+                failing.result(timeout=5.0)
+        assert failing.status == FAILED
+        stats = scheduler.stats()['bench1']
+        assert (stats.cancelled, stats.failed) == (1, 1)
@@ -0,0 +1,166 @@
+"""
+Tests for supervised device sessions with automatic reconnection
+Runs against the in-process simulated SDK
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiRadioEx, JetiSpectroEx, JetiException, JetiError
+from jeti.session import DeviceSession
+from jeti.simulator import SimulatedDevice, SimulatedSDK
+
+
+def _step(device):
+    device.measure(5.0, 1)
+    device.wait_for_measurement(0.001)
+    return device.get_spectral_radiance(380, 780)
+
+
+@pytest.fixture
+def sdk():
+    return SimulatedSDK([SimulatedDevice(serial="SIM00001", time_scale=0.0, seed=1),
+                         SimulatedDevice(serial="SIM00002", time_scale=0.0, seed=2)])
+
+
+@pytest.fixture
+def session(sdk):
+    session = DeviceSession(JetiRadioEx, serial="SIM00002", dll=sdk, retry_interval=0.01,
+                            reconnect_timeout=2.0)
+    with session:
+        yield session
+
+
+class TestDeviceSession:
+    """Test reconnection and configuration replay"""
+
+    def test_opens_by_serial(self, session):
+        """Test that the session opens the device with its serial"""
+        assert session.serial == "SIM00002"
+        assert session.device.get_serial_device(1)[2] == "SIM00002"
+        assert session.config.snapshot['average'] == 1
+        assert session.run(_step).shape == (401,)
+        assert session.stats()['reconnects'] == 0
+
+    def test_reconnect_replays_configuration(self, sdk, session):
+        """Test that a dropped device is reopened and its configuration replayed"""
+        simulated = sdk.devices[1]
+        session.apply({'average': 4, 'integration_time': 25.0})
+        assert simulated.average == 4
+
+        sdk.disconnect(simulated, duration=0.05)
+        spectrum = session.run(_step)
+        assert spectrum.shape == (401,)
+        assert simulated.average == 4
+        assert simulated.integration_time == 25.0
+        stats = session.stats()
+        assert stats['reconnects'] == 1
+        assert stats['failures'] == 0
+        assert 0.04 <= stats['last_downtime'] < 1.0
+        assert session.events[0].error == JetiError.NOT_CONNECTED
+        assert session.events[0].attempts > 1
+
+    def test_reopens_renumbered_device(self, sdk, session):
+        """Test that the device is found by serial after the numbering changed"""
+        sdk.disconnect(sdk.devices[1], duration=0.02)
+        sdk.disconnect(sdk.devices[0])
+        session.run(_step)
+        assert session.device.get_num_devices() == 1
+        assert session.device.get_serial_device(0)[2] == "SIM00002"
+        assert sdk.devices[1] in sdk._handles.values()
+
+    def test_gives_up_after_timeout(self, sdk, session):
+        """Test that handle loss is raised when the device does not come back"""
+        session.reconnect_timeout = 0.05
+        sdk.disconnect(sdk.devices[1])
+        with pytest.raises(JetiException) as info:
+            session.run(_step)
+        assert info.value.error_code == JetiError.NOT_CONNECTED
+        assert session.stats()['failures'] == 1
+
+    def test_acquisition_survives_reconnect(self, sdk, session):
+        """Test that an acquisition built on the session device follows the new handle"""
+        acquisition = session.device.create_acquisition(('sprad', 'cct'))
+        acquisition.acquire()
+        sdk.disconnect(sdk.devices[1], duration=0.05)
+        values = session.run(lambda device: acquisition.acquire())
+        assert values['cct'] > 0.0
+        assert session.stats()['reconnects'] == 1
+
+    def test_reconnect_cap(self, sdk, session):
+        """Test that a step still losing the handle after max_reconnects is raised"""
+        session.max_reconnects = 2
+        calls = []
+
+        def stale(device):
+            calls.append(1)
+            raise JetiException(JetiError.INVALID_HANDLE, "stale handle")
+
+        with pytest.raises(JetiException) as info:
+            session.run(stale)
+        assert info.value.error_code == JetiError.INVALID_HANDLE
+        assert len(calls) == 3
+        assert session.stats()['reconnects'] == 2
+
+    def test_other_errors_propagate(self, sdk, session):
+        """Test that errors other than handle loss are not treated as disconnects"""
+        sdk.inject_error('JETI_MeasureEx', JetiError.BUSY)
+        with pytest.raises(JetiException) as info:
+            session.run(_step)
+        assert info.value.error_code == JetiError.BUSY
+        assert session.stats()['reconnects'] == 0
+
+    def test_loop_resumes_and_keeps_hooks(self, sdk, session):
+        """Test that an acquisition loop continues after a drop with its hooks intact"""
+        seen = []
+        dropped = []
+        session.device.add_measurement_hook(lambda device: seen.append(1))
+
+        def step(device):
+            if len(seen) == 5 and not dropped:
+                dropped.append(True)
+                sdk.disconnect(sdk.devices[1], duration=0.02)
+            return _step(device)
+
+        spectra = list(session.iterate(step, count=10))
+        assert len(spectra) == 10
+        assert all(np.all(np.isfinite(spectrum)) for spectrum in spectra)
+        assert session.stats()['reconnects'] == 1
+        assert len(seen) >= 10
+
+    def test_concurrent_loss_reconnects_once(self, sdk, session):
+        """Test that threads losing the handle together trigger one reconnect"""
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(5):
+                    session.get_cct()
+            except JetiException as exc:
+                errors.append(exc)
+
+        session.run(_step)
+        sdk.disconnect(sdk.devices[1], duration=0.05)
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The power cycle dropped the measurement, so the replayed reads find no data
+        assert all(exc.error_code == JetiError.MEASURE_FAIL for exc in errors)
+        assert session.stats()['reconnects'] == 1
+
+    def test_spectro_session(self, sdk):
+        """Test a session around JetiSpectroEx"""
+        with DeviceSession(JetiSpectroEx, serial="SIM00001", dll=sdk, retry_interval=0.01) as session:
+            sdk.disconnect(sdk.devices[0], duration=0.02)
+            assert session.get_pixel_count() == sdk.devices[0].pixel_count
+            assert session.stats()['reconnects'] == 1
@@ -0,0 +1,146 @@
+"""
+Tests for the Arrow IPC / Parquet spectrum sink
+Runs against the in-process simulated SDK; skipped without pyarrow
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti import JetiRadioEx, JetiSpectroEx
+from jeti.results import RadiometricResult
+from jeti.sink import SpectrumSink, iter_spectra, read_spectra
+
+
+AXIS = np.arange(380.0, 781.0)
+
+
+def _spectra(count: int) -> np.ndarray:
+    return (np.arange(count, dtype=np.float32)[:, None] + AXIS[None, :] / 1000.0).astype(np.float32)
+
+
+def _result(i: int) -> RadiometricResult:
+    return RadiometricResult(1.0 + i, 2.0 + i, 0.3125, 0.375, 3000.0 + i, np.full(15, i, dtype=np.float32))
+
+
+@pytest.fixture
+def device_options():
+    return {'serial': "SIM00001", 'time_scale': 0.0, 'seed': 1}
+
+
+class TestSpectrumSink:
+    """Test incremental writing and reading back"""
+
+    @pytest.mark.parametrize("suffix", [".arrow", ".parquet"])
+    def test_round_trip(self, tmp_path, suffix):
+        """Test that spectra, metadata columns and results survive a round trip"""
+        pytest.importorskip("pyarrow")
+        path = tmp_path / f"run{suffix}"
+        spectra = _spectra(10)
+        with SpectrumSink(path, AXIS, columns={'serial': 'string', 'run': np.int32},
+                          results=True, metadata={'integration_time': 50.0}, batch_rows=4) as sink:
+            for i, spectrum in enumerate(spectra):
+                sink.append(spectrum, result=_result(i), serial="SIM00001", run=i, timestamp=100.0 + i)
+            assert sink.batches_written == 2 and len(sink) == 10
+        assert sink.rows_written == 10 and sink.batches_written == 3
+
+        data = read_spectra(path)
+        np.testing.assert_array_equal(data.axis, AXIS)
+        np.testing.assert_array_equal(data.spectra, spectra)
+        assert data.spectra.dtype == np.float32
+        assert data.metadata == {'integration_time': 50.0}
+        assert data.columns['serial'].tolist() == ["SIM00001"] * 10
+        np.testing.assert_array_equal(data.columns['run'], np.arange(10))
+        np.testing.assert_array_equal(data.columns['timestamp'], 100.0 + np.arange(10))
+        np.testing.assert_array_equal(data.columns['cct'], 3000.0 + np.arange(10))
+        assert data.columns['cri'].shape == (10, 15)
+
+        batches = list(iter_spectra(path))
+        assert [len(batch.spectra) for batch in batches] == [4, 4, 2]
+        np.testing.assert_array_equal(np.concatenate([batch.spectra for batch in batches]), spectra)
+
+    def test_extend_in_blocks(self, tmp_path):
+        """Test that blocks are split across record batches"""
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "run.arrow"
+        spectra = _spectra(7)
+        with SpectrumSink(path, AXIS, columns={'run': np.int64}, batch_rows=3) as sink:
+            sink.extend(spectra[:5], run=np.arange(5))
+            sink.extend(spectra[5:], run=np.arange(5, 7))
+        assert sink.batches_written == 3
+        data = read_spectra(path)
+        np.testing.assert_array_equal(data.spectra, spectra)
+        np.testing.assert_array_equal(data.columns['run'], np.arange(7))
+        assert np.all(data.columns['timestamp'] > 0.0)
+
+    def test_memory_mapped_views(self, tmp_path):
+        """Test that an IPC file is read without copying the spectra"""
+        pa = pytest.importorskip("pyarrow")
+        path = tmp_path / "run.arrow"
+        with SpectrumSink(path, AXIS) as sink:
+            sink.extend(_spectra(5))
+        before = pa.total_allocated_bytes()
+        data = read_spectra(path)
+        assert pa.total_allocated_bytes() == before
+        assert not data.spectra.flags.owndata
+        assert data.spectra.shape == (5, AXIS.size)
+
+    def test_bounded_buffer(self, tmp_path):
+        """Test that only one block of spectra is held in memory"""
+        pytest.importorskip("pyarrow")
+        sink = SpectrumSink(tmp_path / "run.arrow", AXIS, batch_rows=16)
+        buffer = sink._spectra
+        sink.extend(_spectra(100))
+        assert sink._spectra is buffer and buffer.nbytes == 16 * AXIS.size * 4
+        assert sink.rows_written == 96
+        sink.close()
+        assert len(read_spectra(sink.path).spectra) == 100
+
+    def test_device_spectra(self, sdk, tmp_path):
+        """Test collecting radiance and pixel spectra from simulated devices"""
+        pytest.importorskip("pyarrow")
+        radio = JetiRadioEx(dll=sdk)
+        radio.open_device(0)
+        with SpectrumSink(tmp_path / "radiance.parquet", AXIS, results=True) as sink:
+            for _ in range(3):
+                radio.measure(20.0, 1)
+                radio.wait_for_measurement(0.001)
+                sink.append(radio.get_spectral_radiance(380, 780), result=radio.get_result())
+        radio.close_device()
+        assert read_spectra(tmp_path / "radiance.parquet").columns['cct'].shape == (3,)
+
+        spectro = JetiSpectroEx(dll=sdk)
+        spectro.open_device(0)
+        pixels = np.arange(spectro.get_pixel_count())
+        with SpectrumSink(tmp_path / "pixels.arrow", pixels, axis_name='pixel') as sink:
+            spectro.start_light_measurement(10.0, 1)
+            spectro.wait_for_measurement(0.001)
+            light = spectro.get_light_spectrum_pixel()
+            sink.append(light)
+        spectro.close_device()
+        np.testing.assert_array_equal(read_spectra(tmp_path / "pixels.arrow").spectra[0], light)
+
+    def test_invalid_input(self, tmp_path):
+        """Test that missing columns, results and bad shapes are rejected"""
+        pytest.importorskip("pyarrow")
+        with SpectrumSink(tmp_path / "run.arrow", AXIS, columns={'serial': str}, results=True) as sink:
+            with pytest.raises(ValueError, match="serial"):
+                sink.append(_spectra(1)[0], result=_result(0))
+            with pytest.raises(ValueError, match="colorimetric"):
+                sink.append(_spectra(1)[0], serial="x")
+            with pytest.raises(ValueError, match="shape"):
+                sink.extend(_spectra(2)[:, :10], serial=["x", "y"])
+        with pytest.raises(ValueError, match="format"):
+            SpectrumSink(tmp_path / "run.arrow", AXIS, format='csv')
+
+    def test_missing_pyarrow(self, tmp_path, monkeypatch):
+        """Test that the sink names its missing dependency"""
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+        with pytest.raises(ImportError, match="pyarrow"):
+            SpectrumSink(tmp_path / "run.arrow", AXIS)
@@ -0,0 +1,130 @@
+"""
+Tests for the chunked, compressed spectrum store
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import numpy as np
+import pytest
+
+from jeti.storage import CODECS, SpectrumStore, decode_chunk, encode_chunk
+
+
+AXIS = np.arange(380.0, 781.0)
+
+
+def _smooth(rows: int, seed: int = 0) -> np.ndarray:
+    """LED-like spectra: a blue peak and a broad phosphor band"""
+    rng = np.random.default_rng(seed)
+    shape = np.exp(-((AXIS - 450.0) / 10.0) ** 2) + 0.8 * np.exp(-((AXIS - 580.0) / 60.0) ** 2)
+    level = 0.01 * (1.0 + 0.001 * rng.standard_normal((rows, 1)))
+    return (level * shape).astype(np.float32)
+
+
+def _filled(path, chunk_rows=16, **kwargs) -> SpectrumStore:
+    """Store with 64 spectra of two devices, one per second, interleaved"""
+    store = SpectrumStore(path, AXIS, chunk_rows=chunk_rows, **kwargs)
+    spectra = _smooth(64)
+    for row in range(64):
+        store.append("SIM00001", spectra[row], timestamp=1000.0 + row)
+        store.append("SIM00002", spectra[row] * 2.0, timestamp=1000.0 + row)
+    return store
+
+
+class TestChunkEncoding:
+    """Test the delta + shuffle + compressor encoding"""
+
+    @pytest.mark.parametrize("codec", CODECS)
+    def test_lossless_round_trip(self, codec):
+        """Test that every bit pattern survives, including signs, NaN and inf"""
+        spectra = np.random.default_rng(1).standard_normal((8, 401)).astype(np.float32)
+        spectra[0, :3] = (np.nan, np.inf, -np.inf)
+        timestamps = 1.7e9 + np.arange(8) * 0.25
+        data = encode_chunk(timestamps, spectra, codec)
+        decoded_times, decoded = decode_chunk(data, 8, 401, codec)
+        np.testing.assert_array_equal(decoded_times, timestamps)
+        np.testing.assert_array_equal(decoded.view(np.uint32), spectra.view(np.uint32))
+
+    def test_delta_beats_plain_compression(self):
+        """Test that smooth spectra compress better than the raw floats"""
+        spectra = _smooth(256)
+        encoded = encode_chunk(np.zeros(256), spectra)
+        assert len(encoded) < 0.8 * len(zlib.compress(spectra.tobytes(), 6))
+        assert spectra.nbytes / len(encoded) > 2.0
+
+    def test_mantissa_rounding(self):
+        """Test the error bound and gain of rounding to 12 mantissa bits"""
+        spectra = _smooth(256)
+        spectra[0, 0] = np.nan
+        lossless = encode_chunk(np.zeros(256), spectra)
+        rounded = encode_chunk(np.zeros(256), spectra, mantissa_bits=12)
+        _, decoded = decode_chunk(rounded, 256, AXIS.size)
+        assert np.isnan(decoded[0, 0])
+        error = np.abs(decoded[:, 1:] - spectra[:, 1:]) / spectra[:, 1:]
+        assert error.max() <= 2.0 ** -13
+        assert len(rounded) < len(lossless) / 3
+
+
+class TestSpectrumStore:
+    """Test appending, time-range queries and persistence"""
+
+    def test_query_reads_only_needed_chunks(self, tmp_path):
+        """Test that a query decompresses just the chunks overlapping its range"""
+        store = _filled(tmp_path / "store")
+        assert store.stats().chunks == 8
+        timestamps, spectra = store.query("SIM00002", 1010.0, 1030.0)
+        np.testing.assert_array_equal(timestamps, 1010.0 + np.arange(21))
+        np.testing.assert_array_equal(spectra, _smooth(64)[10:31] * 2.0)
+        assert store.chunks_read == 2
+        assert len(store.chunks("SIM00002", 1020.0, 1030.0)) == 1
+
+    def test_buffered_spectra_are_visible(self, tmp_path):
+        """Test that spectra not yet in a chunk are returned by queries"""
+        store = SpectrumStore(tmp_path / "store", AXIS, chunk_rows=16)
+        store.append("SIM00001", _smooth(1)[0], timestamp=5.0)
+        timestamps, spectra = store.query("SIM00001")
+        assert timestamps.tolist() == [5.0] and spectra.shape == (1, AXIS.size)
+        assert store.stats().chunks == 0
+        assert store.query("SIM00009")[1].shape == (0, AXIS.size)
+
+    def test_reopen(self, tmp_path):
+        """Test that a closed store is read back with its settings"""
+        with _filled(tmp_path / "store", codec='lzma', mantissa_bits=16) as store:
+            store.append("SIM00003", _smooth(1)[0], timestamp=2000.0)
+        reopened = SpectrumStore(tmp_path / "store")
+        assert (reopened.codec, reopened.mantissa_bits) == ('lzma', 16)
+        np.testing.assert_array_equal(reopened.axis, AXIS)
+        assert reopened.serials() == ["SIM00001", "SIM00002", "SIM00003"]
+        timestamps, spectra = reopened.query("SIM00001")
+        assert len(timestamps) == 64
+        np.testing.assert_allclose(spectra, _smooth(64), rtol=2.0 ** -17)
+        stats = reopened.stats()
+        assert stats.rows == 129 and stats.ratio > 2.0
+
+    def test_interrupted_write(self, tmp_path):
+        """Test that an index record of a partly written chunk is dropped"""
+        _filled(tmp_path / "store").close()
+        chunks = tmp_path / "store" / "chunks.bin"
+        chunks.write_bytes(chunks.read_bytes()[:-10])
+        store = SpectrumStore(tmp_path / "store")
+        assert store.stats().chunks == 7
+        assert (tmp_path / "store" / "index.bin").stat().st_size == store.index.nbytes
+        store.append("SIM00001", _smooth(1)[0], timestamp=3000.0)
+        store.close()
+        assert SpectrumStore(tmp_path / "store").stats().chunks == 8
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test missing stores, unknown codecs and long serials"""
+        with pytest.raises(FileNotFoundError):
+            SpectrumStore(tmp_path / "missing")
+        with pytest.raises(ValueError, match="codec"):
+            SpectrumStore(tmp_path / "store", AXIS, codec='brotli')
+        store = SpectrumStore(tmp_path / "store", AXIS)
+        with pytest.raises(ValueError, match="longer"):
+            store.append("X" * 33, _smooth(1)[0])
@@ -0,0 +1,93 @@
+"""
+Tests for flicker-synchronised acquisition
+Runs against the in-process simulated SDK
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+
+from jeti import JetiRadioEx
+from jeti.sync import SyncResult, whole_periods
+
+
+@pytest.fixture
+def device_class():
+    return JetiRadioEx
+
+
+@pytest.fixture
+def device_options():
+    return {'flicker_frequency': 100.0, 'flicker_depth': 0.5, 'time_scale': 0.0}
+
+
+class TestWholePeriods:
+    """Test integration time rounding"""
+    
+    def test_rounds_down(self):
+        """Test rounding down to whole periods"""
+        assert whole_periods(25.0, 100.0) == pytest.approx(20.0)
+        assert whole_periods(20.0, 100.0) == pytest.approx(20.0)
+        assert whole_periods(16.0, 120.0) == pytest.approx(1000.0 / 120.0)
+    
+    def test_at_least_one_period(self):
+        """Test that short times are extended to one period"""
+        assert whole_periods(2.0, 50.0) == pytest.approx(20.0)
+    
+    def test_steady_source(self):
+        """Test that a zero frequency keeps the integration time"""
+        assert whole_periods(13.0, 0.0) == 13.0
+
+
+class TestSyncAcquisition:
+    """Test synchronised scans on a flickering source"""
+    
+    def test_frequency_cached_per_source(self, sdk, device):
+        """Test that the flicker frequency is detected once per source"""
+        assert device.detect_flicker_frequency('lamp A') == pytest.approx(100.0)
+        device.create_sync_acquisition('lamp A', integration_time=13.0)
+        device.create_sync_acquisition('lamp A', integration_time=13.0)
+        assert sdk.calls['JETI_GetFlickerFreq'] == 1
+        device.detect_flicker_frequency('lamp B')
+        assert sdk.calls['JETI_GetFlickerFreq'] == 2
+    
+    def test_integration_time_whole_periods(self, device):
+        """Test that the automatic integration time is rounded to whole periods"""
+        acquisition = device.create_sync_acquisition('lamp')
+        periods = acquisition.integration_time * acquisition.frequency / 1000.0
+        assert periods == pytest.approx(round(periods))
+        assert periods >= 1
+    
+    def test_sync_mode_restored(self, sdk, device):
+        """Test that sync mode is enabled during the run only"""
+        acquisition = device.create_sync_acquisition('lamp', integration_time=13.0)
+        result = acquisition.run(max_scans=3)
+        assert sdk.calls['JETI_SetSyncMode'] == 2
+        assert device.get_sync_mode() is False
+        assert device.get_sync_frequency() == pytest.approx(100.0)
+        assert result.scans <= 3
+    
+    def test_converges_faster_than_free_running(self, device):
+        """Test that synced scans reach a stable reading in fewer scans"""
+        synced = device.create_sync_acquisition('lamp', integration_time=13.0).run(
+            tolerance=2e-3, max_scans=60)
+        free = device.create_sync_acquisition('lamp', integration_time=13.0,
+                                              synchronize=False).run(tolerance=2e-3, max_scans=60)
+        assert isinstance(synced, SyncResult)
+        assert synced.stable
+        assert synced.scans == 3
+        assert synced.time_to_stable is not None
+        assert synced.integration_time == pytest.approx(10.0)
+        assert free.integration_time == 13.0
+        assert free.scans > synced.scans
+        assert synced.relative_error < free.relative_error
+    
+    def test_spectrum_average(self, device):
+        """Test the averaged spectral radiance"""
+        result = device.create_sync_acquisition('lamp', integration_time=20.0).run(spectrum=True)
+        assert result.spectrum.shape == device.spectral_axis.grid(380, 780).shape
@@ -0,0 +1,159 @@
+"""
+Tests for hardware-trigger burst capture
+Runs against the in-process simulated SDK and trigger source
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path for development mode
+_project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_project_root / "src"))
+
+import pytest
+import numpy as np
+
+from jeti import JetiException, JetiError
+from jeti.simulator import SimulatedTriggerSource
+from jeti.trigger import TriggeredReadout
+
+
+@pytest.fixture
+def device_options():
+    return {'time_scale': 1.0}
+
+
+class TestTriggerFunctions:
+    """Test the trigger and flash configuration wrappers"""
+    
+    def test_trigger_configuration(self, simulated, device):
+        """Test trigger mode, timeout and flash settings"""
+        device.set_trigger_mode(1)
+        device.set_trigger_timeout(500)
+        device.set_flash(10.0, 0.5)
+        device.set_flash_mode(True)
+        assert simulated.trigger_mode == 1
+        assert device.get_trigger_timeout() == 500
+        assert simulated.flash == pytest.approx((10.0, 0.5))
+        assert simulated.flash_mode == 1
+        assert device.get_optical_trigger() is False
+    
+    def test_pre_trigger_arms(self, simulated, device):
+        """Test that JETI_PreTrigMeasure waits for a trigger"""
+        device.pre_trigger_measure()
+        assert simulated.armed
+        assert simulated.fire_trigger()
+        assert not simulated.fire_trigger()
+        assert simulated.missed_triggers == 1
+
+
+def _wait_until(condition, timeout=5.0):
+    """Poll a condition, failing the test instead of hanging after the timeout"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _wait_armed(simulated):
+    """Wait until the capture thread has armed the device for the first edge"""
+    _wait_until(lambda: simulated.armed)
+
+
+class TestTriggerCapture:
+    """Test armed capture with a consumer thread"""
+    
+    def test_burst_captured_by_consumer(self, simulated, device):
+        """Test that every trigger of a burst reaches the consumer"""
+        received = []
+        capture = device.create_trigger_capture(integration_time=2.0)
+        consumer = threading.Thread(target=lambda: received.extend(capture))
+        source = SimulatedTriggerSource(simulated, rate=50.0, count=20)
+        
+        capture.start()
+        consumer.start()
+        _wait_armed(simulated)
+        source.start()
+        source.join(timeout=5.0)
+        _wait_until(lambda: capture.captured == 20)
+        capture.stop()
+        consumer.join(timeout=5.0)
+        
+        assert source.accepted == 20
+        assert simulated.missed_triggers == 0
+        assert len(received) == 20
+        assert [readout.index for readout in received] == list(range(20))
+        assert isinstance(received[0], TriggeredReadout)
+        assert received[0].counts.shape == (1024,)
+        assert received[0].counts.dtype == np.int32
+        assert not simulated.armed
+        assert simulated.trigger_mode == 0
+    
+    def test_latency_stats(self, simulated, device):
+        """Test trigger-to-data latencies against the simulated edge times"""
+        capture = device.create_trigger_capture(integration_time=2.0)
+        source = SimulatedTriggerSource(simulated, rate=50.0, count=10)
+        with capture:
+            _wait_armed(simulated)
+            source.start()
+            readouts = [capture.get(timeout=2.0) for _ in range(10)]
+        stats = capture.latency_stats()
+        assert stats['queued']['count'] == 10
+        assert stats['delivered']['count'] == 10
+        assert 0.002 <= stats['queued']['p50'] <= stats['queued']['max'] < 0.1
+        edges = np.array(source.fired)
+        estimated = np.array([readout.trigger_time for readout in readouts])
+        assert np.abs(estimated - edges).max() < 0.02
+    
+    def test_queue_limit_drops(self, simulated, device):
+        """Test that a full queue drops readouts instead of delaying the re-arm"""
+        capture = device.create_trigger_capture(integration_time=1.0, queue_size=3)
+        source = SimulatedTriggerSource(simulated, rate=50.0, count=8)
+        with capture:
+            _wait_armed(simulated)
+            source.start()
+            source.join(timeout=5.0)
+            _wait_until(lambda: capture.captured == 8)
+        assert source.accepted == 8
+        assert capture.captured == 8
+        assert capture.dropped == 5
+        assert capture.queue.qsize() == 3 + 1
+    
+    def test_device_reopened(self, simulated, device):
+        """Test that a capture uses the handle of a device reopened after its creation"""
+        capture = device.create_trigger_capture(integration_time=1.0)
+        device.close_device()
+        device.open_device(0)
+        source = SimulatedTriggerSource(simulated, rate=50.0, count=3)
+        with capture:
+            _wait_armed(simulated)
+            source.start()
+            readouts = [capture.get(timeout=2.0) for _ in range(3)]
+        assert [readout.index for readout in readouts] == [0, 1, 2]
+    
+    def test_calls_during_capture(self, simulated, device):
+        """Test that another thread's calls wait at most one JETI_WaitReadTrigger timeout"""
+        capture = device.create_trigger_capture(timeout=0.5)
+        with capture:
+            _wait_armed(simulated)
+            start = time.perf_counter()
+            device.lock_stats()
+            stats_time = time.perf_counter() - start
+            waits = []
+            for _ in range(3):
+                start = time.perf_counter()
+                device.get_trigger_timeout()
+                waits.append(time.perf_counter() - start)
+        assert stats_time < 0.05
+        assert max(waits) < 0.5 + 0.15
+    
+    def test_error_reaches_consumer(self, sdk, simulated, device):
+        """Test that a capture error is raised on the consumer side"""
+        sdk.inject_error('JETI_WaitReadTrigger', JetiError.ERROR_RECEIVE)
+        capture = device.create_trigger_capture()
+        capture.start()
+        with pytest.raises(JetiException):
+            capture.get(timeout=2.0)
+        capture.stop()
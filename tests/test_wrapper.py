@@ -16,7 +16,7 @@ import numpy as np
 from jeti import (
     JetiCore, JetiRadio, JetiRadioEx,
     JetiSpectro, JetiSpectroEx,
-    JetiException, JetiError
+    JetiException, JetiError, SpectralAxis
 )
 
 
@@ -134,6 +134,54 @@ class TestNumpyIntegration:
         assert pixels.dtype == np.int32
 
 
+class TestSpectralAxis:
+    """Test the cached spectral axis (without actual device)"""
+    
+    @pytest.fixture
+    def axis(self):
+        return SpectralAxis(380, 1000, 1, 380, 780, 1, 1024)
+    
+    def test_num_points_float_step(self):
+        """Test that float steps keep the last point"""
+        assert SpectralAxis.num_points(380, 780, 0.1) == 4001
+        assert SpectralAxis.num_points(380, 780, 5.0) == 81
+        assert SpectralAxis.num_points(380, 782, 5.0) == 81
+    
+    def test_grid_values(self, axis):
+        """Test wavelength grid values"""
+        grid = axis.grid(380, 780, 5.0)
+        assert grid.shape == (81,)
+        assert grid[0] == 380.0
+        assert grid[-1] == 780.0
+    
+    def test_grid_cached_read_only(self, axis):
+        """Test that grids are shared and read-only"""
+        grid = axis.grid(380, 780)
+        assert axis.grid(380, 780) is grid
+        assert axis.wavelengths is grid
+        with pytest.raises(ValueError):
+            grid[0] = 0.0
+    
+    def test_axis_immutable(self, axis):
+        """Test that the axis cannot be modified"""
+        with pytest.raises(AttributeError):
+            axis.calib_end = 2000
+    
+    def test_validate_outside_calibration(self, axis):
+        """Test that out-of-range requests fail with ERROR_PARAMETER"""
+        with pytest.raises(JetiException) as exc_info:
+            axis.validate(300, 780)
+        assert exc_info.value.error_code == JetiError.ERROR_PARAMETER
+        with pytest.raises(JetiException):
+            axis.grid(780, 380)
+    
+    def test_validate_step(self, axis):
+        """Test that non-positive steps fail with INVALID_STEPWIDTH"""
+        with pytest.raises(JetiException) as exc_info:
+            axis.validate(380, 780, 0.0)
+        assert exc_info.value.error_code == JetiError.INVALID_STEPWIDTH
+
+
 class TestContextManager:
     """Test context manager support (without actual device)"""
     
@@ -170,6 +218,60 @@ class TestDLLPathResolution:
 
 
 # Optional tests that require DLLs (will be skipped if DLLs not present)
+class TestImageReadout:
+    """Test image frames of JetiSpectroEx against the simulated SDK"""
+
+    @pytest.fixture
+    def device_class(self):
+        return JetiSpectroEx
+
+    @pytest.fixture
+    def device_options(self):
+        return {'serial': "SIM00001", 'pixel_count': 256, 'sensor_rows': 32,
+                'time_scale': 0.0, 'seed': 1}
+
+    def test_frame_shape_from_row_conf(self, device):
+        """Test that frames are uint16 (rows, pixels) views on the transfer buffer"""
+        assert device.get_pda_row_conf() == (0, 32)
+        device.start_light_image(10.0)
+        device.wait_for_measurement(0.001)
+        frame = device.get_light_image()
+        assert frame.shape == (32, 256) and frame.dtype == np.uint16
+        assert not frame.flags.owndata
+        assert frame[16].mean() > frame[0].mean()
+
+        device.set_pda_row_conf(8, 4)
+        assert device.image_shape == (4, 256)
+        device.start_dark_image(10.0)
+        device.wait_for_measurement(0.001)
+        dark = device.get_dark_image()
+        assert dark.shape == (4, 256)
+        assert abs(float(dark.mean()) - 1000.0) < 5.0
+
+    def test_buffer_reuse(self, device):
+        """Test that frames are read into given or rotating buffers"""
+        buffer = device.new_image_buffer()
+        device.start_light_image(10.0)
+        device.wait_for_measurement(0.001)
+        assert device.get_light_image(out=buffer) is buffer
+        np.testing.assert_array_equal(buffer, device.get_light_image())
+
+        frames = [frame.ctypes.data for frame in device.iter_light_images(10.0, count=4, buffers=2)]
+        assert frames[0] == frames[2] and frames[1] == frames[3] and frames[0] != frames[1]
+
+    def test_invalid_buffer_and_rows(self, device):
+        """Test that mismatched buffers and row ranges are rejected"""
+        device.start_light_image(10.0)
+        with pytest.raises(ValueError, match="uint16"):
+            device.get_light_image(out=np.empty((32, 256), dtype=np.int32))
+        with pytest.raises(ValueError):
+            device.get_light_image(out=np.empty((256, 32), dtype=np.uint16).T)
+        with pytest.raises(JetiException) as exc_info:
+            device.set_pda_row_conf(30, 4)
+        assert exc_info.value.error_code == JetiError.ERROR_PARAMETER
+        assert device.image_shape == (32, 256)
+
+
 class TestWithDLLs:
     """Tests that require actual DLL files"""
     